@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 """
-Apply System Identification Corrections to Model Source Files
-================================================================
+Apply System Identification Corrections
+=========================================
 
 Reads optimized correction values from identification/sysid_result.json
-and patches the corresponding _validated.py model files to use those
-values instead of zeros.
+and merges them into the correction overlay (``_corrections_overlay.json``,
+see ``common.correction_overlay``), which models pick up when they are
+loaded.  The whole fleet is applied with one atomic file write; models
+already loaded in a process refresh via ``refresh_models()``.
+
+``--patch-sources`` keeps the old behaviour of rewriting the
+``self.corrections = {...}`` literal in each _validated.py file.
 
 Usage:
     python apply_corrections.py                    # all models
     python apply_corrections.py --family zilog     # one family
     python apply_corrections.py --processor z80    # one processor
     python apply_corrections.py --dry-run          # preview only
+    python apply_corrections.py --patch-sources    # rewrite model sources instead
     python apply_corrections.py --min-improvement 0.5  # only apply if error improved by ≥0.5%
 
 Author: Grey-Box Performance Modeling Research
@@ -19,13 +25,17 @@ Date: January 2026
 """
 
 import argparse
-import json
 import re
 import sys
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.correction_overlay import build_overlay, read_overlay, write_overlay
+from common.jsoncache import load_json
 
 
 def discover_models_with_results(
@@ -38,8 +48,7 @@ def discover_models_with_results(
     if not index_path.exists():
         return []
 
-    with open(index_path) as f:
-        index = json.load(f)
+    index = load_json(index_path)
 
     results = []
     for family, info in index.get("families", {}).items():
@@ -72,8 +81,7 @@ def discover_models_with_results(
 
 def load_sysid_result(path: Path) -> Dict:
     """Load a sysid_result.json file."""
-    with open(path) as f:
-        return json.load(f)
+    return load_json(path)
 
 
 def apply_corrections_to_file(
@@ -138,11 +146,15 @@ def apply_corrections_to_file(
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Apply system identification corrections to model source files"
+        description="Apply system identification corrections to the correction overlay"
     )
     parser.add_argument("--family", help="Only apply to this family")
     parser.add_argument("--processor", help="Only apply to this processor")
     parser.add_argument("--dry-run", action="store_true", help="Preview only")
+    parser.add_argument(
+        "--patch-sources", action="store_true",
+        help="Rewrite the corrections literal in each _validated.py instead of the overlay"
+    )
     parser.add_argument(
         "--min-improvement", type=float, default=0.0,
         help="Only apply if error improved by at least this many %% points (default: 0)"
@@ -153,7 +165,8 @@ def main():
     print("=" * 75)
     print("APPLY SYSTEM IDENTIFICATION CORRECTIONS")
     print("=" * 75)
-    print(f"Mode: {'DRY-RUN' if args.dry_run else 'WRITE FILES'}")
+    print(f"Mode: {'DRY-RUN' if args.dry_run else 'WRITE FILES'}"
+          f" ({'model sources' if args.patch_sources else 'correction overlay'})")
     if args.min_improvement > 0:
         print(f"Min improvement: {args.min_improvement}%")
     print()
@@ -168,6 +181,7 @@ def main():
     applied = 0
     skipped = 0
     failed = 0
+    overlay_results = {}
 
     for entry in entries:
         label = f"{entry['family']}/{entry['processor']}"
@@ -198,6 +212,13 @@ def main():
             continue
 
         # Apply
+        if not args.patch_sources:
+            overlay_results[label] = sysid
+            applied += 1
+            action = "WOULD" if args.dry_run else "STAGED"
+            print(f"  {action:7s} {label:35s} — {len(corrections)} corrections, err={cpi_err:.2f}%")
+            continue
+
         success, msg = apply_corrections_to_file(
             entry["model_file"], corrections, args.dry_run
         )
@@ -210,6 +231,12 @@ def main():
             failed += 1
             print(f"  FAIL  {label:35s} — {msg}")
 
+    if overlay_results and not args.dry_run:
+        models = build_overlay(sysid_results=overlay_results,
+                               base=read_overlay().get("models", {}))
+        version = write_overlay(models)
+        print(f"\nWrote correction overlay v{version} ({len(models)} models)")
+
     print()
     print(f"Applied: {applied}  Skipped: {skipped}  Failed: {failed}")
     if args.dry_run:
@@ -14,11 +14,16 @@ Usage:
 """
 
 import argparse
-import json
+import sys
 from datetime import date
 from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.jsoncache import load_json
+
 TODAY = date.today().isoformat()
 
 
@@ -36,8 +41,7 @@ def main():
         family = model_dir.parent.name
         proc = model_dir.name
 
-        with open(sysid_path) as f:
-            sysid = json.load(f)
+        sysid = load_json(sysid_path)
 
         corrections = sysid.get("corrections", {})
         converged = sysid.get("converged", False)
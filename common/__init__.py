@@ -22,6 +22,32 @@ from .system_identification import (
     identify_model,
     load_measurements_for_model,
 )
+from .evaluator import VectorizedEvaluator
+from .sweep import SweepSummary, sweep_mixes, load_sweep
+from .design_space import DesignSpaceResult, explore_design_space, pareto_front
+from .trace import TimingTable, TraceResult, load_timing_table, replay_trace
+from .tracefile import TRACE_RECORD, TraceReader, TraceWriter, write_trace
+from .cache_sim import CacheGeometry, CacheStats, simulate_caches, derive_cache_config
+from .reuse_distance import ReuseDistanceAnalyzer, ReuseProfile, reuse_profile
+from .branch_sim import PredictorConfig, BranchStats, simulate_branches, derive_branch_config
+from .disasm import Disassembly, disassemble, load_image
+from .interpreter import Kernel, KernelResult, run_kernel, record_measurements
+from .cpu6502 import MOS6502
+from .cpuz80 import Z80
+from .simpoint import SampledResult, SimPoints, find_simpoints, sampled_replay
+from .parallel_replay import ParallelReplayResult, replay_parallel
+from .pipeline_sim import PipelineConfig, PipelineStats, simulate_pipeline
+from .pairing_sim import PairingRules, PairingStats, simulate_pairing
+from .prefetch_sim import BusInterfaceConfig, PrefetchQueueSimulator, PrefetchResult
+from .measurement_store import MeasurementStore, open_store
+from .jsoncache import JsonCache, load_json
+from .run_store import RunStore, open_run_store
+from .result_diff import ResultDiff, ResultSnapshot, diff_snapshots
+from .correction_overlay import CorrectionOverlay, apply_overlay, refresh_models
+from .model_loader import discover_processors, load_model
+from .output_writer import CommitReport, OutputTransaction
+from .fleet_export import iter_records, to_dataframes, write_csv, write_jsonl
+from .analysis_batch import AnalysisBatch
 
 __all__ = [
     'QueueingModel', 'QueueingResult',
@@ -37,4 +63,28 @@ __all__ = [
     'get_model_parameters', 'set_model_parameters',
     'get_model_parameter_bounds', 'get_model_parameter_metadata',
     'IdentificationResult', 'identify_model', 'load_measurements_for_model',
+    'VectorizedEvaluator',
+    'SweepSummary', 'sweep_mixes', 'load_sweep',
+    'DesignSpaceResult', 'explore_design_space', 'pareto_front',
+    'TimingTable', 'TraceResult', 'load_timing_table', 'replay_trace',
+    'TRACE_RECORD', 'TraceReader', 'TraceWriter', 'write_trace',
+    'CacheGeometry', 'CacheStats', 'simulate_caches', 'derive_cache_config',
+    'ReuseDistanceAnalyzer', 'ReuseProfile', 'reuse_profile',
+    'PredictorConfig', 'BranchStats', 'simulate_branches', 'derive_branch_config',
+    'Disassembly', 'disassemble', 'load_image',
+    'Kernel', 'KernelResult', 'run_kernel', 'record_measurements', 'MOS6502', 'Z80',
+    'SampledResult', 'SimPoints', 'find_simpoints', 'sampled_replay',
+    'ParallelReplayResult', 'replay_parallel',
+    'PipelineConfig', 'PipelineStats', 'simulate_pipeline',
+    'PairingRules', 'PairingStats', 'simulate_pairing',
+    'BusInterfaceConfig', 'PrefetchQueueSimulator', 'PrefetchResult',
+    'MeasurementStore', 'open_store',
+    'JsonCache', 'load_json',
+    'RunStore', 'open_run_store',
+    'ResultSnapshot', 'ResultDiff', 'diff_snapshots',
+    'CorrectionOverlay', 'apply_overlay', 'refresh_models',
+    'discover_processors', 'load_model',
+    'OutputTransaction', 'CommitReport',
+    'iter_records', 'write_jsonl', 'write_csv', 'to_dataframes',
+    'AnalysisBatch',
 ]
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Columnar Analysis Result Batches
+=================================
+
+``AnalysisResult`` carries two dicts per instance, which is fine for a
+handful of workloads but not for a million-mix sweep.  ``AnalysisBatch``
+holds the same fields for many results in one NumPy structured array:
+
+    row_id  processor_id  workload_id  cpi  ipc  ips  base_cpi
+    correction_delta  cache_miss_cpi  bottleneck (code)
+
+with the processor, workload and bottleneck names kept once in lookup
+tables, plus an optional shared ``(n, n_categories)`` matrix of per-category
+CPI contributions (what ``analyze()`` reports as ``utilizations``).
+Columns are array views; ``AnalysisResult`` objects are only built when a
+row is accessed:
+
+    batch = evaluator.analyze_batch(weights)      # VectorizedEvaluator
+    batch.cpi.mean()                              # column view, no objects
+    batch[42]                                     # -> AnalysisResult
+    batch[batch.cpi > 5]                          # -> AnalysisBatch (subset)
+
+``row_id`` is the row's position in the batch it was built in and is
+kept through slicing and ``concatenate``, so an anonymous mix is labelled
+``mix[<row_id>]`` (its row in the original weight matrix) in any subset.
+
+Per result the batch stores 64 bytes plus 8 bytes per category of the
+contribution matrix (112 bytes for a 6-category model), against about
+860 bytes for an ``AnalysisResult`` with its dicts.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .base_model import AnalysisResult
+
+RESULT_DTYPE = np.dtype([
+    ('row_id', np.int64),
+    ('processor_id', np.uint16),
+    ('workload_id', np.int32),
+    ('cpi', np.float64),
+    ('ipc', np.float64),
+    ('ips', np.float64),
+    ('base_cpi', np.float64),
+    ('correction_delta', np.float64),
+    ('cache_miss_cpi', np.float64),
+    ('bottleneck', np.uint16),
+])
+
+NUMERIC_FIELDS = ('cpi', 'ipc', 'ips', 'base_cpi', 'correction_delta', 'cache_miss_cpi')
+
+
+def _codes(names: Sequence[str], table: List[str]) -> np.ndarray:
+    """Codes of ``names`` in ``table``, appending unseen names to it."""
+    index = {name: i for i, name in enumerate(table)}
+    codes = np.empty(len(names), dtype=np.int64)
+    for i, name in enumerate(names):
+        code = index.get(name)
+        if code is None:
+            code = index[name] = len(table)
+            table.append(name)
+        codes[i] = code
+    return codes
+
+
+class AnalysisBatch:
+    """Many analysis results in one structured array (see module docstring).
+
+    Args:
+        records: Array of ``RESULT_DTYPE``
+        processors: Processor names indexed by ``processor_id``
+        workloads: Workload names indexed by ``workload_id``; rows with
+            ``workload_id == -1`` are anonymous mixes named ``mix[<row_id>]``
+        bottlenecks: Bottleneck names indexed by the ``bottleneck`` code
+        category_names: Column names of ``contributions``
+        contributions: Optional ``(len(records), len(category_names))``
+            per-category CPI contributions
+    """
+
+    def __init__(self, records: np.ndarray, processors: Sequence[str],
+                 workloads: Sequence[str] = (), bottlenecks: Sequence[str] = (),
+                 category_names: Sequence[str] = (),
+                 contributions: Optional[np.ndarray] = None):
+        if records.dtype != RESULT_DTYPE:
+            raise TypeError(f"records must have RESULT_DTYPE, got {records.dtype}")
+        if contributions is not None and contributions.shape != (len(records),
+                                                                 len(category_names)):
+            raise ValueError(f"contributions shape {contributions.shape} does not match "
+                             f"({len(records)}, {len(category_names)})")
+        self.records = records
+        self.processors = list(processors)
+        self.workloads = list(workloads)
+        self.bottlenecks = list(bottlenecks)
+        self.category_names = list(category_names)
+        self.contributions = contributions
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(cls, processor: Union[str, Sequence[str]],
+                     columns: Dict[str, np.ndarray],
+                     workloads: Optional[Sequence[str]] = None,
+                     category_names: Sequence[str] = (),
+                     contributions: Optional[np.ndarray] = None) -> 'AnalysisBatch':
+        """Build from evaluator-style column arrays.
+
+        Args:
+            processor: One processor name for all rows, or one per row
+            columns: 'cpi', 'ipc', 'ips', 'base_cpi', 'correction_delta',
+                'cache_miss_cpi' arrays and a 'bottleneck' array of names
+            workloads: Workload name per row (None: anonymous mixes)
+            category_names: Column names of ``contributions``
+            contributions: Optional per-category contribution matrix
+        """
+        n = len(columns['cpi'])
+        records = np.zeros(n, dtype=RESULT_DTYPE)
+        records['row_id'] = np.arange(n)
+        for name in NUMERIC_FIELDS:
+            if name in columns:
+                records[name] = columns[name]
+        processors: List[str] = []
+        if isinstance(processor, str):
+            processors.append(processor)
+        else:
+            records['processor_id'] = _codes(list(processor), processors)
+        workload_table: List[str] = []
+        if workloads is None:
+            records['workload_id'] = -1
+        else:
+            records['workload_id'] = _codes(list(workloads), workload_table)
+        bottlenecks: List[str] = []
+        if 'bottleneck' in columns:
+            labels, inverse = np.unique(np.asarray(columns['bottleneck']).astype(str),
+                                        return_inverse=True)
+            bottlenecks = labels.tolist()
+            records['bottleneck'] = inverse.ravel()
+        return cls(records, processors, workload_table, bottlenecks, category_names,
+                   contributions)
+
+    @classmethod
+    def from_results(cls, results: Iterable[AnalysisResult]) -> 'AnalysisBatch':
+        """Pack existing ``AnalysisResult`` objects (utilizations become contributions)."""
+        results = list(results)
+        category_names: List[str] = []
+        for r in results:
+            _codes(list(r.utilizations), category_names)
+        index = {c: i for i, c in enumerate(category_names)}
+        contributions = np.zeros((len(results), len(category_names)))
+        for row, r in enumerate(results):
+            for c, value in r.utilizations.items():
+                contributions[row, index[c]] = value
+        columns = {name: np.array([getattr(r, name) for r in results], dtype=np.float64)
+                   for name in NUMERIC_FIELDS}
+        columns['bottleneck'] = np.array([r.bottleneck for r in results], dtype=object)
+        return cls.from_columns([r.processor for r in results], columns,
+                                [r.workload for r in results], category_names,
+                                contributions if category_names else None)
+
+    @classmethod
+    def concatenate(cls, batches: Sequence['AnalysisBatch']) -> 'AnalysisBatch':
+        """Join batches, merging their name tables.
+
+        Rows keep their ``row_id``.  Contribution matrices are kept only if
+        every batch has one over the same categories.
+        """
+        processors: List[str] = []
+        workloads: List[str] = []
+        bottlenecks: List[str] = []
+        parts = []
+        for batch in batches:
+            records = batch.records.copy()
+            records['processor_id'] = _codes(batch.processors, processors)[
+                batch.records['processor_id']] if len(records) else 0
+            if batch.workloads and len(records):
+                remap = np.append(_codes(batch.workloads, workloads), -1)
+                records['workload_id'] = remap[batch.records['workload_id']]
+            if batch.bottlenecks and len(records):
+                records['bottleneck'] = _codes(batch.bottlenecks, bottlenecks)[
+                    batch.records['bottleneck']]
+            parts.append(records)
+        records = np.concatenate(parts) if parts else np.zeros(0, dtype=RESULT_DTYPE)
+        names = [b.category_names for b in batches]
+        contributions = None
+        if batches and all(b.contributions is not None for b in batches) \
+                and all(n == names[0] for n in names):
+            contributions = np.concatenate([b.contributions for b in batches])
+        return cls(records, processors, workloads, bottlenecks,
+                   names[0] if contributions is not None else (), contributions)
+
+    # ------------------------------------------------------------------
+    # Column access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name in NUMERIC_FIELDS:
+            return self.records[name]
+        raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the record array and the contribution matrix."""
+        extra = self.contributions.nbytes if self.contributions is not None else 0
+        return self.records.nbytes + extra
+
+    def bottleneck_names(self) -> np.ndarray:
+        """Bottleneck name per row (object array)."""
+        return np.array(self.bottlenecks or [''], dtype=object)[self.records['bottleneck']]
+
+    def processor_names(self) -> np.ndarray:
+        return np.array(self.processors, dtype=object)[self.records['processor_id']]
+
+    def workload_names(self) -> np.ndarray:
+        ids = self.records['workload_id']
+        table = np.array(self.workloads + [''], dtype=object)
+        names = table[np.where(ids >= 0, ids, len(self.workloads))]
+        anonymous = np.flatnonzero(ids < 0)
+        names[anonymous] = [f"mix[{i}]" for i in self.records['row_id'][anonymous]]
+        return names
+
+    # ------------------------------------------------------------------
+    # Row access
+    # ------------------------------------------------------------------
+
+    def result(self, row: int) -> AnalysisResult:
+        """Materialize one row as an ``AnalysisResult``."""
+        n = len(self.records)
+        if row < 0:
+            row += n
+        if not 0 <= row < n:
+            raise IndexError(f"row {row} out of range for batch of {n}")
+        rec = self.records[row]
+        workload_id = int(rec['workload_id'])
+        utilizations = {}
+        if self.contributions is not None:
+            values = self.contributions[row]
+            utilizations = {self.category_names[i]: float(values[i])
+                            for i in np.flatnonzero(values)}
+        return AnalysisResult(
+            processor=self.processors[int(rec['processor_id'])],
+            workload=(self.workloads[workload_id] if workload_id >= 0
+                      else f"mix[{int(rec['row_id'])}]"),
+            ipc=float(rec['ipc']),
+            cpi=float(rec['cpi']),
+            ips=float(rec['ips']),
+            bottleneck=self.bottlenecks[int(rec['bottleneck'])] if self.bottlenecks else '',
+            utilizations=utilizations,
+            base_cpi=float(rec['base_cpi']),
+            correction_delta=float(rec['correction_delta']),
+            cache_miss_cpi=float(rec['cache_miss_cpi']),
+        )
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, np.integer)):
+            return self.result(int(key))
+        records = self.records[key]
+        if records.ndim == 0:
+            return self.result(int(key))
+        contributions = self.contributions[key] if self.contributions is not None else None
+        return AnalysisBatch(records, self.processors, self.workloads, self.bottlenecks,
+                             self.category_names, contributions)
+
+    def __iter__(self) -> Iterator[AnalysisResult]:
+        for row in range(len(self.records)):
+            yield self.result(row)
+
+    def __repr__(self) -> str:
+        return (f"AnalysisBatch({len(self)} results, {len(self.processors)} processor(s), "
+                f"{self.nbytes} bytes)")
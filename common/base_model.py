@@ -8,6 +8,11 @@ Provides common interfaces and data classes for all processor models.
 IMPORTANT: Field order in dataclasses must match how they're called!
 WorkloadProfile is called as: WorkloadProfile(name, category_weights_dict, description)
 
+The data classes use ``__slots__`` (Python 3.10+) and intern category names,
+so a fully loaded fleet keeps no per-instance ``__dict__`` and one copy of
+each category name string.  Instances therefore reject attributes that are
+not declared fields.
+
 Author: Grey-Box Performance Modeling Research
 Date: January 2026
 """
@@ -15,9 +20,21 @@ Date: January 2026
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Tuple
 import math
+import sys
+
+# dataclass(slots=True) needs Python 3.10; older interpreters get plain classes
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
+def _intern_keys(weights: Dict[str, float]) -> None:
+    """Intern the category-name keys of a weights dict in place."""
+    if any(type(k) is str and sys.intern(k) is not k for k in weights):
+        interned = {sys.intern(k) if type(k) is str else k: v for k, v in weights.items()}
+        weights.clear()
+        weights.update(interned)
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class CacheConfig:
     """Memory hierarchy configuration for cache miss modeling.
 
@@ -53,7 +70,7 @@ class CacheConfig:
         return penalty
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BranchPredictionConfig:
     """Branch prediction configuration for pipeline-aware branch cost modeling.
 
@@ -93,7 +110,7 @@ class BranchPredictionConfig:
                 (1.0 - self.predict_accuracy) * mispredict_cost)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class InstructionCategory:
     """Represents an instruction category with timing information"""
     name: str
@@ -101,13 +118,17 @@ class InstructionCategory:
     memory_cycles: float = 0.0
     description: str = ""
     frequency: float = 0.0  # Fraction of instructions in this category
-    
+
+    def __post_init__(self):
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+
     @property
     def total_cycles(self) -> float:
         return self.base_cycles + self.memory_cycles
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class WorkloadProfile:
     """Represents a workload with instruction category weights
     
@@ -118,7 +139,13 @@ class WorkloadProfile:
     # category_weights MUST come before description to match calling code!
     category_weights: Dict[str, float] = field(default_factory=dict)
     description: str = ""
-    
+
+    def __post_init__(self):
+        if type(self.name) is str:
+            self.name = sys.intern(self.name)
+        if isinstance(self.category_weights, dict):
+            _intern_keys(self.category_weights)
+
     def validate(self) -> bool:
         """Check that weights sum to 1.0"""
         if not self.category_weights:
@@ -127,7 +154,7 @@ class WorkloadProfile:
         return abs(total - 1.0) < 0.01
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class AnalysisResult:
     """Results from model analysis"""
     processor: str
@@ -281,7 +308,7 @@ class BaseProcessorModel:
         if penalty <= 0.0:
             return 0.0
 
-        memory_cats = getattr(self, 'memory_categories', [])
+        memory_cats = _get_memory_categories(self)
         cache_miss_cpi = 0.0
         for cat_name in memory_cats:
             if cat_name in categories:
@@ -311,7 +338,7 @@ class BaseProcessorModel:
             return 0.0
 
         effective_cost = bp_config.effective_branch_penalty()
-        branch_cats = getattr(self, 'branch_categories', ['branch', 'control'])
+        branch_cats = _get_branch_categories(self)
         bp_delta = 0.0
 
         for cat_name in branch_cats:
@@ -485,6 +512,16 @@ def _get_cache_config(model) -> Optional['CacheConfig']:
     return getattr(model, 'cache_config', None)
 
 
+def _get_memory_categories(model) -> List[str]:
+    """Categories that pay the cache miss penalty (none unless declared)."""
+    return getattr(model, 'memory_categories', [])
+
+
+def _get_branch_categories(model) -> List[str]:
+    """Categories whose cost the branch predictor replaces."""
+    return getattr(model, 'branch_categories', ['branch', 'control'])
+
+
 def get_model_parameters(model) -> Dict[str, float]:
     """Extract all tunable parameters from any model as a flat dict.
 
@@ -568,6 +605,21 @@ def set_model_parameters(model, params: Dict[str, float]):
                         setattr(bp, field_name, value)
 
 
+# Physically plausible ranges for cache and branch prediction parameters.
+# Shared by system identification and the design-space explorer.
+HARDWARE_PARAMETER_BOUNDS: Dict[str, tuple] = {
+    'cache.l1_hit_rate': (0.80, 0.999),
+    'cache.l2_hit_rate': (0.70, 0.999),
+    'cache.l1_latency': (1.0, 5.0),
+    'cache.l2_latency': (5.0, 30.0),
+    'cache.dram_latency': (20.0, 200.0),
+    'bp.predict_accuracy': (0.50, 0.99),
+    'bp.pipeline_depth': (3.0, 15.0),
+    'bp.btb_hit_rate': (0.60, 0.99),
+    'bp.taken_cycles': (1.0, 5.0),
+}
+
+
 def get_model_parameter_bounds(model) -> Dict[str, tuple]:
     """Get physically plausible (min, max) bounds for each parameter.
 
@@ -605,28 +657,8 @@ def get_model_parameter_bounds(model) -> Dict[str, tuple]:
             else:
                 limit = 5.0
             bounds[key] = (-limit, limit)
-        elif key.startswith('cache.'):
-            field_name = key[6:]
-            if field_name == 'l1_hit_rate':
-                bounds[key] = (0.80, 0.999)
-            elif field_name == 'l2_hit_rate':
-                bounds[key] = (0.70, 0.999)
-            elif field_name == 'l1_latency':
-                bounds[key] = (1.0, 5.0)
-            elif field_name == 'l2_latency':
-                bounds[key] = (5.0, 30.0)
-            elif field_name == 'dram_latency':
-                bounds[key] = (20.0, 200.0)
-        elif key.startswith('bp.'):
-            field_name = key[3:]
-            if field_name == 'predict_accuracy':
-                bounds[key] = (0.50, 0.99)
-            elif field_name == 'pipeline_depth':
-                bounds[key] = (3.0, 15.0)
-            elif field_name == 'btb_hit_rate':
-                bounds[key] = (0.60, 0.99)
-            elif field_name == 'taken_cycles':
-                bounds[key] = (1.0, 5.0)
+        elif key in HARDWARE_PARAMETER_BOUNDS:
+            bounds[key] = HARDWARE_PARAMETER_BOUNDS[key]
 
     return bounds
 
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Trace-Driven Set-Associative Cache Simulator
+==============================================
+
+Derives ``CacheConfig`` hit rates from address traces instead of
+hard-coding them.
+
+Many cache geometries are simulated in one pass.  Each geometry's sets get
+a slice of a shared set-id space, and every chunk of addresses is grouped
+by set.  Sets are independent, so the chunk is replayed in *rounds*: round
+``r`` performs the r-th access of every set at once as a handful of
+vectorized row operations on a ``(n_sets, ways)`` tag array.  The number
+of Python-level iterations is therefore about ``accesses / sets`` rather
+than ``accesses``.
+
+LRU geometries that share line size and set count are simulated once at the
+largest associativity: the LRU stack depth of each hit answers the question
+for every smaller associativity (stack inclusion), so e.g. 1/2/4/8-way
+variants of the same set count cost one simulation.
+
+Replacement policies: 'lru', 'fifo', 'random'.  Writes can be
+no-write-allocate.  L2 caches see the L1 miss stream (see
+``simulate_hierarchy``).  Very few sets (fully associative caches) mean
+many rounds; use ``common.reuse_distance`` for those.
+
+Usage:
+    from common.cache_sim import CacheGeometry, simulate_caches, derive_cache_config
+    stats = simulate_caches(reader, [CacheGeometry(8192, 4, 16),
+                                     CacheGeometry(8192, 2, 16)])
+    config = derive_cache_config(reader, CacheGeometry(8192, 4, 16),
+                                 l2=CacheGeometry(256 * 1024, 4, 32))
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .base_model import CacheConfig
+from .trace import FLAG_MEM_READ, FLAG_MEM_WRITE
+
+REPLACEMENT_POLICIES = ('lru', 'fifo', 'random')
+_POLICY_CODES = {name: code for code, name in enumerate(REPLACEMENT_POLICIES)}
+_LRU, _FIFO, _RANDOM = 0, 1, 2
+
+ACCESS_KINDS = ('data', 'instruction', 'unified')
+_EMPTY = -1
+
+
+@dataclass(frozen=True)
+class CacheGeometry:
+    """One cache organization.
+
+    Attributes:
+        size: Capacity in bytes
+        associativity: Ways per set
+        line_size: Line size in bytes (power of two)
+        policy: 'lru', 'fifo' or 'random'
+        write_allocate: Allocate a line on a write miss
+    """
+    size: int
+    associativity: int
+    line_size: int = 32
+    policy: str = 'lru'
+    write_allocate: bool = True
+
+    def __post_init__(self):
+        if self.policy not in REPLACEMENT_POLICIES:
+            raise ValueError(f"Unknown replacement policy '{self.policy}'")
+        n_sets = self.size // (self.associativity * self.line_size)
+        if (n_sets < 1 or n_sets * self.associativity * self.line_size != self.size
+                or n_sets & (n_sets - 1) or self.line_size & (self.line_size - 1)):
+            raise ValueError(f"{self.label}: size / (ways * line) must be a power of two")
+
+    @property
+    def n_sets(self) -> int:
+        return self.size // (self.associativity * self.line_size)
+
+    @property
+    def label(self) -> str:
+        size = f"{self.size // 1024}K" if self.size % 1024 == 0 else f"{self.size}B"
+        return f"{size}/{self.associativity}w/{self.line_size}B/{self.policy}"
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counts of one geometry."""
+    geometry: CacheGeometry
+    reads: int = 0
+    read_hits: int = 0
+    writes: int = 0
+    write_hits: int = 0
+
+    @property
+    def accesses(self) -> int:
+        return self.reads + self.writes
+
+    @property
+    def hits(self) -> int:
+        return self.read_hits + self.write_hits
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.accesses if self.accesses else 0.0
+
+    @property
+    def miss_rate(self) -> float:
+        return 1.0 - self.hit_rate if self.accesses else 0.0
+
+    def to_dict(self) -> Dict:
+        d = {'geometry': asdict(self.geometry), 'label': self.geometry.label}
+        d.update(reads=self.reads, read_hits=self.read_hits, writes=self.writes,
+                 write_hits=self.write_hits, hit_rate=self.hit_rate)
+        return d
+
+
+class _SetGroup:
+    """Geometries sharing one tag array (same sets, line size, policy)."""
+
+    def __init__(self, line_size: int, n_sets: int, policy: str, write_allocate: bool):
+        self.line_shift = line_size.bit_length() - 1
+        self.n_sets = n_sets
+        self.policy = _POLICY_CODES[policy]
+        self.write_allocate = write_allocate
+        self.ways = 0
+        self.members: List[int] = []     # geometry indices
+
+
+class CacheSimulator:
+    """Streaming simulator for many cache geometries at once.
+
+    Feed address chunks with ``feed()``; counts accumulate across chunks and
+    cache contents persist, so a trace can be replayed in any chunking.
+    """
+
+    def __init__(self, geometries: Sequence[CacheGeometry], seed: Optional[int] = 0):
+        self.geometries = list(geometries)
+        self._rng = np.random.default_rng(seed)
+
+        groups: Dict[Tuple, _SetGroup] = {}
+        for index, geom in enumerate(self.geometries):
+            # LRU stacks of different depths nest; other policies do not
+            share = geom.policy == 'lru'
+            key = (geom.line_size, geom.n_sets, geom.policy, geom.write_allocate,
+                   None if share else index)
+            group = groups.setdefault(key, _SetGroup(geom.line_size, geom.n_sets,
+                                                     geom.policy, geom.write_allocate))
+            group.ways = max(group.ways, geom.associativity)
+            group.members.append(index)
+        self._groups = list(groups.values())
+
+        self.max_ways = max(g.ways for g in self._groups)
+        offsets = np.cumsum([0] + [g.n_sets for g in self._groups])
+        self._offsets = offsets[:-1]
+        total_sets = int(offsets[-1])
+        # One spare column used as a lookup sentinel (see _access)
+        self._tags = np.full((total_sets, self.max_ways + 1), _EMPTY, dtype=np.int64)
+        self._ways = np.concatenate([np.full(g.n_sets, g.ways) for g in self._groups])
+        self._policy = np.concatenate([np.full(g.n_sets, g.policy) for g in self._groups])
+        self._allocate_writes = np.concatenate(
+            [np.full(g.n_sets, g.write_allocate) for g in self._groups])
+        self._columns = np.arange(self.max_ways + 1)
+        # Column c takes column c - 1 when shifting (column 0 is overwritten)
+        self._shift_source = np.maximum(self._columns - 1, 0)
+        self._uniform_ways = len({g.ways for g in self._groups}) == 1
+        self._all_lru = all(g.policy == _LRU and g.write_allocate for g in self._groups)
+
+        # depth histogram per (group, is_write); depth == ways means miss
+        self._depths = np.zeros((len(self._groups), 2, self.max_ways + 1), dtype=np.int64)
+
+    # ------------------------------------------------------------------
+
+    def feed(self, addresses: np.ndarray, is_write: Optional[np.ndarray] = None,
+             return_depths: bool = False) -> Optional[np.ndarray]:
+        """Simulate one chunk of byte addresses in program order.
+
+        Args:
+            addresses: Byte addresses
+            is_write: Optional boolean mask of writes
+            return_depths: Also return the per-access hit depth per group
+
+        Returns:
+            If ``return_depths``: (n_groups, n) array; an access hits a
+            geometry of associativity ``a`` in that group iff depth < a
+            (depth == group ways for a miss)
+        """
+        addresses = np.asarray(addresses, dtype=np.int64)
+        n = len(addresses)
+        writes = (np.zeros(n, dtype=bool) if is_write is None
+                  else np.asarray(is_write, dtype=bool))
+        if not n:
+            return np.zeros((len(self._groups), 0), dtype=np.int64) if return_depths else None
+
+        n_groups = len(self._groups)
+        set_ids = np.empty(n_groups * n, dtype=np.int64)
+        tags = np.empty(n_groups * n, dtype=np.int64)
+        for g, group in enumerate(self._groups):
+            lines = addresses >> group.line_shift
+            set_ids[g * n:(g + 1) * n] = self._offsets[g] + (lines & (group.n_sets - 1))
+            tags[g * n:(g + 1) * n] = lines
+
+        # Group accesses by set (program order kept within a set), then
+        # by their rank within the set: round r is a contiguous slice.
+        by_set = np.argsort(set_ids, kind='stable')
+        sorted_sets = set_ids[by_set]
+        boundaries = np.flatnonzero(np.diff(sorted_sets)) + 1
+        run_starts = np.zeros(len(sorted_sets), dtype=np.int64)
+        run_starts[boundaries] = boundaries
+        np.maximum.accumulate(run_starts, out=run_starts)
+        rank = np.arange(len(sorted_sets)) - run_starts
+        by_round = np.argsort(rank, kind='stable')
+        order = by_set[by_round]
+        round_edges = np.searchsorted(rank[by_round], np.arange(rank.max() + 2))
+
+        ordered_sets = set_ids[order]
+        ordered_tags = tags[order]
+        ordered_writes = writes[order % n]
+        depth = np.empty(len(order), dtype=np.int64)
+        for r in range(len(round_edges) - 1):
+            lo, hi = round_edges[r], round_edges[r + 1]
+            depth[lo:hi] = self._access(ordered_sets[lo:hi], ordered_tags[lo:hi],
+                                        ordered_writes[lo:hi])
+
+        flat = ((order // n) * 2 + ordered_writes) * (self.max_ways + 1) + depth
+        self._depths += np.bincount(flat, minlength=self._depths.size).reshape(
+            self._depths.shape)
+        if return_depths:
+            result = np.empty(n_groups * n, dtype=np.int64)
+            result[order] = depth
+            return result.reshape(n_groups, n)
+        return None
+
+    def _access(self, sets: np.ndarray, tags: np.ndarray, writes: np.ndarray) -> np.ndarray:
+        """Perform one access in each of ``sets`` (all distinct)."""
+        rows = self._tags[sets]
+        # The spare last column holds the looked-up tag, so argmax gives the
+        # hit way, or max_ways on a miss
+        rows[:, -1] = tags
+        depth = (rows == tags[:, np.newaxis]).argmax(axis=1)
+        ways = self._ways[sets]
+        if not self._uniform_ways:
+            np.minimum(depth, ways, out=depth)
+        cols = self._columns
+
+        if self._all_lru:
+            # Move to front: columns 1..depth take their left neighbour
+            moved = (cols <= depth[:, np.newaxis]) & (cols < ways[:, np.newaxis])
+            rows = np.where(moved, rows[:, self._shift_source], rows)
+            rows[:, 0] = tags
+            self._tags[sets] = rows
+            return depth
+
+        policy = self._policy[sets]
+        hit = depth < ways
+        allocate = hit | ~writes | self._allocate_writes[sets]
+
+        # LRU: move to front on every access; FIFO: insert at front on a
+        # miss only. Both shift columns 1..depth right by one.
+        shift = allocate & ((policy == _LRU) | ((policy == _FIFO) & ~hit))
+        moved = ((cols <= depth[:, np.newaxis]) & (cols < ways[:, np.newaxis])
+                 & shift[:, np.newaxis])
+        rows = np.where(moved, rows[:, self._shift_source], rows)
+        rows[shift, 0] = tags[shift]
+
+        replace = allocate & ~hit & (policy == _RANDOM)
+        if replace.any():
+            idx = np.flatnonzero(replace)
+            empty = (rows[idx, :-1] == _EMPTY) & (cols[:-1] < ways[idx, np.newaxis])
+            has_empty = empty.any(axis=1)
+            victim = np.where(has_empty, empty.argmax(axis=1),
+                              (self._rng.random(len(idx)) * ways[idx]).astype(np.int64))
+            rows[idx, victim] = tags[idx]
+
+        self._tags[sets] = rows
+        return depth
+
+    # ------------------------------------------------------------------
+
+    def results(self) -> List[CacheStats]:
+        """CacheStats for every geometry, in input order."""
+        stats = [None] * len(self.geometries)
+        for g, group in enumerate(self._groups):
+            hist = self._depths[g]
+            for index in group.members:
+                ways = self.geometries[index].associativity
+                reads, writes = hist[0].sum(), hist[1].sum()
+                if group.policy == _LRU:
+                    read_hits, write_hits = hist[0, :ways].sum(), hist[1, :ways].sum()
+                else:
+                    read_hits, write_hits = reads - hist[0, ways], writes - hist[1, ways]
+                stats[index] = CacheStats(self.geometries[index], int(reads), int(read_hits),
+                                          int(writes), int(write_hits))
+        return stats
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Cache contents and counts, for checkpointing (see ``set_state``)."""
+        rng = json.dumps(self._rng.bit_generator.state)
+        return {'tags': self._tags.copy(), 'depths': self._depths.copy(),
+                'rng': np.array(rng)}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restore a state saved by ``state`` on a simulator of the same geometries."""
+        if np.shape(state['tags']) != self._tags.shape:
+            raise ValueError("cache state does not match these geometries")
+        self._tags = np.array(state['tags'], dtype=np.int64)
+        self._depths = np.array(state['depths'], dtype=np.int64)
+        self._rng.bit_generator.state = json.loads(str(state['rng']))
+
+    def hit_mask(self, depths: np.ndarray, index: int) -> np.ndarray:
+        """Per-access hit flags of geometry ``index`` from ``feed`` depths."""
+        for g, group in enumerate(self._groups):
+            if index in group.members:
+                return depths[g] < self.geometries[index].associativity
+        raise IndexError(index)
+
+
+# ---------------------------------------------------------------------------
+# Trace front end
+# ---------------------------------------------------------------------------
+
+def memory_accesses(chunk, kind: str = 'data') -> Tuple[np.ndarray, np.ndarray]:
+    """Extract (addresses, is_write) from a chunk.
+
+    Accepts plain address arrays, (addresses, is_write) tuples and
+    ``common.tracefile`` record arrays.  For records, ``kind`` selects data
+    accesses (FLAG_MEM_READ / FLAG_MEM_WRITE), instruction fetches (pc) or
+    both interleaved in program order ('unified').
+    """
+    if isinstance(chunk, tuple):
+        return np.asarray(chunk[0]), np.asarray(chunk[1], dtype=bool)
+    names = getattr(getattr(chunk, 'dtype', None), 'names', None)
+    if not names:
+        addresses = np.asarray(chunk)
+        return addresses, np.zeros(len(addresses), dtype=bool)
+    if kind not in ACCESS_KINDS:
+        raise ValueError(f"Unknown access kind '{kind}'; expected one of {ACCESS_KINDS}")
+
+    flags = chunk['flags']
+    is_data = (flags & (FLAG_MEM_READ | FLAG_MEM_WRITE)) != 0
+    data_write = (flags[is_data] & FLAG_MEM_WRITE) != 0
+    if kind == 'instruction':
+        return chunk['pc'].astype(np.int64), np.zeros(len(chunk), dtype=bool)
+    if kind == 'data':
+        return chunk['addr'][is_data].astype(np.int64), data_write
+
+    # unified: fetch, then the instruction's data access
+    slots = 1 + is_data.astype(np.int64)
+    fetch_pos = np.concatenate([[0], np.cumsum(slots)[:-1]])
+    addresses = np.empty(int(slots.sum()), dtype=np.int64)
+    writes = np.zeros(len(addresses), dtype=bool)
+    addresses[fetch_pos] = chunk['pc']
+    data_pos = fetch_pos[is_data] + 1
+    addresses[data_pos] = chunk['addr'][is_data]
+    writes[data_pos] = data_write
+    return addresses, writes
+
+
+def simulate_caches(chunks: Iterable, geometries: Sequence[CacheGeometry],
+                    kind: str = 'data', seed: Optional[int] = 0) -> List[CacheStats]:
+    """Simulate many geometries over a chunked trace in one pass.
+
+    Args:
+        chunks: Address arrays, (addresses, is_write) tuples or trace records
+            (e.g. a ``common.tracefile.TraceReader``)
+        geometries: Cache organizations to simulate
+        kind: For trace records: 'data', 'instruction' or 'unified'
+        seed: Seed for random replacement
+
+    Returns:
+        CacheStats per geometry, in input order
+    """
+    sim = CacheSimulator(geometries, seed)
+    for chunk in chunks:
+        sim.feed(*memory_accesses(chunk, kind))
+    return sim.results()
+
+
+def simulate_hierarchy(chunks: Iterable, l1: CacheGeometry,
+                       l2: Sequence[CacheGeometry], kind: str = 'data',
+                       seed: Optional[int] = 0) -> Tuple[CacheStats, List[CacheStats]]:
+    """Simulate one L1 and any number of L2 candidates behind it.
+
+    L2 caches see the L1 miss stream (write-backs are not modeled), so their
+    hit rates are local hit rates, as ``CacheConfig.l2_hit_rate`` expects.
+    With no L2 candidates only the L1 is simulated.
+    """
+    l1_sim = CacheSimulator([l1], seed)
+    l2_sim = CacheSimulator(l2, seed) if l2 else None
+    for chunk in chunks:
+        addresses, writes = memory_accesses(chunk, kind)
+        if l2_sim is None:
+            l1_sim.feed(addresses, writes)
+            continue
+        depths = l1_sim.feed(addresses, writes, return_depths=True)
+        miss = ~l1_sim.hit_mask(depths, 0)
+        l2_sim.feed(addresses[miss], writes[miss])
+    return l1_sim.results()[0], l2_sim.results() if l2_sim else []
+
+
+def derive_cache_config(chunks: Iterable, l1: CacheGeometry,
+                        l2: Optional[CacheGeometry] = None, kind: str = 'data',
+                        l1_latency: float = 1.0, l2_latency: float = 10.0,
+                        dram_latency: float = 50.0) -> CacheConfig:
+    """Simulate a hierarchy and return a CacheConfig with measured hit rates."""
+    l1_stats, l2_stats = simulate_hierarchy(chunks, l1, [l2] if l2 else [], kind)
+    return CacheConfig(
+        has_cache=True,
+        l1_latency=l1_latency,
+        l1_hit_rate=l1_stats.hit_rate,
+        l2_latency=l2_latency,
+        l2_hit_rate=l2_stats[0].hit_rate if l2_stats else CacheConfig().l2_hit_rate,
+        has_l2=l2 is not None,
+        dram_latency=dram_latency,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Parallel front end
+# ---------------------------------------------------------------------------
+
+def _simulate_file(path: str, geometries: List[CacheGeometry], kind: str,
+                   seed: Optional[int]) -> List[CacheStats]:
+    from .tracefile import TraceReader
+
+    with TraceReader(path) as reader:
+        return simulate_caches(reader, geometries, kind, seed)
+
+
+def simulate_caches_parallel(path: Union[str, Path], geometries: Sequence[CacheGeometry],
+                             kind: str = 'data', workers: Optional[int] = None,
+                             seed: Optional[int] = 0) -> List[CacheStats]:
+    """Simulate geometries over a trace file, split across processes.
+
+    Geometries that can share a simulation (LRU, same line size and set
+    count) stay in the same worker; each worker reads the trace itself.
+    """
+    geometries = list(geometries)
+    buckets: Dict[Tuple, List[int]] = {}
+    for index, geom in enumerate(geometries):
+        key = ((geom.line_size, geom.n_sets, geom.write_allocate)
+               if geom.policy == 'lru' else ('solo', index))
+        buckets.setdefault(key, []).append(index)
+
+    stats: List[Optional[CacheStats]] = [None] * len(geometries)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_simulate_file, str(path), [geometries[i] for i in members],
+                               kind, seed): members
+                   for members in buckets.values()}
+        for future, members in futures.items():
+            for index, result in zip(members, future.result()):
+                stats[index] = result
+    return stats
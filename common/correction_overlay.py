@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Runtime Correction Overlay
+===========================
+
+Consolidated store of the system-identification correction terms for the
+whole fleet, applied to models when they are loaded instead of being
+patched into every ``*_validated.py`` source.
+
+The overlay is one JSON file at the repository root,
+``_corrections_overlay.json``:
+
+    {
+      "version": 7,                          # bumped on every write
+      "generated": "2026-01-30T12:00:00",
+      "models": {
+        "zilog/z80": {"corrections": {"alu": 0.304196, ...},
+                      "method": "ridge", "cpi_error_percent": 0.01,
+                      "date": "2026-01-29"},
+        ...
+      }
+    }
+
+It is built from all ``identification/sysid_result.json`` files with
+``build_overlay()`` and written atomically (temporary file +
+``os.replace``) by ``write_overlay()``, so applying a fleet re-fit is a
+single file write.  Models not in the overlay keep the corrections in
+their source.
+
+At load time ``apply_overlay(model, model_dir)`` records the model's source
+corrections, sets ``model.corrections`` (in place) to source + overlay
+entry and registers the model.  After the overlay file changes,
+``refresh_models()`` re-reads it (stat-checked) and rebuilds every
+registered model that is still alive -- no re-import:
+
+    from common.correction_overlay import apply_overlay, refresh_models
+    apply_overlay(model, 'models/zilog/z80')
+    ...                                   # apply_corrections.py rewrites overlay
+    refresh_models()                      # live models now use the new terms
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+import os
+import weakref
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OVERLAY_PATH = REPO_ROOT / "_corrections_overlay.json"
+ZERO_TOLERANCE = 1e-8
+
+
+def model_key(model_dir: Union[str, Path]) -> str:
+    """``family/processor`` key of a model directory or model source file."""
+    parts = Path(model_dir).parts
+    if 'models' in parts:
+        parts = parts[len(parts) - list(reversed(parts)).index('models'):]
+        return '/'.join(parts[:2])
+    return '/'.join(parts[-2:])
+
+
+def overlay_entry(sysid: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Overlay entry for one ``sysid_result.json`` document, or None to skip.
+
+    Results without corrections, rolled-back fits and all-zero corrections
+    are skipped (the same rules ``apply_corrections.py`` has always used).
+    """
+    corrections = sysid.get("corrections") or {}
+    if not corrections:
+        return None
+    if (sysid.get("loss_before", 0) == sysid.get("loss_after", 0)
+            and sysid.get("message", "").startswith("Rolled back")):
+        return None
+    if all(abs(v) < ZERO_TOLERANCE for v in corrections.values()):
+        return None
+    return {
+        "corrections": {(k[4:] if k.startswith("cor.") else k): v
+                        for k, v in sorted(corrections.items())},
+        "method": sysid.get("method", "ridge"),
+        "cpi_error_percent": sysid.get("cpi_error_percent"),
+        "date": sysid.get("date"),
+    }
+
+
+def build_overlay(repo_root: Union[str, Path, None] = None,
+                  sysid_results: Optional[Dict[str, Dict[str, Any]]] = None,
+                  base: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Collect overlay entries from identification results.
+
+    Args:
+        repo_root: Repository to scan for ``models/*/*/identification/sysid_result.json``
+        sysid_results: ``{model_key: sysid document}`` to use instead of scanning
+        base: Existing ``models`` mapping to update (entries not rebuilt are kept)
+
+    Returns:
+        ``{model_key: entry}``
+    """
+    from .jsoncache import load_json
+
+    root = Path(repo_root) if repo_root else REPO_ROOT
+    if sysid_results is None:
+        sysid_results = {model_key(p.parent.parent): load_json(p)
+                         for p in sorted(root.glob("models/*/*/identification/sysid_result.json"))}
+    models = dict(base or {})
+    for key, sysid in sysid_results.items():
+        entry = overlay_entry(sysid)
+        if entry is not None:
+            models[key] = entry
+    return dict(sorted(models.items()))
+
+
+def read_overlay(path: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """The overlay document (an empty version-0 overlay if the file is missing)."""
+    path = Path(path) if path else DEFAULT_OVERLAY_PATH
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"version": 0, "generated": None, "models": {}}
+
+
+def write_overlay(models: Dict[str, Dict[str, Any]],
+                  path: Union[str, Path, None] = None) -> int:
+    """Atomically replace the overlay file, bumping its version.
+
+    Returns:
+        The new version number
+    """
+    path = Path(path) if path else DEFAULT_OVERLAY_PATH
+    version = int(read_overlay(path).get("version", 0)) + 1
+    document = {
+        "version": version,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "models": models,
+    }
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w") as f:
+            json.dump(document, f, indent=1)
+            f.write("\n")
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return version
+
+
+class CorrectionOverlay:
+    """Stat-checked view of the overlay file plus the models it was applied to.
+
+    Args:
+        path: Overlay file (default ``_corrections_overlay.json``)
+    """
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else DEFAULT_OVERLAY_PATH
+        self.version = 0
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self._stat = None
+        self._applied: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+        self.reload()
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-read the file if it changed since the last read.
+
+        Returns:
+            True if the overlay contents were (re)loaded
+        """
+        try:
+            st = os.stat(self.path)
+            stat = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stat = None
+        if stat == self._stat and not force:
+            return False
+        document = read_overlay(self.path) if stat else {"version": 0, "models": {}}
+        self.version = int(document.get("version", 0))
+        self.models = document.get("models", {})
+        self._stat = stat
+        return True
+
+    def corrections_for(self, key: str) -> Optional[Dict[str, float]]:
+        entry = self.models.get(key)
+        return entry["corrections"] if entry else None
+
+    def apply(self, model, model_dir: Union[str, Path]) -> bool:
+        """Set ``model.corrections`` (in place) to its source terms plus the overlay entry.
+
+        The source corrections are recorded the first time a model is seen
+        and the model is remembered (weakly), so ``refresh()`` can rebuild it
+        -- terms dropped from the overlay, or a dropped entry, revert to the
+        source values.
+
+        Returns:
+            True if the overlay had an entry for the model
+        """
+        key = model_key(model_dir)
+        target = getattr(model, 'corrections', None)
+        if target is None:
+            model.corrections = target = {}
+        try:
+            _, source = self._applied.get(model) or (key, dict(target))
+            self._applied[model] = (key, source)
+        except TypeError:
+            source = dict(target)  # not weak-referenceable; applied once, not refreshed
+        corrections = self.corrections_for(key)
+        self._rebuild(target, source, corrections)
+        return corrections is not None
+
+    @staticmethod
+    def _rebuild(target: Dict[str, float], source: Dict[str, float],
+                 corrections: Optional[Dict[str, float]]) -> bool:
+        """Rebuild ``target`` as source + overlay corrections; True if it changed."""
+        merged = dict(source)
+        merged.update(corrections or {})
+        if merged == target:
+            return False
+        target.clear()
+        target.update(merged)
+        return True
+
+    def refresh(self) -> int:
+        """Reload the file if it changed and rebuild every live model from it.
+
+        Returns:
+            Number of models whose corrections changed
+        """
+        if not self.reload():
+            return 0
+        updated = 0
+        for model, (key, source) in list(self._applied.items()):
+            target = getattr(model, 'corrections', None)
+            if target is None:
+                model.corrections = target = {}
+            updated += self._rebuild(target, source, self.corrections_for(key))
+        return updated
+
+
+_default: Optional[CorrectionOverlay] = None
+
+
+def get_overlay() -> CorrectionOverlay:
+    """The process-wide overlay for the repository's overlay file."""
+    global _default
+    if _default is None:
+        _default = CorrectionOverlay()
+    return _default
+
+
+def apply_overlay(model, model_dir: Union[str, Path]) -> bool:
+    """Apply the repository overlay to a freshly loaded model (see module docstring)."""
+    overlay = get_overlay()
+    overlay.refresh()
+    return overlay.apply(model, model_dir)
+
+
+def refresh_models() -> int:
+    """Push the current overlay file to every model it was applied to."""
+    return get_overlay().refresh()
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""
+6502 / 65C02 Reference Interpreter
+====================================
+
+Pure-Python 6502 core whose dispatch table is generated from the timing
+table itself: every ``(mnemonic, addressing_mode)`` entry of
+``*_timing.json`` selects an addressing-mode template and an operation
+template, and the resulting handler is compiled once (see
+``common.interpreter``).  Tables that contain 65C02 instructions (BRA,
+STZ, TRB/TSB, BBR/BBS, RMB/SMB, (zp) addressing) get the CMOS behaviour,
+including the fixed ``JMP (abs)``.  65C816-family tables run in emulation
+mode (8-bit registers, direct page at 0) on their 6502-compatible opcodes.
+
+Cycles: the table's cycles for the opcode, plus
+    +1 for reads with indexed addressing that cross a page,
+    +1 for a taken branch, +1 more if it crosses a page (BRA, BBR/BBS:
+       page crossing only, their base already includes the branch).
+
+BRK, STP and WAI halt the interpreter (kernels end with BRK); interrupts
+are not modeled.  Decimal-mode flags follow the NMOS behaviour.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from .interpreter import Halt, Interpreter, Kernel, assemble, build_core, indent, operation_name
+
+_STATE = ('a', 'x', 'y', 'sp', 'pc', 'fc', 'fv', 'fd', 'fi', 'fz', 'fn', 'extra')
+
+_FETCH1 = 'pc = (pc + 1) & 0xFFFF'
+_FETCH2 = 'pc = (pc + 2) & 0xFFFF'
+_ABS = 'mem[pc] | (mem[(pc + 1) & 0xFFFF] << 8)'
+
+# Effective-address templates: leave the address in ``ea`` (immediate
+# points ``ea`` at the operand byte) and ``b`` = un-indexed base
+_MODES = {
+    'immediate': ['ea = pc', _FETCH1],
+    'zero_page': ['ea = mem[pc]', _FETCH1],
+    'zero_page_x': ['ea = (mem[pc] + x) & 0xFF', _FETCH1],
+    'zero_page_y': ['ea = (mem[pc] + y) & 0xFF', _FETCH1],
+    'absolute': [f'ea = {_ABS}', _FETCH2],
+    'absolute_x': [f'b = {_ABS}', 'ea = (b + x) & 0xFFFF', _FETCH2],
+    'absolute_y': [f'b = {_ABS}', 'ea = (b + y) & 0xFFFF', _FETCH2],
+    'indirect_x': ['t = (mem[pc] + x) & 0xFF', 'ea = mem[t] | (mem[(t + 1) & 0xFF] << 8)', _FETCH1],
+    'indirect_y': ['t = mem[pc]', 'b = mem[t] | (mem[(t + 1) & 0xFF] << 8)',
+                   'ea = (b + y) & 0xFFFF', _FETCH1],
+    'zp_indirect': ['t = mem[pc]', 'ea = mem[t] | (mem[(t + 1) & 0xFF] << 8)', _FETCH1],
+}
+# 65C816-family names of the same modes (emulation mode, direct page at 0)
+_MODE_ALIASES = {
+    'direct': 'zero_page', 'direct_page': 'zero_page', 'direct_x': 'zero_page_x',
+    'direct_y': 'zero_page_y', 'direct_indirect': 'zp_indirect',
+    'direct_x_indirect': 'indirect_x', 'direct_indirect_y': 'indirect_y',
+    'dp_indirect_y': 'indirect_y', 'absolute_indirect': 'indirect',
+}
+_PAGED_MODES = frozenset({'absolute_x', 'absolute_y', 'indirect_y'})
+_PAGED_READS = frozenset({'LDA', 'LDX', 'LDY', 'ADC', 'SBC', 'AND', 'ORA', 'EOR', 'CMP', 'BIT'})
+_PAGE_PENALTY = 'if (ea ^ b) & 0xFF00: extra += 1'
+
+_PACK = '((fn & 0x80) | (fv << 6) | 0x20 | (fd << 3) | (fi << 2) | (0 if fz else 2) | fc)'
+_UNPACK = ['fn = p & 0x80', 'fv = (p >> 6) & 1', 'fd = (p >> 3) & 1', 'fi = (p >> 2) & 1',
+           'fz = 0 if p & 2 else 1', 'fc = p & 1']
+
+
+def _push(value: str) -> List[str]:
+    return [f'mem[0x100 | sp] = {value}', 'sp = (sp - 1) & 0xFF']
+
+
+def _pull(target: str) -> List[str]:
+    return ['sp = (sp + 1) & 0xFF', f'{target} = mem[0x100 | sp]']
+
+
+_ADC = [
+    'v = mem[ea]',
+    'if fd:',
+    '    r = (a & 0x0F) + (v & 0x0F) + fc',
+    '    if r > 9: r += 6',
+    '    r = (r & 0x0F) + (a & 0xF0) + (v & 0xF0) + (0x10 if r > 0x0F else 0)',
+    '    fz = (a + v + fc) & 0xFF',
+    '    fn = r & 0xFF',
+    '    fv = ((a ^ r) & (v ^ r) & 0x80) >> 7',
+    '    if r > 0x9F: r += 0x60',
+    '    fc = 1 if r > 0xFF else 0',
+    '    a = r & 0xFF',
+    'else:',
+    '    r = a + v + fc',
+    '    fv = ((a ^ r) & (v ^ r) & 0x80) >> 7',
+    '    fc = r >> 8',
+    '    a = fz = fn = r & 0xFF',
+]
+
+_SBC = [
+    'v = mem[ea]',
+    'r = a - v - 1 + fc',
+    'fv = ((a ^ v) & (a ^ r) & 0x80) >> 7',
+    'if fd:',
+    '    lo = (a & 0x0F) - (v & 0x0F) - 1 + fc',
+    '    hi = (a >> 4) - (v >> 4)',
+    '    if lo < 0:',
+    '        lo -= 6',
+    '        hi -= 1',
+    '    if hi < 0: hi -= 6',
+    '    fz = fn = r & 0xFF',
+    '    a = ((hi << 4) | (lo & 0x0F)) & 0xFF',
+    'else:',
+    '    a = fz = fn = r & 0xFF',
+    'fc = 0 if r < 0 else 1',
+]
+
+_BRANCH_CONDITIONS = {
+    'BCC': 'not fc', 'BCS': 'fc', 'BEQ': 'not fz', 'BNE': 'fz',
+    'BMI': 'fn & 0x80', 'BPL': 'not fn & 0x80', 'BVC': 'not fv', 'BVS': 'fv', 'BRA': 'True',
+}
+
+_IMPLIED = {
+    'TAX': ['x = fz = fn = a'], 'TAY': ['y = fz = fn = a'], 'TXA': ['a = fz = fn = x'],
+    'TYA': ['a = fz = fn = y'], 'TSX': ['x = fz = fn = sp'], 'TXS': ['sp = x'],
+    'INX': ['x = fz = fn = (x + 1) & 0xFF'], 'INY': ['y = fz = fn = (y + 1) & 0xFF'],
+    'DEX': ['x = fz = fn = (x - 1) & 0xFF'], 'DEY': ['y = fz = fn = (y - 1) & 0xFF'],
+    'CLC': ['fc = 0'], 'SEC': ['fc = 1'], 'CLI': ['fi = 0'], 'SEI': ['fi = 1'],
+    'CLV': ['fv = 0'], 'CLD': ['fd = 0'], 'SED': ['fd = 1'], 'NOP': ['pass'],
+    'PHA': _push('a'), 'PHX': _push('x'), 'PHY': _push('y'), 'PHP': _push(f'{_PACK} | 0x10'),
+    'PLA': ['sp = (sp + 1) & 0xFF', 'a = fz = fn = mem[0x100 | sp]'],
+    'PLX': ['sp = (sp + 1) & 0xFF', 'x = fz = fn = mem[0x100 | sp]'],
+    'PLY': ['sp = (sp + 1) & 0xFF', 'y = fz = fn = mem[0x100 | sp]'],
+    'PLP': _pull('p') + _UNPACK,
+    'RTS': _pull('r') + ['sp = (sp + 1) & 0xFF', 'pc = ((r | (mem[0x100 | sp] << 8)) + 1) & 0xFFFF'],
+    'RTI': _pull('p') + _UNPACK + _pull('r') + ['sp = (sp + 1) & 0xFF',
+                                                'pc = r | (mem[0x100 | sp] << 8)'],
+    'BRK': ['raise Halt'], 'STP': ['raise Halt'], 'WAI': ['raise Halt'],
+}
+
+_CONTROL = frozenset(_BRANCH_CONDITIONS) | {'JMP', 'JSR', 'RTS', 'RTI'}
+
+
+def _shift(mnemonic: str, loc: str) -> List[str]:
+    body = {
+        'ASL': ['fc = v >> 7', 'r = (v << 1) & 0xFF'],
+        'LSR': ['fc = v & 1', 'r = v >> 1'],
+        'ROL': ['r = ((v << 1) | fc) & 0xFF', 'fc = v >> 7'],
+        'ROR': ['r = (v >> 1) | (fc << 7)', 'fc = v & 1'],
+    }[mnemonic]
+    return [f'v = {loc}'] + body + [f'{loc} = fz = fn = r']
+
+
+def _branch(condition: str, taken_extra: bool) -> List[str]:
+    cost = 'extra += 2 if (t ^ pc) & 0xFF00 else 1' if taken_extra else _PAGE_PENALTY.replace(
+        '(ea ^ b)', '(t ^ pc)')
+    return [f'if {condition}:',
+            '    t = (pc + d - ((d & 0x80) << 1)) & 0xFFFF',
+            f'    {cost}',
+            '    pc = t']
+
+
+def _operation(mnemonic: str, mode: str, cmos: bool) -> Optional[List[str]]:
+    """Handler body for one (mnemonic, addressing mode), or None if unknown."""
+    name = operation_name(mnemonic)
+    mode = _MODE_ALIASES.get(mode, mode)
+    if name in _BRANCH_CONDITIONS and mode == 'relative':
+        return ['d = mem[pc]', _FETCH1] + _branch(_BRANCH_CONDITIONS[name], name != 'BRA')
+    if name[:3] in ('BBR', 'BBS') and mode == 'zp_relative':
+        bit = int(name[3])
+        test = f'{"not " if name[:3] == "BBR" else ""}(v >> {bit}) & 1'
+        return ['v = mem[mem[pc]]', 'd = mem[(pc + 1) & 0xFFFF]', _FETCH2] + _branch(test, False)
+    if name == 'JMP':
+        if mode == 'absolute':
+            return [f'pc = {_ABS}']
+        if mode == 'indirect':
+            high = '(t + 1) & 0xFFFF' if cmos else '(t & 0xFF00) | ((t + 1) & 0xFF)'
+            return [f't = {_ABS}', f'pc = mem[t] | (mem[{high}] << 8)']
+        if mode == 'absolute_x_indirect':
+            return [f't = ({_ABS} + x) & 0xFFFF', 'pc = mem[t] | (mem[(t + 1) & 0xFFFF] << 8)']
+        return None
+    if name == 'JSR':
+        return [f't = {_ABS}', 'r = (pc + 1) & 0xFFFF'] + _push('r >> 8') + _push('r & 0xFF') + ['pc = t']
+    if mode in ('implied', '') and name in _IMPLIED:
+        return _IMPLIED[name]
+    if mode == 'accumulator':
+        if name in ('ASL', 'LSR', 'ROL', 'ROR'):
+            return _shift(name, 'a')
+        if name in ('INC', 'DEC'):
+            return [f'a = fz = fn = (a {"+" if name == "INC" else "-"} 1) & 0xFF']
+        return None
+
+    if mode not in _MODES:
+        return None
+    address = list(_MODES[mode])
+    if mode in _PAGED_MODES and name in _PAGED_READS:
+        address.append(_PAGE_PENALTY)
+    registers = {'A': 'a', 'X': 'x', 'Y': 'y'}
+    if name in ('LDA', 'LDX', 'LDY'):
+        body = [f'{registers[name[2]]} = fz = fn = mem[ea]']
+    elif name in ('STA', 'STX', 'STY'):
+        body = [f'mem[ea] = {registers[name[2]]}']
+    elif name == 'STZ':
+        body = ['mem[ea] = 0']
+    elif name in ('AND', 'ORA', 'EOR'):
+        op = {'AND': '&', 'ORA': '|', 'EOR': '^'}[name]
+        body = [f'a = fz = fn = a {op} mem[ea]']
+    elif name == 'ADC':
+        body = _ADC
+    elif name == 'SBC':
+        body = _SBC
+    elif name in ('CMP', 'CPX', 'CPY'):
+        reg = {'CMP': 'a', 'CPX': 'x', 'CPY': 'y'}[name]
+        body = [f'r = {reg} - mem[ea]', 'fc = 1 if r >= 0 else 0', 'fz = fn = r & 0xFF']
+    elif name == 'BIT':
+        body = (['fz = a & mem[ea]'] if mode == 'immediate' else
+                ['v = mem[ea]', 'fz = a & v', 'fn = v', 'fv = (v >> 6) & 1'])
+    elif name in ('INC', 'DEC'):
+        body = [f'v = (mem[ea] {"+" if name == "INC" else "-"} 1) & 0xFF', 'mem[ea] = fz = fn = v']
+    elif name in ('ASL', 'LSR', 'ROL', 'ROR'):
+        body = _shift(name, 'mem[ea]')
+    elif name in ('TSB', 'TRB'):
+        update = 'v | a' if name == 'TSB' else 'v & (a ^ 0xFF)'
+        body = ['v = mem[ea]', 'fz = a & v', f'mem[ea] = {update}']
+    elif name[:3] in ('RMB', 'SMB') and name[3:].isdigit():
+        bit = 1 << int(name[3:])
+        body = [f'mem[ea] &= {0xFF ^ bit}'] if name[:3] == 'RMB' else [f'mem[ea] |= {bit}']
+    elif name == 'NOP':
+        body = ['pass']
+    else:
+        return None
+    return address + body
+
+
+class MOS6502(Interpreter):
+    """6502 / 65C02 core driven by a 6502-family timing table."""
+    isa = '6502'
+
+    def slot_words(self) -> List[Optional[int]]:
+        return list(range(256))
+
+    def _compile(self) -> Dict[str, Callable]:
+        tables = [t for t in (self.table, self.fallback) if t is not None]
+        cmos = any('BRA' in t.mnemonics for t in tables)
+        state = ', '.join(_STATE)
+
+        handlers = []
+        assignments = []
+        missing: Dict[str, Callable] = {}
+        for opcode in range(256):
+            if not self.slot_known[opcode]:
+                missing[f'h_{opcode:02X}'] = self._untimed(opcode)
+                continue
+            mnemonic = self.slot_mnemonic[opcode]
+            body = _operation(mnemonic, self.slot_mode[opcode], cmos)
+            if body is None:
+                missing[f'h_{opcode:02X}'] = self._undefined(opcode)
+                continue
+            if operation_name(mnemonic) in _CONTROL or mnemonic[:3].upper() in ('BBR', 'BBS'):
+                self.slot_flow[opcode] = 1
+            handlers.append(f'def h_{opcode:02X}():\n    nonlocal {state}\n' + indent(body, 1))
+        assignments = ', '.join(f'h_{op:02X}' for op in range(256))
+
+        source = (
+            'def build():\n'
+            '    a = x = y = pc = fc = fv = fd = fz = fn = extra = 0\n'
+            '    sp = 0xFD\n'
+            '    fi = 1\n'
+            + indent(''.join(handlers).splitlines(), 1)
+            + f'    handlers = [{assignments}]\n'
+            + indent(_RUNTIME.splitlines(), 1)
+        )
+        namespace = dict(missing, Halt=Halt, mem=self.memory, counts=self.counts,
+                         __name__='cpu6502')
+        return build_core(source, namespace)
+
+
+_RUNTIME = f'''
+def run(limit):
+    nonlocal pc
+    h = handlers
+    c = counts
+    m = mem
+    for _ in range(limit):
+        op = m[pc]
+        pc = (pc + 1) & 0xFFFF
+        h[op]()
+        c[op] += 1
+
+def trace_run(limit, record):
+    nonlocal pc
+    for _ in range(limit):
+        start = pc
+        before = extra
+        op = mem[pc]
+        pc = (pc + 1) & 0xFFFF
+        handlers[op]()
+        counts[op] += 1
+        record(start, extra - before, pc)
+
+def get_state():
+    return dict(a=a, x=x, y=y, sp=sp, pc=pc, p={_PACK})
+
+def set_state(**r):
+    nonlocal a, x, y, sp, pc, fc, fv, fd, fi, fz, fn
+    a = r.get('a', a)
+    x = r.get('x', x)
+    y = r.get('y', y)
+    sp = r.get('sp', sp)
+    pc = r.get('pc', pc)
+    if 'p' in r:
+        p = r['p']
+        {"; ".join(_UNPACK)}
+
+def reset():
+    nonlocal a, x, y, sp, pc, fc, fv, fd, fi, fz, fn, extra
+    a = x = y = pc = fc = fv = fd = fn = extra = 0
+    sp = 0xFD
+    fi = fz = 1
+
+def get_extra():
+    return extra
+
+return dict(run=run, trace_run=trace_run, get_state=get_state, set_state=set_state,
+            reset=reset, extra=get_extra)
+'''
+
+
+# ---------------------------------------------------------------------------
+# Benchmark kernels
+# ---------------------------------------------------------------------------
+
+_ORIGIN = 0x0400
+_SIEVE = 0x2000
+_ARRAY = 0x2100
+_SOURCE, _DEST, _COPY_PAGES = 0x3000, 0x5000, 16
+_MUL_ROUNDS = 255
+
+
+def _sieve_kernel() -> Kernel:
+    """Sieve of Eratosthenes below 256, repeated 20 times; 54 primes."""
+    code = assemble(_ORIGIN, [
+        0xA9, 20, 0x85, 0x11,                       # LDA #20 ; STA rounds
+        'top:',
+        0xA2, 0x00, 0xA9, 0x00,                     # LDX #0 ; LDA #0
+        'clear:',
+        0x9D, _SIEVE & 0xFF, _SIEVE >> 8,           # STA sieve,X
+        0xE8, 0xD0, ('rel', 'clear'),               # INX ; BNE clear
+        0xA2, 0x02,                                 # LDX #2
+        'outer:',
+        0xBD, _SIEVE & 0xFF, _SIEVE >> 8,           # LDA sieve,X
+        0xD0, ('rel', 'next'),                      # BNE next
+        0x86, 0x10, 0x8A,                           # STX step ; TXA
+        'mark:',
+        0x18, 0x65, 0x10,                           # CLC ; ADC step
+        0xB0, ('rel', 'next'),                      # BCS next
+        0xA8, 0xA9, 0x01,                           # TAY ; LDA #1
+        0x99, _SIEVE & 0xFF, _SIEVE >> 8,           # STA sieve,Y
+        0x98, 0x4C, ('abs', 'mark'),                # TYA ; JMP mark
+        'next:',
+        0xE8, 0xD0, ('rel', 'outer'),               # INX ; BNE outer
+        0xA2, 0x02, 0xA0, 0x00,                     # LDX #2 ; LDY #0
+        'count:',
+        0xBD, _SIEVE & 0xFF, _SIEVE >> 8,           # LDA sieve,X
+        0xD0, ('rel', 'skip'),                      # BNE skip
+        0xC8,                                       # INY
+        'skip:',
+        0xE8, 0xD0, ('rel', 'count'),               # INX ; BNE count
+        0x84, 0x30,                                 # STY result
+        0xC6, 0x11, 0xD0, ('rel', 'top'),           # DEC rounds ; BNE top
+        0x00,                                       # BRK
+    ])
+    return Kernel('sieve256', 'typical', 'Sieve of Eratosthenes below 256 (x20)',
+                  code, _ORIGIN, _ORIGIN, lambda mem: mem[0x30] == 54)
+
+
+def _multiply_kernel() -> Kernel:
+    """Shift-and-add 8x8 multiply over 255 operand pairs, summed to 16 bits."""
+    def expected() -> int:
+        return sum(i * ((i * 7 + 3) & 0xFF) for i in range(1, _MUL_ROUNDS + 1)) & 0xFFFF
+
+    code = assemble(_ORIGIN, [
+        0xA9, 0x00, 0x85, 0x40, 0x85, 0x41,         # LDA #0 ; STA sum ; STA sum+1
+        0xA0, 0x01,                                 # LDY #1
+        'loop:',
+        0x84, 0x20,                                 # STY m
+        0x98, 0x0A, 0x0A, 0x0A,                     # TYA ; ASL ; ASL ; ASL
+        0x38, 0xE5, 0x20,                           # SEC ; SBC m       (7 * i)
+        0x18, 0x69, 0x03, 0x85, 0x21,               # CLC ; ADC #3 ; STA n
+        0xA9, 0x00, 0xA2, 0x08, 0x46, 0x21,         # LDA #0 ; LDX #8 ; LSR n
+        'bit:',
+        0x90, ('rel', 'noadd'),                     # BCC noadd
+        0x18, 0x65, 0x20,                           # CLC ; ADC m
+        'noadd:',
+        0x6A, 0x66, 0x21,                           # ROR A ; ROR n
+        0xCA, 0xD0, ('rel', 'bit'),                 # DEX ; BNE bit
+        0xAA,                                       # TAX (high byte)
+        0x18, 0xA5, 0x21, 0x65, 0x40, 0x85, 0x40,   # CLC ; LDA n ; ADC sum ; STA sum
+        0x8A, 0x65, 0x41, 0x85, 0x41,               # TXA ; ADC sum+1 ; STA sum+1
+        0xC8, 0xD0, ('rel', 'loop'),                # INY ; BNE loop
+        0x00,                                       # BRK
+    ])
+    total = expected()
+    return Kernel('multiply8', 'compute', 'Shift-and-add 8x8 multiply, 255 products summed',
+                  code, _ORIGIN, _ORIGIN,
+                  lambda mem: mem[0x40] | (mem[0x41] << 8) == total)
+
+
+def _copy_kernel() -> Kernel:
+    """Copy 4 KB through (zp),Y pointers, four times."""
+    pattern = bytes((i * 37 + (i >> 8)) & 0xFF for i in range(_COPY_PAGES * 256))
+    code = assemble(_ORIGIN, [
+        0xA9, 0x04, 0x85, 0x54,                     # LDA #4 ; STA rounds
+        'round:',
+        0xA9, 0x00, 0x85, 0x50, 0x85, 0x52,         # LDA #0 ; STA src ; STA dst
+        0xA9, _SOURCE >> 8, 0x85, 0x51,             # LDA #>src ; STA src+1
+        0xA9, _DEST >> 8, 0x85, 0x53,               # LDA #>dst ; STA dst+1
+        0xA2, _COPY_PAGES, 0xA0, 0x00,              # LDX #pages ; LDY #0
+        'copy:',
+        0xB1, 0x50, 0x91, 0x52,                     # LDA (src),Y ; STA (dst),Y
+        0xC8, 0xD0, ('rel', 'copy'),                # INY ; BNE copy
+        0xE6, 0x51, 0xE6, 0x53,                     # INC src+1 ; INC dst+1
+        0xCA, 0xD0, ('rel', 'copy'),                # DEX ; BNE copy
+        0xC6, 0x54, 0xD0, ('rel', 'round'),         # DEC rounds ; BNE round
+        0x00,                                       # BRK
+    ])
+    return Kernel('blockcopy4k', 'memory', 'Copy 4 KB with indirect-indexed loads/stores (x4)',
+                  code, _ORIGIN, _ORIGIN,
+                  lambda mem: bytes(mem[_DEST:_DEST + len(pattern)]) == pattern,
+                  data={_SOURCE: pattern})
+
+
+def _sort_kernel() -> Kernel:
+    """Bubble sort of 64 bytes."""
+    values = bytes((i * 97 + 41) % 251 for i in range(64))
+    code = assemble(_ORIGIN, [
+        'outer:',
+        0xA0, 0x00, 0x84, 0x60, 0xA2, 0x00,         # LDY #0 ; STY swapped ; LDX #0
+        'inner:',
+        0xBD, _ARRAY & 0xFF, _ARRAY >> 8,           # LDA array,X
+        0xDD, (_ARRAY + 1) & 0xFF, (_ARRAY + 1) >> 8,   # CMP array+1,X
+        0x90, ('rel', 'noswap'),                    # BCC noswap
+        0xF0, ('rel', 'noswap'),                    # BEQ noswap
+        0xA8,                                       # TAY
+        0xBD, (_ARRAY + 1) & 0xFF, (_ARRAY + 1) >> 8,   # LDA array+1,X
+        0x9D, _ARRAY & 0xFF, _ARRAY >> 8,           # STA array,X
+        0x98,                                       # TYA
+        0x9D, (_ARRAY + 1) & 0xFF, (_ARRAY + 1) >> 8,   # STA array+1,X
+        0xA9, 0x01, 0x85, 0x60,                     # LDA #1 ; STA swapped
+        'noswap:',
+        0xE8, 0xE0, 63,                             # INX ; CPX #63
+        0xD0, ('rel', 'inner'),                     # BNE inner
+        0xA5, 0x60, 0xD0, ('rel', 'outer'),         # LDA swapped ; BNE outer
+        0x00,                                       # BRK
+    ])
+    return Kernel('bubblesort64', 'control', 'Bubble sort of 64 bytes',
+                  code, _ORIGIN, _ORIGIN,
+                  lambda mem: bytes(mem[_ARRAY:_ARRAY + 64]) == bytes(sorted(values)),
+                  data={_ARRAY: values})
+
+
+KERNELS: List[Kernel] = [_sieve_kernel(), _multiply_kernel(), _copy_kernel(), _sort_kernel()]
@@ -0,0 +1,769 @@
+#!/usr/bin/env python3
+"""
+Z80 Reference Interpreter
+==========================
+
+Pure-Python Z80 core for ``common.interpreter``.  Every opcode slot --
+unprefixed, CB, ED, DD, FD, DDCB and FDCB -- is decoded structurally
+(the usual x / y / z / p / q fields of the opcode byte) into a handler
+source template, timed from the processor's ``*_timing.json`` and
+compiled once.
+
+Timing adjustments the Z80 table states only in its notes:
+    JR cc / DJNZ / CALL cc / RET cc   base = not-taken cycles (7 / 8 / 10 / 5
+                                      unless ``cycles_not_taken`` is given);
+                                      taken adds the difference
+    LDIR and other repeating blocks   base = final iteration (the LDI-type
+                                      counterpart); each repeat adds the
+                                      difference
+    (HL) forms timed by an "r"        +3 cycles (LD / ALU), +7 (INC / DEC);
+    register-range entry              CB +7 (+4 for BIT); (IX+d) / (IY+d)
+                                      forms +12 more (+9 for LD (IX+d),n,
+                                      +8 for DDCB / FDCB).  Used only when
+                                      neither table has the memory form
+    DD / FD opcodes without their     timed by the group entry (LD r,(IX+d),
+    own entry                         LD (IX+d),r, ALU A,(IX+d), rotate (IX+d))
+
+Each repeat of a block instruction counts as one executed instruction, as
+the opcode is fetched again.  HALT stops the interpreter; interrupts, the
+R refresh counter and the undocumented flag bits 3 / 5 are not modeled, and
+undocumented opcodes (IXH / IXL, DDCB register copies, ED mirrors) raise
+EmulationError when executed.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .interpreter import Halt, Interpreter, Kernel, assemble, build_core, indent
+
+_STATE = ('a', 'f', 'b', 'c', 'd', 'e', 'h', 'l', 'a_', 'f_', 'b_', 'c_', 'd_', 'e_', 'h_', 'l_',
+          'ix', 'iy', 'sp', 'pc', 'i_', 'r_', 'iff1', 'iff2', 'im', 'extra')
+
+# Slot groups: (name, first slot, packed opcode word of op 0)
+_GROUPS = (('main', 0, 0), ('cb', 256, 0xCB00), ('ed', 512, 0xED00), ('dd', 768, 0xDD00),
+           ('fd', 1024, 0xFD00), ('ddcb', 1280, 0xDDCB0000), ('fdcb', 1536, 0xFDCB0000))
+N_SLOTS = 1792
+_BASE = {name: first for name, first, _ in _GROUPS}
+_INDEX = {'dd': 'ix', 'fd': 'iy', 'ddcb': 'ix', 'fdcb': 'iy'}
+_PREFIXES = {0xCB: 'cb', 0xED: 'ed', 0xDD: 'dd', 0xFD: 'fd'}
+
+# Flag tables: S and Z, plus P (even parity) for logical results
+SZ = [(i & 0x80) | (0x40 if i == 0 else 0) for i in range(256)]
+SZP = [SZ[i] | (0 if bin(i).count('1') & 1 else 0x04) for i in range(256)]
+
+_R = ('b', 'c', 'd', 'e', 'h', 'l', None, 'a')
+_RP = ('bc', 'de', 'hl', 'sp')
+_RP2 = ('bc', 'de', 'hl', 'af')
+_CC = ('not f & 0x40', 'f & 0x40', 'not f & 1', 'f & 1',
+       'not f & 4', 'f & 4', 'not f & 0x80', 'f & 0x80')
+_ALU = ('ADD', 'ADC', 'SUB', 'SBC', 'AND', 'XOR', 'OR', 'CP')
+_ROT = ('RLC', 'RRC', 'RL', 'RR', 'SLA', 'SRA', 'SLL', 'SRL')
+
+# Not-taken cycles stated in the Z80 table notes
+_NOT_TAKEN = {'JR': 7, 'DJNZ': 8, 'CALL': 10, 'RET': 5}
+_TAKEN = 'extra += TAKEN'
+
+_NN = 'mem[pc] | (mem[(pc + 1) & 0xFFFF] << 8)'
+_FETCH1 = 'pc = (pc + 1) & 0xFFFF'
+_FETCH2 = 'pc = (pc + 2) & 0xFFFF'
+_JR = 'pc = (pc + t - ((t & 0x80) << 1)) & 0xFFFF'
+
+
+@dataclass
+class _Op:
+    """Decoded slot: operation name, handler body and timing kind."""
+    name: str
+    body: List[str]
+    flow: bool = False
+    timing: str = ''            # '', 'cond' (taken adds cycles) or 'repeat'
+    memory: bool = False        # operand is (HL) / (IX+d) / (IY+d)
+
+
+def _get16(rp: str, index: Optional[str] = None) -> str:
+    if rp == 'hl' and index:
+        return index
+    if rp == 'sp':
+        return 'sp'
+    return f'(({rp[0]} << 8) | {rp[1]})'
+
+
+def _set16(rp: str, value: str, index: Optional[str] = None) -> List[str]:
+    if rp == 'hl' and index:
+        return [f'{index} = {value}']
+    if rp == 'sp':
+        return [f'sp = {value}']
+    return [f'w = {value}', f'{rp[0]} = w >> 8', f'{rp[1]} = w & 0xFF']
+
+
+def _push(value: str) -> List[str]:
+    return [f'w = {value}', 'sp = (sp - 1) & 0xFFFF', 'mem[sp] = w >> 8',
+            'sp = (sp - 1) & 0xFFFF', 'mem[sp] = w & 0xFF']
+
+
+_POP = ['w = mem[sp] | (mem[(sp + 1) & 0xFFFF] << 8)', 'sp = (sp + 2) & 0xFFFF']
+
+
+def _memory(index: Optional[str], prefetched: bool = False) -> List[str]:
+    """Set ``ea`` to (HL), or (IX+d) / (IY+d) fetching the displacement."""
+    if not index:
+        return ['ea = (h << 8) | l']
+    fetch = ['t = mem[(pc - 2) & 0xFFFF]'] if prefetched else ['t = mem[pc]', _FETCH1]
+    return fetch + [f'ea = ({index} + t - ((t & 0x80) << 1)) & 0xFFFF']
+
+
+def _alu(k: int) -> List[str]:
+    """ALU operation ``k`` of A with the operand in ``v``."""
+    add_flags = ('f = SZ[r & 0xFF] | ((a ^ v ^ r) & 0x10) | '
+                 '(((a ^ v ^ 0x80) & (a ^ r) & 0x80) >> 5) | (r >> 8)')
+    sub_flags = ('f = SZ[r & 0xFF] | ((a ^ v ^ r) & 0x10) | '
+                 '(((a ^ v) & (a ^ r) & 0x80) >> 5) | 2 | ((r >> 8) & 1)')
+    return [
+        ['r = a + v', add_flags, 'a = r & 0xFF'],
+        ['r = a + v + (f & 1)', add_flags, 'a = r & 0xFF'],
+        ['r = a - v', sub_flags, 'a = r & 0xFF'],
+        ['r = a - v - (f & 1)', sub_flags, 'a = r & 0xFF'],
+        ['a &= v', 'f = SZP[a] | 0x10'],
+        ['a ^= v', 'f = SZP[a]'],
+        ['a |= v', 'f = SZP[a]'],
+        ['r = a - v', sub_flags],
+    ][k]
+
+
+def _incdec(loc: str, inc: bool) -> List[str]:
+    if inc:
+        return [f'v = ({loc} + 1) & 0xFF', f'{loc} = v',
+                'f = (f & 1) | SZ[v] | (0 if v & 0x0F else 0x10) | (4 if v == 0x80 else 0)']
+    return [f'v = ({loc} - 1) & 0xFF', f'{loc} = v',
+            'f = (f & 1) | SZ[v] | 2 | (0x10 if (v & 0x0F) == 0x0F else 0) | (4 if v == 0x7F else 0)']
+
+
+def _rotate(k: int, loc: str) -> List[str]:
+    body = [
+        ['cy = v >> 7', 'v = ((v << 1) | cy) & 0xFF'],
+        ['cy = v & 1', 'v = (v >> 1) | (cy << 7)'],
+        ['cy = v >> 7', 'v = ((v << 1) | (f & 1)) & 0xFF'],
+        ['cy = v & 1', 'v = (v >> 1) | ((f & 1) << 7)'],
+        ['cy = v >> 7', 'v = (v << 1) & 0xFF'],
+        ['cy = v & 1', 'v = (v >> 1) | (v & 0x80)'],
+        ['cy = v >> 7', 'v = ((v << 1) | 1) & 0xFF'],
+        ['cy = v & 1', 'v >>= 1'],
+    ][k]
+    return [f'v = {loc}'] + body + [f'{loc} = v', 'f = SZP[v] | cy']
+
+
+def _ret(condition: Optional[str] = None) -> _Op:
+    if condition is None:
+        return _Op('RET', _POP + ['pc = w'], flow=True)
+    return _Op('RET', [f'if {condition}:'] + ['    ' + s for s in _POP + ['pc = w', _TAKEN]],
+               flow=True, timing='cond')
+
+
+_DAA = [
+    't = 0',
+    'cy = f & 1',
+    'if f & 0x10 or (a & 0x0F) > 9: t = 6',
+    'if cy or a > 0x99:',
+    '    t |= 0x60',
+    '    cy = 1',
+    'if f & 2:',
+    '    hc = 0x10 if f & 0x10 and (a & 0x0F) < 6 else 0',
+    '    a = (a - t) & 0xFF',
+    'else:',
+    '    hc = 0x10 if (a & 0x0F) > 9 else 0',
+    '    a = (a + t) & 0xFF',
+    'f = SZP[a] | (f & 2) | hc | cy',
+]
+
+_ACCUMULATOR = (
+    ('RLCA', ['a = ((a << 1) | (a >> 7)) & 0xFF', 'f = (f & 0xC4) | (a & 1)']),
+    ('RRCA', ['cy = a & 1', 'a = (a >> 1) | (cy << 7)', 'f = (f & 0xC4) | cy']),
+    ('RLA', ['r = (a << 1) | (f & 1)', 'f = (f & 0xC4) | (r >> 8)', 'a = r & 0xFF']),
+    ('RRA', ['cy = a & 1', 'a = (a >> 1) | ((f & 1) << 7)', 'f = (f & 0xC4) | cy']),
+    ('DAA', _DAA),
+    ('CPL', ['a ^= 0xFF', 'f |= 0x12']),
+    ('SCF', ['f = (f & 0xC4) | 1']),
+    ('CCF', ['f = (f & 0xC4) | ((f & 1) << 4) | ((f & 1) ^ 1)']),
+)
+
+
+def _decode_main(op: int, index: Optional[str] = None) -> Optional[_Op]:
+    """Unprefixed opcode, or its DD / FD form when ``index`` is given.
+
+    Index forms exist only where the instruction uses HL or (HL); the
+    undocumented IXH / IXL forms return None.
+    """
+    x, y, z = op >> 6, (op >> 3) & 7, op & 7
+    p, q = y >> 1, y & 1
+
+    if x == 1:
+        if op == 0x76:
+            return None if index else _Op('HALT', ['raise Halt'])
+        if z == 6:
+            return _Op('LD', _memory(index) + [f'{_R[y]} = mem[ea]'], memory=True)
+        if y == 6:
+            return _Op('LD', _memory(index) + [f'mem[ea] = {_R[z]}'], memory=True)
+        return None if index else _Op('LD', [f'{_R[y]} = {_R[z]}'])
+
+    if x == 2:
+        if z == 6:
+            return _Op(_ALU[y], _memory(index) + ['v = mem[ea]'] + _alu(y), memory=True)
+        return None if index else _Op(_ALU[y], [f'v = {_R[z]}'] + _alu(y))
+
+    if x == 0:
+        if z == 1 and q == 1:
+            rp = _get16(_RP[p], index)
+            return _Op('ADD', [f'v = {_get16("hl", index)}', f'q = {rp}', 'r = v + q',
+                               'f = (f & 0xC4) | (((v ^ q ^ r) >> 8) & 0x10) | (r >> 16)']
+                       + _set16('hl', 'r & 0xFFFF', index))
+        if z in (4, 5) and y == 6:
+            return _Op('INC' if z == 4 else 'DEC', _memory(index) + _incdec('mem[ea]', z == 4),
+                       memory=True)
+        if z == 6 and y == 6:
+            return _Op('LD', _memory(index) + ['mem[ea] = mem[pc]', _FETCH1], memory=True)
+        if index and not ((z in (1, 3) and p == 2) or (z == 2 and p == 2)):
+            return None
+        if z == 0:
+            if y == 0:
+                return _Op('NOP', ['pass'])
+            if y == 1:
+                return _Op('EX', ['a, f, a_, f_ = a_, f_, a, f'])
+            if y == 2:
+                return _Op('DJNZ', ['b = (b - 1) & 0xFF', 't = mem[pc]', _FETCH1,
+                                    'if b:', '    ' + _JR, '    ' + _TAKEN],
+                           flow=True, timing='cond')
+            if y == 3:
+                return _Op('JR', ['t = mem[pc]', _FETCH1, _JR], flow=True)
+            return _Op('JR', ['t = mem[pc]', _FETCH1, f'if {_CC[y - 4]}:',
+                              '    ' + _JR, '    ' + _TAKEN], flow=True, timing='cond')
+        if z == 1:
+            return _Op('LD', _set16(_RP[p], _NN, index) + [_FETCH2])
+        if z == 2:
+            if p == 2:
+                if q == 0:
+                    return _Op('LD', ['t = ' + _NN, _FETCH2, f'v = {_get16("hl", index)}',
+                                      'mem[t] = v & 0xFF', 'mem[(t + 1) & 0xFFFF] = v >> 8'])
+                return _Op('LD', ['t = ' + _NN, _FETCH2]
+                           + _set16('hl', 'mem[t] | (mem[(t + 1) & 0xFFFF] << 8)', index))
+            address = ('((b << 8) | c)', '((d << 8) | e)', None, None)[p]
+            if p == 3:
+                body = ['t = ' + _NN, _FETCH2, 'mem[t] = a' if q == 0 else 'a = mem[t]']
+            else:
+                body = [f'mem[{address}] = a' if q == 0 else f'a = mem[{address}]']
+            return _Op('LD', body)
+        if z == 3:
+            step = '+ 1' if q == 0 else '- 1'
+            return _Op('INC' if q == 0 else 'DEC',
+                       _set16(_RP[p], f'({_get16(_RP[p], index)} {step}) & 0xFFFF', index))
+        if z in (4, 5):
+            return _Op('INC' if z == 4 else 'DEC', _incdec(_R[y], z == 4))
+        if z == 6:
+            return _Op('LD', [f'{_R[y]} = mem[pc]', _FETCH1])
+        return _Op(*_ACCUMULATOR[y])
+
+    # x == 3
+    if index and not ((z == 1 and p == 2) or (z == 1 and q == 1 and p == 3)
+                      or op == 0xE3 or op == 0xE5):
+        return None
+    if z == 0:
+        return _ret(_CC[y])
+    if z == 1:
+        if q == 0:
+            return _Op('POP', _POP + _set16(_RP2[p], 'w', index))
+        if p == 0:
+            return _ret()
+        if p == 1:
+            return _Op('EXX', ['b, c, d, e, h, l, b_, c_, d_, e_, h_, l_ = '
+                               'b_, c_, d_, e_, h_, l_, b, c, d, e, h, l'])
+        if p == 2:
+            return _Op('JP', [f'pc = {_get16("hl", index)}'], flow=True)
+        return _Op('LD', [f'sp = {_get16("hl", index)}'])
+    if z == 2:
+        return _Op('JP', [f'if {_CC[y]}:', f'    pc = {_NN}', 'else:', '    ' + _FETCH2], flow=True)
+    if z == 3:
+        if y == 0:
+            return _Op('JP', [f'pc = {_NN}'], flow=True)
+        if y == 2:
+            return _Op('OUT', ['ports[mem[pc]] = a', _FETCH1])
+        if y == 3:
+            return _Op('IN', ['a = ports[mem[pc]]', _FETCH1])
+        if y == 4:
+            return _Op('EX', ['t = mem[sp] | (mem[(sp + 1) & 0xFFFF] << 8)',
+                              f'v = {_get16("hl", index)}', 'mem[sp] = v & 0xFF',
+                              'mem[(sp + 1) & 0xFFFF] = v >> 8'] + _set16('hl', 't', index))
+        if y == 5:
+            return _Op('EX', ['d, e, h, l = h, l, d, e'])
+        if y == 6:
+            return _Op('DI', ['iff1 = iff2 = 0'])
+        if y == 7:
+            return _Op('EI', ['iff1 = iff2 = 1'])
+        return None                                     # CB prefix
+    call = ['t = ' + _NN] + _push('(pc + 2) & 0xFFFF') + ['pc = t']
+    if z == 4:
+        return _Op('CALL', [f'if {_CC[y]}:'] + ['    ' + s for s in call + [_TAKEN]]
+                   + ['else:', '    ' + _FETCH2], flow=True, timing='cond')
+    if z == 5:
+        if q == 0:
+            return _Op('PUSH', _push(_get16(_RP2[p], index)))
+        return _Op('CALL', call, flow=True) if p == 0 else None
+    if z == 6:
+        return _Op(_ALU[y], ['v = mem[pc]', _FETCH1] + _alu(y))
+    return _Op('RST', _push('pc') + [f'pc = {y * 8}'], flow=True)
+
+
+def _decode_cb(op: int, index: Optional[str] = None) -> Optional[_Op]:
+    """CB-prefixed opcode, or DDCB / FDCB when ``index`` is given."""
+    x, y, z = op >> 6, (op >> 3) & 7, op & 7
+    if z == 6 or index:
+        if z != 6:
+            return None                                 # undocumented register copies
+        pre, loc = _memory(index, prefetched=True), 'mem[ea]'
+    else:
+        pre, loc = [], _R[z]
+    memory = bool(pre)
+    if x == 0:
+        return _Op(_ROT[y], pre + _rotate(y, loc), memory=memory)
+    if x == 1:
+        return _Op('BIT', pre + [f'f = (f & 1) | 0x10 | SZP[{loc} & {1 << y}]'], memory=memory)
+    if x == 2:
+        return _Op('RES', pre + [f'{loc} &= {0xFF ^ (1 << y)}'], memory=memory)
+    return _Op('SET', pre + [f'{loc} |= {1 << y}'], memory=memory)
+
+
+def _block(y: int, z: int) -> _Op:
+    """LDI / CPI / INI / OUTI and their decrementing / repeating forms."""
+    sign = '+' if y in (4, 6) else '-'
+    repeat = y >= 6
+    hl = _set16('hl', f'(((h << 8) | l) {sign} 1) & 0xFFFF')
+    de = _set16('de', f'(((d << 8) | e) {sign} 1) & 0xFFFF')
+    bc = _set16('bc', '(((b << 8) | c) - 1) & 0xFFFF')
+    suffix = ('I', 'D')[y & 1]
+    if z == 0:
+        name = ('LD' + suffix + 'R') if repeat else 'LD' + suffix
+        body = ['mem[(d << 8) | e] = mem[(h << 8) | l]'] + hl + de + bc + \
+               ['f = (f & 0xC1) | (4 if b | c else 0)']
+        condition = 'b | c'
+    elif z == 1:
+        name = ('CP' + suffix + 'R') if repeat else 'CP' + suffix
+        body = ['v = mem[(h << 8) | l]', 'r = a - v'] + hl + bc + \
+               ['f = (f & 1) | SZ[r & 0xFF] | ((a ^ v ^ r) & 0x10) | (4 if b | c else 0) | 2']
+        condition = '(b | c) and r & 0xFF'
+    elif z == 2:
+        name = ('IN' + suffix + 'R') if repeat else 'IN' + suffix
+        body = ['mem[(h << 8) | l] = ports[c]'] + hl + ['b = (b - 1) & 0xFF', 'f = SZ[b] | 2']
+        condition = 'b'
+    else:
+        name = ('OT' + suffix + 'R') if repeat else 'OUT' + suffix
+        body = ['b = (b - 1) & 0xFF', 'ports[c] = mem[(h << 8) | l]'] + hl + ['f = SZ[b] | 2']
+        condition = 'b'
+    if not repeat:
+        return _Op(name, body)
+    return _Op(name, body + [f'if {condition}:', '    pc = (pc - 2) & 0xFFFF', '    ' + _TAKEN],
+               flow=True, timing='repeat')
+
+
+def _decode_ed(op: int) -> Optional[_Op]:
+    x, y, z = op >> 6, (op >> 3) & 7, op & 7
+    p, q = y >> 1, y & 1
+    if x == 2 and z <= 3 and y >= 4:
+        return _block(y, z)
+    if x != 1:
+        return None
+    if z == 0:
+        return _Op('IN', ['v = ports[c]'] + ([] if y == 6 else [f'{_R[y]} = v'])
+                   + ['f = (f & 1) | SZP[v]'])
+    if z == 1:
+        return None if y == 6 else _Op('OUT', [f'ports[c] = {_R[y]}'])
+    if z == 2:
+        rp = _get16(_RP[p])
+        if q == 0:
+            flags = ('f = ((r >> 8) & 0x80) | (0 if r & 0xFFFF else 0x40) | '
+                     '(((v ^ q ^ r) >> 8) & 0x10) | ((((v ^ q) & (v ^ r)) >> 13) & 4) | '
+                     '2 | ((r >> 16) & 1)')
+            return _Op('SBC', ['v = (h << 8) | l', f'q = {rp}', 'r = v - q - (f & 1)', flags]
+                       + _set16('hl', 'r & 0xFFFF'))
+        flags = ('f = ((r >> 8) & 0x80) | (0 if r & 0xFFFF else 0x40) | '
+                 '(((v ^ q ^ r) >> 8) & 0x10) | ((((v ^ q ^ 0x8000) & (v ^ r)) >> 13) & 4) | '
+                 '((r >> 16) & 1)')
+        return _Op('ADC', ['v = (h << 8) | l', f'q = {rp}', 'r = v + q + (f & 1)', flags]
+                   + _set16('hl', 'r & 0xFFFF'))
+    if z == 3:
+        if q == 0:
+            return _Op('LD', ['t = ' + _NN, _FETCH2, f'v = {_get16(_RP[p])}',
+                              'mem[t] = v & 0xFF', 'mem[(t + 1) & 0xFFFF] = v >> 8'])
+        return _Op('LD', ['t = ' + _NN, _FETCH2]
+                   + _set16(_RP[p], 'mem[t] | (mem[(t + 1) & 0xFFFF] << 8)'))
+    if z == 4:
+        return _Op('NEG', ['v = a', 'a = 0'] + _alu(2))
+    if z == 5:
+        return _Op('RETI' if y == 1 else 'RETN', ['iff1 = iff2'] + _POP + ['pc = w'], flow=True)
+    if z == 6:
+        return _Op('IM', [f'im = {(0, 0, 1, 2)[y & 3]}'])
+    if y == 0:
+        return _Op('LD', ['i_ = a'])
+    if y == 1:
+        return _Op('LD', ['r_ = a'])
+    if y in (2, 3):
+        source = 'i_' if y == 2 else 'r_'
+        return _Op('LD', [f'a = {source}', 'f = (f & 1) | SZ[a] | (iff2 << 2)'])
+    if y in (4, 5):
+        update = (['mem[ea] = ((a << 4) | (v >> 4)) & 0xFF', 'a = (a & 0xF0) | (v & 0x0F)']
+                  if y == 4 else
+                  ['mem[ea] = ((v << 4) | (a & 0x0F)) & 0xFF', 'a = (a & 0xF0) | (v >> 4)'])
+        return _Op('RRD' if y == 4 else 'RLD',
+                   ['ea = (h << 8) | l', 'v = mem[ea]'] + update + ['f = (f & 1) | SZP[a]'])
+    return None
+
+
+def _decode(slot: int) -> Optional[_Op]:
+    group, op = _GROUPS[slot >> 8][0], slot & 0xFF
+    if group == 'main':
+        return None if op in _PREFIXES else _decode_main(op)
+    if group == 'cb':
+        return _decode_cb(op)
+    if group == 'ed':
+        return _decode_ed(op)
+    if group in ('dd', 'fd'):
+        return None if op in _PREFIXES else _decode_main(op, _INDEX[group])
+    return _decode_cb(op, _INDEX[group])
+
+
+def _memory_extra(slot: int, name: str) -> int:
+    """Cycles an (HL) / (IX+d) / (IY+d) form adds to the register form timing it."""
+    group, op = _GROUPS[slot >> 8][0], slot & 0xFF
+    if group in ('cb', 'ddcb', 'fdcb'):
+        return (4 if name == 'BIT' else 7) + (8 if group != 'cb' else 0)
+    extra = 7 if name in ('INC', 'DEC') else 3
+    if group in ('dd', 'fd'):
+        extra += 9 if op == 0x36 else 12
+    return extra
+
+
+class Z80(Interpreter):
+    """Z80 core driven by a Z80-family timing table."""
+    isa = 'z80'
+
+    def __init__(self, table, fallback=None):
+        self._ops = [_decode(slot) for slot in range(N_SLOTS)]
+        self._taken: Dict[int, int] = {}
+        super().__init__(table, fallback)
+
+    def slot_words(self) -> List[Optional[int]]:
+        words: List[Optional[int]] = []
+        for name, _, word in _GROUPS:
+            for op in range(256):
+                prefix = (name == 'main' and op in _PREFIXES) or (name in ('dd', 'fd') and op == 0xCB)
+                words.append(None if prefix else word | op)
+        return words
+
+    def slot_operation(self, slot: int) -> str:
+        op = self._ops[slot]
+        return op.name if op else ''
+
+    def slot_memory_operand(self, slot: int) -> bool:
+        op = self._ops[slot]
+        return op is not None and op.memory
+
+    def timing_words(self, slot: int) -> List[int]:
+        word = self.slot_word[slot]
+        group, op = _GROUPS[slot >> 8][0], slot & 0xFF
+        if group in ('dd', 'fd') and op != 0x76:
+            x, y, z = op >> 6, (op >> 3) & 7, op & 7
+            stand_in = None
+            if x == 1 and z == 6:
+                stand_in = 0x46
+            elif x == 1 and y == 6:
+                stand_in = 0x70
+            elif x == 2 and z == 6:
+                stand_in = 0x86
+            if stand_in is not None:
+                return [word, (word & 0xFF00) | stand_in]
+        if group in ('ddcb', 'fdcb') and op < 0x40:
+            return [word, (word & ~0xFF) | 0x06]
+        return [word]
+
+    def _adjust_cycles(self, slot: int, mnemonic: str, cycles: int, cycles_not_taken: int) -> int:
+        op = self._ops[slot]
+        if op is not None and op.timing == 'cond':
+            base = cycles_not_taken if cycles_not_taken != cycles else _NOT_TAKEN.get(op.name, cycles)
+            self._taken[slot] = cycles - base
+            return base
+        if op is not None and op.timing == 'repeat':
+            single = slot - 0x10
+            if cycles_not_taken != cycles:
+                base = cycles_not_taken
+            elif self.slot_known[single]:
+                base = self.slot_cycles[single]
+            else:
+                base = cycles
+            self._taken[slot] = cycles - base
+            return base
+        if op is not None and op.memory and not self.memory_form(mnemonic):
+            return cycles + _memory_extra(slot, op.name)
+        return cycles
+
+    def slot_at(self, address: int) -> int:
+        m = self.memory
+        first = m[address]
+        group = _PREFIXES.get(first)
+        if group is None:
+            return first
+        second = m[(address + 1) & 0xFFFF]
+        if group in ('dd', 'fd') and second == 0xCB:
+            return _BASE[group + 'cb'] + m[(address + 3) & 0xFFFF]
+        return _BASE[group] + second
+
+    def _compile(self) -> Dict[str, Callable]:
+        state = ', '.join(_STATE)
+        handlers = []
+        missing: Dict[str, Callable] = {}
+        for slot in range(N_SLOTS):
+            name = f'h_{slot:03X}'
+            if self.slot_word[slot] is None:
+                body = self._dispatch(slot)
+            elif not self.slot_known[slot]:
+                missing[name] = self._untimed(slot)
+                continue
+            elif self._ops[slot] is None:
+                missing[name] = self._undefined(slot)
+                continue
+            else:
+                op = self._ops[slot]
+                body = [s.replace('TAKEN', str(self._taken.get(slot, 0))) for s in op.body]
+                if op.flow:
+                    self.slot_flow[slot] = 1
+            handlers.append(f'def {name}():\n    nonlocal {state}\n' + indent(body, 1))
+        table = ', '.join(f'h_{slot:03X}' for slot in range(N_SLOTS))
+
+        source = (
+            'def build():\n'
+            f'    {" = ".join(_STATE)} = 0\n'
+            '    sp = 0xFFFF\n'
+            + indent(''.join(handlers).splitlines(), 1)
+            + f'    handlers = [{table}]\n'
+            + indent(_RUNTIME.splitlines(), 1)
+        )
+        namespace = dict(missing, Halt=Halt, mem=self.memory, ports=self.ports, counts=self.counts,
+                         SZ=SZ, SZP=SZP, __name__='cpuz80')
+        return build_core(source, namespace)
+
+    @staticmethod
+    def _dispatch(slot: int) -> List[str]:
+        """Body of a prefix slot: fetch the next opcode byte and dispatch."""
+        op = slot & 0xFF
+        if slot < 256:
+            first, fetch, advance = _BASE[_PREFIXES[op]], 'mem[pc]', _FETCH1
+        else:                                           # DD CB / FD CB: d, then op
+            group = 'ddcb' if slot < _BASE['fd'] else 'fdcb'
+            first, fetch, advance = _BASE[group], 'mem[(pc + 1) & 0xFFFF]', _FETCH2
+        return [f'op = {fetch} + {first}', advance, 'handlers[op]()', 'counts[op] += 1']
+
+
+_RUNTIME = '''
+def run(limit):
+    nonlocal pc
+    h = handlers
+    c = counts
+    m = mem
+    for _ in range(limit):
+        op = m[pc]
+        pc = (pc + 1) & 0xFFFF
+        h[op]()
+        c[op] += 1
+
+def trace_run(limit, record):
+    nonlocal pc
+    for _ in range(limit):
+        start = pc
+        before = extra
+        op = mem[pc]
+        pc = (pc + 1) & 0xFFFF
+        handlers[op]()
+        counts[op] += 1
+        record(start, extra - before, pc)
+
+def get_state():
+    return dict(a=a, f=f, b=b, c=c, d=d, e=e, h=h, l=l, ix=ix, iy=iy, sp=sp, pc=pc,
+                i=i_, r=r_, iff1=iff1, iff2=iff2, im=im)
+
+def set_state(**r):
+    nonlocal a, f, b, c, d, e, h, l, ix, iy, sp, pc, i_, r_, iff1, iff2, im
+    a = r.get('a', a)
+    f = r.get('f', f)
+    b = r.get('b', b)
+    c = r.get('c', c)
+    d = r.get('d', d)
+    e = r.get('e', e)
+    h = r.get('h', h)
+    l = r.get('l', l)
+    ix = r.get('ix', ix)
+    iy = r.get('iy', iy)
+    sp = r.get('sp', sp)
+    pc = r.get('pc', pc)
+    i_ = r.get('i', i_)
+    r_ = r.get('r', r_)
+    iff1 = r.get('iff1', iff1)
+    iff2 = r.get('iff2', iff2)
+    im = r.get('im', im)
+
+def reset():
+    nonlocal a, f, b, c, d, e, h, l, a_, f_, b_, c_, d_, e_, h_, l_
+    nonlocal ix, iy, sp, pc, i_, r_, iff1, iff2, im, extra
+    a = f = b = c = d = e = h = l = a_ = f_ = b_ = c_ = d_ = e_ = h_ = l_ = 0
+    ix = iy = pc = i_ = r_ = iff1 = iff2 = im = extra = 0
+    sp = 0xFFFF
+
+def get_extra():
+    return extra
+
+return dict(run=run, trace_run=trace_run, get_state=get_state, set_state=set_state,
+            reset=reset, extra=get_extra)
+'''
+
+
+# ---------------------------------------------------------------------------
+# Benchmark kernels
+# ---------------------------------------------------------------------------
+
+_ORIGIN = 0x0100
+_STACK = 0xFF00
+_SIEVE = 0x8000
+_ARRAY = 0x8100
+_ROUNDS, _RESULT, _SUM = 0x9000, 0x9001, 0x9002
+_SOURCE, _DEST, _DEST2, _COPY_BYTES, _INDEXED_BYTES = 0xA000, 0xB000, 0xC000, 4096, 1024
+_MUL_ROUNDS = 255
+
+
+def _lo(value: int) -> int:
+    return value & 0xFF
+
+
+def _hi(value: int) -> int:
+    return value >> 8
+
+
+def _sieve_kernel() -> Kernel:
+    """Sieve of Eratosthenes below 256, repeated 20 times; 54 primes."""
+    code = assemble(_ORIGIN, [
+        0x31, _lo(_STACK), _hi(_STACK),             # LD SP,stack
+        0x3E, 20, 0x32, _lo(_ROUNDS), _hi(_ROUNDS), # LD A,20 ; LD (rounds),A
+        'top:',
+        0x21, _lo(_SIEVE), _hi(_SIEVE),             # LD HL,sieve
+        0x06, 0x00, 0xAF,                           # LD B,0 ; XOR A
+        'clear:',
+        0x77, 0x23, 0x10, ('rel', 'clear'),         # LD (HL),A ; INC HL ; DJNZ clear
+        0x0E, 0x02,                                 # LD C,2
+        'outer:',
+        0x26, _hi(_SIEVE), 0x69,                    # LD H,>sieve ; LD L,C
+        0x7E, 0xB7, 0x20, ('rel', 'next'),          # LD A,(HL) ; OR A ; JR NZ,next
+        0x79,                                       # LD A,C
+        'mark:',
+        0x81, 0x38, ('rel', 'next'),                # ADD A,C ; JR C,next
+        0x6F, 0x36, 0x01, 0x18, ('rel', 'mark'),    # LD L,A ; LD (HL),1 ; JR mark
+        'next:',
+        0x0C, 0x20, ('rel', 'outer'),               # INC C ; JR NZ,outer
+        0x2E, 0x02, 0x06, 254, 0x1E, 0x00,          # LD L,2 ; LD B,254 ; LD E,0
+        'count:',
+        0x7E, 0xB7, 0x20, ('rel', 'skip'),          # LD A,(HL) ; OR A ; JR NZ,skip
+        0x1C,                                       # INC E
+        'skip:',
+        0x2C, 0x10, ('rel', 'count'),               # INC L ; DJNZ count
+        0x7B, 0x32, _lo(_RESULT), _hi(_RESULT),     # LD A,E ; LD (result),A
+        0x21, _lo(_ROUNDS), _hi(_ROUNDS),           # LD HL,rounds
+        0x35, 0x20, ('rel', 'top'),                 # DEC (HL) ; JR NZ,top
+        0x76,                                       # HALT
+    ])
+    return Kernel('sieve256', 'typical', 'Sieve of Eratosthenes below 256 (x20)',
+                  code, _ORIGIN, _ORIGIN, lambda mem: mem[_RESULT] == 54)
+
+
+def _multiply_kernel() -> Kernel:
+    """Shift-and-add 8x8 multiply over 255 operand pairs, summed to 16 bits."""
+    total = sum(i * ((i * 7 + 3) & 0xFF) for i in range(1, _MUL_ROUNDS + 1)) & 0xFFFF
+    code = assemble(_ORIGIN, [
+        0x31, _lo(_STACK), _hi(_STACK),             # LD SP,stack
+        0x21, 0x00, 0x00, 0x22, _lo(_SUM), _hi(_SUM),   # LD HL,0 ; LD (sum),HL
+        0x0E, 0x01,                                 # LD C,1
+        'loop:',
+        0x79, 0x87, 0x87, 0x87, 0x91, 0xC6, 0x03,   # LD A,C ; ADD A,A (x3) ; SUB C ; ADD A,3
+        0x5F, 0x16, 0x00,                           # LD E,A ; LD D,0
+        0x21, 0x00, 0x00, 0x79, 0x06, 0x08,         # LD HL,0 ; LD A,C ; LD B,8
+        'bit:',
+        0x29, 0x87, 0x30, ('rel', 'noadd'),         # ADD HL,HL ; ADD A,A ; JR NC,noadd
+        0x19,                                       # ADD HL,DE
+        'noadd:',
+        0x10, ('rel', 'bit'),                       # DJNZ bit
+        0xEB, 0x2A, _lo(_SUM), _hi(_SUM),           # EX DE,HL ; LD HL,(sum)
+        0x19, 0x22, _lo(_SUM), _hi(_SUM),           # ADD HL,DE ; LD (sum),HL
+        0x0C, 0x20, ('rel', 'loop'),                # INC C ; JR NZ,loop
+        0x76,                                       # HALT
+    ])
+    return Kernel('multiply8', 'compute', 'Shift-and-add 8x8 multiply, 255 products summed',
+                  code, _ORIGIN, _ORIGIN,
+                  lambda mem: mem[_SUM] | (mem[_SUM + 1] << 8) == total)
+
+
+def _copy_kernel() -> Kernel:
+    """4 KB LDIR copy plus a 1 KB (IX+d) -> (IY+d) copy, four times."""
+    pattern = bytes((i * 37 + (i >> 8)) & 0xFF for i in range(_COPY_BYTES))
+    code = assemble(_ORIGIN, [
+        0x31, _lo(_STACK), _hi(_STACK),             # LD SP,stack
+        0x3E, 4, 0x32, _lo(_ROUNDS), _hi(_ROUNDS),  # LD A,4 ; LD (rounds),A
+        'round:',
+        0x21, _lo(_SOURCE), _hi(_SOURCE),           # LD HL,src
+        0x11, _lo(_DEST), _hi(_DEST),               # LD DE,dst
+        0x01, _lo(_COPY_BYTES), _hi(_COPY_BYTES),   # LD BC,4096
+        0xED, 0xB0,                                 # LDIR
+        0xDD, 0x21, _lo(_DEST), _hi(_DEST),         # LD IX,dst
+        0xFD, 0x21, _lo(_DEST2), _hi(_DEST2),       # LD IY,dst2
+        0x01, _lo(_INDEXED_BYTES), _hi(_INDEXED_BYTES),  # LD BC,1024
+        'indexed:',
+        0xDD, 0x7E, 0x00, 0xFD, 0x77, 0x00,         # LD A,(IX+0) ; LD (IY+0),A
+        0xDD, 0x7E, 0x01, 0xFD, 0x77, 0x01,         # LD A,(IX+1) ; LD (IY+1),A
+        0xDD, 0x23, 0xDD, 0x23,                     # INC IX ; INC IX
+        0xFD, 0x23, 0xFD, 0x23,                     # INC IY ; INC IY
+        0x0B, 0x0B, 0x78, 0xB1,                     # DEC BC ; DEC BC ; LD A,B ; OR C
+        0x20, ('rel', 'indexed'),                   # JR NZ,indexed
+        0x21, _lo(_ROUNDS), _hi(_ROUNDS),           # LD HL,rounds
+        0x35, 0x20, ('rel', 'round'),               # DEC (HL) ; JR NZ,round
+        0x76,                                       # HALT
+    ])
+
+    def check(mem: bytearray) -> bool:
+        return (bytes(mem[_DEST:_DEST + _COPY_BYTES]) == pattern
+                and bytes(mem[_DEST2:_DEST2 + _INDEXED_BYTES]) == pattern[:_INDEXED_BYTES])
+    return Kernel('blockcopy4k', 'memory', 'LDIR 4 KB copy plus indexed 1 KB copy (x4)',
+                  code, _ORIGIN, _ORIGIN, check, data={_SOURCE: pattern})
+
+
+def _sort_kernel() -> Kernel:
+    """Bubble sort of 64 bytes with a compare-and-swap subroutine."""
+    values = bytes((i * 97 + 41) % 251 for i in range(64))
+    code = assemble(_ORIGIN, [
+        0x31, _lo(_STACK), _hi(_STACK),             # LD SP,stack
+        'outer:',
+        0x21, _lo(_ARRAY), _hi(_ARRAY),             # LD HL,array
+        0x06, 63, 0x0E, 0x00,                       # LD B,63 ; LD C,0
+        'inner:',
+        0xCD, ('abs', 'swap'), 0x23,                # CALL swap ; INC HL
+        0x10, ('rel', 'inner'),                     # DJNZ inner
+        0x79, 0xB7, 0x20, ('rel', 'outer'),         # LD A,C ; OR A ; JR NZ,outer
+        0x76,                                       # HALT
+        'swap:',
+        0x7E, 0x23, 0xBE,                           # LD A,(HL) ; INC HL ; CP (HL)
+        0x38, ('rel', 'done'),                      # JR C,done
+        0x28, ('rel', 'done'),                      # JR Z,done
+        0x56, 0x77, 0x2B, 0x72, 0x23,               # LD D,(HL) ; LD (HL),A ; DEC HL ; LD (HL),D ; INC HL
+        0x0E, 0x01,                                 # LD C,1
+        'done:',
+        0x2B, 0xC9,                                 # DEC HL ; RET
+    ])
+    return Kernel('bubblesort64', 'control', 'Bubble sort of 64 bytes',
+                  code, _ORIGIN, _ORIGIN,
+                  lambda mem: bytes(mem[_ARRAY:_ARRAY + 64]) == bytes(sorted(values)),
+                  data={_ARRAY: values})
+
+
+KERNELS: List[Kernel] = [_sieve_kernel(), _multiply_kernel(), _copy_kernel(), _sort_kernel()]
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Cache and Branch-Predictor Design-Space Exploration
+=====================================================
+
+Evaluates a processor model over many hypothetical memory-hierarchy and
+branch-prediction configurations and reports the Pareto frontier of CPI
+against a hardware cost proxy.
+
+Design points are sampled over the ``cache.*`` / ``bp.*`` fields used by
+``get_model_parameters`` (ranges from ``HARDWARE_PARAMETER_BOUNDS``) plus the
+boolean axes ``cache.has_l2`` and ``bp.has_branch_prediction``.  Each point
+is applied the way ``BaseProcessorModel.analyze`` applies a configuration:
+
+    memory categories:  memory_cycles = CacheConfig.effective_memory_penalty()
+    branch categories:  base_cycles   = BranchPredictionConfig.effective_branch_penalty()
+
+Categories come from the model's ``memory_categories`` / ``branch_categories``
+(with the ``BaseProcessorModel`` defaults).  Design points without a cache
+(or without a predictor) keep the costs the model defines, so the model's
+own configuration reproduces ``analyze()`` exactly.
+
+For linear models (see ``VectorizedEvaluator``) this is a closed form, so
+every workload x design point is computed in a handful of array operations.
+Non-linear models are evaluated point by point through ``analyze()`` on a
+copy of the model.
+
+Usage:
+    from common.design_space import explore_design_space
+    result = explore_design_space(model, n=2000)
+    for row in result.pareto_rows():
+        print(row['cost'], row['cpi'], row['design'])
+
+    # What if the 486 had an L2?
+    explore_design_space(model, axes=['cache.l2_hit_rate', 'cache.l2_latency'],
+                         fixed={'cache.has_l2': 1})
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import copy
+import itertools
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .base_model import (
+    BranchPredictionConfig, CacheConfig, HARDWARE_PARAMETER_BOUNDS,
+    _get_branch_categories, _get_branch_prediction, _get_cache_config, _get_categories,
+    _get_memory_categories,
+)
+from .evaluator import VectorizedEvaluator
+
+SAMPLING_METHODS = ('lhs', 'grid')
+
+# Axes explored when none are given; dram_latency is a property of the
+# memory system rather than the core, so it stays at the model's value.
+DEFAULT_AXES = (
+    'cache.l1_hit_rate', 'cache.l1_latency',
+    'cache.has_l2', 'cache.l2_hit_rate', 'cache.l2_latency',
+    'bp.has_branch_prediction', 'bp.predict_accuracy', 'bp.pipeline_depth',
+)
+
+BOOLEAN_AXES = frozenset({'cache.has_cache', 'cache.has_l2', 'bp.has_branch_prediction'})
+INTEGER_AXES = frozenset({'bp.pipeline_depth'})
+
+# Every configuration field, in the order used for design columns
+CONFIG_FIELDS = (
+    'cache.has_cache', 'cache.l1_latency', 'cache.l1_hit_rate', 'cache.has_l2',
+    'cache.l2_latency', 'cache.l2_hit_rate', 'cache.dram_latency',
+    'bp.has_branch_prediction', 'bp.predict_accuracy', 'bp.pipeline_depth',
+    'bp.btb_hit_rate', 'bp.taken_cycles',
+)
+
+
+def design_bounds() -> Dict[str, tuple]:
+    """(min, max) for every design axis (booleans are (0, 1))."""
+    bounds = dict(HARDWARE_PARAMETER_BOUNDS)
+    for name in BOOLEAN_AXES:
+        bounds[name] = (0.0, 1.0)
+    return bounds
+
+
+# ---------------------------------------------------------------------------
+# Sampling
+# ---------------------------------------------------------------------------
+
+def _snap(points: np.ndarray, axes: Sequence[str]) -> np.ndarray:
+    """Round boolean and integer axes to valid values."""
+    for col, name in enumerate(axes):
+        if name in BOOLEAN_AXES or name in INTEGER_AXES:
+            points[:, col] = np.round(points[:, col])
+    return points
+
+
+def latin_hypercube(axes: Sequence[str], n: int, bounds: Dict[str, tuple],
+                    seed: Optional[int] = 0) -> np.ndarray:
+    """Latin-hypercube sample of ``n`` design points.
+
+    Returns:
+        (n, len(axes)) array of design values
+    """
+    from scipy.stats import qmc
+
+    unit = qmc.LatinHypercube(d=len(axes), seed=seed).random(n)
+    low = np.array([bounds[a][0] for a in axes])
+    high = np.array([bounds[a][1] for a in axes])
+    points = low + unit * (high - low)
+    # Booleans: lower half of the stratum -> 0, upper half -> 1
+    for col, name in enumerate(axes):
+        if name in BOOLEAN_AXES:
+            points[:, col] = unit[:, col] >= 0.5
+    return _snap(points, axes)
+
+
+def grid_points(axes: Sequence[str], levels: Union[int, Dict[str, Sequence[float]]],
+                bounds: Dict[str, tuple]) -> np.ndarray:
+    """Full factorial grid over the design axes.
+
+    Args:
+        axes: Axis names
+        levels: Points per continuous axis, or explicit values per axis
+        bounds: Axis bounds used for evenly spaced levels
+
+    Returns:
+        (n_points, len(axes)) array of design values
+    """
+    values = []
+    for name in axes:
+        if isinstance(levels, dict) and name in levels:
+            values.append(np.asarray(levels[name], dtype=np.float64))
+        elif name in BOOLEAN_AXES:
+            values.append(np.array([0.0, 1.0]))
+        else:
+            count = levels if isinstance(levels, int) else 5
+            low, high = bounds[name]
+            axis_values = np.linspace(low, high, count)
+            if name in INTEGER_AXES:
+                axis_values = np.unique(np.round(axis_values))
+            values.append(axis_values)
+    return np.array(list(itertools.product(*values)), dtype=np.float64).reshape(-1, len(axes))
+
+
+# ---------------------------------------------------------------------------
+# Configuration columns and cost
+# ---------------------------------------------------------------------------
+
+def baseline_design(model) -> Dict[str, float]:
+    """The model's own configuration as design values.
+
+    Models without a cache or predictor get the CacheConfig /
+    BranchPredictionConfig defaults (with has_cache / has_branch_prediction 0).
+    """
+    cache = _get_cache_config(model) or CacheConfig()
+    bp = _get_branch_prediction(model) or BranchPredictionConfig()
+    design = {}
+    for name in CONFIG_FIELDS:
+        prefix, field_name = name.split('.')
+        source = cache if prefix == 'cache' else bp
+        design[name] = float(getattr(source, field_name))
+    return design
+
+
+def _design_columns(points: np.ndarray, axes: Sequence[str],
+                    defaults: Dict[str, float]) -> Dict[str, np.ndarray]:
+    """Expand sampled points into one array per configuration field."""
+    columns = {name: np.full(len(points), value, dtype=np.float64)
+               for name, value in defaults.items()}
+    for col, name in enumerate(axes):
+        columns[name] = points[:, col]
+    return columns
+
+
+def memory_penalty(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized CacheConfig.effective_memory_penalty()."""
+    l1_miss = 1.0 - columns['cache.l1_hit_rate']
+    l1_latency = columns['cache.l1_latency']
+    l2_hit = columns['cache.l2_hit_rate']
+    dram = columns['cache.dram_latency'] - l1_latency
+    with_l2 = l1_miss * (l2_hit * (columns['cache.l2_latency'] - l1_latency) +
+                         (1.0 - l2_hit) * dram)
+    penalty = np.where(columns['cache.has_l2'] > 0, with_l2, l1_miss * dram)
+    return np.where(columns['cache.has_cache'] > 0, penalty, 0.0)
+
+
+def branch_cost(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized BranchPredictionConfig.effective_branch_penalty()."""
+    taken = columns['bp.taken_cycles']
+    accuracy = columns['bp.predict_accuracy']
+    return taken + (1.0 - accuracy) * np.round(columns['bp.pipeline_depth'])
+
+
+def hardware_cost(columns: Dict[str, np.ndarray]) -> np.ndarray:
+    """Relative hardware cost of each design point (arbitrary units).
+
+    A deliberately simple area proxy; pass ``cost_fn`` to
+    ``explore_design_space`` to use a different one.
+
+    - Cache capacity follows the sqrt(2) rule (halving the miss rate takes
+      4x the capacity); an 8KB-class L1 at 95% hits is 1.0 unit.  Faster
+      arrays cost more.  L2 capacity is a quarter of the price per unit.
+    - A branch predictor costs 0.1 units at 80% accuracy and doubles for
+      every halving of the misprediction rate; pipeline latches cost 0.02
+      units per stage.
+    """
+    l1_units = ((1.0 - 0.95) / (1.0 - columns['cache.l1_hit_rate'])) ** 2
+    l1 = l1_units * (1.0 + 1.0 / columns['cache.l1_latency'])
+    l2_units = ((1.0 - 0.90) / (1.0 - columns['cache.l2_hit_rate'])) ** 2
+    l2 = 0.25 * l2_units * (1.0 + 5.0 / columns['cache.l2_latency'])
+    cache = np.where(columns['cache.has_cache'] > 0,
+                     l1 + np.where(columns['cache.has_l2'] > 0, l2, 0.0), 0.0)
+
+    predictor = 0.1 * (1.0 - 0.80) / (1.0 - columns['bp.predict_accuracy'])
+    pipeline = 0.02 * columns['bp.pipeline_depth']
+    branch = np.where(columns['bp.has_branch_prediction'] > 0, predictor + pipeline, 0.0)
+    return cache + branch
+
+
+# ---------------------------------------------------------------------------
+# Pareto frontier
+# ---------------------------------------------------------------------------
+
+def pareto_front(objective: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    """Indices of points not dominated in (objective, cost), sorted by cost.
+
+    Both quantities are minimized.  Among exact ties the first point is kept.
+    """
+    order = np.lexsort((objective, cost))
+    best_so_far = np.minimum.accumulate(objective[order])
+    # A point is on the front if it strictly improves on every cheaper point
+    improves = np.empty(len(order), dtype=bool)
+    if len(order):
+        improves[0] = True
+        improves[1:] = objective[order][1:] < best_so_far[:-1]
+    return order[improves]
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+@dataclass
+class DesignSpaceResult:
+    """CPI and cost for every sampled design point of one model.
+
+    Attributes:
+        processor: Model display name
+        axes: Sampled configuration fields (columns of ``points``)
+        points: (n_points, n_axes) sampled design values
+        workload_names: Columns of ``cpi``
+        cpi: (n_points, n_workloads) predicted CPI
+        cost: (n_points,) hardware cost proxy
+        baseline: The model's own configuration (all CONFIG_FIELDS)
+        baseline_cpi: (n_workloads,) CPI of the model as shipped
+        baseline_cost: Cost proxy of the model as shipped
+        method: 'vectorized' or 'analyze'
+    """
+    processor: str
+    axes: List[str]
+    points: np.ndarray
+    workload_names: List[str]
+    cpi: np.ndarray
+    cost: np.ndarray
+    baseline: Dict[str, float]
+    baseline_cpi: np.ndarray
+    baseline_cost: float
+    method: str
+
+    def objective(self, workload: Optional[str] = None) -> np.ndarray:
+        """CPI for one workload, or the mean over all workloads."""
+        if workload is None:
+            return self.cpi.mean(axis=1)
+        return self.cpi[:, self.workload_names.index(workload)]
+
+    def pareto(self, workload: Optional[str] = None) -> np.ndarray:
+        """Indices of Pareto-optimal design points, cheapest first."""
+        return pareto_front(self.objective(workload), self.cost)
+
+    def design(self, index: int) -> Dict[str, float]:
+        """Sampled axis values of one design point."""
+        return {name: float(v) for name, v in zip(self.axes, self.points[index])}
+
+    def pareto_rows(self, workload: Optional[str] = None) -> List[Dict]:
+        """Pareto frontier as a list of {'cost', 'cpi', 'design'} dicts."""
+        objective = self.objective(workload)
+        return [{'cost': float(self.cost[i]), 'cpi': float(objective[i]),
+                 'design': self.design(i)}
+                for i in self.pareto(workload)]
+
+    def to_dict(self, workload: Optional[str] = None) -> Dict:
+        """JSON-serializable summary: baseline and Pareto frontier."""
+        baseline_cpi = (float(self.baseline_cpi.mean()) if workload is None
+                        else float(self.baseline_cpi[self.workload_names.index(workload)]))
+        return {
+            'processor': self.processor,
+            'workload': workload or 'mean',
+            'method': self.method,
+            'n_points': int(len(self.points)),
+            'axes': list(self.axes),
+            'baseline': {'cost': self.baseline_cost, 'cpi': baseline_cpi,
+                         'design': self.baseline},
+            'pareto': self.pareto_rows(workload),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Exploration
+# ---------------------------------------------------------------------------
+
+def memory_categories(model) -> List[str]:
+    """Categories that pay the cache penalty (the model's ``memory_categories``)."""
+    categories = _get_categories(model)
+    return [name for name in _get_memory_categories(model) if name in categories]
+
+
+def branch_categories(model) -> List[str]:
+    """Categories whose cost is replaced by the branch predictor's."""
+    categories = _get_categories(model)
+    return [name for name in _get_branch_categories(model) if name in categories]
+
+
+def unmodified_cycles(model, mem_cats: List[str],
+                      br_cats: List[str]) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Category costs as defined, before ``analyze()`` applied the configuration.
+
+    ``analyze()`` overwrites ``memory_cycles`` of memory categories when the
+    model has a cache, and ``base_cycles`` of branch categories when it has
+    a branch predictor.  Those values are read from a freshly constructed
+    instance of the model; all other values are the model's current ones.
+
+    Returns:
+        ({memory category: memory_cycles}, {branch category: base_cycles})
+    """
+    cache = _get_cache_config(model)
+    bp = _get_branch_prediction(model)
+    source = _get_categories(model)
+    if (cache is not None and cache.has_cache) or (bp is not None and bp.has_branch_prediction):
+        try:
+            source = _get_categories(type(model)())
+        except Exception:
+            pass
+    current = _get_categories(model)
+    memory = {name: (source.get(name) or current[name]).memory_cycles for name in mem_cats}
+    branch = {name: (source.get(name) or current[name]).base_cycles for name in br_cats}
+    return memory, branch
+
+
+def _vectorized_cpi(evaluator: VectorizedEvaluator, columns: Dict[str, np.ndarray],
+                    mem_cats: List[str], br_cats: List[str],
+                    inherent_memory: Dict[str, float],
+                    inherent_branch: Dict[str, float]) -> np.ndarray:
+    """Closed-form (n_points, n_workloads) CPI for a linear model."""
+    categories = _get_categories(evaluator.model)
+    index = {name: i for i, name in enumerate(evaluator.category_names)}
+    weights = evaluator.workload_weights
+
+    # Per-category memory/branch cost as compiled (current) and as defined
+    mem_mask = np.zeros(len(index))
+    mem_current = np.zeros(len(index))
+    mem_inherent = np.zeros(len(index))
+    for name in mem_cats:
+        mem_mask[index[name]] = 1.0
+        mem_current[index[name]] = categories[name].memory_cycles
+        mem_inherent[index[name]] = inherent_memory[name]
+    br_mask = np.zeros(len(index))
+    br_current = np.zeros(len(index))
+    br_inherent = np.zeros(len(index))
+    for name in br_cats:
+        br_mask[index[name]] = 1.0
+        br_current[index[name]] = categories[name].base_cycles
+        br_inherent[index[name]] = inherent_branch[name]
+
+    base = weights @ (evaluator.cycles + evaluator.corrections)
+    # analyze() sets memory_cycles to the penalty when there is one and
+    # leaves the defined cost otherwise; likewise for branch base_cycles.
+    penalty = memory_penalty(columns)
+    memory = np.where((penalty > 0)[:, np.newaxis],
+                      np.outer(penalty, weights @ mem_mask), weights @ mem_inherent)
+    has_bp = columns['bp.has_branch_prediction'] > 0
+    branch = np.where(has_bp[:, np.newaxis],
+                      np.outer(branch_cost(columns), weights @ br_mask), weights @ br_inherent)
+    return base + memory - weights @ mem_current + branch - weights @ br_current
+
+
+def _analyze_cpi(model, columns: Dict[str, np.ndarray], workload_names: List[str],
+                 mem_cats: List[str], br_cats: List[str],
+                 inherent_memory: Dict[str, float],
+                 inherent_branch: Dict[str, float]) -> np.ndarray:
+    """Point-by-point (n_points, n_workloads) CPI through analyze()."""
+    trial = copy.deepcopy(model)
+    categories = _get_categories(trial)
+    penalty = memory_penalty(columns)
+    bp_cycles = branch_cost(columns)
+    n_points = len(penalty)
+    cpi = np.empty((n_points, len(workload_names)))
+
+    for row in range(n_points):
+        values = {name: float(columns[name][row]) for name in CONFIG_FIELDS}
+        trial.cache_config = CacheConfig(**{
+            name[6:]: (bool(v) if name in BOOLEAN_AXES else v)
+            for name, v in values.items() if name.startswith('cache.')})
+        trial.branch_prediction = BranchPredictionConfig(**{
+            name[3:]: (bool(v) if name in BOOLEAN_AXES else
+                       int(round(v)) if name in INTEGER_AXES else v)
+            for name, v in values.items() if name.startswith('bp.')})
+        # Restore the defined costs; analyze() re-applies this point's config
+        for name in mem_cats:
+            categories[name].memory_cycles = (penalty[row] if penalty[row] > 0
+                                              else inherent_memory[name])
+        for name in br_cats:
+            categories[name].base_cycles = (bp_cycles[row] if values['bp.has_branch_prediction']
+                                            else inherent_branch[name])
+        cpi[row] = [trial.analyze(w).cpi for w in workload_names]
+    return cpi
+
+
+def explore_design_space(model, axes: Optional[Sequence[str]] = None, n: int = 1024,
+                         method: str = 'lhs',
+                         levels: Union[int, Dict[str, Sequence[float]]] = 5,
+                         fixed: Optional[Dict[str, float]] = None,
+                         bounds: Optional[Dict[str, tuple]] = None,
+                         cost_fn: Callable[[Dict[str, np.ndarray]], np.ndarray] = hardware_cost,
+                         seed: Optional[int] = 0) -> DesignSpaceResult:
+    """Evaluate a model over sampled cache / branch-predictor designs.
+
+    Every design point has a cache (``cache.has_cache`` = 1) unless ``fixed``
+    says otherwise; fields that are neither sampled nor fixed keep the
+    model's own values (see ``baseline_design``).
+
+    Args:
+        model: Any processor model object
+        axes: Configuration fields to sample (default DEFAULT_AXES)
+        n: Number of Latin-hypercube points (method='lhs')
+        method: 'lhs' or 'grid'
+        levels: Grid levels per axis, or explicit values per axis (method='grid')
+        fixed: Field values applied to every design point
+        bounds: Overrides for axis (min, max) ranges
+        cost_fn: Maps design columns to a cost per point
+        seed: Random seed for the Latin hypercube
+
+    Returns:
+        DesignSpaceResult with CPI for every point and workload
+    """
+    if method not in SAMPLING_METHODS:
+        raise ValueError(f"Unknown sampling method '{method}'; expected one of {SAMPLING_METHODS}")
+    axes = list(axes or DEFAULT_AXES)
+    unknown = [a for a in axes if a not in CONFIG_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown design axes: {unknown}")
+    all_bounds = design_bounds()
+    all_bounds.update(bounds or {})
+
+    if method == 'lhs':
+        points = latin_hypercube(axes, n, all_bounds, seed)
+    else:
+        points = grid_points(axes, levels, all_bounds)
+
+    baseline = baseline_design(model)
+    defaults = dict(baseline, **{'cache.has_cache': 1.0})
+    defaults.update(fixed or {})
+    columns = _design_columns(points, axes, defaults)
+
+    mem_cats = memory_categories(model)
+    br_cats = branch_categories(model)
+    inherent = unmodified_cycles(model, mem_cats, br_cats)
+    evaluator = VectorizedEvaluator(model)
+    if evaluator.linear:
+        cpi = _vectorized_cpi(evaluator, columns, mem_cats, br_cats, *inherent)
+        used = 'vectorized'
+    else:
+        cpi = _analyze_cpi(model, columns, evaluator.workload_names, mem_cats, br_cats,
+                           *inherent)
+        used = 'analyze'
+
+    baseline_columns = {name: np.array([value]) for name, value in baseline.items()}
+    return DesignSpaceResult(
+        processor=evaluator.processor,
+        axes=axes,
+        points=points,
+        workload_names=list(evaluator.workload_names),
+        cpi=cpi,
+        cost=np.asarray(cost_fn(columns), dtype=np.float64),
+        baseline=baseline,
+        baseline_cpi=evaluator.evaluate_workloads()['cpi'],
+        baseline_cost=float(cost_fn(baseline_columns)[0]),
+        method=used,
+    )
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+Static Instruction-Mix Extraction from ROM / Program Images
+=============================================================
+
+Disassembles binary images with the opcode tables already present in the
+``*_timing.json`` files and turns the static instruction histogram into a
+``WorkloadProfile``.
+
+Decoding is table driven and vectorized: every byte offset of the image is
+decoded at once by walking the ``TimingTable`` lookup pages, which yields
+the timing entry and instruction length at each offset.  From there:
+
+    linear     follow offset -> offset + length from the start address;
+               the chain is collected with pointer doubling
+               (O(n log n), no per-instruction Python loop)
+    recursive  follow control flow from the reset / interrupt vectors:
+               fall-through, relative branches, absolute jumps and calls,
+               RST vectors.  Successor edges for every offset are built in
+               one pass and reachability is one sparse-graph traversal, so
+               data embedded in the ROM is not counted as code.
+
+Control-flow rules exist for the 6502, Z80 and 8080/8085 families; the ISA
+is recognized from the table itself (JSR/RTS, JR/CALL, CALL/JMP at their
+opcodes), so second sources and derivatives (65C02, Z80A, NSC800, 8085,
+...) are covered.  Other tables with opcode fields can still be linearly
+swept.  Tables without opcode fields (e.g. the 6809's) cannot be decoded.
+
+The static mix counts each instruction once; it approximates the dynamic
+mix of code without hot loops, and is a data-driven starting point where
+only hand-assigned weights exist today.
+
+Usage:
+    from common.disasm import disassemble, load_image
+    from common.trace import load_timing_table
+    table = load_timing_table('models/zilog/z80')
+    result = disassemble(table, load_image('roms/zx48.rom'))
+    profile = result.to_workload_profile('zx48_rom')
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .base_model import WorkloadProfile
+from .trace import (MAX_OPCODE_BYTES, UNKNOWN_ENTRY, TimingTable, TraceReplayer, TraceResult,
+                    load_timing_table)
+
+DISASSEMBLY_MODES = ('recursive', 'linear')
+IMAGE_SUFFIXES = ('.bin', '.rom', '.prg', '.com', '.img')
+
+# Control-flow kind of a timing entry
+FLOW_NEXT = 0       # falls through only
+FLOW_BRANCH = 1     # falls through and may go to a target (branch, call)
+FLOW_JUMP = 2       # goes to its target only
+FLOW_STOP = 3       # no static successor (return, indirect jump, halt)
+
+# How the target address is encoded
+TARGET_NONE = 0
+TARGET_REL8 = 1     # signed displacement in the last byte, relative to the next instruction
+TARGET_ABS16 = 2    # little-endian address in the last two bytes
+TARGET_FIXED = 3    # fixed address named by the mnemonic (RST n)
+
+# (mnemonic pattern, flow, target, required addressing mode, fixed-target parser)
+_Rule = Tuple[str, int, int, Optional[str], Optional[Callable[[re.Match], int]]]
+
+_CONTROL_FLOW: Dict[str, List[_Rule]] = {
+    '6502': [
+        (r'^(BCC|BCS|BEQ|BMI|BNE|BPL|BVC|BVS|BBR\d?|BBS\d?)\b', FLOW_BRANCH, TARGET_REL8, None, None),
+        (r'^BRA\b', FLOW_JUMP, TARGET_REL8, None, None),
+        (r'^JMP\b', FLOW_JUMP, TARGET_ABS16, 'absolute', None),
+        (r'^JSR\b', FLOW_BRANCH, TARGET_ABS16, 'absolute', None),
+        (r'^(JMP|RTS|RTI|BRK|STP)\b', FLOW_STOP, TARGET_NONE, None, None),
+    ],
+    'z80': [
+        (r'^(DJNZ\b|JR\s+\w+,)', FLOW_BRANCH, TARGET_REL8, None, None),
+        (r'^JR\b', FLOW_JUMP, TARGET_REL8, None, None),
+        (r'^JP\s+\(', FLOW_STOP, TARGET_NONE, None, None),
+        (r'^JP\s+\w+,', FLOW_BRANCH, TARGET_ABS16, None, None),
+        (r'^JP\b', FLOW_JUMP, TARGET_ABS16, None, None),
+        (r'^CALL\b', FLOW_BRANCH, TARGET_ABS16, None, None),
+        (r'^RET\s+\w', FLOW_NEXT, TARGET_NONE, None, None),
+        (r'^(RET|RETI|RETN|HALT)\b', FLOW_STOP, TARGET_NONE, None, None),
+        (r'^RST\s+([0-9A-F]+)H', FLOW_BRANCH, TARGET_FIXED, None, lambda m: int(m.group(1), 16)),
+    ],
+    '8080': [
+        (r'^J(NZ|Z|NC|C|PO|PE|P|M)\b', FLOW_BRANCH, TARGET_ABS16, None, None),
+        (r'^JMP\b', FLOW_JUMP, TARGET_ABS16, None, None),
+        (r'^(CALL|C(NZ|Z|NC|C|PO|PE|P|M))\b', FLOW_BRANCH, TARGET_ABS16, None, None),
+        (r'^(RET|PCHL|HLT)\b', FLOW_STOP, TARGET_NONE, None, None),
+        (r'^RST\s+([0-7])\b', FLOW_BRANCH, TARGET_FIXED, None, lambda m: 8 * int(m.group(1))),
+    ],
+}
+
+# Opcode -> mnemonic prefix pairs that identify each ISA's table
+_ISA_SIGNATURES = {
+    '6502': ((0x20, 'JSR'), (0x60, 'RTS')),
+    'z80': ((0x18, 'JR'), (0xCD, 'CALL')),
+    '8080': ((0xC3, 'JMP'), (0xCD, 'CALL')),
+}
+
+# Little-endian vectors read from the image (6502) / fixed entry points
+_VECTORS = {'6502': (0xFFFA, 0xFFFC, 0xFFFE)}
+_ENTRY_POINTS = {'z80': (0x0000, 0x0066), '8080': (0x0000,)}
+
+
+def detect_isa(table: TimingTable) -> Optional[str]:
+    """Recognize a 6502, Z80 or 8080 opcode table, or return None."""
+    for isa, signature in _ISA_SIGNATURES.items():
+        entries = table.lookup(np.array([opcode for opcode, _ in signature], dtype=np.uint32))
+        if all(entry >= 0 and table.mnemonics[entry].upper().startswith(prefix)
+               for entry, (_, prefix) in zip(entries, signature)):
+            return isa
+    return None
+
+
+def control_flow(table: TimingTable, isa: Optional[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Classify every timing entry's control flow.
+
+    Returns:
+        (flow, target_kind, fixed_target) arrays of length ``len(table)``
+    """
+    n = len(table)
+    flow = np.full(n, FLOW_NEXT, dtype=np.int8)
+    target = np.full(n, TARGET_NONE, dtype=np.int8)
+    fixed = np.zeros(n, dtype=np.int64)
+    rules = [(re.compile(p), f, t, mode, parse) for p, f, t, mode, parse in _CONTROL_FLOW.get(isa, [])]
+    for index, mnemonic in enumerate(table.mnemonics):
+        mnemonic = mnemonic.upper()
+        for pattern, rule_flow, rule_target, mode, parse in rules:
+            match = pattern.match(mnemonic)
+            if not match or (mode and table.addressing_modes[index] != mode):
+                continue
+            if rule_target == TARGET_ABS16 and table.opcode_bytes[index] < 3:
+                continue
+            flow[index], target[index] = rule_flow, rule_target
+            if parse is not None:
+                fixed[index] = parse(match)
+            break
+    return flow, target, fixed
+
+
+def decode_image(table: TimingTable, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Decode an instruction at every byte offset of an image.
+
+    Returns:
+        (entries, lengths): timing entry (UNKNOWN_ENTRY if none) and
+        instruction length in bytes (1 for unknown bytes) at each offset
+    """
+    data = np.asarray(image, dtype=np.uint8)
+    n = len(data)
+    padded = np.concatenate([data, np.zeros(MAX_OPCODE_BYTES, dtype=np.uint8)])
+    entries = table.pages[0][data].astype(np.int64)
+    walked = np.ones(n, dtype=np.int64)
+
+    # Prefixed opcodes continue on further pages
+    rows = np.flatnonzero(entries <= -2)
+    page = -entries[rows] - 2
+    for step in range(1, MAX_OPCODE_BYTES + 1):
+        if not len(rows):
+            break
+        ended = (rows + step >= n) | (step == MAX_OPCODE_BYTES)
+        entries[rows[ended]] = table.page_default[page[ended]]
+        rows, page = rows[~ended], page[~ended]
+        value = table.pages[page, padded[rows + step]]
+        entries[rows] = value
+        walked[rows] = step + 1
+        follow = value <= -2
+        rows, page = rows[follow], -value[follow] - 2
+
+    known = entries >= 0
+    lengths = np.ones(n, dtype=np.int64)
+    lengths[known] = np.maximum(table.opcode_bytes[entries[known]], walked[known])
+    entries[~known] = UNKNOWN_ENTRY
+    return entries, lengths
+
+
+def _linear_sweep(lengths: np.ndarray, start: int) -> np.ndarray:
+    """Offsets visited by a linear sweep from ``start`` (pointer doubling)."""
+    n = len(lengths)
+    jump = np.append(np.minimum(np.arange(n) + lengths, n), n)    # n is a sink
+    jumps = [jump]
+    while (1 << len(jumps)) <= n:
+        jumps.append(jumps[-1][jumps[-1]])
+    # After level k the set holds every offset within 2**(k+1) steps
+    visited = np.array([start], dtype=np.int64)
+    for jump in reversed(jumps):
+        visited = np.union1d(visited, jump[visited])
+    return visited[visited < n]
+
+
+def _successors(table: TimingTable, data: np.ndarray, entries: np.ndarray, lengths: np.ndarray,
+                isa: str, base: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(fall-through, target) offset of every decoded offset; -1 if none."""
+    n = len(data)
+    flow, target_kind, fixed = control_flow(table, isa)
+    offsets = np.arange(n)
+    known = entries >= 0
+    entry = np.where(known, entries, 0)
+    kind = np.where(known, flow[entry], FLOW_STOP)
+
+    fall = np.where((kind == FLOW_NEXT) | (kind == FLOW_BRANCH), offsets + lengths, -1)
+    padded = np.concatenate([data, np.zeros(2, dtype=np.uint8)]).astype(np.int64)
+    last = np.minimum(offsets + lengths - 1, n)
+    rel = padded[last]
+    rel = np.where(rel >= 0x80, rel - 0x100, rel)
+    absolute = padded[np.maximum(last - 1, 0)] | (padded[last] << 8)
+    tkind = np.where(kind == FLOW_NEXT, TARGET_NONE, target_kind[entry])
+    address = np.select(
+        [tkind == TARGET_REL8, tkind == TARGET_ABS16, tkind == TARGET_FIXED],
+        [(base + offsets + lengths + rel) & 0xFFFF, absolute, fixed[entry]], -1)
+    target = np.where(address >= 0, address - base, -1)
+    fall[(fall < 0) | (fall >= n)] = -1
+    target[(target < 0) | (target >= n)] = -1
+    return fall, target
+
+
+def _recursive_descent(fall: np.ndarray, target: np.ndarray, starts: Sequence[int]) -> np.ndarray:
+    """Offsets reachable from ``starts`` over fall-through and target edges."""
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order
+
+    n = len(fall)
+    source = n      # virtual node with an edge to every start
+    rows = np.concatenate([np.arange(n), np.arange(n), np.full(len(starts), source)])
+    cols = np.concatenate([fall, target, np.asarray(starts, dtype=np.int64)])
+    valid = cols >= 0
+    graph = csr_matrix((np.ones(int(valid.sum()), dtype=np.int8), (rows[valid], cols[valid])),
+                       shape=(n + 1, n + 1))
+    order = breadth_first_order(graph, source, directed=True, return_predecessors=False)
+    return np.sort(order[order != source])
+
+
+@dataclass
+class Disassembly:
+    """Static decode of one image.
+
+    Attributes:
+        name: Image name
+        processor: Processor of the timing table
+        isa: Control-flow rules used ('6502', 'z80', '8080' or None)
+        mode: 'recursive' or 'linear'
+        base: Load address of the image
+        size: Image size in bytes
+        offsets: Image offsets of the decoded instructions
+        entries: Timing entry of each instruction (UNKNOWN_ENTRY if none)
+        lengths: Length in bytes of each instruction
+        mix: Static histogram as a TraceResult (category counts and cycles)
+    """
+    name: str
+    processor: str
+    isa: Optional[str]
+    mode: str
+    base: int
+    size: int
+    offsets: np.ndarray
+    entries: np.ndarray
+    lengths: np.ndarray
+    mix: TraceResult
+
+    @property
+    def code_bytes(self) -> int:
+        return int(self.lengths.sum())
+
+    @property
+    def code_fraction(self) -> float:
+        """Fraction of the image decoded as code."""
+        return self.code_bytes / self.size if self.size else 0.0
+
+    def to_workload_profile(self, name: Optional[str] = None,
+                            category_map: Optional[Dict[str, str]] = None) -> WorkloadProfile:
+        """Static instruction mix as a WorkloadProfile (see TraceResult)."""
+        return self.mix.to_workload_profile(
+            name or self.name, category_map,
+            f"Static mix of {self.name} ({self.mix.instructions} instructions, {self.mode})")
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'processor': self.processor,
+            'isa': self.isa,
+            'mode': self.mode,
+            'base': self.base,
+            'size': self.size,
+            'instructions': self.mix.instructions,
+            'unknown': self.mix.unknown,
+            'code_fraction': self.code_fraction,
+            'category_mix': self.mix.category_mix(),
+            'static_cpi': self.mix.cpi,
+        }
+
+
+def load_image(path: Union[str, Path]) -> np.ndarray:
+    """Read a raw binary image."""
+    return np.fromfile(path, dtype=np.uint8)
+
+
+def disassemble(table: TimingTable, image: np.ndarray, mode: str = 'recursive',
+                base: Optional[int] = None, entry_points: Optional[Sequence[int]] = None,
+                isa: Optional[str] = None, name: str = 'image') -> Disassembly:
+    """Disassemble an image and histogram its instruction categories.
+
+    Args:
+        table: Timing table with opcode fields
+        image: Image bytes
+        mode: 'recursive' (follow control flow) or 'linear' (sweep)
+        base: Load address; defaults to the top of the 64 KB space for the
+            6502 (ROMs hold the vectors) and 0 otherwise
+        entry_points: Start addresses; default: reset / interrupt vectors
+            for recursive mode, ``base`` for linear mode
+        isa: Control-flow rules; detected from the table when omitted
+        name: Image name for reports
+
+    Returns:
+        Disassembly with the static mix
+    """
+    if mode not in DISASSEMBLY_MODES:
+        raise ValueError(f"Unknown mode '{mode}'; expected one of {DISASSEMBLY_MODES}")
+    if not table.n_decodable:
+        raise ValueError(f"{table.processor}: timing table has no opcode fields to decode with")
+    data = np.asarray(image, dtype=np.uint8)
+    n = len(data)
+    isa = isa or detect_isa(table)
+    if mode == 'recursive' and isa is None:
+        raise ValueError(f"{table.processor}: no control-flow rules; use mode='linear'")
+    if base is None:
+        base = 0x10000 - n if isa == '6502' and 0 < n <= 0x10000 else 0
+
+    entries, lengths = decode_image(table, data)
+    if entry_points is None:
+        entry_points = _default_entry_points(data, isa, base) if mode == 'recursive' else [base]
+    starts = [a - base for a in entry_points if 0 <= a - base < n]
+
+    if not starts:
+        offsets = np.empty(0, dtype=np.int64)
+    elif mode == 'linear':
+        offsets = np.unique(np.concatenate([_linear_sweep(lengths, s) for s in starts]))
+    else:
+        fall, target = _successors(table, data, entries, lengths, isa, base)
+        offsets = _recursive_descent(fall, target, starts)
+
+    replayer = TraceReplayer(table)
+    replayer.update(indices=entries[offsets])
+    return Disassembly(name, table.processor, isa, mode, base, n, offsets,
+                       entries[offsets], lengths[offsets], replayer.result())
+
+
+def _default_entry_points(data: np.ndarray, isa: Optional[str], base: int) -> List[int]:
+    points = list(_ENTRY_POINTS.get(isa, ()))
+    for vector in _VECTORS.get(isa, ()):
+        offset = vector - base
+        if 0 <= offset and offset + 1 < len(data):
+            points.append(int(data[offset]) | (int(data[offset + 1]) << 8))
+    return points or [base]
+
+
+# ---------------------------------------------------------------------------
+# Directory front end
+# ---------------------------------------------------------------------------
+
+def _disassemble_file(path: str, model_dir: str, options: Dict) -> Dict:
+    try:
+        table = load_timing_table(model_dir)
+        result = disassemble(table, load_image(path), name=Path(path).stem, **options)
+    except (OSError, ValueError) as e:
+        return {'name': Path(path).stem, 'path': path, 'status': 'error', 'error': str(e)}
+    summary = result.to_dict()
+    summary.update(path=path, status='ok')
+    return summary
+
+
+def find_images(directory: Union[str, Path],
+                suffixes: Sequence[str] = IMAGE_SUFFIXES) -> List[Path]:
+    """Image files under a directory (recursive), sorted."""
+    return sorted(p for p in Path(directory).rglob('*')
+                  if p.is_file() and p.suffix.lower() in suffixes)
+
+
+def disassemble_images(paths: Sequence[Union[str, Path]], model_dir: Union[str, Path],
+                       workers: Optional[int] = None, **options) -> List[Dict]:
+    """Disassemble many images in parallel against one model's timing table.
+
+    Args:
+        paths: Image files
+        model_dir: Model directory holding ``timing/<processor>_timing.json``
+        workers: Worker processes (default: CPU count)
+        **options: Passed to ``disassemble`` (mode, base, entry_points, isa)
+
+    Returns:
+        One summary dict per image (``Disassembly.to_dict`` plus status)
+    """
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_disassemble_file, str(p), str(model_dir), options) for p in paths]
+        return [f.result() for f in futures]
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Vectorized Model Evaluator for Modeling_2026
+==============================================
+
+Compiles any processor model into per-category cost vectors so that CPI
+for many instruction mixes can be computed with one matrix product instead
+of one ``analyze()`` call per mix.
+
+Almost every model computes
+
+    cpi = sum(weight[c] * (total_cycles[c] + correction[c]))
+
+once cache penalties have been written into ``memory_cycles``.  The
+evaluator reads those vectors from the model and then *verifies* them
+against ``analyze()`` on every named workload profile.  Models whose
+``analyze()`` does something else (e.g. workload-dependent stall terms)
+are flagged as non-linear and evaluated row by row through ``analyze()``,
+so results always match the model.
+
+Usage:
+    from common.evaluator import VectorizedEvaluator
+    ev = VectorizedEvaluator(model)
+    cpi = ev.cpi(weights)          # weights: (n_mixes, n_categories)
+    batch = ev.analyze_batch(weights)   # columnar results (common.analysis_batch)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .analysis_batch import AnalysisBatch
+from .base_model import _get_categories, _get_corrections
+
+
+# Relative tolerance used when checking the compiled vectors against analyze()
+VERIFY_RTOL = 1e-9
+
+# Placeholder profile name used for row-by-row evaluation of non-linear models
+_SCRATCH_PROFILE = '__vectorized_eval__'
+
+
+def _get_profiles(model) -> Dict[str, object]:
+    """Get workload profiles from any model object."""
+    return getattr(model, 'workload_profiles',
+                   getattr(model, '_workload_profiles', {}))
+
+
+def _close(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=VERIFY_RTOL, abs_tol=VERIFY_RTOL)
+
+
+class VectorizedEvaluator:
+    """Evaluate a processor model for a batch of instruction mixes.
+
+    Columns of every weight matrix follow ``category_names`` (the model's
+    instruction category order).
+
+    Attributes:
+        processor: Model display name
+        clock_mhz: Model clock, used for IPS
+        category_names: Column order for weight matrices
+        cycles: Per-category total cycles (base + memory) after cache penalties
+        corrections: Per-category correction terms
+        base_vector, delta_vector: Per-category terms of the reported base_cpi
+            and correction_delta
+        cache_miss: Per-category cache miss cycles as reported by analyze()
+        ips_per_ipc: IPS for an IPC of 1.0 (normally clock_mhz * 1e6)
+        linear: True if the compiled vectors reproduce analyze() exactly
+        bottleneck_rule: 'max_contribution', 'constant' or None (per-row analyze)
+        result_processor: Processor name the model puts in its AnalysisResults
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.processor = getattr(model, 'name', type(model).__name__)
+        self.clock_mhz = float(getattr(model, 'clock_mhz', 1.0))
+        self.compile()
+
+    # ------------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------------
+
+    def compile(self):
+        """(Re)build cost vectors from the model's current parameters."""
+        profiles = _get_profiles(self.model)
+        # analyze() applies cache penalties to memory_cycles; run it once per
+        # profile so the category state is settled before reading it.
+        reference = {name: self.model.analyze(name) for name in profiles}
+
+        categories = _get_categories(self.model)
+        corrections = _get_corrections(self.model)
+        self.category_names: List[str] = list(categories)
+        self._index = {name: i for i, name in enumerate(self.category_names)}
+        self.cycles = np.array([categories[n].total_cycles for n in self.category_names],
+                               dtype=np.float64)
+        self.corrections = np.array([corrections.get(n, 0.0) for n in self.category_names],
+                                    dtype=np.float64)
+
+        memory_cats = set(getattr(self.model, 'memory_categories', []))
+        cache_miss = np.array(
+            [categories[n].memory_cycles if n in memory_cats else 0.0
+             for n in self.category_names], dtype=np.float64)
+
+        self.workload_names: List[str] = list(profiles)
+        self.workload_weights = self.weights_matrix(
+            [profiles[name].category_weights for name in self.workload_names])
+
+        zeros = np.zeros_like(self.cycles)
+        self.linear = self._verify_linear(reference)
+        if self.linear:
+            # Models differ in what they report next to cpi; pick the linear
+            # form that reproduces each field.
+            self.base_vector = self._fit_field(
+                reference, 'base_cpi', [self.cycles, self.cycles + self.corrections])
+            self.delta_vector = self._fit_field(
+                reference, 'correction_delta', [self.corrections, zeros])
+            self.cache_miss = self._fit_field(reference, 'cache_miss_cpi', [cache_miss, zeros])
+            self.linear = not any(v is None for v in
+                                  (self.base_vector, self.delta_vector, self.cache_miss))
+        if not self.linear:
+            self.base_vector = self.delta_vector = None
+            self.cache_miss = cache_miss
+        self.ips_per_ipc = self._fit_ips_scale(reference)
+        self.bottleneck_rule, self.constant_bottleneck = self._detect_bottleneck_rule(reference)
+        # Some models report a different processor name in analyze() results
+        self.result_processor = (next(iter(reference.values())).processor if reference
+                                 else self.processor)
+
+    def _verify_linear(self, reference) -> bool:
+        """Check the compiled CPI vector against analyze() for every profile."""
+        if not reference:
+            return False
+        profiles = _get_profiles(self.model)
+        costs = self.cycles + self.corrections
+        for row, name in enumerate(self.workload_names):
+            if not set(profiles[name].category_weights) <= set(self._index):
+                return False
+            if not _close(reference[name].cpi, float(self.workload_weights[row] @ costs)):
+                return False
+        return True
+
+    def _fit_field(self, reference, field_name: str, candidates) -> Optional[np.ndarray]:
+        """Return the first candidate vector reproducing a reported field."""
+        reported = [getattr(r, field_name, 0.0) for r in reference.values()]
+        for vector in candidates:
+            if all(_close(value, float(w @ vector))
+                   for value, w in zip(reported, self.workload_weights)):
+                return vector
+        return None
+
+    def _fit_ips_scale(self, reference) -> float:
+        """Instructions per second per unit IPC (clock * 1e6 for most models)."""
+        scale = self.clock_mhz * 1e6
+        for r in reference.values():
+            if r.ipc > 0 and not _close(r.ips, scale * r.ipc):
+                return r.ips / r.ipc
+        return scale
+
+    def _detect_bottleneck_rule(self, reference):
+        """Work out how the model names its bottleneck."""
+        if not self.linear:
+            return None, None
+        names = [r.bottleneck for r in reference.values()]
+        predicted = [self._max_contribution(w) for w in self.workload_weights]
+        if names == predicted:
+            return 'max_contribution', None
+        if len(set(names)) == 1:
+            return 'constant', names[0]
+        return None, None
+
+    def _max_contribution(self, weights: np.ndarray) -> str:
+        contributions = weights * self.cycles
+        present = weights != 0
+        if not present.any():
+            return 'unknown'
+        masked = np.where(present, contributions, -np.inf)
+        return self.category_names[int(np.argmax(masked))]
+
+    # ------------------------------------------------------------------
+    # Input helpers
+    # ------------------------------------------------------------------
+
+    def weights_matrix(self, mixes) -> np.ndarray:
+        """Convert a sequence of {category: weight} dicts to a weight matrix.
+
+        Categories the model does not define are dropped.
+        """
+        matrix = np.zeros((len(mixes), len(self.category_names)), dtype=np.float64)
+        for row, mix in enumerate(mixes):
+            for cat, weight in mix.items():
+                col = self._index.get(cat)
+                if col is not None:
+                    matrix[row, col] = weight
+        return matrix
+
+    def _as_matrix(self, weights) -> np.ndarray:
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 1:
+            weights = weights[np.newaxis, :]
+        if weights.shape[1] != len(self.category_names):
+            raise ValueError(
+                f"{self.processor}: expected {len(self.category_names)} category "
+                f"columns, got {weights.shape[1]}"
+            )
+        return weights
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def cpi(self, weights) -> np.ndarray:
+        """Corrected CPI for each row of a weight matrix."""
+        weights = self._as_matrix(weights)
+        if self.linear:
+            return weights @ (self.cycles + self.corrections)
+        return self._analyze_rows(weights)['cpi']
+
+    def evaluate(self, weights) -> Dict[str, np.ndarray]:
+        """Full per-row results for a weight matrix.
+
+        Returns:
+            Dict of arrays with keys 'cpi', 'ipc', 'ips', 'base_cpi',
+            'correction_delta', 'cache_miss_cpi' and 'bottleneck'
+        """
+        weights = self._as_matrix(weights)
+        if not self.linear:
+            results = self._analyze_rows(weights)
+        else:
+            results = {
+                'cpi': weights @ (self.cycles + self.corrections),
+                'base_cpi': weights @ self.base_vector,
+                'correction_delta': weights @ self.delta_vector,
+                'cache_miss_cpi': weights @ self.cache_miss,
+                'bottleneck': self._bottlenecks(weights),
+            }
+        cpi = results['cpi']
+        with np.errstate(divide='ignore'):
+            ipc = np.where(cpi > 0, 1.0 / cpi, 0.0)
+        results['ipc'] = ipc
+        results['ips'] = self.ips_per_ipc * ipc
+        return results
+
+    def evaluate_workloads(self) -> Dict[str, np.ndarray]:
+        """Evaluate every named workload profile of the model."""
+        if not self.linear:
+            return self._analyze_named(self.workload_names)
+        return self.evaluate(self.workload_weights)
+
+    def analyze_batch(self, weights=None, workload_names: Optional[List[str]] = None,
+                      contributions: bool = False) -> AnalysisBatch:
+        """Results for a weight matrix as a columnar ``AnalysisBatch``.
+
+        Args:
+            weights: Weight matrix (default: every named workload profile)
+            workload_names: Name per row (default: the profile names when
+                ``weights`` is None, otherwise anonymous mixes)
+            contributions: Also keep the per-category CPI contributions
+                (``weight * total_cycles``, what ``BaseProcessorModel.analyze()``
+                reports as utilizations; some models report other values)
+
+        Returns:
+            AnalysisBatch whose rows convert to ``AnalysisResult`` on access
+        """
+        if weights is None:
+            weights = self.workload_weights
+            values = self.evaluate_workloads()
+            if workload_names is None:
+                workload_names = self.workload_names
+        else:
+            weights = self._as_matrix(weights)
+            values = self.evaluate(weights)
+        if workload_names is not None and len(workload_names) != len(weights):
+            raise ValueError(f"{self.processor}: {len(workload_names)} workload names for "
+                             f"{len(weights)} rows")
+        return AnalysisBatch.from_columns(
+            self.result_processor, values, workload_names, self.category_names,
+            weights * self.cycles if contributions else None)
+
+    def _bottlenecks(self, weights: np.ndarray) -> np.ndarray:
+        if self.bottleneck_rule == 'constant':
+            return np.full(len(weights), self.constant_bottleneck, dtype=object)
+        if self.bottleneck_rule == 'max_contribution':
+            contributions = np.where(weights != 0, weights * self.cycles, -np.inf)
+            best = np.argmax(contributions, axis=1)
+            names = np.array(self.category_names + ['unknown'], dtype=object)
+            best = np.where((weights != 0).any(axis=1), best, len(self.category_names))
+            return names[best]
+        return self._analyze_rows(weights)['bottleneck']
+
+    def _analyze_rows(self, weights: np.ndarray) -> Dict[str, np.ndarray]:
+        """Evaluate rows one at a time through the model's own analyze()."""
+        profiles = _get_profiles(self.model)
+        profile_type = type(next(iter(profiles.values())))
+        try:
+            results = []
+            for row in weights:
+                mix = {name: float(w) for name, w in zip(self.category_names, row) if w != 0}
+                profiles[_SCRATCH_PROFILE] = profile_type(_SCRATCH_PROFILE, mix, "")
+                results.append(self.model.analyze(_SCRATCH_PROFILE))
+        finally:
+            profiles.pop(_SCRATCH_PROFILE, None)
+        return self._collect(results)
+
+    def _analyze_named(self, names: List[str]) -> Dict[str, np.ndarray]:
+        results = [self.model.analyze(name) for name in names]
+        collected = self._collect(results)
+        cpi = collected['cpi']
+        with np.errstate(divide='ignore'):
+            collected['ipc'] = np.where(cpi > 0, 1.0 / cpi, 0.0)
+        collected['ips'] = np.array([r.ips for r in results], dtype=np.float64)
+        return collected
+
+    @staticmethod
+    def _collect(results) -> Dict[str, np.ndarray]:
+        return {
+            'cpi': np.array([r.cpi for r in results], dtype=np.float64),
+            'base_cpi': np.array([r.base_cpi for r in results], dtype=np.float64),
+            'correction_delta': np.array([r.correction_delta for r in results],
+                                         dtype=np.float64),
+            'cache_miss_cpi': np.array([getattr(r, 'cache_miss_cpi', 0.0) for r in results],
+                                       dtype=np.float64),
+            'bottleneck': np.array([r.bottleneck for r in results], dtype=object),
+        }
+
+    def cpi_bounds(self) -> Optional[tuple]:
+        """(min, max) CPI over the whole probability simplex, if linear."""
+        if not self.linear or not len(self.cycles):
+            return None
+        costs = self.cycles + self.corrections
+        return float(costs.min()), float(costs.max())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Streaming Fleet Export
+=======================
+
+Flat, analysis-ready records for the whole fleet, produced by generators
+that hold one model in memory at a time:
+
+    processor   one per model: family, processor, name, manufacturer, year,
+                clock, transistors, plus _models_config.json fields
+    parameter   one per model x parameter (``get_model_parameters``)
+    result      one per model x workload profile: cpi, ipc, ips, base_cpi,
+                correction_delta, cache_miss_cpi, bottleneck
+
+Records are ``(kind, dict)`` pairs from ``iter_records()``; writers stream
+them out as JSON Lines (one ``"record"``-tagged object per line) or as one
+CSV per kind, and ``to_dataframes()`` collects them into pandas DataFrames
+with categorical dtypes for the repeated string columns:
+
+    from common.fleet_export import iter_records, write_jsonl
+    with open('fleet.jsonl', 'w') as f:
+        write_jsonl(iter_records(family='intel'), f)
+
+Per-workload results come from ``common.evaluator.VectorizedEvaluator``
+(one matrix product per model).
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import csv
+import json
+import math
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from .base_model import get_model_parameters
+from .evaluator import VectorizedEvaluator
+from .jsoncache import load_json
+from .model_loader import discover_processors, load_model
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RECORD_KINDS = ('processor', 'parameter', 'result')
+
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'processor': ('model', 'family', 'processor', 'name', 'manufacturer', 'year', 'clock_mhz',
+                  'transistor_count', 'word', 'target_cpi', 'display', 'arch', 'n_categories',
+                  'n_workloads', 'linear'),
+    'parameter': ('model', 'family', 'processor', 'parameter', 'group', 'category', 'field',
+                  'value'),
+    'result': ('model', 'family', 'processor', 'workload', 'cpi', 'ipc', 'ips', 'base_cpi',
+               'correction_delta', 'cache_miss_cpi', 'bottleneck'),
+}
+
+# Columns stored as pandas categoricals by to_dataframes()
+CATEGORICAL = {
+    'processor': ('family', 'manufacturer'),
+    'parameter': ('model', 'family', 'processor', 'parameter', 'group', 'category', 'field'),
+    'result': ('model', 'family', 'processor', 'workload', 'bottleneck'),
+}
+
+Record = Tuple[str, Dict[str, Any]]
+
+
+def _load_config(repo_root: Path) -> Dict[str, Dict[str, Any]]:
+    """_models_config.json entries keyed by ``family/processor``."""
+    path = repo_root / '_models_config.json'
+    if not path.exists():
+        return {}
+    out = {}
+    for entry in load_json(path).values():
+        parts = Path(entry.get('dir', '')).parts
+        if len(parts) >= 3:
+            out['/'.join(parts[-2:])] = entry
+    return out
+
+
+def _split_parameter(name: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """'cat.alu.base_cycles' -> ('cat', 'alu', 'base_cycles'); 'cor.alu' -> ('cor', 'alu', None)."""
+    group, _, rest = name.partition('.')
+    if group == 'cat':
+        category, _, field_name = rest.rpartition('.')
+        return group, category, field_name
+    if group == 'cor':
+        return group, rest, None
+    return group, None, rest
+
+
+def _clean(value):
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def iter_records(kinds: Sequence[str] = RECORD_KINDS,
+                 repo_root: Union[str, Path, None] = None,
+                 family: Optional[str] = None,
+                 processor: Optional[str] = None,
+                 errors: Optional[Dict[str, str]] = None) -> Iterator[Record]:
+    """Yield ``(kind, record)`` pairs model by model.
+
+    Args:
+        kinds: Subset of ``RECORD_KINDS`` to produce
+        repo_root: Repository to export (default: this one)
+        family: Only models in this family
+        processor: Only this processor
+        errors: Optional dict that receives ``{model: error}`` for models
+            that fail to load or evaluate (they are skipped)
+    """
+    unknown = set(kinds) - set(RECORD_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown record kinds {sorted(unknown)}. Choose from: {RECORD_KINDS}")
+    root = Path(repo_root) if repo_root else REPO_ROOT
+    config = _load_config(root) if 'processor' in kinds else {}
+
+    for entry in discover_processors(root, family, processor):
+        fam, proc = entry['family'], entry['processor']
+        key = f"{fam}/{proc}"
+        ident = {'model': key, 'family': fam, 'processor': proc}
+        model, error = load_model(entry['model_file'])
+        if model is None:
+            if errors is not None:
+                errors[key] = error
+            continue
+        try:
+            evaluator = VectorizedEvaluator(model)
+            values = evaluator.evaluate_workloads() if 'result' in kinds else None
+        except Exception as e:
+            if errors is not None:
+                errors[key] = f"{type(e).__name__}: {e}"
+            continue
+
+        if 'processor' in kinds:
+            extra = config.get(key, {})
+            yield 'processor', {
+                **ident,
+                'name': getattr(model, 'name', None),
+                'manufacturer': getattr(model, 'manufacturer', None),
+                'year': getattr(model, 'year', None) or extra.get('year'),
+                'clock_mhz': getattr(model, 'clock_mhz', None) or extra.get('clock'),
+                'transistor_count': getattr(model, 'transistor_count', None),
+                'word': extra.get('word'),
+                'target_cpi': extra.get('target_cpi'),
+                'display': extra.get('display'),
+                'arch': extra.get('arch'),
+                'n_categories': len(evaluator.category_names),
+                'n_workloads': len(evaluator.workload_names),
+                'linear': evaluator.linear,
+            }
+
+        if 'parameter' in kinds:
+            for name, value in get_model_parameters(model).items():
+                group, category, field_name = _split_parameter(name)
+                yield 'parameter', {**ident, 'parameter': name, 'group': group,
+                                    'category': category, 'field': field_name,
+                                    'value': _clean(float(value))}
+
+        if 'result' in kinds:
+            columns = {k: values[k].tolist() for k in COLUMNS['result'][4:]}
+            for row, workload in enumerate(evaluator.workload_names):
+                record = dict(ident, workload=workload)
+                for k, column in columns.items():
+                    value = column[row]
+                    record[k] = str(value) if k == 'bottleneck' else _clean(value)
+                yield 'result', record
+
+
+def write_jsonl(records: Iterable[Record], fp: IO[str]) -> Dict[str, int]:
+    """Write records as JSON Lines tagged with ``"record": kind``.
+
+    Returns:
+        Record count per kind
+    """
+    counts: Dict[str, int] = {}
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    for kind, record in records:
+        fp.write(dumps({'record': kind, **record}))
+        fp.write('\n')
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def write_csv(records: Iterable[Record], streams: Dict[str, IO[str]]) -> Dict[str, int]:
+    """Write each record kind to its own CSV stream (header first).
+
+    Args:
+        records: ``(kind, record)`` pairs
+        streams: ``{kind: text stream}``; kinds without a stream are dropped
+
+    Returns:
+        Record count per kind
+    """
+    writers = {}
+    counts: Dict[str, int] = {}
+    for kind, record in records:
+        stream = streams.get(kind)
+        if stream is None:
+            continue
+        writer = writers.get(kind)
+        if writer is None:
+            writer = writers[kind] = csv.DictWriter(stream, COLUMNS[kind],
+                                                    extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+        writer.writerow(record)
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def to_dataframes(records: Iterable[Record]) -> Dict[str, Any]:
+    """Collect records into one pandas DataFrame per kind.
+
+    Repeated string columns (``CATEGORICAL``) use the ``category`` dtype.
+
+    Raises:
+        ImportError: If pandas is not installed
+    """
+    import pandas as pd
+
+    columns: Dict[str, Dict[str, list]] = {}
+    for kind, record in records:
+        table = columns.get(kind)
+        if table is None:
+            table = columns[kind] = {c: [] for c in COLUMNS[kind]}
+        for c, values in table.items():
+            values.append(record.get(c))
+    frames = {}
+    for kind, table in columns.items():
+        frame = pd.DataFrame(table, columns=list(COLUMNS[kind]))
+        for c in CATEGORICAL[kind]:
+            frame[c] = frame[c].astype('category')
+        frames[kind] = frame
+    return frames
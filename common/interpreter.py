@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+Table-Driven Reference Interpreter Framework
+==============================================
+
+Runs small benchmark kernels on pure-Python CPU cores and reports exact
+cycle counts, so ``measured_cpi.json`` can carry locally generated
+"emulator" measurements instead of only coarse published MIPS figures.
+
+Cycle counts come from the processor's ``*_timing.json`` table: every
+opcode slot of a core (one per first byte, plus one per byte after each
+prefix) is looked up in the compiled ``TimingTable`` once, when the core is
+built.  Cores add only the dynamic, data-dependent cycles the tables
+describe in their notes (branch taken / not taken, page crossings, the last
+iteration of block instructions).
+
+Speed: each core generates the source of one handler per opcode from
+per-addressing-mode and per-operation templates, compiles it once, and keeps
+CPU state in closure cells.  The run loop is a fetch, a list index into the
+handler table and a call -- no per-instruction dict lookups or attribute
+access.  Executed instructions are counted per slot; cycles are
+sum(count * base cycles) + dynamic extras.
+
+Cores:
+    common.cpu6502.MOS6502   NMOS 6502 and CMOS 65C02 (opcodes from the table)
+    common.cpuz80.Z80        Z80 with CB / ED / DD / FD / DDCB / FDCB prefixes
+
+Kernels are tiny machine-code programs mapped to the standard workloads
+(typical / compute / memory / control); each checks its own result so a
+broken core cannot produce a plausible CPI.
+
+Usage:
+    from common.cpu6502 import MOS6502, KERNELS
+    from common.trace import load_timing_table
+    cpu = MOS6502(load_timing_table('models/mos_wdc/mos6502'))
+    results = [run_kernel(cpu, k) for k in KERNELS]
+    record_measurements('models/mos_wdc/mos6502', results)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .measurements import CPIMeasurement, MeasuredCPIFile, load_measured_cpi, save_measured_cpi
+from .trace import (FLAG_BRANCH, FLAG_NOT_TAKEN, FLAG_TAKEN, UNKNOWN_ENTRY, TimingTable)
+
+DEFAULT_MAX_INSTRUCTIONS = 20_000_000
+_TRACE_BUFFER = 1 << 16
+
+
+class EmulationError(RuntimeError):
+    """Raised for undefined opcodes, untimed opcodes or runaway kernels."""
+
+
+class Halt(Exception):
+    """Raised by a core's halting instruction to leave the run loop."""
+
+
+@dataclass
+class RunStats:
+    """Outcome of one run.
+
+    Attributes:
+        instructions: Executed instructions
+        cycles: Exact cycles (table base cycles plus dynamic extras)
+        slot_counts: Executions per opcode slot
+        category_counts: Executions per timing category
+    """
+    instructions: int
+    cycles: int
+    slot_counts: np.ndarray
+    category_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+
+@dataclass
+class Kernel:
+    """A benchmark kernel: machine code plus a self-check.
+
+    Attributes:
+        name: Kernel name
+        workload: Standard workload it stands for
+        description: What it computes
+        code: Machine code bytes
+        origin: Load address of ``code``
+        entry: Start address
+        check: Returns True if memory holds the expected result
+        data: Extra {address: bytes} loaded before the run
+        max_instructions: Guard against runaway kernels
+    """
+    name: str
+    workload: str
+    description: str
+    code: bytes
+    origin: int
+    entry: int
+    check: Callable[[bytearray], bool]
+    data: Dict[int, bytes] = field(default_factory=dict)
+    max_instructions: int = DEFAULT_MAX_INSTRUCTIONS
+
+
+@dataclass
+class KernelResult:
+    """CPI of one kernel run on one core."""
+    kernel: str
+    workload: str
+    processor: str
+    instructions: int
+    cycles: int
+    passed: bool
+    category_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'kernel': self.kernel,
+            'workload': self.workload,
+            'processor': self.processor,
+            'instructions': self.instructions,
+            'cycles': self.cycles,
+            'cpi': self.cpi,
+            'passed': self.passed,
+            'category_counts': dict(self.category_counts),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Assembler helper for kernels
+# ---------------------------------------------------------------------------
+
+def assemble(origin: int, items: Sequence[Union[int, str, Tuple[str, str]]]) -> bytes:
+    """Resolve labels in a hand-assembled byte list.
+
+    Items are byte values, ``'label:'`` definitions, ``('rel', label)``
+    (signed 8-bit displacement from the next byte) or ``('abs', label)``
+    (little-endian 16-bit address).
+    """
+    labels: Dict[str, int] = {}
+    address = origin
+    for item in items:
+        if isinstance(item, str):
+            labels[item.rstrip(':')] = address
+        else:
+            address += 2 if isinstance(item, tuple) and item[0] == 'abs' else 1
+
+    out = bytearray()
+    for item in items:
+        if isinstance(item, str):
+            continue
+        if isinstance(item, tuple):
+            kind, label = item
+            target = labels[label]
+            if kind == 'abs':
+                out += bytes((target & 0xFF, target >> 8))
+            else:
+                displacement = target - (origin + len(out) + 1)
+                if not -128 <= displacement <= 127:
+                    raise ValueError(f"branch to '{label}' out of range ({displacement})")
+                out.append(displacement & 0xFF)
+        else:
+            out.append(item & 0xFF)
+    return bytes(out)
+
+
+# ---------------------------------------------------------------------------
+# Core base class
+# ---------------------------------------------------------------------------
+
+class Interpreter:
+    """Base class of the CPU cores.
+
+    Subclasses define ``isa``, ``slot_words()`` (packed opcode word of every
+    slot, None for prefix slots), ``_adjust_cycles()`` and ``_compile()``,
+    which returns the generated run functions.
+    """
+    isa = ''
+
+    def __init__(self, table: TimingTable, fallback: Optional[TimingTable] = None):
+        self.table = table
+        self.fallback = fallback
+        self.processor = table.processor
+        self.memory = bytearray(0x10000)
+        self.ports = bytearray(0x100)
+
+        words = self.slot_words()
+        n = len(words)
+        self.slot_word = words
+        self.slot_cycles = [0] * n
+        self.slot_category = [''] * n
+        self.slot_mnemonic = [''] * n
+        self.slot_mode = [''] * n
+        self.slot_known = [False] * n
+        self.slot_length = [1] * n
+        self.slot_flow = np.zeros(n, dtype=np.int8)
+        for slot, word in enumerate(words):
+            if word is None:
+                continue
+            source, entry = self._find_entry(slot, word)
+            if source is None:
+                continue
+            self.slot_known[slot] = True
+            self.slot_mnemonic[slot] = source.mnemonics[entry]
+            self.slot_mode[slot] = source.addressing_modes[entry]
+            self.slot_category[slot] = source.categories[source.category_ids[entry]]
+            self.slot_length[slot] = int(source.opcode_bytes[entry])
+            self.slot_cycles[slot] = self._adjust_cycles(
+                slot, source.mnemonics[entry], int(source.cycles[entry]),
+                int(source.cycles_not_taken[entry]))
+        self.counts = [0] * n
+        self._fns = self._compile()
+
+    # -- subclass interface ----------------------------------------------
+
+    def slot_words(self) -> List[Optional[int]]:
+        raise NotImplementedError
+
+    def slot_operation(self, slot: int) -> str:
+        """Canonical mnemonic of a slot's operation ('' if not checked)."""
+        return ''
+
+    def slot_memory_operand(self, slot: int) -> bool:
+        """True if a slot's operand is a memory form ((HL), (IX+d), ...)."""
+        return False
+
+    def timing_words(self, slot: int) -> List[int]:
+        """Opcode words to look up for a slot: its own word, then stand-ins
+        for tables that time a whole group with one entry."""
+        return [self.slot_word[slot]]
+
+    def _adjust_cycles(self, slot: int, mnemonic: str, cycles: int, cycles_not_taken: int) -> int:
+        return cycles
+
+    def _compile(self) -> Dict[str, Callable]:
+        raise NotImplementedError
+
+    def slot_at(self, address: int) -> int:
+        """Opcode slot of the instruction at ``address``."""
+        return self.memory[address]
+
+    # -- timing lookup ---------------------------------------------------
+
+    def _find_entry(self, slot: int, word: int) -> Tuple[Optional[TimingTable], int]:
+        """Timing entry for a slot: the primary table, then the fallback.
+
+        When an opcode pattern is shared by several entries (e.g. BIT / SET
+        / RES under one ``DDCB+d+op`` spec), the entry whose mnemonic names
+        the slot's operation is preferred.  A table that times the opcode
+        as a different operation (a non-compatible derivative) leaves the
+        slot untimed rather than falling back.
+
+        A memory-operand slot matched by a register-form entry (e.g. 0x8E
+        ``ADC A,(HL)`` inside an ``ADC A,r`` range) keeps looking -- the
+        fallback table usually has the memory form -- and uses the register
+        entry only if no table does; ``_adjust_cycles`` then adds the memory
+        form's cycles.
+        """
+        operation = self.slot_operation(slot)
+        memory = self.slot_memory_operand(slot)
+        register = None
+        for source in (self.table, self.fallback):
+            if source is None:
+                continue
+            conflict = False
+            for position, candidate in enumerate(self.timing_words(slot)):
+                entry = int(source.lookup(np.array([candidate], dtype=np.uint32))[0])
+                if entry == UNKNOWN_ENTRY:
+                    continue
+                found = source.mnemonics[entry]
+                if position == 0 and operation and operation_name(found) != operation:
+                    named = [i for i, m in enumerate(source.mnemonics)
+                             if operation_name(m) == operation and self._same_form(found, m)]
+                    if not named:
+                        conflict = True
+                        continue
+                    entry = named[0]
+                if memory and not self.memory_form(source.mnemonics[entry]):
+                    register = register or (source, entry)
+                    continue
+                return source, entry
+            if conflict:
+                break
+        return register or (None, UNKNOWN_ENTRY)
+
+    @staticmethod
+    def _same_form(found: str, candidate: str) -> bool:
+        """Operands of two mnemonics match (e.g. 'BIT b,(IX+d)' ~ 'SET b,(IX+d)')."""
+        return found.partition(' ')[2] == candidate.partition(' ')[2]
+
+    @staticmethod
+    def memory_form(mnemonic: str) -> bool:
+        """Mnemonic has a memory operand (e.g. 'ADC A,(HL)', not 'ADC A,r')."""
+        return '(' in mnemonic.partition(' ')[2]
+
+    # -- running ---------------------------------------------------------
+
+    def load(self, data: bytes, address: int):
+        self.memory[address:address + len(data)] = data
+
+    def reset(self):
+        self.counts[:] = [0] * len(self.counts)
+        self._fns['reset']()
+
+    def state(self) -> Dict[str, int]:
+        """Register values."""
+        return self._fns['get_state']()
+
+    def set_state(self, **registers):
+        self._fns['set_state'](**registers)
+
+    def run(self, start: int, max_instructions: int = DEFAULT_MAX_INSTRUCTIONS,
+            trace=None) -> RunStats:
+        """Execute from ``start`` until the core halts.
+
+        Args:
+            start: Start address
+            max_instructions: Raise EmulationError if not halted by then
+            trace: Optional ``common.tracefile.TraceWriter``; records carry
+                pc, opcode, cycles, length and branch flags (data
+                addresses are not recorded)
+
+        Returns:
+            RunStats (the halting instruction is not counted)
+        """
+        self.reset()
+        self.set_state(pc=start)
+        try:
+            if trace is None:
+                self._fns['run'](max_instructions)
+            else:
+                self._run_traced(max_instructions, trace)
+        except Halt:
+            pass
+        else:
+            raise EmulationError(f"{self.processor}: no halt within {max_instructions} instructions")
+        return self._stats()
+
+    def _run_traced(self, limit: int, writer):
+        from .tracefile import make_records
+
+        columns: Dict[str, List[int]] = {k: [] for k in ('pc', 'opcode', 'flags', 'cycles', 'length')}
+
+        def flush():
+            if columns['pc']:
+                writer.append(make_records(**{k: np.array(v) for k, v in columns.items()}))
+                for values in columns.values():
+                    values.clear()
+
+        slot_at, words, lengths, cycles = self.slot_at, self.slot_word, self.slot_length, self.slot_cycles
+        flow = self.slot_flow
+
+        def record(pc_before: int, extra: int, pc_after: int):
+            slot = slot_at(pc_before)
+            length = lengths[slot]
+            flags = 0
+            if flow[slot]:
+                if pc_after != (pc_before + length) & 0xFFFF:
+                    flags = FLAG_BRANCH | FLAG_TAKEN
+                else:
+                    flags = FLAG_BRANCH | FLAG_NOT_TAKEN
+            columns['pc'].append(pc_before)
+            columns['opcode'].append(words[slot] or 0)
+            columns['flags'].append(flags)
+            columns['cycles'].append(cycles[slot] + extra)
+            columns['length'].append(length)
+            if len(columns['pc']) >= _TRACE_BUFFER:
+                flush()
+
+        try:
+            self._fns['trace_run'](limit, record)
+        finally:
+            flush()
+
+    def _stats(self) -> RunStats:
+        counts = np.array(self.counts, dtype=np.int64)
+        for slot, word in enumerate(self.slot_word):
+            if word is None:
+                counts[slot] = 0     # prefixes are counted in their sub-slots
+        cycles = int(counts @ np.array(self.slot_cycles, dtype=np.int64)) + self._fns['extra']()
+        categories: Dict[str, int] = {}
+        for slot in np.flatnonzero(counts):
+            name = self.slot_category[slot]
+            categories[name] = categories.get(name, 0) + int(counts[slot])
+        return RunStats(int(counts.sum()), cycles, counts, categories)
+
+    def _untimed(self, slot: int) -> Callable[[], None]:
+        word = self.slot_word[slot]
+
+        def handler(*_):
+            raise EmulationError(f"{self.processor}: no matching timing entry for opcode {word:#x}")
+        return handler
+
+    def _undefined(self, slot: int) -> Callable[[], None]:
+        def handler(*_):
+            raise EmulationError(f"{self.processor}: opcode slot {slot:#x} not implemented")
+        return handler
+
+
+def operation_name(mnemonic: str) -> str:
+    """Operation part of a table mnemonic ('LD A,(HL)' / 'LD_nn_A' -> 'LD')."""
+    return re.split(r'[\s_.]', mnemonic.strip(), maxsplit=1)[0].upper()
+
+
+def build_core(source: str, namespace: Dict[str, Any]) -> Dict[str, Callable]:
+    """Compile generated core source and return its ``build()`` result."""
+    code = compile(source, f"<{namespace.get('__name__', 'core')}>", 'exec')
+    exec(code, namespace)
+    return namespace['build']()
+
+
+def indent(lines: Sequence[str], depth: int) -> str:
+    pad = '    ' * depth
+    return ''.join(f"{pad}{line}\n" for line in lines)
+
+
+# ---------------------------------------------------------------------------
+# Kernels and measurements
+# ---------------------------------------------------------------------------
+
+def run_kernel(core: Interpreter, kernel: Kernel, trace=None) -> KernelResult:
+    """Load and run one kernel, then verify its result."""
+    core.memory[:] = bytes(len(core.memory))
+    for address, data in kernel.data.items():
+        core.load(data, address)
+    core.load(kernel.code, kernel.origin)
+    stats = core.run(kernel.entry, kernel.max_instructions, trace)
+    return KernelResult(kernel.name, kernel.workload, core.processor, stats.instructions,
+                        stats.cycles, bool(kernel.check(core.memory)), stats.category_counts)
+
+
+def workload_cpi(results: Sequence[KernelResult]) -> Dict[str, float]:
+    """CPI per workload (total cycles / total instructions of its kernels)."""
+    totals: Dict[str, List[int]] = {}
+    for r in results:
+        t = totals.setdefault(r.workload, [0, 0])
+        t[0] += r.cycles
+        t[1] += r.instructions
+    return {w: c / n for w, (c, n) in totals.items() if n}
+
+
+def emulator_measurements(results: Sequence[KernelResult], clock_mhz: Optional[float] = None,
+                          detail: str = "") -> List[CPIMeasurement]:
+    """CPIMeasurement (source "emulator") per workload of passing kernels."""
+    passed = [r for r in results if r.passed]
+    measurements = []
+    for workload, cpi in workload_cpi(passed).items():
+        kernels = [r for r in passed if r.workload == workload]
+        conditions: Dict[str, Any] = {
+            'kernels': [r.kernel for r in kernels],
+            'instructions': sum(r.instructions for r in kernels),
+            'cycles': sum(r.cycles for r in kernels),
+            'memory_config': 'no wait states',
+        }
+        if clock_mhz:
+            conditions['clock_mhz'] = clock_mhz
+        measurements.append(CPIMeasurement(
+            workload=workload,
+            measured_cpi=round(cpi, 4),
+            source='emulator',
+            source_detail=detail or 'common.interpreter table-driven core',
+            conditions=conditions,
+            confidence='medium',
+            date_measured=date.today().isoformat(),
+            notes='Exact cycle count of local benchmark kernels; '
+                  'kernel choice limits representativeness',
+        ))
+    return measurements
+
+
+def record_measurements(model_dir: str, results: Sequence[KernelResult],
+                        clock_mhz: Optional[float] = None, detail: str = "") -> Optional[str]:
+    """Replace a model's "emulator" entries in measured_cpi.json.
+
+    Entries from other sources are kept.  Returns the file path, or None if
+    no kernel passed.
+    """
+    new = emulator_measurements(results, clock_mhz, detail)
+    if not new:
+        return None
+    existing = load_measured_cpi(model_dir)
+    if existing is None:
+        existing = MeasuredCPIFile(processor=results[0].processor)
+    replaced = {m.workload for m in new}
+    existing.measurements = [m for m in existing.measurements
+                             if not (m.get('source') == 'emulator' and m.get('workload') in replaced)]
+    for m in new:
+        existing.add_measurement(m)
+    return save_measured_cpi(model_dir, existing)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Parsed-JSON Cache
+==================
+
+Shared on-disk cache of parsed JSON documents for the batch tools.  Every
+fleet-wide script re-reads ``index.json``, ``_models_config.json`` and a
+handful of files per model; ``load_json()`` answers those reads from a
+single marshal bundle instead of re-parsing the text:
+
+    from common.jsoncache import load_json
+
+    index = load_json(REPO_ROOT / "index.json")
+
+The bundle (``.cache/jsoncache.marshal`` under the repository root) maps
+each absolute path to ``(mtime_ns, size, marshalled_document)``.  A lookup
+stats the file and only uses the cached document when both match;
+anything else is parsed with ``json`` and queued for the next flush.
+Documents are stored individually marshalled, so a hit costs one
+``marshal.loads`` of that document and always returns a fresh object the
+caller may mutate.
+
+Concurrency: the bundle is read in one piece and written to a per-process
+temporary file that is moved into place with ``os.replace``, so readers
+see either the old or the new bundle, never a partial one.  A flush merges
+with whatever is on disk at that moment; if two writers race, the loser's
+new entries are simply parsed again later -- validity never depends on the
+bundle, only on the stat check.  The bundle is tagged with the interpreter
+version and discarded when it does not match.  It can be deleted at any
+time.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import atexit
+import json
+import marshal
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_PATH = REPO_ROOT / ".cache" / "jsoncache.marshal"
+CACHE_FORMAT = 1
+
+_Entry = Tuple[int, int, bytes]
+
+
+def _bundle_tag() -> Tuple[int, int, int, int]:
+    return (CACHE_FORMAT, marshal.version) + tuple(sys.version_info[:2])
+
+
+class JsonCache:
+    """Stat-validated cache of parsed JSON files backed by a marshal bundle.
+
+    Args:
+        cache_path: Bundle file (default ``.cache/jsoncache.marshal``).
+        enabled: When False every load parses the file and nothing is written.
+    """
+
+    def __init__(self, cache_path: Optional[Union[str, Path]] = None,
+                 enabled: bool = True):
+        self.cache_path = Path(cache_path) if cache_path else DEFAULT_CACHE_PATH
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._entries: Optional[Dict[str, _Entry]] = None
+        self._dirty: Dict[str, _Entry] = {}
+
+    # ------------------------------------------------------------------
+    # Bundle I/O
+    # ------------------------------------------------------------------
+
+    def _read_bundle(self) -> Dict[str, _Entry]:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                bundle = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+        if not isinstance(bundle, dict) or bundle.get('tag') != _bundle_tag():
+            return {}
+        return bundle.get('entries', {})
+
+    @property
+    def entries(self) -> Dict[str, _Entry]:
+        if self._entries is None:
+            self._entries = self._read_bundle() if self.enabled else {}
+        return self._entries
+
+    def flush(self) -> int:
+        """Write entries parsed since the last flush into the bundle.
+
+        Returns:
+            Number of entries written.
+        """
+        if not self._dirty:
+            return 0
+        entries = self._read_bundle()
+        entries.update(self._dirty)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(marshal.dumps({'tag': _bundle_tag(), 'entries': entries}))
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return 0
+        written = len(self._dirty)
+        self._entries = entries
+        self._dirty = {}
+        return written
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def load(self, path: Union[str, Path]) -> Any:
+        """Return the parsed contents of a JSON file.
+
+        Args:
+            path: JSON file to read.
+
+        Returns:
+            The parsed document (a new object on every call).
+
+        Raises:
+            OSError, json.JSONDecodeError: As ``json.load`` would.
+        """
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        if self.enabled:
+            cached = self._dirty.get(key) or self.entries.get(key)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                self.hits += 1
+                return marshal.loads(cached[2])
+        self.misses += 1
+        with open(key) as f:
+            data = json.load(f)
+        if self.enabled:
+            try:
+                blob = marshal.dumps(data)
+            except ValueError:
+                return data
+            self._dirty[key] = (st.st_mtime_ns, st.st_size, blob)
+        return data
+
+    def invalidate(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Drop one path (or every path) from the in-memory view.
+
+        Stale entries are never served anyway; this only forces a re-parse
+        in the current process.
+        """
+        if path is None:
+            self._entries = {}
+            self._dirty = {}
+            return
+        key = os.path.abspath(path)
+        self.entries.pop(key, None)
+        self._dirty.pop(key, None)
+
+    def clear(self) -> None:
+        """Delete the bundle file and forget all entries."""
+        self.invalidate()
+        try:
+            self.cache_path.unlink()
+        except OSError:
+            pass
+
+
+_default: Optional[JsonCache] = None
+
+
+def get_cache() -> JsonCache:
+    """Return the process-wide cache, flushed automatically at exit.
+
+    Setting ``MODELING_JSONCACHE=0`` in the environment disables it.
+    """
+    global _default
+    if _default is None:
+        _default = JsonCache(enabled=os.environ.get('MODELING_JSONCACHE', '1') != '0')
+        atexit.register(_default.flush)
+    return _default
+
+
+def load_json(path: Union[str, Path]) -> Any:
+    """Parse a JSON file through the process-wide cache.
+
+    Args:
+        path: JSON file to read.
+
+    Returns:
+        The parsed document; callers own it and may modify it freely.
+    """
+    return get_cache().load(path)
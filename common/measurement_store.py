@@ -0,0 +1,576 @@
+#!/usr/bin/env python3
+"""
+SQLite Measurement Store
+=========================
+
+Indexed local SQLite mirror of the per-model JSON data under ``models/``:
+
+    measurements/measured_cpi.json        -> cpi_measurements
+    measurements/instruction_traces.json  -> instruction_timings
+    measurements/benchmarks.json          -> benchmark_results
+    timing/*.json                         -> timing_entries
+    validation/*_validation.json          -> validations
+
+Row columns mirror ``CPIMeasurement``, ``InstructionTiming`` and
+``BenchmarkResult`` (``common.measurements``); keys outside the schema are
+kept in an ``extra`` JSON column, and the alternate file layouts some
+models use (``workload_measurements``, ``instruction_traces``, benchmark
+``name``) are normalized on load.  Every row references its source file.
+
+The JSON files stay the source of truth.  ``sync()`` stats every file and
+only re-reads files whose mtime or size changed; a changed stat with an
+unchanged SHA-1 just refreshes the stat.  Re-read files replace their rows
+in one transaction (bulk ``executemany`` inserts), and rows of deleted
+files are dropped.  After that, fleet-wide questions are single SQL
+statements:
+
+    store = MeasurementStore()
+    store.sync()
+    rows = store.cpi_measurements(workload='typical', source='published_benchmark',
+                                  year_to=1985)
+    cpi = store.measured_cpi_map()            # {model_dir: {workload: cpi}}
+
+The database lives in ``.cache/measurements.sqlite3`` under the repository
+root unless a path is given; it can be deleted at any time.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import hashlib
+import json
+import sqlite3
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .measurements import (BenchmarkResult, BenchmarksFile, CPIMeasurement,
+                           InstructionTiming, InstructionTracesFile, MeasuredCPIFile)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB_PATH = REPO_ROOT / ".cache" / "measurements.sqlite3"
+SCHEMA_VERSION = 1
+
+_CPI_FIELDS = [f.name for f in fields(CPIMeasurement)]
+_TIMING_FIELDS = [f.name for f in fields(InstructionTiming)]
+_BENCHMARK_FIELDS = [f.name for f in fields(BenchmarkResult)]
+_ENTRY_FIELDS = ['mnemonic', 'operands', 'opcode', 'bytes', 'cycles', 'cycles_not_taken',
+                 'category', 'addressing_mode']
+_JSON_FIELDS = ('conditions',)
+_CONFIDENCE_RANK = {'low': 1, 'medium': 2, 'high': 3}
+_FILE_HEADER_FIELDS = ('processor', 'manufacturer', 'year', 'schema_version')
+_ABSENT = '_absent'               # schema keys missing from the source record
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY, path TEXT UNIQUE NOT NULL, kind TEXT NOT NULL,
+    model_dir TEXT NOT NULL, mtime_ns INTEGER, size INTEGER, sha1 TEXT, header TEXT);
+CREATE TABLE IF NOT EXISTS processors (
+    model_dir TEXT PRIMARY KEY, family TEXT, name TEXT, processor TEXT,
+    manufacturer TEXT, year INTEGER);
+CREATE TABLE IF NOT EXISTS cpi_measurements (
+    file_id INTEGER NOT NULL, model_dir TEXT NOT NULL,
+    workload TEXT, measured_cpi REAL, source TEXT, source_detail TEXT, conditions TEXT,
+    uncertainty REAL, confidence TEXT, date_measured TEXT, notes TEXT, extra TEXT);
+CREATE TABLE IF NOT EXISTS instruction_timings (
+    file_id INTEGER NOT NULL, model_dir TEXT NOT NULL,
+    mnemonic TEXT, category TEXT, measured_cycles REAL, bytes INTEGER, t_states INTEGER,
+    source TEXT, source_detail TEXT, addressing_mode TEXT, condition TEXT, notes TEXT,
+    extra TEXT);
+CREATE TABLE IF NOT EXISTS benchmark_results (
+    file_id INTEGER NOT NULL, model_dir TEXT NOT NULL,
+    benchmark TEXT, score REAL, unit TEXT, source TEXT, source_detail TEXT,
+    conditions TEXT, date_measured TEXT, notes TEXT, extra TEXT);
+CREATE TABLE IF NOT EXISTS timing_entries (
+    file_id INTEGER NOT NULL, model_dir TEXT NOT NULL, position INTEGER,
+    mnemonic TEXT, operands TEXT, opcode TEXT, bytes INTEGER, cycles REAL,
+    cycles_not_taken REAL, category TEXT, addressing_mode TEXT, extra TEXT);
+CREATE TABLE IF NOT EXISTS validations (
+    file_id INTEGER NOT NULL, model_dir TEXT NOT NULL, processor TEXT,
+    validation_date TEXT, document TEXT);
+CREATE INDEX IF NOT EXISTS processors_name ON processors (name);
+CREATE INDEX IF NOT EXISTS processors_year ON processors (year);
+CREATE INDEX IF NOT EXISTS cpi_model ON cpi_measurements (model_dir, workload);
+CREATE INDEX IF NOT EXISTS cpi_workload ON cpi_measurements (workload);
+CREATE INDEX IF NOT EXISTS cpi_source ON cpi_measurements (source, confidence);
+CREATE INDEX IF NOT EXISTS cpi_file ON cpi_measurements (file_id);
+CREATE INDEX IF NOT EXISTS timings_model ON instruction_timings (model_dir, category);
+CREATE INDEX IF NOT EXISTS timings_file ON instruction_timings (file_id);
+CREATE INDEX IF NOT EXISTS benchmarks_model ON benchmark_results (model_dir, benchmark);
+CREATE INDEX IF NOT EXISTS benchmarks_file ON benchmark_results (file_id);
+CREATE INDEX IF NOT EXISTS entries_model ON timing_entries (model_dir, category);
+CREATE INDEX IF NOT EXISTS entries_file ON timing_entries (file_id);
+CREATE INDEX IF NOT EXISTS validations_file ON validations (file_id);
+"""
+
+# Top-level keys holding a file's records (everything else is its header)
+_RECORD_KEYS = ('measurements', 'workload_measurements', 'timings', 'instruction_traces',
+                'benchmarks', 'instructions')
+
+_ROW_TABLES = ('cpi_measurements', 'instruction_timings', 'benchmark_results',
+               'timing_entries', 'validations')
+
+
+@dataclass
+class SyncReport:
+    """What one ``MeasurementStore.sync()`` pass did.
+
+    Attributes:
+        scanned: Source files found under models/
+        loaded: Files (re)parsed into the store
+        touched: Files whose stat changed but whose content hash did not
+        removed: Files that disappeared since the last sync
+        errors: path -> parse error for files that could not be loaded
+    """
+    scanned: int = 0
+    loaded: int = 0
+    touched: int = 0
+    removed: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.loaded or self.removed)
+
+
+def _source_files(models_root: Path) -> Iterable[Tuple[Path, str]]:
+    """(path, kind) of every mirrored JSON file under ``models_root``."""
+    for model_dir in sorted(p for p in models_root.glob('*/*') if p.is_dir()):
+        measurements = model_dir / 'measurements'
+        for name, kind in (('measured_cpi.json', 'measured_cpi'),
+                           ('instruction_traces.json', 'instruction_traces'),
+                           ('benchmarks.json', 'benchmarks')):
+            if (measurements / name).is_file():
+                yield measurements / name, kind
+        for path in sorted((model_dir / 'timing').glob('*.json')):
+            yield path, 'timing'
+        for path in sorted((model_dir / 'validation').glob('*_validation.json')):
+            yield path, 'validation'
+
+
+def _sha1(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def _split(record: Dict[str, Any], names: Sequence[str],
+           renames: Optional[Dict[str, str]] = None) -> List[Any]:
+    """Schema columns of ``record`` (plus an 'extra' JSON column for the rest)."""
+    record = dict(record)
+    for old, new in (renames or {}).items():
+        if old in record and new not in record:
+            record[new] = record.pop(old)
+    values = []
+    absent = [name for name in names if name not in record]
+    for name in names:
+        value = record.pop(name, None)
+        if name in _JSON_FIELDS and value is not None:
+            value = json.dumps(value, sort_keys=True)
+        elif isinstance(value, (dict, list)):
+            value = json.dumps(value, sort_keys=True)
+        values.append(value)
+    if absent:
+        record[_ABSENT] = absent
+    values.append(json.dumps(record, sort_keys=True) if record else None)
+    return values
+
+
+def _rows(kind: str, data: Dict[str, Any]) -> Dict[str, List[List[Any]]]:
+    """Table rows (without file_id / model_dir) for one parsed file."""
+    if kind == 'measured_cpi':
+        records = data.get('measurements', data.get('workload_measurements', []))
+        return {'cpi_measurements': [
+            _split(m, _CPI_FIELDS, {'measurement_method': 'source'}) for m in records]}
+    if kind == 'instruction_traces':
+        records = data.get('timings', data.get('instruction_traces', []))
+        renames = {'instruction_example': 'mnemonic', 'instruction_bytes': 'bytes',
+                   'measurement_source': 'source', 'description': 'notes'}
+        return {'instruction_timings': [_split(t, _TIMING_FIELDS, renames) for t in records]}
+    if kind == 'benchmarks':
+        return {'benchmark_results': [_split(b, _BENCHMARK_FIELDS, {'name': 'benchmark'})
+                                      for b in data.get('benchmarks', [])]}
+    if kind == 'timing':
+        return {'timing_entries': [[k] + _split(e, _ENTRY_FIELDS)
+                                   for k, e in enumerate(data.get('instructions', []))]}
+    return {'validations': [[data.get('processor'), data.get('validation_date'),
+                             json.dumps(data, sort_keys=True)]]}
+
+
+class MeasurementStore:
+    """SQLite mirror of the model JSON files (see module docstring).
+
+    Args:
+        db_path: Database file (default ``.cache/measurements.sqlite3``);
+            ':memory:' gives a throwaway store
+        repo_root: Repository whose ``models/`` tree is mirrored
+        sync: Bring the store up to date on open
+    """
+
+    def __init__(self, db_path: Union[str, Path, None] = None,
+                 repo_root: Union[str, Path, None] = None, sync: bool = False):
+        self.repo_root = Path(repo_root) if repo_root else REPO_ROOT
+        self.db_path = DEFAULT_DB_PATH if db_path is None else db_path
+        if str(self.db_path) != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        if sync:
+            self.sync()
+
+    def __enter__(self) -> 'MeasurementStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _create_schema(self):
+        version = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+            version = int(row[0]) if row else None
+        except sqlite3.OperationalError:
+            pass
+        if version not in (None, SCHEMA_VERSION):
+            for table in ('meta', 'files', 'processors') + _ROW_TABLES:
+                self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                              (str(SCHEMA_VERSION),))
+
+    # -- synchronization ------------------------------------------------
+
+    def sync(self, force: bool = False) -> SyncReport:
+        """Bring the store in line with the JSON files.
+
+        Args:
+            force: Re-read every file regardless of its stat
+
+        Returns:
+            SyncReport of the pass
+        """
+        models_root = self.repo_root / 'models'
+        known = {row['path']: row for row in self.conn.execute(
+            "SELECT id, path, model_dir, mtime_ns, size, sha1 FROM files")}
+        report = SyncReport()
+        seen = set()
+        changed_models = set()
+        with self.conn:
+            for path, kind in _source_files(models_root):
+                report.scanned += 1
+                rel = path.relative_to(self.repo_root).as_posix()
+                seen.add(rel)
+                stat = path.stat()
+                row = known.get(rel)
+                if row is not None and not force and \
+                        (row['mtime_ns'], row['size']) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+                digest = _sha1(path)
+                if row is not None and not force and row['sha1'] == digest:
+                    self.conn.execute("UPDATE files SET mtime_ns=?, size=? WHERE id=?",
+                                      (stat.st_mtime_ns, stat.st_size, row['id']))
+                    report.touched += 1
+                    continue
+                model_dir = path.parent.parent.relative_to(models_root).as_posix()
+                try:
+                    with open(path) as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as exc:
+                    report.errors[rel] = str(exc)
+                    data = None
+                self._load_file(rel, kind, model_dir, stat, digest, row, data)
+                changed_models.add(model_dir)
+                report.loaded += 1
+            for rel, row in known.items():
+                if rel not in seen:
+                    self._delete_rows(row['id'])
+                    self.conn.execute("DELETE FROM files WHERE id=?", (row['id'],))
+                    changed_models.add(row['model_dir'])
+                    report.removed += 1
+            self._refresh_processors(changed_models)
+        return report
+
+    def _delete_rows(self, file_id: int):
+        for table in _ROW_TABLES:
+            self.conn.execute(f"DELETE FROM {table} WHERE file_id=?", (file_id,))
+
+    def _load_file(self, rel: str, kind: str, model_dir: str, stat, digest: str,
+                   row, data: Optional[Dict[str, Any]]):
+        if row is None:
+            file_id = self.conn.execute(
+                "INSERT INTO files (path, kind, model_dir, mtime_ns, size, sha1) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rel, kind, model_dir, stat.st_mtime_ns, stat.st_size, digest)).lastrowid
+        else:
+            file_id = row['id']
+            self._delete_rows(file_id)
+            self.conn.execute("UPDATE files SET mtime_ns=?, size=?, sha1=? WHERE id=?",
+                              (stat.st_mtime_ns, stat.st_size, digest, file_id))
+        if not isinstance(data, dict):
+            return
+        header = {k: v for k, v in data.items() if k not in _RECORD_KEYS}
+        self.conn.execute("UPDATE files SET header=? WHERE id=?",
+                          (json.dumps(header, sort_keys=True), file_id))
+        for table, rows in _rows(kind, data).items():
+            if not rows:
+                continue
+            marks = ', '.join('?' * (len(rows[0]) + 2))
+            self.conn.executemany(f"INSERT INTO {table} VALUES ({marks})",
+                                  ([file_id, model_dir] + r for r in rows))
+
+    def _refresh_processors(self, model_dirs: Iterable[str]):
+        """Processor name / manufacturer / year from the first file that has them."""
+        for model_dir in sorted(model_dirs):
+            self.conn.execute("DELETE FROM processors WHERE model_dir=?", (model_dir,))
+            info = {'processor': None, 'manufacturer': None, 'year': None}
+            headers = self.conn.execute(
+                "SELECT header FROM files WHERE model_dir=? ORDER BY kind, path",
+                (model_dir,)).fetchall()
+            if not headers:
+                continue
+            for (header,) in headers:
+                header = json.loads(header) if header else {}
+                for key in info:
+                    if info[key] is None and header.get(key) not in (None, ''):
+                        info[key] = header[key]
+            year = info['year']
+            try:
+                year = int(year) if year is not None else None
+            except (TypeError, ValueError):
+                year = None
+            family, name = model_dir.split('/', 1)
+            self.conn.execute("INSERT INTO processors VALUES (?, ?, ?, ?, ?, ?)",
+                              (model_dir, family, name, info['processor'],
+                               info['manufacturer'], year))
+
+    # -- queries ----------------------------------------------------------
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run arbitrary SQL against the store (rows are sqlite3.Row)."""
+        return self.conn.execute(sql, params).fetchall()
+
+    def _select(self, table: str, columns: Sequence[str], processor=None, family=None,
+                year=None, year_from=None, year_to=None,
+                min_confidence: Optional[str] = None, **equal) -> List[Dict[str, Any]]:
+        """Rows of ``table`` joined with their processor, filtered.
+
+        Every filter accepts a single value or a list of values; ``processor``
+        matches the model directory name or the processor's display name.
+        """
+        clauses, params = [], []
+
+        def add(column: str, value):
+            if value is None:
+                return
+            values = list(value) if isinstance(value, (list, tuple, set)) else [value]
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+        if processor is not None:
+            values = list(processor) if isinstance(processor, (list, tuple, set)) else [processor]
+            marks = ', '.join('?' * len(values))
+            clauses.append(f"(p.name IN ({marks}) OR p.processor IN ({marks}))")
+            params.extend(values + values)
+        add('p.family', family)
+        add('p.year', year)
+        if year_from is not None:
+            clauses.append("p.year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("p.year <= ?")
+            params.append(year_to)
+        if min_confidence is not None:
+            allowed = [c for c, r in _CONFIDENCE_RANK.items()
+                       if r >= _CONFIDENCE_RANK[min_confidence]]
+            add('t.confidence', allowed)
+        for column, value in equal.items():
+            add(f't.{column}', value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (f"SELECT p.name AS processor, p.processor AS processor_name, p.family, p.year, "
+               f"t.model_dir, {', '.join('t.' + c for c in columns)}, t.extra "
+               f"FROM {table} t LEFT JOIN processors p ON p.model_dir = t.model_dir "
+               f"{where} ORDER BY t.model_dir, t.rowid")
+        return [self._decode(dict(row)) for row in self.conn.execute(sql, params)]
+
+    @staticmethod
+    def _decode(row: Dict[str, Any], as_stored: bool = False) -> Dict[str, Any]:
+        """Parse JSON columns and merge 'extra' back into the row.
+
+        With ``as_stored`` schema keys the source record did not have are
+        dropped again, so loaders reproduce the file's records.
+        """
+        for name in _JSON_FIELDS:
+            if row.get(name) is not None:
+                row[name] = json.loads(row[name])
+        extra = row.pop('extra', None)
+        if extra:
+            extra = json.loads(extra)
+            absent = extra.pop(_ABSENT, ())
+            if as_stored:
+                for key in absent:
+                    row.pop(key, None)
+            for key, value in extra.items():
+                row.setdefault(key, value)
+        return row
+
+    def cpi_measurements(self, processor=None, workload=None, source=None, confidence=None,
+                         family=None, year=None, year_from=None, year_to=None,
+                         min_confidence: Optional[str] = None) -> List[Dict[str, Any]]:
+        """CPI measurements (``CPIMeasurement`` fields plus processor context).
+
+        Args:
+            processor: Model directory name(s) or display name(s)
+            workload: Workload name(s)
+            source: Source kind(s), e.g. 'published_benchmark'
+            confidence: Exact confidence level(s)
+            family: Manufacturer directory name(s) under models/
+            year / year_from / year_to: Introduction year filters
+            min_confidence: Lowest acceptable confidence ('low' < 'medium' < 'high')
+
+        Returns:
+            List of row dicts ordered by model directory
+        """
+        return self._select('cpi_measurements', _CPI_FIELDS, processor, family, year,
+                            year_from, year_to, min_confidence, workload=workload,
+                            source=source, confidence=confidence)
+
+    def instruction_timings(self, processor=None, category=None, mnemonic=None, source=None,
+                            family=None, year=None, year_from=None,
+                            year_to=None) -> List[Dict[str, Any]]:
+        """Per-instruction timings (``InstructionTiming`` fields plus processor context)."""
+        return self._select('instruction_timings', _TIMING_FIELDS, processor, family, year,
+                            year_from, year_to, category=category, mnemonic=mnemonic,
+                            source=source)
+
+    def benchmark_results(self, processor=None, benchmark=None, unit=None, source=None,
+                          family=None, year=None, year_from=None,
+                          year_to=None) -> List[Dict[str, Any]]:
+        """Benchmark scores (``BenchmarkResult`` fields plus processor context)."""
+        return self._select('benchmark_results', _BENCHMARK_FIELDS, processor, family, year,
+                            year_from, year_to, benchmark=benchmark, unit=unit, source=source)
+
+    def timing_entries(self, processor=None, category=None, mnemonic=None, family=None,
+                       year=None, year_from=None, year_to=None) -> List[Dict[str, Any]]:
+        """Timing-table entries (``*_timing.json`` instructions) in file order."""
+        return self._select('timing_entries', ['position'] + _ENTRY_FIELDS, processor, family,
+                            year, year_from, year_to, category=category, mnemonic=mnemonic)
+
+    def validation(self, processor: str) -> Optional[Dict[str, Any]]:
+        """Parsed ``*_validation.json`` document of one processor."""
+        row = self.conn.execute(
+            "SELECT v.document FROM validations v JOIN processors p ON p.model_dir = v.model_dir "
+            "WHERE p.name = ? OR p.processor = ? OR p.model_dir = ? LIMIT 1",
+            (processor, processor, processor)).fetchone()
+        return json.loads(row['document']) if row else None
+
+    def processors(self, family=None, year_from=None, year_to=None) -> List[Dict[str, Any]]:
+        """Processors known to the store."""
+        clauses, params = [], []
+        if family is not None:
+            clauses.append("family = ?")
+            params.append(family)
+        if year_from is not None:
+            clauses.append("year >= ?")
+            params.append(year_from)
+        if year_to is not None:
+            clauses.append("year <= ?")
+            params.append(year_to)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return [dict(r) for r in self.conn.execute(
+            f"SELECT * FROM processors {where} ORDER BY model_dir", params)]
+
+    # -- bulk loaders -------------------------------------------------------
+
+    def measured_cpi_map(self, workload=None, source=None,
+                         min_confidence: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """{model_dir: {workload: measured CPI}} for the whole fleet in one query.
+
+        Same selection as ``system_identification.load_measurements_for_model``
+        (positive CPI, later entries for a workload win).
+        """
+        result: Dict[str, Dict[str, float]] = {}
+        for row in self._select('cpi_measurements', ['workload', 'measured_cpi'],
+                                min_confidence=min_confidence, workload=workload,
+                                source=source):
+            cpi = row['measured_cpi']
+            if row['workload'] and isinstance(cpi, (int, float)) and cpi > 0:
+                result.setdefault(row['model_dir'], {})[row['workload']] = float(cpi)
+        return result
+
+    def measurements_for_model(self, model_dir: Union[str, Path]) -> Dict[str, float]:
+        """Workload -> measured CPI of one model (``load_measurements_for_model`` shape)."""
+        key = self._model_key(model_dir)
+        rows = self.conn.execute(
+            "SELECT workload, measured_cpi FROM cpi_measurements WHERE model_dir = ? "
+            "ORDER BY rowid", (key,))
+        return {w: float(c) for w, c in rows
+                if w and isinstance(c, (int, float)) and c > 0}
+
+    def _model_key(self, model_dir: Union[str, Path]) -> str:
+        path = Path(model_dir)
+        if path.is_absolute():
+            try:
+                return path.resolve().relative_to((self.repo_root / 'models').resolve()).as_posix()
+            except ValueError:
+                pass
+        parts = path.parts
+        if 'models' in parts:
+            parts = parts[parts.index('models') + 1:]
+        return '/'.join(parts[-2:])
+
+    def _file_header(self, key: str, kind: str, names: Sequence[str]) -> Dict[str, Any]:
+        """Constructor arguments of a file dataclass from the stored file header."""
+        row = self.conn.execute("SELECT header FROM files WHERE model_dir = ? AND kind = ?",
+                                (key, kind)).fetchone()
+        header = json.loads(row['header']) if row and row['header'] else {}
+        header.setdefault('processor', key.split('/')[-1])
+        return {name: header[name] for name in names if name in header}
+
+    def _records(self, table: str, columns: Sequence[str], key: str) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)}, extra FROM {table} WHERE model_dir = ? ORDER BY rowid",
+            (key,))
+        return [self._decode(dict(r), as_stored=True) for r in rows]
+
+    def load_measured_cpi(self, model_dir: Union[str, Path]) -> Optional[MeasuredCPIFile]:
+        """``common.measurements.load_measured_cpi`` served from the store."""
+        key = self._model_key(model_dir)
+        if not self._has_file(key, 'measured_cpi'):
+            return None
+        header = self._file_header(key, 'measured_cpi', _FILE_HEADER_FIELDS)
+        return MeasuredCPIFile(measurements=self._records('cpi_measurements', _CPI_FIELDS, key),
+                               **header)
+
+    def load_instruction_traces(self, model_dir: Union[str, Path]) -> Optional[InstructionTracesFile]:
+        """``common.measurements.load_instruction_traces`` served from the store."""
+        key = self._model_key(model_dir)
+        if not self._has_file(key, 'instruction_traces'):
+            return None
+        header = self._file_header(key, 'instruction_traces', _FILE_HEADER_FIELDS + ('source',))
+        return InstructionTracesFile(
+            timings=self._records('instruction_timings', _TIMING_FIELDS, key), **header)
+
+    def load_benchmarks(self, model_dir: Union[str, Path]) -> Optional[BenchmarksFile]:
+        """``common.measurements.load_benchmarks`` served from the store."""
+        key = self._model_key(model_dir)
+        if not self._has_file(key, 'benchmarks'):
+            return None
+        header = self._file_header(key, 'benchmarks', _FILE_HEADER_FIELDS)
+        return BenchmarksFile(benchmarks=self._records('benchmark_results', _BENCHMARK_FIELDS, key),
+                              **header)
+
+    def _has_file(self, key: str, kind: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM files WHERE model_dir = ? AND kind = ?",
+                                 (key, kind)).fetchone() is not None
+
+
+def open_store(db_path: Union[str, Path, None] = None,
+               repo_root: Union[str, Path, None] = None) -> MeasurementStore:
+    """Open the measurement store and bring it up to date."""
+    return MeasurementStore(db_path, repo_root, sync=True)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Model Discovery and Loading
+============================
+
+Finds the processor models listed in ``index.json`` and loads them from
+their ``current/*_validated.py`` files:
+
+    from common.model_loader import discover_processors, load_model
+    for entry in discover_processors(family_filter='zilog'):
+        model, error = load_model(entry['model_file'])
+
+Loaded models get the fleet correction overlay applied
+(``common.correction_overlay``).  The batch runners
+(``run_system_identification.py``, ``tools/run_fleet_analysis.py``, ...)
+and the library modules that walk the fleet all use these two functions.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import importlib.util
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .correction_overlay import apply_overlay
+from .jsoncache import load_json
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_model(model_path: Union[str, Path]) -> Tuple[Any, Optional[str]]:
+    """Dynamically load a processor model from its _validated.py file.
+
+    Corrections from the correction overlay (``common.correction_overlay``)
+    are applied to the new instance.
+
+    Returns:
+        (model_instance, None) on success, or (None, error_message) on failure.
+    """
+    try:
+        spec = importlib.util.spec_from_file_location("model", model_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        for name in dir(module):
+            if name.endswith("Model") and name != "BaseProcessorModel":
+                obj = getattr(module, name)
+                if isinstance(obj, type):
+                    model = obj()
+                    apply_overlay(model, model_path)
+                    return model, None
+
+        return None, "No Model class found"
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def discover_processors(
+    repo_root: Union[str, Path, None] = None,
+    family_filter: Optional[str] = None,
+    processor_filter: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Discover processors from index.json.
+
+    Args:
+        repo_root: Repository to scan (default: this one)
+        family_filter: Only this family
+        processor_filter: Only this processor
+
+    Returns list of dicts with keys: family, processor, model_dir, model_file.
+    """
+    repo_root = Path(repo_root) if repo_root else REPO_ROOT
+    index_path = repo_root / "index.json"
+    if not index_path.exists():
+        print(f"ERROR: {index_path} not found")
+        return []
+
+    index = load_json(index_path)
+
+    processors = []
+    for family, info in index.get("families", {}).items():
+        if family_filter and family != family_filter:
+            continue
+        for proc in info.get("processors", []):
+            if processor_filter and proc != processor_filter:
+                continue
+
+            model_dir = repo_root / "models" / family / proc
+            if not model_dir.exists():
+                continue
+
+            # Find the validated model file
+            current_dir = model_dir / "current"
+            if not current_dir.exists():
+                continue
+            model_files = list(current_dir.glob("*_validated.py"))
+            if not model_files:
+                continue
+
+            processors.append({
+                "family": family,
+                "processor": proc,
+                "model_dir": model_dir,
+                "model_file": model_files[0],
+            })
+
+    return processors
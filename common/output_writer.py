@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Transactional Output Writer
+============================
+
+Stages the JSON documents a batch run produces (``sysid_result.json``,
+``*_validation.json`` updates, ...) in memory and commits them together:
+
+    with OutputTransaction() as tx:
+        tx.stage(model_dir / 'identification' / 'sysid_result.json', data)
+        val = tx.read(val_path)              # staged version if any, else disk
+        val['accuracy']['sysid_date'] = today
+        tx.stage(val_path, val)
+    print(tx.report.summary())
+
+``commit()`` serializes every staged document, drops the ones whose bytes
+equal the file on disk, writes the rest to temporary files next to their
+targets and only then renames them into place with ``os.replace``.  A
+failure while preparing leaves every target untouched; each individual
+target is always either the old or the new file.  Leaving the ``with``
+block through an exception discards the staged documents.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+
+def serialize_json(document: Any, indent: int = 2) -> bytes:
+    """The bytes ``json.dump(document, f, indent=indent)`` would write."""
+    return json.dumps(document, indent=indent).encode()
+
+
+@dataclass
+class CommitReport:
+    """What a commit did, by target path."""
+    created: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    bytes_written: int = 0
+    dry_run: bool = False
+
+    @property
+    def changed(self) -> List[str]:
+        return self.created + self.updated
+
+    def summary(self) -> str:
+        verb = "would write" if self.dry_run else "wrote"
+        return (f"{verb} {len(self.changed)} file(s) ({len(self.created)} new, "
+                f"{len(self.updated)} updated, {self.bytes_written} bytes); "
+                f"{len(self.unchanged)} unchanged")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'created': self.created, 'updated': self.updated,
+                'unchanged': self.unchanged, 'bytes_written': self.bytes_written,
+                'dry_run': self.dry_run}
+
+
+class OutputTransaction:
+    """Batch of staged JSON documents committed with atomic renames.
+
+    Args:
+        dry_run: ``commit()`` computes the report but writes nothing
+        indent: JSON indentation used for staged documents
+    """
+
+    def __init__(self, dry_run: bool = False, indent: int = 2):
+        self.dry_run = dry_run
+        self.indent = indent
+        self._staged: Dict[Path, bytes] = {}
+        self.report = CommitReport(dry_run=dry_run)
+
+    def __enter__(self) -> 'OutputTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def stage(self, path: Union[str, Path], document: Any) -> None:
+        """Stage a JSON document for ``path`` (replacing an earlier staging)."""
+        self._staged[Path(path)] = serialize_json(document, self.indent)
+
+    def read(self, path: Union[str, Path]) -> Any:
+        """The staged document for ``path``, else the file's parsed contents.
+
+        Raises:
+            OSError, json.JSONDecodeError: When nothing is staged and the
+            file is missing or malformed
+        """
+        path = Path(path)
+        if path in self._staged:
+            return json.loads(self._staged[path])
+        with open(path) as f:
+            return json.load(f)
+
+    def discard(self) -> None:
+        self._staged.clear()
+
+    def commit(self) -> CommitReport:
+        """Write every staged document that differs from disk.
+
+        Returns:
+            CommitReport (also kept as ``self.report``)
+        """
+        report = CommitReport(dry_run=self.dry_run)
+        pending = []
+        for path, data in sorted(self._staged.items()):
+            try:
+                current = path.read_bytes()
+            except FileNotFoundError:
+                current = None
+            if current == data:
+                report.unchanged.append(str(path))
+                continue
+            (report.created if current is None else report.updated).append(str(path))
+            report.bytes_written += len(data)
+            pending.append((path, data))
+
+        if not self.dry_run and pending:
+            temps = []
+            try:
+                for path, data in pending:
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+                    temps.append((tmp, path))
+                    with open(tmp, 'wb') as f:
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+            except BaseException:
+                for tmp, _ in temps:
+                    tmp.unlink(missing_ok=True)
+                raise
+            for tmp, path in temps:
+                os.replace(tmp, path)
+
+        self._staged.clear()
+        self.report = report
+        return report
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+Dual-Issue Pairing Simulator
+==============================
+
+Trace-driven issue-group simulation of the in-order superscalars (Pentium
+U/V pipes, 68060 pOEP/sOEP, i960CA/CF REG/MEM/CTRL sides, i860
+dual-instruction mode), replacing the flat "pairing fraction" guesses of
+their models with the pairing actually achieved by a trace.
+
+Every timing-table entry carries a ``pairing`` class (``TimingTable.
+pairing_classes``).  A PairingRules object says which pipes each class may
+issue to, whether slot k of a group is bound to pipe k (``ordered``, the
+U/V style: the first instruction goes to U, the second to V) or the
+members only need distinct pipes (``ordered=False``), and which classes
+pair only with specific partners (Pentium FP + FXCH).  Classes not listed
+in ``units`` never pair.
+
+Issue is greedy and in order: a group starts at record i and takes i+1
+(and i+2 for three-wide machines) while
+
+    - the class combination is legal: precomputed ``compat2[C, C]`` /
+      ``compat3[C, C, C]`` lookup matrices hold the verdict for every class
+      tuple, so a chunk is judged with a few vectorized gathers
+    - no member is a branch before the last slot (``branch_ends_group``)
+    - no member reads or overwrites a register written by an earlier
+      member (``check_dependencies``, RAW / WAW via ``dst`` / ``src1`` /
+      ``src2``)
+
+The size of the group that would start at each record depends only on that
+record and its successors, so group starts follow from a prefix scan of
+small state maps (state = records until the next group start); the last
+records of a chunk carry over as lookahead for the next.  A group takes the
+cycles of its slowest member (taken / not-taken aware).  Each group that
+issues narrower than the machine width is charged to the reason its next
+slot was refused.
+
+Usage:
+    from common.pairing_sim import PAIRING_PRESETS, simulate_pairing
+    table = load_timing_table('models/intel/pentium')
+    stats = simulate_pairing(reader, [PAIRING_PRESETS['pentium']], table, indices=True)
+    print(stats[0].ipc, stats[0].cpi, stats[0].rejection_breakdown())
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from dataclasses import dataclass, asdict, field, replace
+from itertools import permutations
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .trace import FLAG_BRANCH, FLAG_NOT_TAKEN, TimingTable, _split_chunk
+
+REJECT_REASONS = ('not_pairable', 'pipe_conflict', 'class_mismatch', 'dependency',
+                  'branch', 'end_of_trace')
+_OK, _NOT_PAIRABLE, _PIPE_CONFLICT, _CLASS_MISMATCH, _DEPENDENCY, _BRANCH, _END = range(7)
+UNPAIRED_CLASS = 'NP'
+
+
+@dataclass(frozen=True)
+class PairingRules:
+    """Issue-group rules of one superscalar (see module docstring).
+
+    Attributes:
+        name: Rule set name
+        pipes: Issue pipes, in slot order for ordered machines
+        units: Pairing class -> pipes it may issue to
+        ordered: Slot k of a group must issue to ``pipes[k]``
+        partners: Pairing class -> the only classes it may share a group with
+        branch_ends_group: A branch can only be the last member of a group
+        check_dependencies: Refuse members that depend on an earlier member
+    """
+    name: str
+    pipes: Tuple[str, ...] = ('U', 'V')
+    units: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    ordered: bool = True
+    partners: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    branch_ends_group: bool = True
+    check_dependencies: bool = True
+
+    def __post_init__(self):
+        if not 2 <= len(self.pipes) <= 3:
+            raise ValueError("PairingRules supports two- and three-wide issue")
+        for cls, pipes in self.units.items():
+            unknown = set(pipes) - set(self.pipes)
+            if unknown:
+                raise ValueError(f"Class '{cls}' uses unknown pipes {sorted(unknown)}")
+
+    def __hash__(self):
+        return hash((self.name, self.pipes, self.ordered))
+
+    @property
+    def width(self) -> int:
+        return len(self.pipes)
+
+    @property
+    def classes(self) -> List[str]:
+        """Rule classes; the last one collects everything that never pairs."""
+        return [c for c in self.units if c != UNPAIRED_CLASS] + [UNPAIRED_CLASS]
+
+    def verdict(self, members: Sequence[str]) -> int:
+        """Reason code for issuing ``members`` as one group (0 = legal)."""
+        if any(not self.units.get(c) for c in members):
+            return _NOT_PAIRABLE
+        for k, cls in enumerate(members):
+            allowed = self.partners.get(cls)
+            others = members[:k] + members[k + 1:]
+            if allowed is not None and any(o not in allowed for o in others):
+                return _CLASS_MISMATCH
+        if self.ordered:
+            legal = all(self.pipes[k] in self.units[c] for k, c in enumerate(members))
+        else:
+            legal = any(all(p in self.units[c] for p, c in zip(assignment, members))
+                        for assignment in permutations(self.pipes, len(members)))
+        return _OK if legal else _PIPE_CONFLICT
+
+    def compat_matrices(self) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Verdict lookup matrices over ``classes`` plus an end-of-trace sentinel.
+
+        Returns:
+            (compat2, compat3): (C+1, C+1) and, for three-wide rules,
+            (C+1, C+1, C+1) int8 reason codes
+        """
+        classes = self.classes
+        end = len(classes)
+        compat2 = np.full((end + 1, end + 1), _END, dtype=np.int8)
+        for a, ca in enumerate(classes):
+            for b, cb in enumerate(classes):
+                compat2[a, b] = self.verdict((ca, cb))
+        compat3 = None
+        if self.width == 3:
+            compat3 = np.full((end + 1,) * 3, _END, dtype=np.int8)
+            for a, ca in enumerate(classes):
+                for b, cb in enumerate(classes):
+                    for c, cc in enumerate(classes):
+                        compat3[a, b, c] = self.verdict((ca, cb, cc))
+        return compat2, compat3
+
+
+PAIRING_PRESETS: Dict[str, PairingRules] = {
+    'pentium': PairingRules(
+        'pentium', ('U', 'V'),
+        {'UV': ('U', 'V'), 'PU': ('U',), 'PV': ('V',), 'FP': ('U',), 'FX': ('V',)},
+        partners={'FP': ('FX',), 'FX': ('FP',)}),
+    'm68060': PairingRules(
+        'm68060', ('pOEP', 'sOEP'), {'OO': ('pOEP', 'sOEP'), 'PO': ('pOEP',)}),
+    'i960ca': PairingRules(
+        'i960ca', ('REG', 'MEM', 'CTRL'),
+        {'REG': ('REG',), 'MEM': ('MEM',), 'CTRL': ('CTRL',)}, ordered=False),
+    'i960cf': PairingRules(
+        'i960cf', ('REG', 'MEM', 'CTRL'),
+        {'REG': ('REG',), 'MEM': ('MEM',), 'CTRL': ('CTRL',)}, ordered=False),
+    # Dual-instruction mode (one core + one FP op per cycle) is under
+    # compiler control; simulating it as always-on gives the upper bound.
+    'i860': PairingRules(
+        'i860', ('core', 'fp'), {'CORE': ('core',), 'FP': ('fp',)}, ordered=False),
+}
+
+
+@dataclass
+class PairingStats:
+    """Issue-group accounting of one rule set.
+
+    Attributes:
+        rules: The simulated PairingRules
+        instructions: Records simulated
+        groups: Issue groups (cycles at one group per clock)
+        cycles: Sum over groups of the slowest member's table cycles
+        group_sizes: Groups per size (1 .. width)
+        rejections: Narrower-than-width groups per refusal reason
+        class_counts: Instructions per pairing class
+        class_paired: Instructions per class issued in multi-instruction groups
+        unknown: Records whose opcode is not in the timing table
+    """
+    rules: PairingRules
+    instructions: int = 0
+    groups: int = 0
+    cycles: float = 0.0
+    group_sizes: Dict[int, int] = field(default_factory=dict)
+    rejections: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(REJECT_REASONS, 0))
+    class_counts: Dict[str, int] = field(default_factory=dict)
+    class_paired: Dict[str, int] = field(default_factory=dict)
+    unknown: int = 0
+
+    @property
+    def ipc(self) -> float:
+        """Instructions issued per issue group."""
+        return self.instructions / self.groups if self.groups else 0.0
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    @property
+    def pair_rate(self) -> float:
+        """Fraction of instructions issued alongside another."""
+        paired = sum(self.class_paired.values())
+        return paired / self.instructions if self.instructions else 0.0
+
+    def rejection_breakdown(self) -> Dict[str, float]:
+        """Refusals per issue group, by reason."""
+        n = max(self.groups, 1)
+        return {reason: count / n for reason, count in self.rejections.items()}
+
+    def class_pair_rates(self) -> Dict[str, float]:
+        """Fraction of each class's instructions that issued in a group."""
+        return {cls: self.class_paired.get(cls, 0) / count
+                for cls, count in self.class_counts.items() if count}
+
+    def to_dict(self) -> Dict:
+        rules = asdict(self.rules)
+        rules['units'] = {k: list(v) for k, v in self.rules.units.items()}
+        return {
+            'rules': rules,
+            'instructions': self.instructions,
+            'groups': self.groups,
+            'cycles': self.cycles,
+            'ipc': self.ipc,
+            'cpi': self.cpi,
+            'pair_rate': self.pair_rate,
+            'group_sizes': {str(k): v for k, v in self.group_sizes.items()},
+            'rejections': dict(self.rejections),
+            'rejection_breakdown': self.rejection_breakdown(),
+            'class_counts': dict(self.class_counts),
+            'class_pair_rates': self.class_pair_rates(),
+            'unknown': self.unknown,
+        }
+
+
+def _group_starts(sizes: np.ndarray, state: int) -> Tuple[np.ndarray, int]:
+    """Group-start mask for a run of records, by prefix scan of state maps.
+
+    The state before a record is the number of records until the next group
+    start; a start (state 0) leaves ``sizes[i] - 1``, anything else counts
+    down.  Each record is a map over the three states and the maps compose
+    associatively (Hillis-Steele, log2(n) gathers).
+
+    Returns:
+        (starts mask, state after the last record)
+    """
+    n = len(sizes)
+    maps = np.empty((n, 3), dtype=np.int8)
+    maps[:, 0] = sizes - 1
+    maps[:, 1] = 0
+    maps[:, 2] = 1
+    composed = maps.copy()
+    step = 1
+    while step < n:
+        composed[step:] = np.take_along_axis(composed[step:], composed[:-step], axis=1)
+        step *= 2
+    before = np.empty(n, dtype=np.int8)
+    before[0] = state
+    before[1:] = composed[:-1, state]
+    return before == 0, int(composed[-1, state])
+
+
+class PairingSimulator:
+    """Streaming issue-group simulator for one rule set.
+
+    Feed record chunks with ``feed()``; the group-start state and the last
+    ``width - 1`` records (lookahead) carry across chunks and are flushed
+    by ``results()``.
+    """
+
+    _FIELDS = ('cls', 'cycles', 'branch', 'dst', 'src1', 'src2')
+
+    def __init__(self, rules: PairingRules, table: Optional[TimingTable] = None,
+                 indices: bool = False):
+        self.rules = rules
+        self.table = table
+        self.indices = indices
+        self._classes = rules.classes
+        self._compat2, self._compat3 = rules.compat_matrices()
+        self._end = len(self._classes)
+        self._class_of_pairing = None
+        if table is not None:
+            index = {name: k for k, name in enumerate(self._classes)}
+            self._class_of_pairing = np.array(
+                [index.get(name, self._end - 1) for name in table.pairing_classes] or [0],
+                dtype=np.int64)
+        self._stats = PairingStats(rules)
+        self._state = 0
+        self._tail = {name: np.zeros(0, dtype=np.int64) for name in self._FIELDS}
+
+    def _decode(self, chunk) -> Dict[str, np.ndarray]:
+        """Per-record rule class, cycles, branch flag and registers."""
+        n = len(chunk)
+        values, flags = _split_chunk(chunk)
+        flags = np.zeros(n, dtype=np.int64) if flags is None else flags.astype(np.int64)
+        names = getattr(getattr(chunk, 'dtype', None), 'names', None) or ()
+        columns = {name: (chunk[name].astype(np.int64) if name in names
+                          else np.zeros(n, dtype=np.int64))
+                   for name in ('dst', 'src1', 'src2')}
+        if not self.rules.check_dependencies:
+            columns = {name: np.zeros(n, dtype=np.int64) for name in columns}
+
+        unpaired = self._end - 1
+        if self.table is None:
+            cls = np.full(n, unpaired, dtype=np.int64)
+            cycles = np.ones(n)
+        else:
+            entries = (np.asarray(values, dtype=np.int64) if self.indices
+                       else self.table.lookup(values))
+            # Index traces store UNKNOWN_ENTRY in an unsigned field
+            known = (entries >= 0) & (entries < len(self.table))
+            self._stats.unknown += int((~known).sum())
+            safe = np.where(known, entries, 0)
+            cls = np.where(known, self._class_of_pairing[self.table.pairing_ids[safe]], unpaired)
+            cycles = np.where((flags & FLAG_NOT_TAKEN) != 0,
+                              self.table.cycles_not_taken[safe], self.table.cycles[safe])
+            cycles = np.where(known, cycles, 1.0)
+        return dict(cls=cls, cycles=cycles, branch=(flags & FLAG_BRANCH) != 0, **columns)
+
+    def _depends(self, run, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Record b reads or overwrites a register written by record a."""
+        written = run['dst'][a]
+        return (written != 0) & ((written == run['src1'][b]) | (written == run['src2'][b]) |
+                                 (written == run['dst'][b]))
+
+    def _issue(self, run: Dict[str, np.ndarray], final: bool, stats: PairingStats) -> int:
+        """Form groups over ``run``; returns how many records were consumed."""
+        m = len(run['cls'])
+        lookahead = self.rules.width - 1
+        complete = m if final else m - lookahead
+        if complete <= 0:
+            return 0
+        pos = np.arange(complete)
+        cls = np.append(run['cls'], np.full(lookahead, self._end))
+
+        def refusal(members: List[np.ndarray], verdict: np.ndarray) -> np.ndarray:
+            """Reason the last of ``members`` cannot join the earlier ones."""
+            members = [np.minimum(k, m - 1) for k in members]   # past the end: verdict _END
+            code = verdict.astype(np.int64)
+            structural = (code == _OK) | (code == _PIPE_CONFLICT)
+            if self.rules.branch_ends_group:
+                code = np.where(structural & run['branch'][members[-2]], _BRANCH, code)
+            dependent = np.zeros(complete, dtype=bool)
+            for earlier in members[:-1]:
+                dependent |= self._depends(run, earlier, members[-1])
+            return np.where((code == _OK) & dependent, _DEPENDENCY, code)
+
+        reason = refusal([pos, pos + 1], self._compat2[cls[pos], cls[pos + 1]])
+        sizes = np.where(reason == _OK, 2, 1)
+        if self.rules.width == 3:
+            third = refusal([pos, pos + 1, pos + 2],
+                            self._compat3[cls[pos], cls[pos + 1], cls[pos + 2]])
+            grow = (sizes == 2) & (third == _OK)
+            reason = np.where(sizes == 2, third, reason)
+            sizes = np.where(grow, 3, sizes)
+
+        starts_mask, self._state = _group_starts(sizes, self._state)
+        starts = np.flatnonzero(starts_mask)
+        stats.instructions += complete
+        for k, name in enumerate(self._classes):
+            count = int((run['cls'][:complete] == k).sum())
+            if count:
+                stats.class_counts[name] = stats.class_counts.get(name, 0) + count
+        if not len(starts):
+            return complete
+
+        size = sizes[starts]
+        stats.groups += len(starts)
+        end = int(starts[-1] + size[-1])
+        stats.cycles += float(np.maximum.reduceat(run['cycles'][:end], starts).sum())
+        for s, count in enumerate(np.bincount(size, minlength=self.rules.width + 1)):
+            if s and count:
+                stats.group_sizes[s] = stats.group_sizes.get(s, 0) + int(count)
+        narrow = reason[starts][size < self.rules.width]
+        for code, count in enumerate(np.bincount(narrow, minlength=_END + 1)):
+            if code and count:
+                stats.rejections[REJECT_REASONS[code - 1]] += int(count)
+        for offset in range(self.rules.width):
+            members = starts[size > max(offset, 1)] + offset
+            for k, count in enumerate(np.bincount(run['cls'][members], minlength=self._end)):
+                if count:
+                    name = self._classes[k]
+                    stats.class_paired[name] = stats.class_paired.get(name, 0) + int(count)
+        return complete
+
+    def feed(self, chunk):
+        """Form issue groups over one chunk of trace records in program order."""
+        if not len(chunk):
+            return
+        decoded = self._decode(chunk)
+        run = {name: np.concatenate([self._tail[name], decoded[name]]) for name in self._FIELDS}
+        consumed = self._issue(run, False, self._stats)
+        self._tail = {name: values[consumed:] for name, values in run.items()}
+
+    def results(self) -> PairingStats:
+        """Accumulated PairingStats, with the carried lookahead records issued."""
+        s = self._stats
+        stats = replace(s, group_sizes=dict(s.group_sizes), rejections=dict(s.rejections),
+                        class_counts=dict(s.class_counts), class_paired=dict(s.class_paired))
+        if len(self._tail['cls']):
+            state = self._state
+            self._issue(self._tail, True, stats)
+            self._state = state
+        return stats
+
+
+def simulate_pairing(chunks: Iterable, rules: Sequence[PairingRules],
+                     table: Optional[TimingTable] = None,
+                     indices: bool = False) -> List[PairingStats]:
+    """Simulate issue pairing for several rule sets over a chunked trace in one pass.
+
+    Args:
+        chunks: Trace record arrays (e.g. a ``common.tracefile.TraceReader``)
+        rules: Pairing rule sets (e.g. ``PAIRING_PRESETS`` values)
+        table: Timing table supplying pairing classes and cycles
+        indices: Record opcodes are table entry indices
+
+    Returns:
+        PairingStats per rule set, in input order
+    """
+    sims = [PairingSimulator(r, table, indices) for r in rules]
+    for chunk in chunks:
+        for sim in sims:
+            sim.feed(chunk)
+    return [sim.results() for sim in sims]
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Parallel Chunked Trace Replay
+===============================
+
+Replays one trace file through the timing-table replayer
+(``common.trace``), the cache simulator (``common.cache_sim``) and the
+branch-predictor simulator (``common.branch_sim``) in a process pool.
+
+The file's chunks are split into contiguous partitions
+(``TraceReader.partitions``).  Each worker opens the file itself, warms
+fresh simulators on the ``warmup`` records preceding its partition
+(replayed but not counted) and replays the partition.  Partition counts
+add up to the totals:
+
+    instructions, cycles, CPI   exact (the timing table has no state)
+    cache / predictor counts    exact except where the warmed-up state at a
+                                partition start differs from the state a
+                                sequential run would have there
+
+Bias estimate: at every partition start after the first, a second set of
+simulators warmed on only the last half of the warm-up also replays the
+first ``warmup`` records of the partition.  What doubling the warm-up
+gained there (hits, correct predictions) is summed over the boundaries and
+reported as a rate; the remaining cold-start bias is of that order and has
+the same sign.  Raise ``warmup`` until it is negligible.
+
+Checkpoints: with ``checkpoint_dir`` every worker saves its complete state
+(replayer counts, cache tags, predictor tables and histories, bias counts)
+every ``checkpoint_every`` chunks to ``part<NNN>.npz``.  A rerun over the
+same trace and configuration resumes each partition from its last
+checkpoint, and finished partitions are not replayed again; the result is
+identical to an uninterrupted run.
+
+Work per worker is its partition plus one warm-up, so with partitions much
+longer than the warm-up the replay scales linearly with the number of
+processes.
+
+Usage:
+    from common.parallel_replay import replay_parallel
+    result = replay_parallel('z80.trace', table,
+                             geometries=[CacheGeometry(8192, 4, 16)],
+                             predictors=[PredictorConfig('bimodal', 10)],
+                             warmup=200_000, checkpoint_dir='ckpt/')
+    print(result.trace.cpi, result.cache[0].hit_rate, result.cache_bias)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .branch_sim import BranchSimulator, BranchStats, PredictorConfig, branch_stream
+from .cache_sim import CacheGeometry, CacheSimulator, CacheStats, memory_accesses
+from .trace import TimingTable, TraceReplayer, TraceResult
+
+DEFAULT_WARMUP = 100_000
+DEFAULT_CHECKPOINT_EVERY = 16
+
+
+@dataclass
+class PartitionResult:
+    """Counts of one partition (records ``start`` .. ``stop - 1``).
+
+    ``cache_bias`` / ``branch_bias`` are the hits / correct predictions
+    gained at the partition start by doubling the warm-up.
+    """
+    index: int
+    start: int
+    stop: int
+    warmup: int
+    replayer: Optional[Dict[str, np.ndarray]]
+    cache: List[CacheStats]
+    branch: List[BranchStats]
+    cache_bias: List[int]
+    branch_bias: List[int]
+    resumed: bool = False
+
+
+@dataclass
+class ParallelReplayResult:
+    """Merged result of a parallel replay.
+
+    Attributes:
+        instructions: Records replayed (the whole trace)
+        partitions: Number of partitions
+        warmup: Warm-up records replayed in total (not counted)
+        trace: Timing-table result (None without a table)
+        cache: CacheStats per geometry
+        branch: BranchStats per predictor
+        cache_bias: Estimated remaining cold-start bias of each hit rate
+        branch_bias: Estimated remaining cold-start bias of each accuracy
+        resumed: Partitions continued from a checkpoint
+    """
+    instructions: int
+    partitions: int
+    warmup: int
+    trace: Optional[TraceResult] = None
+    cache: List[CacheStats] = field(default_factory=list)
+    branch: List[BranchStats] = field(default_factory=list)
+    cache_bias: Dict[str, float] = field(default_factory=dict)
+    branch_bias: Dict[str, float] = field(default_factory=dict)
+    resumed: int = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            'instructions': self.instructions,
+            'partitions': self.partitions,
+            'warmup': self.warmup,
+            'resumed': self.resumed,
+            'trace': self.trace.to_dict() if self.trace is not None else None,
+            'cache': [s.to_dict() for s in self.cache],
+            'branch': [s.to_dict() for s in self.branch],
+            'cache_bias': dict(self.cache_bias),
+            'branch_bias': dict(self.branch_bias),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Checkpoints
+# ---------------------------------------------------------------------------
+
+def _fingerprint(reader, table: Optional[TimingTable], geometries: Sequence[CacheGeometry],
+                 predictors: Sequence[PredictorConfig], kind: str, warmup: int,
+                 bounds: Tuple[int, int]) -> str:
+    """Identifies a partition's work, so stale checkpoints are ignored."""
+    key = json.dumps({
+        'records': reader.n_records, 'chunks': reader.n_chunks,
+        'metadata': reader.metadata,
+        'table': table.processor if table is not None else None,
+        'entries': len(table) if table is not None else 0,
+        'geometries': [g.label for g in geometries],
+        'predictors': [p.label for p in predictors],
+        'kind': kind, 'warmup': warmup, 'bounds': list(bounds),
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def save_checkpoint(path: Union[str, Path], meta: Dict, replayer: Optional[TraceReplayer],
+                    caches: Optional[CacheSimulator], branches: Optional[BranchSimulator]):
+    """Write simulator states and ``meta`` to one .npz file (atomically)."""
+    arrays = {'meta': np.array(json.dumps(meta))}
+    for prefix, sim in (('replayer', replayer), ('cache', caches), ('branch', branches)):
+        if sim is not None:
+            arrays.update({f'{prefix}/{k}': v for k, v in sim.state().items()})
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Union[str, Path]) -> Tuple[Dict, Dict[str, Dict[str, np.ndarray]]]:
+    """Read a checkpoint: (meta, {'replayer' | 'cache' | 'branch': state})."""
+    states: Dict[str, Dict[str, np.ndarray]] = {}
+    with np.load(path) as data:
+        meta = json.loads(str(data['meta']))
+        for key in data.files:
+            if '/' in key:
+                prefix, name = key.split('/', 1)
+                states.setdefault(prefix, {})[name] = data[key]
+    return meta, states
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _simulators(geometries: Sequence[CacheGeometry], predictors: Sequence[PredictorConfig],
+                seed: Optional[int]) -> Tuple[Optional[CacheSimulator], Optional[BranchSimulator]]:
+    return (CacheSimulator(geometries, seed) if geometries else None,
+            BranchSimulator(predictors) if predictors else None)
+
+
+def _feed(records: np.ndarray, replayer: Optional[TraceReplayer],
+          caches: Optional[CacheSimulator], branches: Optional[BranchSimulator], kind: str):
+    if replayer is not None:
+        replayer.update(records['opcode'], records['flags'])
+    if caches is not None:
+        caches.feed(*memory_accesses(records, kind))
+    if branches is not None:
+        branches.feed(*branch_stream(records))
+
+
+def _counts(caches: Optional[CacheSimulator],
+            branches: Optional[BranchSimulator]) -> Tuple[List[List[int]], List[List[int]]]:
+    """Raw counters of both simulators, as JSON-friendly lists."""
+    cache = ([[s.reads, s.read_hits, s.writes, s.write_hits] for s in caches.results()]
+             if caches is not None else [])
+    branch = ([[s.branches, s.correct, s.taken, s.btb_lookups, s.btb_hits]
+               for s in branches.results()] if branches is not None else [])
+    return cache, branch
+
+
+def _head_gain(head: np.ndarray, caches: Optional[CacheSimulator],
+               branches: Optional[BranchSimulator], kind: str) -> Tuple[List[int], List[int]]:
+    """Cache hits and correct predictions the simulators score on ``head``."""
+    before = _counts(caches, branches)
+    _feed(head, None, caches, branches, kind)
+    after = _counts(caches, branches)
+    return ([a[1] + a[3] - b[1] - b[3] for a, b in zip(after[0], before[0])],
+            [a[1] - b[1] for a, b in zip(after[1], before[1])])
+
+
+def _boundary_bias(reader, start: int, stop: int, prefix: np.ndarray,
+                   caches: Optional[CacheSimulator], branches: Optional[BranchSimulator],
+                   geometries: Sequence[CacheGeometry], predictors: Sequence[PredictorConfig],
+                   kind: str, seed: Optional[int]) -> Tuple[List[int], List[int]]:
+    """What warming on all of ``prefix`` instead of its second half gains on the partition head."""
+    head = reader.read(start, min(len(prefix), stop - start))
+    full = _simulators(geometries, predictors, seed)
+    for clone, sim in zip(full, (caches, branches)):
+        if sim is not None:
+            clone.set_state(sim.state())
+    half = _simulators(geometries, predictors, seed)
+    _feed(prefix[len(prefix) // 2:], None, *half, kind)
+    full_gain, half_gain = _head_gain(head, *full, kind), _head_gain(head, *half, kind)
+    return ([f - h for f, h in zip(full_gain[0], half_gain[0])],
+            [f - h for f, h in zip(full_gain[1], half_gain[1])])
+
+
+def replay_partition(path: str, index: int, chunks: Tuple[int, int],
+                     table: Optional[TimingTable], geometries: Sequence[CacheGeometry],
+                     predictors: Sequence[PredictorConfig], kind: str = 'data',
+                     warmup: int = DEFAULT_WARMUP, checkpoint_dir: Optional[str] = None,
+                     checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+                     seed: Optional[int] = 0) -> PartitionResult:
+    """Replay chunks ``chunks[0]`` .. ``chunks[1] - 1`` after a warm-up (worker process)."""
+    from .tracefile import TraceReader
+
+    first, stop_chunk = chunks
+    with TraceReader(path) as reader:
+        start = int(reader.index['first_record'][first])
+        stop = (int(reader.index['first_record'][stop_chunk])
+                if stop_chunk < reader.n_chunks else reader.n_records)
+        warm = min(warmup, start)
+        replayer = TraceReplayer(table) if table is not None else None
+        caches, branches = _simulators(geometries, predictors, seed)
+
+        checkpoint = Path(checkpoint_dir) / f"part{index:03d}.npz" if checkpoint_dir else None
+        fingerprint = _fingerprint(reader, table, geometries, predictors, kind, warmup, chunks)
+        meta = None
+        if checkpoint is not None and checkpoint.exists():
+            saved, states = load_checkpoint(checkpoint)
+            if saved.get('fingerprint') == fingerprint:
+                meta = saved
+                for sim, prefix in ((replayer, 'replayer'), (caches, 'cache'), (branches, 'branch')):
+                    if sim is not None:
+                        sim.set_state(states[prefix])
+        resumed = meta is not None
+
+        if not resumed:
+            meta = {'fingerprint': fingerprint, 'next_chunk': first, 'done': False,
+                    'cache_bias': [0] * len(geometries), 'branch_bias': [0] * len(predictors)}
+            if warm:
+                prefix = reader.read(start - warm, warm)
+                _feed(prefix, None, caches, branches, kind)
+                meta['cache_bias'], meta['branch_bias'] = _boundary_bias(
+                    reader, start, stop, prefix, caches, branches, geometries, predictors,
+                    kind, seed)
+            # Counters after the warm-up, subtracted from the final counts
+            meta['cache_base'], meta['branch_base'] = _counts(caches, branches)
+
+        for i in range(meta['next_chunk'], stop_chunk):
+            _feed(reader.chunk(i), replayer, caches, branches, kind)
+            if (checkpoint is not None and i + 1 < stop_chunk
+                    and (i + 1 - first) % checkpoint_every == 0):
+                meta['next_chunk'] = i + 1
+                save_checkpoint(checkpoint, meta, replayer, caches, branches)
+        if checkpoint is not None and not meta['done']:
+            meta.update(next_chunk=stop_chunk, done=True)
+            save_checkpoint(checkpoint, meta, replayer, caches, branches)
+
+        cache_counts, branch_counts = _counts(caches, branches)
+        return PartitionResult(
+            index=index, start=start, stop=stop, warmup=warm,
+            replayer=replayer.state() if replayer is not None else None,
+            cache=[CacheStats(g, *(a - b for a, b in zip(now, base)))
+                   for g, now, base in zip(geometries, cache_counts, meta['cache_base'])],
+            branch=[BranchStats(p, *(a - b for a, b in zip(now, base)))
+                    for p, now, base in zip(predictors, branch_counts, meta['branch_base'])],
+            cache_bias=list(meta['cache_bias']), branch_bias=list(meta['branch_bias']),
+            resumed=resumed,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+def merge_partitions(results: Sequence[PartitionResult], table: Optional[TimingTable],
+                     geometries: Sequence[CacheGeometry],
+                     predictors: Sequence[PredictorConfig]) -> ParallelReplayResult:
+    """Add partition counts into trace totals and bias rates."""
+    results = sorted(results, key=lambda r: r.index)
+    merged = ParallelReplayResult(
+        instructions=sum(r.stop - r.start for r in results),
+        partitions=len(results),
+        warmup=sum(r.warmup for r in results),
+        resumed=sum(r.resumed for r in results),
+    )
+    if table is not None:
+        replayer = TraceReplayer(table)
+        replayer.set_state({key: sum(r.replayer[key] for r in results)
+                            for key in ('counts', 'not_taken')})
+        merged.trace = replayer.result()
+    for g, geometry in enumerate(geometries):
+        stats = CacheStats(geometry)
+        for r in results:
+            s = r.cache[g]
+            stats.reads += s.reads
+            stats.read_hits += s.read_hits
+            stats.writes += s.writes
+            stats.write_hits += s.write_hits
+        merged.cache.append(stats)
+        bias = sum(r.cache_bias[g] for r in results)
+        merged.cache_bias[geometry.label] = bias / stats.accesses if stats.accesses else 0.0
+    for p, config in enumerate(predictors):
+        stats = BranchStats(config)
+        for r in results:
+            s = r.branch[p]
+            stats.branches += s.branches
+            stats.correct += s.correct
+            stats.taken += s.taken
+            stats.btb_lookups += s.btb_lookups
+            stats.btb_hits += s.btb_hits
+        merged.branch.append(stats)
+        bias = sum(r.branch_bias[p] for r in results)
+        merged.branch_bias[config.label] = bias / stats.branches if stats.branches else 0.0
+    return merged
+
+
+def replay_parallel(path: Union[str, Path], table: Optional[TimingTable] = None,
+                    geometries: Sequence[CacheGeometry] = (),
+                    predictors: Sequence[PredictorConfig] = (),
+                    kind: str = 'data', warmup: int = DEFAULT_WARMUP,
+                    partitions: Optional[int] = None, workers: Optional[int] = None,
+                    checkpoint_dir: Optional[Union[str, Path]] = None,
+                    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+                    seed: Optional[int] = 0) -> ParallelReplayResult:
+    """Replay a trace file through the table, cache and branch engines in parallel.
+
+    Args:
+        path: Trace file (``common.tracefile``)
+        table: Timing table for CPI (None = no CPI)
+        geometries: Cache organizations to simulate
+        predictors: Branch predictors to simulate
+        kind: Cache access kind ('data', 'instruction', 'unified')
+        warmup: Records replayed uncounted before each partition
+        partitions: Number of partitions (default: ``workers``)
+        workers: Worker processes (default: CPU count)
+        checkpoint_dir: Directory for resumable per-partition checkpoints
+        checkpoint_every: Chunks between checkpoints
+        seed: Seed for random cache replacement
+
+    Returns:
+        ParallelReplayResult
+    """
+    from .tracefile import TraceReader
+
+    workers = workers or os.cpu_count() or 1
+    with TraceReader(path) as reader:
+        bounds = reader.partitions(partitions or workers)
+    if checkpoint_dir is not None:
+        Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+        checkpoint_dir = str(checkpoint_dir)
+
+    geometries, predictors = list(geometries), list(predictors)
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(bounds), 1))) as pool:
+        futures = [pool.submit(replay_partition, str(path), i, b, table, geometries, predictors,
+                               kind, warmup, checkpoint_dir, checkpoint_every, seed)
+                   for i, b in enumerate(bounds)]
+        results = [f.result() for f in futures]
+    return merge_partitions(results, table, geometries, predictors)
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Trace-Driven In-Order Pipeline Hazard Simulator
+=================================================
+
+Scoreboard simulation of classic single-issue pipelines (IF ID EX MEM WB
+and relatives) over ``common.tracefile`` records, replacing the flat
+load-use / branch penalties of the RISC models with measured stalls.
+
+Records supply the hazards: ``dst`` / ``src1`` / ``src2`` register ids
+(0 = none) give the data dependencies, FLAG_MEM_READ / FLAG_MEM_WRITE mark
+loads and stores, FLAG_BRANCH / FLAG_TAKEN mark control transfers.  With a
+timing table, ALU-class instructions listed with more than one cycle
+(multiply, divide) occupy EX for the extra cycles.
+
+Per PipelineConfig:
+
+    forwarding          'full' (EX->EX and MEM->EX bypasses), 'alu' (EX->EX
+                        only) or 'none' (results through the register file,
+                        written in the first half of WB)
+    load_delay          cycles after EX until a load's data can be bypassed
+    interlocked         False: hazards are the compiler's job (MIPS load
+                        delay slots) -- no data stalls are inserted and
+                        dependents inside the delay count as violations
+    branch_resolve      fetch slots until a branch's target is known
+    branch_delay_slots  architectural delay slots (their instructions are in
+                        the trace; they hide that many fetch slots)
+    branch_policy       'not_taken' (only taken branches pay) or 'stall'
+    branch_operands_in_id
+                        branches compare in ID and need operands a cycle
+                        early (MIPS)
+    load_busy / store_busy
+                        extra cycles a memory access holds the pipeline
+
+Timing is the recurrence over EX issue times
+
+    t[i] = max(t[i-1] + 1 + bubble[i-1],  t[j] + latency[j] - (i - j) ... )
+
+for the last writer ``j`` of each source.  Bubbles (control and structural)
+do not depend on the schedule, so with u[i] = t[i] - i the chain term is a
+prefix sum and the data terms reach back only a bounded dependency
+window.  That makes the recurrence linear in the max-plus semiring; it is
+solved exactly by composing per-record transition matrices blockwise
+(``_issue_offsets``), so results are exact, not approximations.  Register
+ready times and the last issue time carry across chunks.
+
+Reported cycles are instructions plus stalls (steady state; pipeline fill
+is not counted).  Stalls are broken down by cause and attributed to the
+class of the instruction responsible (the producing load, the branch, ...),
+which gives per-class effective cycles to calibrate a model's categories.
+
+Usage:
+    from common.pipeline_sim import PIPELINE_PRESETS, simulate_pipeline
+    stats = simulate_pipeline(reader, [PIPELINE_PRESETS['mips_r3000'],
+                                       PIPELINE_PRESETS['classic5']])
+    print(stats[0].cpi, stats[0].stall_breakdown(), stats[0].class_cycles())
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from dataclasses import dataclass, asdict, field, replace
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .base_model import BranchPredictionConfig
+from .trace import (FLAG_BRANCH, FLAG_MEM_READ, FLAG_MEM_WRITE, FLAG_TAKEN,
+                    TimingTable, _split_chunk)
+
+FORWARDING_MODES = ('full', 'alu', 'none')
+BRANCH_POLICIES = ('not_taken', 'stall')
+STALL_CAUSES = ('load_use', 'raw', 'multicycle', 'branch', 'structural')
+INSTRUCTION_CLASSES = ('alu', 'load', 'store', 'branch', 'multicycle')
+_ALU, _LOAD, _STORE, _BRANCH, _MULTI = range(5)
+_N_REGISTERS = 256
+_NEG = -(1 << 40)        # max-plus 'minus infinity'
+_BLOCK = 256
+
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """One in-order pipeline organization (see module docstring)."""
+    name: str = 'classic5'
+    stages: int = 5
+    ex_stage: int = 2
+    forwarding: str = 'full'
+    load_delay: int = 1
+    interlocked: bool = True
+    branch_resolve: int = 1
+    branch_delay_slots: int = 1
+    branch_policy: str = 'not_taken'
+    branch_operands_in_id: bool = False
+    load_busy: int = 0
+    store_busy: int = 0
+    multicycle: bool = True
+
+    def __post_init__(self):
+        if self.forwarding not in FORWARDING_MODES:
+            raise ValueError(f"Unknown forwarding '{self.forwarding}'; expected one of {FORWARDING_MODES}")
+        if self.branch_policy not in BRANCH_POLICIES:
+            raise ValueError(f"Unknown branch policy '{self.branch_policy}'")
+        if not 0 < self.ex_stage < self.stages:
+            raise ValueError("ex_stage must lie inside the pipeline")
+
+    @property
+    def register_file_latency(self) -> int:
+        """Issue distance at which a result can be read from the register file."""
+        return self.stages - self.ex_stage
+
+    @property
+    def alu_latency(self) -> int:
+        return 1 if self.forwarding != 'none' else self.register_file_latency
+
+    @property
+    def load_latency(self) -> int:
+        if self.forwarding == 'full':
+            return 1 + self.load_delay
+        return max(self.register_file_latency, 1 + self.load_delay)
+
+    @property
+    def branch_penalty(self) -> int:
+        """Bubbles after a branch that has to wait for its target."""
+        return max(0, self.branch_resolve - self.branch_delay_slots)
+
+
+PIPELINE_PRESETS: Dict[str, PipelineConfig] = {
+    'classic5': PipelineConfig('classic5'),
+    'classic5_no_forwarding': PipelineConfig('classic5_no_forwarding', forwarding='none'),
+    'stanford_mips': PipelineConfig('stanford_mips', interlocked=False,
+                                    branch_operands_in_id=True),
+    'r2000': PipelineConfig('r2000', interlocked=False, branch_operands_in_id=True),
+    'mips_r3000': PipelineConfig('mips_r3000', interlocked=False, branch_operands_in_id=True),
+    'mips_r4000': PipelineConfig('mips_r4000', stages=8, ex_stage=3, load_delay=2,
+                                 branch_resolve=3),
+    'berkeley_risc1': PipelineConfig('berkeley_risc1', stages=2, ex_stage=1,
+                                     branch_resolve=1, load_busy=1, store_busy=1),
+    'berkeley_risc2': PipelineConfig('berkeley_risc2', stages=3, ex_stage=2,
+                                     branch_resolve=2, load_busy=1, store_busy=1),
+    'sparc': PipelineConfig('sparc', stages=4, ex_stage=2, load_busy=1, store_busy=2),
+    'arm2': PipelineConfig('arm2', stages=3, ex_stage=2, branch_resolve=2,
+                           branch_delay_slots=0, load_busy=2, store_busy=1),
+}
+
+
+@dataclass
+class PipelineStats:
+    """Stall accounting of one pipeline configuration.
+
+    Attributes:
+        config: The simulated PipelineConfig
+        instructions: Records simulated
+        stalls: Stall cycles per cause (STALL_CAUSES)
+        class_counts: Instructions per class (INSTRUCTION_CLASSES)
+        class_stalls: Stall cycles attributed to each class
+        taken_branches: Taken branches
+        violations: Unenforced hazards (non-interlocked pipelines)
+    """
+    config: PipelineConfig
+    instructions: int = 0
+    stalls: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(STALL_CAUSES, 0))
+    class_counts: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(INSTRUCTION_CLASSES, 0))
+    class_stalls: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(INSTRUCTION_CLASSES, 0))
+    taken_branches: int = 0
+    violations: int = 0
+
+    @property
+    def cycles(self) -> int:
+        return self.instructions + sum(self.stalls.values())
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    def stall_breakdown(self) -> Dict[str, float]:
+        """Stall cycles per instruction, by cause."""
+        n = max(self.instructions, 1)
+        return {cause: cycles / n for cause, cycles in self.stalls.items()}
+
+    def class_cycles(self) -> Dict[str, float]:
+        """Effective cycles per instruction of each class (1 + attributed stalls)."""
+        return {cls: 1.0 + self.class_stalls[cls] / count
+                for cls, count in self.class_counts.items() if count}
+
+    def to_dict(self) -> Dict:
+        return {
+            'config': asdict(self.config),
+            'instructions': self.instructions,
+            'cycles': self.cycles,
+            'cpi': self.cpi,
+            'stalls': dict(self.stalls),
+            'stall_breakdown': self.stall_breakdown(),
+            'class_counts': dict(self.class_counts),
+            'class_cycles': self.class_cycles(),
+            'taken_branches': self.taken_branches,
+            'violations': self.violations,
+        }
+
+
+def _issue_offsets(u_last: int, bubble_in: np.ndarray, weights: np.ndarray,
+                   carried: np.ndarray) -> np.ndarray:
+    """Solve u[i] = max(u[i-1] + bubble_in[i], u[i-d] + weights[i, d-1], carried[i]).
+
+    The recurrence is linear in the max-plus semiring over the state
+    (u[i], .., u[i-D+1], 0).  Each block of ``_BLOCK`` records composes its
+    transition matrices position by position, vectorized across blocks;
+    a short sequential pass over the block totals then gives every block's
+    entry state, and one product per record gives u exactly.
+    """
+    n, depth = weights.shape
+    size = depth + 1
+    n_blocks = -(-n // _BLOCK)
+    rows = np.full((n_blocks * _BLOCK, size), _NEG, dtype=np.int64)
+    rows[:n, :depth] = weights
+    rows[:n, 0] = np.maximum(weights[:, 0], bubble_in)
+    rows[:n, depth] = carried
+    rows[n:, 0] = 0                                  # padding: u[i] = u[i-1]
+    rows = rows.reshape(n_blocks, _BLOCK, size)
+
+    product = np.full((n_blocks, size, size), _NEG, dtype=np.int64)
+    product[:, np.arange(size), np.arange(size)] = 0
+    first_rows = np.empty((_BLOCK, n_blocks, size), dtype=np.int64)
+    for k in range(_BLOCK):
+        top = (rows[:, k, :, np.newaxis] + product).max(axis=1)
+        product[:, 1:depth, :] = product[:, 0:depth - 1, :].copy()
+        product[:, 0, :] = np.maximum(top, _NEG)
+        first_rows[k] = product[:, 0, :]
+
+    state = np.full(size, _NEG, dtype=np.int64)
+    state[0], state[depth] = u_last, 0
+    entry = np.empty((n_blocks, size), dtype=np.int64)
+    for b in range(n_blocks):
+        entry[b] = state
+        state = np.maximum((product[b] + state).max(axis=1), _NEG)
+    u = (first_rows + entry[np.newaxis]).max(axis=2)
+    return u.T.reshape(-1)[:n]
+
+
+class PipelineSimulator:
+    """Streaming hazard simulator for one pipeline configuration.
+
+    Feed record chunks with ``feed()``; register ready times and the issue
+    time of the last instruction persist across chunks.
+    """
+
+    def __init__(self, config: PipelineConfig, table: Optional[TimingTable] = None,
+                 indices: bool = False):
+        self.config = config
+        self.table = table
+        self.indices = indices
+        self._stats = PipelineStats(config)
+        self._position = 0               # global index of the next record
+        self._u = 0                      # t - index of the last record
+        self._bubble = 0                 # bubbles after the last record
+        self._ready = np.full(_N_REGISTERS, _NEG, dtype=np.int64)
+        self._ready_class = np.zeros(_N_REGISTERS, dtype=np.int64)
+
+    def _busy_cycles(self, chunk, n: int) -> np.ndarray:
+        """Extra EX cycles of multi-cycle ALU instructions (from the table)."""
+        if self.table is None or not self.config.multicycle:
+            return np.zeros(n, dtype=np.int64)
+        values, _ = _split_chunk(chunk)
+        entries = np.asarray(values, dtype=np.int64) if self.indices else self.table.lookup(values)
+        # Index traces store UNKNOWN_ENTRY in an unsigned field
+        known = (entries >= 0) & (entries < len(self.table))
+        cycles = np.where(known, self.table.cycles[np.where(known, entries, 0)], 1)
+        return np.maximum(np.ceil(cycles).astype(np.int64) - 1, 0)
+
+    def feed(self, chunk):
+        """Simulate one chunk of trace records in program order."""
+        n = len(chunk)
+        if not n:
+            return
+        cfg = self.config
+        flags = chunk['flags'].astype(np.int64)
+        dst = chunk['dst'].astype(np.int64)
+        sources = (chunk['src1'].astype(np.int64), chunk['src2'].astype(np.int64))
+        is_store = (flags & FLAG_MEM_WRITE) != 0
+        is_load = ((flags & FLAG_MEM_READ) != 0) & ~is_store
+        is_branch = (flags & FLAG_BRANCH) != 0
+        taken = is_branch & ((flags & FLAG_TAKEN) != 0)
+
+        busy = np.where(is_load | is_store | is_branch, 0, self._busy_cycles(chunk, n))
+        klass = np.full(n, _ALU, dtype=np.int64)
+        klass[busy > 0] = _MULTI
+        klass[is_branch] = _BRANCH
+        klass[is_store] = _STORE
+        klass[is_load] = _LOAD
+        busy = busy + np.where(is_load, cfg.load_busy, 0) + np.where(is_store, cfg.store_busy, 0)
+
+        paying = taken if cfg.branch_policy == 'not_taken' else is_branch
+        control = np.where(paying, cfg.branch_penalty, 0)
+        bubble = busy + control
+        latency = np.where(is_load, cfg.load_latency, cfg.alu_latency) + busy
+        early = np.where(is_branch, int(cfg.branch_operands_in_id), 0)
+
+        index = self._position + np.arange(n)
+        # Bubbles in front of each record (the first one's come from the previous chunk)
+        bubble_in = np.empty(n, dtype=np.int64)
+        bubble_in[0] = self._bubble
+        bubble_in[1:] = bubble[:-1]
+
+        # Last writer of each source inside the chunk (searchsorted on reg * n + pos)
+        writers = np.flatnonzero(dst)
+        keys = np.sort(dst[writers] * n + writers)
+        producers = []
+        for src in sources:
+            at = np.searchsorted(keys, src * n + np.arange(n), side='left') - 1
+            key = keys[np.maximum(at, 0)] if len(keys) else np.zeros(n, dtype=np.int64)
+            found = (src > 0) & (at >= 0) & (key // n == src)
+            producers.append((src, np.where(found, key % n, -1)))
+
+        def data_bound(u: np.ndarray):
+            """Earliest u[i] allowed by each record's sources, and the binding class."""
+            bound = np.full(n, _NEG, dtype=np.int64)
+            cause = np.full(n, -1, dtype=np.int64)
+            for src, producer in producers:
+                inside = producer >= 0
+                j = np.maximum(producer, 0)
+                value = np.where(inside, u[j] + latency[j] - (np.arange(n) - j),
+                                 self._ready[src] - index)
+                value = np.where(src > 0, value + early, _NEG)
+                who = np.where(inside, klass[j], self._ready_class[src])
+                better = value > bound
+                bound = np.where(better, value, bound)
+                cause = np.where(better, who, cause)
+            return bound, cause
+
+        chain = self._u + np.cumsum(bubble_in)
+        if cfg.interlocked:
+            # Only producers closer than the longest bypass latency can bind
+            window = max(cfg.load_latency, cfg.alu_latency) + int(cfg.branch_operands_in_id) - 1
+            window = max(window, 1)
+            weights = np.full((n, window), _NEG, dtype=np.int64)
+            carried = np.full(n, _NEG, dtype=np.int64)
+            for src, producer in producers:
+                distance = np.arange(n) - producer
+                near = (producer >= 0) & (distance <= window)
+                rows = np.flatnonzero(near)
+                d = distance[rows]
+                np.maximum.at(weights, (rows, d - 1),
+                              latency[producer[rows]] - d + early[rows])
+                far = (src > 0) & (producer < 0)
+                carried = np.where(far, np.maximum(carried, self._ready[src] - index + early),
+                                   carried)
+            u = _issue_offsets(self._u, bubble_in, weights, carried)
+            bound, cause = data_bound(u)
+        else:
+            u = chain
+            bound, cause = data_bound(u)
+            self._stats.violations += int((bound > u).sum())
+            cause = np.full(n, -1, dtype=np.int64)
+
+        # Data stall in front of each record, and who caused it
+        before = np.empty(n, dtype=np.int64)
+        before[0] = u[0] - self._u - self._bubble
+        before[1:] = u[1:] - u[:-1] - bubble[:-1]
+        stalled = before > 0
+        stats = self._stats
+        blame = np.where(stalled, cause, -1)
+        for cls, name in ((_LOAD, 'load_use'), (_MULTI, 'multicycle')):
+            stats.stalls[name] += int(before[blame == cls].sum())
+        stats.stalls['raw'] += int(before[stalled & (blame != _LOAD) & (blame != _MULTI)].sum())
+        stats.stalls['branch'] += int(control.sum())
+        stats.stalls['structural'] += int(busy.sum())
+
+        for cls, name in enumerate(INSTRUCTION_CLASSES):
+            stats.class_counts[name] += int((klass == cls).sum())
+            stats.class_stalls[name] += int(bubble[klass == cls].sum())
+            stats.class_stalls[name] += int(before[stalled & (blame == cls)].sum())
+        stats.instructions += n
+        stats.taken_branches += int(taken.sum())
+
+        # Carry register ready times (absolute issue cycles) to the next chunk
+        if len(writers):
+            order = np.argsort(dst[writers], kind='stable')
+            w = writers[order]
+            last = np.append(dst[w][1:] != dst[w][:-1], True)
+            w = w[last]
+            self._ready[dst[w]] = index[w] + u[w] + latency[w]
+            self._ready_class[dst[w]] = klass[w]
+        self._u = int(u[-1])
+        self._bubble = int(bubble[-1])
+        self._position += n
+
+    def results(self) -> PipelineStats:
+        """Copy of the accumulated PipelineStats."""
+        s = self._stats
+        return replace(s, stalls=dict(s.stalls), class_counts=dict(s.class_counts),
+                       class_stalls=dict(s.class_stalls))
+
+
+def simulate_pipeline(chunks: Iterable, configs: Sequence[PipelineConfig],
+                      table: Optional[TimingTable] = None,
+                      indices: bool = False) -> List[PipelineStats]:
+    """Simulate pipeline configurations over a chunked trace in one pass.
+
+    Args:
+        chunks: Trace record arrays (e.g. a ``common.tracefile.TraceReader``)
+        configs: Pipeline organizations
+        table: Optional timing table for multi-cycle EX instructions
+        indices: Record opcodes are table entry indices
+
+    Returns:
+        PipelineStats per configuration, in input order
+    """
+    sims = [PipelineSimulator(c, table, indices) for c in configs]
+    for chunk in chunks:
+        for sim in sims:
+            sim.feed(chunk)
+    return [sim.results() for sim in sims]
+
+
+def derive_branch_config(stats: PipelineStats) -> BranchPredictionConfig:
+    """BranchPredictionConfig equivalent to a simulated branch policy.
+
+    A 'not_taken' pipeline mispredicts exactly the taken branches and pays
+    ``branch_penalty`` bubbles for each; 'stall' pipelines pay on every
+    branch (accuracy 0).
+    """
+    cfg = stats.config
+    branches = stats.class_counts['branch']
+    accuracy = 0.0
+    if cfg.branch_policy == 'not_taken' and branches:
+        accuracy = 1.0 - stats.taken_branches / branches
+    return BranchPredictionConfig(
+        has_branch_prediction=True,
+        predict_accuracy=accuracy,
+        pipeline_depth=cfg.branch_penalty,
+        taken_cycles=1.0,
+    )
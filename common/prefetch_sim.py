@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Prefetch-Queue / Bus-Interface Co-Simulation
+==============================================
+
+Bus interface unit (BIU) / execution unit (EU) simulation of the
+8086-class prefetch-queue processors (8086/8088, 80186/80188, V20/V30 and
+their clones), measuring the queue starvation that ``QueueingModel``
+otherwise estimates from three fixed fullness thresholds.
+
+The machine, per BusInterfaceConfig:
+
+    BIU     fetches ``bus_bytes`` per bus cycle of ``bus_cycle +
+            wait_states`` clocks, back to back, whenever at least
+            ``bus_bytes`` of the ``queue_bytes`` queue are free and the EU
+            has no data transfer pending
+    EU      takes an instruction's bytes from the queue as they arrive,
+            then runs for its documented clock count; the documented count
+            includes its data transfers at ``bus_cycle`` clocks each, which
+            are issued at the end of execution and wait for an in-flight
+            prefetch to complete (8088 words take two bus cycles)
+    jumps   flush the queue; the target fetch starts ``jump_overlap``
+            clocks before the jump completes (the refill the documented
+            jump timings already include)
+
+Instruction streams are drawn from a workload mix over a timing table's
+entries (lengths, clocks and bus transfers per entry).  The simulation is
+exact to the clock but event-stepped: between two EU events (an
+instruction's start and end) the BIU's progress has a closed form, so one
+step advances a whole instruction.  Steps are vectorized across workloads,
+so thousands of mixes run side by side in one pass.
+
+Usage:
+    from common.prefetch_sim import PrefetchQueueSimulator
+    sim = PrefetchQueueSimulator.from_model('models/intel/i8088')
+    result = sim.simulate(['typical', {'alu': 0.6, 'control': 0.4}])
+    print(result.cpi, result.starvation_share, result.starved_fraction)
+
+    # As the prefetch stage of a QueueingModel
+    model = QueueingModel(4.77, categories, bus_width=8, prefetch_depth=4,
+                          prefetch_simulator=sim)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .trace import find_timing_file
+
+DEFAULT_INSTRUCTIONS = 4096
+DEFAULT_TAKEN_RATE = 0.6
+
+_CONDITIONAL = ('J', 'LOOP', 'BC', 'BN', 'BV', 'BE', 'BL', 'BP')
+_UNCONDITIONAL = ('JMP', 'CALL', 'RET', 'INT', 'IRET', 'BR', 'DBNZ')
+
+# Data bus transfers (words) that are implicit in the instruction
+_IMPLICIT_TRANSFERS = {
+    'PUSH': 1, 'POP': 1, 'PUSHF': 1, 'POPF': 1, 'XLAT': 1, 'IN': 1, 'OUT': 1,
+    'LDS': 2, 'LES': 2, 'MOVS': 2, 'CMPS': 2, 'SCAS': 1, 'LODS': 1, 'STOS': 1,
+    'INS': 2, 'OUTS': 2, 'CALL': 1, 'RET': 1, 'INT': 5, 'INTO': 5, 'IRET': 3,
+    'PUSHA': 8, 'POPA': 8, 'ENTER': 2, 'LEAVE': 1,
+}
+
+
+@dataclass(frozen=True)
+class BusInterfaceConfig:
+    """Bus interface of one prefetch-queue processor (see module docstring)."""
+    name: str = 'i8086'
+    queue_bytes: int = 6
+    bus_bytes: int = 2
+    bus_cycle: int = 4
+    wait_states: int = 0
+    jump_overlap: int = 8
+
+    def __post_init__(self):
+        if self.queue_bytes < 2 * self.bus_bytes:
+            raise ValueError("queue_bytes must hold at least two bus fetches")
+
+    @property
+    def fetch_clocks(self) -> int:
+        return self.bus_cycle + self.wait_states
+
+
+PREFETCH_PRESETS: Dict[str, BusInterfaceConfig] = {
+    'i8086': BusInterfaceConfig('i8086', 6, 2),
+    'i8088': BusInterfaceConfig('i8088', 4, 1),
+    'i80186': BusInterfaceConfig('i80186', 6, 2),
+    'i80188': BusInterfaceConfig('i80188', 4, 1),
+    'i80c186': BusInterfaceConfig('i80c186', 6, 2),
+    'nec_v30': BusInterfaceConfig('nec_v30', 6, 2),
+    'nec_v20': BusInterfaceConfig('nec_v20', 4, 1),
+    'k1810vm86': BusInterfaceConfig('k1810vm86', 6, 2),
+    'k1810vm88': BusInterfaceConfig('k1810vm88', 4, 1),
+}
+
+
+def _operands(entry: Dict) -> List[str]:
+    text = entry.get('operands') or entry.get('addressing_mode', '')
+    return [op.strip().lower() for op in text.split(',') if op.strip()]
+
+
+def bus_transfers(entry: Dict) -> int:
+    """Data bus transfers of one timing entry (explicit 'bus_transfers' wins).
+
+    Memory operands count one transfer (two for a 32-bit pointer), one
+    more when a memory destination is also read (read-modify-write); stack,
+    string, I/O and interrupt instructions add their implicit transfers.
+    """
+    if 'bus_transfers' in entry:
+        return int(entry['bus_transfers'])
+    mnemonic = entry.get('mnemonic', '').upper().split()[-1] if entry.get('mnemonic') else ''
+    operands = _operands(entry)
+    memory = [op for op in operands if 'mem' in op]
+    count = sum(2 if '32' in op else 1 for op in memory)
+    if operands and 'mem' in operands[0] and len(operands) > 1 and mnemonic != 'MOV':
+        count += 1
+    implicit = _IMPLICIT_TRANSFERS.get(mnemonic, 0)
+    if mnemonic in ('CALL', 'RET') and 'far' in ' '.join(operands):
+        implicit = 2
+    return count + implicit
+
+
+def _byte_transfer(entry: Dict) -> bool:
+    """Transfers are bytes (one bus cycle even on an 8-bit bus)."""
+    text = ' '.join(_operands(entry))
+    return 'mem8' in text or 'memory8' in text or 'byte' in text and 'word' not in text
+
+
+@dataclass
+class PrefetchResult:
+    """Queue-starvation statistics per workload.
+
+    Every numeric field is a 1-D array with one entry per workload.
+
+    Attributes:
+        config: The simulated BusInterfaceConfig
+        workloads: Workload labels
+        instructions: Instructions simulated per workload
+        cpi: Cycles per instruction including queue and bus stalls
+        documented_cpi: CPI of the documented clock counts (full queue)
+        starvation_cpi: EU clocks per instruction spent waiting for the queue
+        starved_fraction: Fraction of instructions that waited for the queue
+        empty_fraction: Fraction of instructions that found the queue empty
+        avg_queue_bytes: Mean queue fill when the EU asks for an instruction
+        contention_cpi: Clocks per instruction data transfers waited for a prefetch
+        bus_utilization: Fraction of clocks the bus is busy
+        prefetch_utilization: Fraction of clocks spent on prefetch cycles
+        flushed_bytes: Prefetched bytes discarded by jumps, per instruction
+    """
+    config: BusInterfaceConfig
+    workloads: List[str]
+    instructions: int
+    cpi: np.ndarray
+    documented_cpi: np.ndarray
+    starvation_cpi: np.ndarray
+    starved_fraction: np.ndarray
+    empty_fraction: np.ndarray
+    avg_queue_bytes: np.ndarray
+    contention_cpi: np.ndarray
+    bus_utilization: np.ndarray
+    prefetch_utilization: np.ndarray
+    flushed_bytes: np.ndarray
+
+    @property
+    def starvation_share(self) -> np.ndarray:
+        """Fraction of all clocks the EU spent starved."""
+        return self.starvation_cpi / self.cpi
+
+    def to_dict(self) -> Dict:
+        data = {'config': asdict(self.config), 'workloads': list(self.workloads),
+                'instructions': self.instructions,
+                'starvation_share': self.starvation_share.tolist()}
+        for name in ('cpi', 'documented_cpi', 'starvation_cpi', 'starved_fraction',
+                     'empty_fraction', 'avg_queue_bytes', 'contention_cpi',
+                     'bus_utilization', 'prefetch_utilization', 'flushed_bytes'):
+            data[name] = getattr(self, name).tolist()
+        return data
+
+
+class PrefetchQueueSimulator:
+    """BIU/EU co-simulator over the entries of one timing table.
+
+    Args:
+        instructions: Timing entries (the ``instructions`` list of a timing JSON)
+        config: Bus interface parameters
+        taken_rate: Probability that a conditional transfer is taken
+        n_instructions: Instructions simulated per workload
+        seed: Seed of the instruction-stream sampler (results are reproducible)
+    """
+
+    def __init__(self, instructions: Sequence[Dict], config: BusInterfaceConfig,
+                 taken_rate: float = DEFAULT_TAKEN_RATE,
+                 n_instructions: int = DEFAULT_INSTRUCTIONS, seed: int = 0):
+        self.config = config
+        self.taken_rate = taken_rate
+        self.n_instructions = n_instructions
+        self.seed = seed
+        self.categories = [i.get('category', 'unknown') for i in instructions]
+        self.addressing_modes = [i.get('addressing_mode', '') for i in instructions]
+        self.length = np.array([max(int(i.get('bytes', 1)), 1) for i in instructions],
+                               dtype=np.int64)
+        self.clocks = np.array([int(np.ceil(float(i.get('cycles', 1)))) for i in instructions],
+                               dtype=np.int64)
+        self.clocks_not_taken = np.array(
+            [int(np.ceil(float(i.get('cycles_not_taken', i.get('cycles', 1)))))
+             for i in instructions], dtype=np.int64)
+        self.transfers = np.array([bus_transfers(i) for i in instructions], dtype=np.int64)
+        word_cycles = -(-2 // config.bus_bytes)
+        self.cycles_per_transfer = np.array(
+            [1 if _byte_transfer(i) else word_cycles for i in instructions], dtype=np.int64)
+        mnemonics = [i.get('mnemonic', '').upper() for i in instructions]
+        control = np.array([c == 'control' for c in self.categories])
+        unconditional = np.array([m.split()[-1].startswith(_UNCONDITIONAL) if m else False
+                                  for m in mnemonics])
+        conditional = np.array([m.startswith(_CONDITIONAL) if m else False for m in mnemonics])
+        self.always_flush = control & (unconditional | ~conditional)
+        self.conditional = control & conditional & ~unconditional
+
+    @classmethod
+    def from_model(cls, model_dir: Union[str, Path],
+                   config: Optional[BusInterfaceConfig] = None,
+                   **kwargs) -> 'PrefetchQueueSimulator':
+        """Simulator for a model directory (config from ``PREFETCH_PRESETS``).
+
+        Timing files that declare ``prefetch_queue_bytes`` / ``bus_width``
+        override the preset's queue size and bus width.  Files that only
+        list their differences from a ``base_timing_reference`` (8088 vs
+        8086) are simulated with the base table: its clock counts assume
+        the base bus, and the simulation adds the narrower bus's cost.
+        """
+        path = find_timing_file(model_dir)
+        if path is None:
+            raise FileNotFoundError(f"No *_timing.json found for {model_dir}")
+        with open(path) as f:
+            data = json.load(f)
+        instructions = data.get('instructions', [])
+        base = data.get('base_timing_reference')
+        if base and (path.parent.parent / base).is_file():
+            with open(path.parent.parent / base) as f:
+                instructions = json.load(f).get('instructions', instructions)
+        name = Path(model_dir).name if Path(model_dir).is_dir() else path.parent.parent.name
+        if config is None:
+            if name not in PREFETCH_PRESETS:
+                raise KeyError(f"No bus interface preset for '{name}'")
+            config = PREFETCH_PRESETS[name]
+            if 'prefetch_queue_bytes' in data or 'bus_width' in data:
+                config = BusInterfaceConfig(
+                    name, int(data.get('prefetch_queue_bytes', config.queue_bytes)),
+                    int(data.get('bus_width', config.bus_bytes * 8)) // 8,
+                    config.bus_cycle, config.wait_states, config.jump_overlap)
+        return cls(instructions, config, **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.length)
+
+    # -- workload mixes -------------------------------------------------
+
+    def _selector(self, name: str) -> np.ndarray:
+        """Entries a mix key selects: a timing category, else an addressing mode."""
+        mask = np.array([c == name for c in self.categories])
+        if not mask.any():
+            mask = np.array([name in m.split(',') for m in self.addressing_modes])
+        return mask
+
+    def category_matrix(self, names: Sequence[str]) -> np.ndarray:
+        """(len(names), n_entries) map spreading a category weight over its entries."""
+        matrix = np.zeros((len(names), len(self)), dtype=np.float64)
+        for row, name in enumerate(names):
+            mask = self._selector(name)
+            if mask.any():
+                matrix[row, mask] = 1.0 / mask.sum()
+        return matrix
+
+    def entry_weights(self, mixes: Sequence[Union[str, Dict[str, float]]]) -> np.ndarray:
+        """Workload x entry weight matrix.
+
+        Args:
+            mixes: Dicts of category (or addressing mode) -> weight; the
+                string 'typical' (or any other name) weights every entry equally
+
+        Returns:
+            Array of shape (len(mixes), n_entries)
+        """
+        weights = np.zeros((len(mixes), len(self)), dtype=np.float64)
+        for row, mix in enumerate(mixes):
+            if isinstance(mix, str):
+                weights[row] = 1.0
+                continue
+            names = list(mix)
+            weights[row] = np.array([mix[n] for n in names]) @ self.category_matrix(names)
+        return weights
+
+    # -- simulation -----------------------------------------------------
+
+    def simulate(self, mixes: Union[Sequence[Union[str, Dict[str, float]]], np.ndarray],
+                 labels: Optional[Sequence[str]] = None) -> PrefetchResult:
+        """Co-simulate BIU and EU for every workload mix side by side.
+
+        Args:
+            mixes: Workload mixes (see ``entry_weights``) or a workload x
+                entry weight matrix
+            labels: Workload labels (default: mix names or row numbers)
+
+        Returns:
+            PrefetchResult with one entry per workload
+        """
+        if isinstance(mixes, np.ndarray):
+            weights = np.atleast_2d(np.asarray(mixes, dtype=np.float64))
+        else:
+            weights = self.entry_weights(mixes)
+            if labels is None:
+                labels = [m if isinstance(m, str) else str(k) for k, m in enumerate(mixes)]
+        if labels is None:
+            labels = [str(k) for k in range(len(weights))]
+        return self._run(weights, list(labels))
+
+    def simulate_categories(self, weights: np.ndarray,
+                            category_names: Sequence[str]) -> PrefetchResult:
+        """Simulate a workload x category matrix (``QueueingModel`` columns)."""
+        return self.simulate(np.atleast_2d(weights) @ self.category_matrix(category_names))
+
+    def _advance(self, q, inflight, done_at, until):
+        """BIU progress to ``until`` with the queue untouched by the EU.
+
+        Fetches complete every ``fetch_clocks`` from ``done_at`` while the
+        queue has room for another; returns the new (q, inflight, done_at)
+        and the bytes delivered.
+        """
+        cfg = self.config
+        room_fetches = (cfg.queue_bytes - q) // cfg.bus_bytes
+        k = np.where(inflight & (until >= done_at),
+                     np.minimum(room_fetches, (until - done_at) // cfg.fetch_clocks + 1), 0)
+        delivered = k * cfg.bus_bytes
+        return q + delivered, inflight & (k < room_fetches), done_at + k * cfg.fetch_clocks, delivered
+
+    def _run(self, weights: np.ndarray, labels: List[str]) -> PrefetchResult:
+        cfg = self.config
+        lanes = len(weights)
+        n_entries = len(self)
+        totals = weights.sum(axis=1, keepdims=True)
+        weights = np.where(totals > 0, weights, 1.0)
+        cdf = np.cumsum(weights, axis=1)
+        cdf /= cdf[:, -1:]
+        lane = np.arange(lanes)
+        flat = (cdf + lane[:, np.newaxis]).ravel()
+        rng = np.random.default_rng(self.seed)
+        T = cfg.fetch_clocks
+
+        # Queue full and BIU idle at t = 0
+        t = np.zeros(lanes, dtype=np.int64)
+        q = np.full(lanes, cfg.queue_bytes, dtype=np.int64)
+        inflight = np.zeros(lanes, dtype=bool)
+        done_at = np.zeros(lanes, dtype=np.int64)
+        starve = np.zeros(lanes, dtype=np.int64)
+        starved = np.zeros(lanes, dtype=np.int64)
+        empty = np.zeros(lanes, dtype=np.int64)
+        queue_sum = np.zeros(lanes, dtype=np.int64)
+        contention = np.zeros(lanes, dtype=np.int64)
+        fetched = np.zeros(lanes, dtype=np.int64)
+        data_cycles = np.zeros(lanes, dtype=np.int64)
+        flushed = np.zeros(lanes, dtype=np.int64)
+        documented = np.zeros(lanes, dtype=np.int64)
+
+        for _ in range(self.n_instructions):
+            entry = np.searchsorted(flat, rng.random(lanes) + lane, side='right') - lane * n_entries
+            entry = np.minimum(entry, n_entries - 1)
+            taken = self.always_flush[entry] | (self.conditional[entry] &
+                                                (rng.random(lanes) < self.taken_rate))
+            length = self.length[entry]
+            clocks = np.where(self.conditional[entry] & ~taken,
+                              self.clocks_not_taken[entry], self.clocks[entry])
+            transfers = self.transfers[entry]
+            bus = transfers * self.cycles_per_transfer[entry]
+            documented += clocks
+
+            # Instruction bytes: from the queue, else as the BIU delivers them
+            queue_sum += q
+            empty += q == 0
+            short = q < length
+            done_at = np.where(short & ~inflight, t + T, done_at)
+            need = -(-(length - q) // cfg.bus_bytes)
+            start = np.where(short, done_at + (need - 1) * T, t)
+            fetched += np.where(short, need * cfg.bus_bytes, 0)
+            q = np.where(short, q + need * cfg.bus_bytes - length, q - length)
+            room = cfg.queue_bytes - q >= cfg.bus_bytes
+            done_at = np.where(short, start + T,
+                               np.where(~inflight & room, start + T, done_at))
+            inflight = short | inflight | room
+            starve += start - t
+            starved += short
+
+            # Execution; data transfers at its end wait for an in-flight fetch
+            memory = transfers > 0
+            request = start + np.maximum(clocks - transfers * cfg.bus_cycle, 0)
+            flush_at = np.maximum(start, start + clocks - cfg.jump_overlap)
+            stop = np.where(memory, request, np.where(taken, flush_at, start + clocks))
+            q, inflight, done_at, got = self._advance(q, inflight, done_at, stop)
+            fetched += got
+            pending = memory & inflight
+            granted = np.where(pending, np.maximum(request, done_at), request)
+            q = np.where(pending, q + cfg.bus_bytes, q)
+            fetched += np.where(pending, cfg.bus_bytes, 0)
+            contention += granted - request
+            end = np.where(memory, granted + bus * T, start + clocks)
+            data_cycles += bus
+            room = cfg.queue_bytes - q >= cfg.bus_bytes
+            inflight = np.where(memory, room, inflight)
+            done_at = np.where(memory & room, end + T, done_at)
+
+            # Taken transfers: flush at flush_at (after the data transfers
+            # for memory instructions) and refetch from the target
+            if taken.any():
+                restart = np.where(memory, end,
+                                   np.where(inflight, np.maximum(flush_at, done_at), flush_at))
+                flushed += np.where(taken, q, 0)
+                tq, tinf, tdone, tgot = self._advance(
+                    np.zeros(lanes, dtype=np.int64), np.ones(lanes, dtype=bool), restart + T, end)
+                fetched += np.where(taken, tgot, 0)
+                q = np.where(taken, tq, q)
+                inflight = np.where(taken, tinf, inflight)
+                done_at = np.where(taken, tdone, done_at)
+            t = end
+
+        n = self.n_instructions
+        cycles = np.maximum(t, 1).astype(np.float64)
+        prefetch_busy = fetched / cfg.bus_bytes * T
+        return PrefetchResult(
+            config=cfg, workloads=labels, instructions=n,
+            cpi=t / n,
+            documented_cpi=documented / n,
+            starvation_cpi=starve / n,
+            starved_fraction=starved / n,
+            empty_fraction=empty / n,
+            avg_queue_bytes=queue_sum / n,
+            contention_cpi=contention / n,
+            bus_utilization=np.minimum((prefetch_busy + data_cycles * T) / cycles, 1.0),
+            prefetch_utilization=np.minimum(prefetch_busy / cycles, 1.0),
+            flushed_bytes=flushed / n,
+        )
@@ -2,15 +2,28 @@
 
 This module provides queueing theory based analysis for CPU performance modeling.
 It implements M/M/1 queue analysis for fetch, decode, execute, and memory stages.
+
+Category names are classified once when a QueueingModel is built, so
+``analyze()`` can evaluate a whole batch of workloads (a workload x category
+weight matrix) with a handful of NumPy operations.
 """
 
 from dataclasses import dataclass
-from typing import Dict, Optional, List, Tuple, Union
+from functools import lru_cache
+from typing import Dict, Optional, List, Sequence, Tuple, Union
+
+import numpy as np
 
 
 @dataclass
 class QueueingResult:
-    """Results from queueing analysis."""
+    """Results from queueing analysis.
+
+    For a single workload every field is a scalar.  For a batch of workloads
+    (see ``QueueingModel.analyze``) every numeric field is a 1-D array with
+    one entry per workload, ``bottleneck`` is an array of stage names, and
+    ``stage_utilizations`` maps each stage to an array.
+    """
     ips: float                      # Instructions per second
     cpi: float                      # Cycles per instruction
     utilization: float              # Overall system utilization
@@ -52,6 +65,56 @@ def mm1_wait_time(arrival_rate: float, service_rate: float) -> float:
     return rho / (service_rate - arrival_rate)
 
 
+# Substrings used to classify category names.  Matching happens once per
+# distinct name (see _classify_category), never per analyze() call.
+_DECODE_COMPLEX_KEYS = ('call', 'return', 'mul', 'div', 'string')
+_DECODE_MEDIUM_KEYS = ('branch', 'jump', 'memory')
+_MEMORY_KEYS = ('memory', 'load', 'store', 'push', 'pop', 'stack')
+_ALU_KEYS = ('alu', 'arith')
+_MEM_KEYS = ('mem', 'load', 'store')
+_CONTROL_KEYS = ('branch', 'jump', 'call')
+
+# Per-workload weight multipliers as (keys, factor) rules; the first matching
+# rule wins, unmatched categories keep their weight.
+_NAMED_WORKLOAD_RULES = {
+    'compute': ((_ALU_KEYS, 1.5), (_MEM_KEYS, 0.7), (('branch',), 0.6)),
+    'memory': ((_MEM_KEYS, 1.8), (('alu',), 0.6)),
+    'control': ((_CONTROL_KEYS, 2.0), (('alu',), 0.5)),
+}
+
+
+def _contains_any(name: str, keys: Sequence[str]) -> bool:
+    """True if any of ``keys`` is a substring of ``name``."""
+    return any(k in name for k in keys)
+
+
+@lru_cache(maxsize=None)
+def _classify_category(name: str) -> Tuple[float, bool]:
+    """Classify a category name.
+
+    Returns:
+        Tuple of (decode complexity weight, is memory-stage category)
+    """
+    lower = name.lower()
+    if _contains_any(lower, _DECODE_COMPLEX_KEYS):
+        decode_weight = 2.0
+    elif _contains_any(lower, _DECODE_MEDIUM_KEYS):
+        decode_weight = 1.2
+    else:
+        decode_weight = 1.0
+    return decode_weight, _contains_any(lower, _MEMORY_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _named_workload_factor(workload: str, name: str) -> float:
+    """Weight multiplier applied to category ``name`` by a named workload."""
+    lower = name.lower()
+    for keys, factor in _NAMED_WORKLOAD_RULES.get(workload, ()):
+        if _contains_any(lower, keys):
+            return factor
+    return 1.0
+
+
 class QueueingModel:
     """M/M/1 queueing model for CPU performance analysis."""
     
@@ -63,7 +126,8 @@ class QueueingModel:
         prefetch_depth: int = 0,
         cache_size: int = 0,
         pipeline_stages: int = 1,
-        memory_wait_states: int = 0
+        memory_wait_states: int = 0,
+        prefetch_simulator=None
     ):
         """Initialize queueing model.
         
@@ -75,6 +139,10 @@ class QueueingModel:
             cache_size: Instruction cache size in bytes (0 = no cache)
             pipeline_stages: Number of pipeline stages (1 = no pipelining)
             memory_wait_states: Additional memory wait states
+            prefetch_simulator: Optional ``common.prefetch_sim.PrefetchQueueSimulator``;
+                when given, the prefetch stages come from a BIU/EU
+                co-simulation of each workload instead of the fullness
+                thresholds
         """
         self.clock_mhz = clock_mhz
         self.clock_hz = clock_mhz * 1_000_000
@@ -84,16 +152,75 @@ class QueueingModel:
         self.cache_size = cache_size
         self.pipeline_stages = pipeline_stages
         self.memory_wait_states = memory_wait_states
+        self.prefetch_simulator = prefetch_simulator
+        self.compile_categories()
+
+    def compile_categories(self):
+        """Precompute per-category lookup vectors from ``timing_categories``.
+
+        Classifies every category name once into boolean masks and weight
+        vectors, and builds the named workload mixes.  Call again after
+        editing ``timing_categories`` in place.
+        """
+        names = list(self.timing_categories)
+        self.category_names: List[str] = names
+        self._category_index = {name: i for i, name in enumerate(names)}
+
+        cats = [self.timing_categories[n] for n in names]
+        self._cycles = np.array([c.get('cycles', 4) for c in cats], dtype=np.float64)
+        self._exec_cycles = np.maximum(self._cycles - 2, 1)
+        self._default_weights = np.array([c.get('weight', 0.0) for c in cats],
+                                         dtype=np.float64)
+
+        classes = [_classify_category(n) for n in names]
+        self._decode_weights = np.array([c[0] for c in classes], dtype=np.float64)
+        self._memory_mask = np.array([c[1] for c in classes], dtype=bool)
+
+        self._named_workloads = {'typical': self._default_weights}
+        for workload in _NAMED_WORKLOAD_RULES:
+            factors = np.array([_named_workload_factor(workload, n) for n in names],
+                               dtype=np.float64)
+            self._named_workloads[workload] = _normalized(self._default_weights * factors)
+        self._normalized_default = _normalized(self._default_weights)
+
+    def workload_matrix(self, workloads: Sequence[Union[str, Dict[str, float]]]) -> np.ndarray:
+        """Build a workload x category weight matrix for ``analyze()``.
+
+        Args:
+            workloads: Sequence of workload names or dicts of category -> weight.
+                       Dict entries for unknown categories are dropped.
+
+        Returns:
+            Array of shape (len(workloads), len(category_names))
+        """
+        matrix = np.zeros((len(workloads), len(self.category_names)), dtype=np.float64)
+        for row, workload in enumerate(workloads):
+            if isinstance(workload, str):
+                matrix[row] = self._named_vector(workload)
+            else:
+                for cat, weight in workload.items():
+                    col = self._category_index.get(cat)
+                    if col is not None:
+                        matrix[row, col] = weight
+        return matrix
+
+    def _named_vector(self, name: str) -> np.ndarray:
+        """Weight vector for a named workload profile."""
+        return self._named_workloads.get(name, self._normalized_default)
     
-    def weighted_cpi(self, workload: Dict[str, float]) -> float:
+    def weighted_cpi(self, workload: Union[Dict[str, float], np.ndarray]) -> Union[float, np.ndarray]:
         """Calculate weighted CPI for a workload.
         
         Args:
-            workload: Dict of category -> weight (must sum to ~1.0)
+            workload: Dict of category -> weight (must sum to ~1.0), or a
+                      workload x category weight matrix
             
         Returns:
-            Weighted average cycles per instruction
+            Weighted average cycles per instruction (array for a matrix)
         """
+        if isinstance(workload, np.ndarray):
+            return self._weighted_cpi_matrix(workload)
+
         total_cpi = 0.0
         total_weight = 0.0
         
@@ -106,6 +233,14 @@ class QueueingModel:
         if total_weight > 0:
             return total_cpi / total_weight
         return sum(c.get('cycles', 4) for c in self.timing_categories.values()) / len(self.timing_categories)
+
+    def _weighted_cpi_matrix(self, weights: np.ndarray) -> np.ndarray:
+        """Row-wise weighted CPI; rows with no weight fall back to the mean."""
+        total_weight = weights.sum(axis=1)
+        total_cpi = weights @ self._cycles
+        fallback = self._cycles.mean() if self._cycles.size else np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total_weight > 0, total_cpi / total_weight, fallback)
     
     def calculate_ips(self, workload: Dict[str, float]) -> float:
         """Calculate instructions per second.
@@ -146,14 +281,8 @@ class QueueingModel:
     def _analyze_decode_stage(self, cpi: float, workload: Dict[str, float]) -> Tuple[float, float]:
         """Analyze instruction decode stage utilization."""
         # Estimate decode complexity from instruction mix
-        complex_weight = 0.0
-        for cat, weight in workload.items():
-            if any(x in cat.lower() for x in ['call', 'return', 'mul', 'div', 'string']):
-                complex_weight += weight * 2.0
-            elif any(x in cat.lower() for x in ['branch', 'jump', 'memory']):
-                complex_weight += weight * 1.2
-            else:
-                complex_weight += weight * 1.0
+        complex_weight = sum(weight * _classify_category(cat)[0]
+                             for cat, weight in workload.items())
         
         # Decode typically takes 1-2 cycles for simple CPUs
         decode_cycles = 1.0 + complex_weight * 0.5
@@ -179,7 +308,7 @@ class QueueingModel:
         """Analyze memory access stage utilization."""
         mem_cycles = 0.0
         for cat, weight in workload.items():
-            if any(x in cat.lower() for x in ['memory', 'load', 'store', 'push', 'pop', 'stack']):
+            if _classify_category(cat)[1]:
                 # Memory operations include wait states
                 mem_cycles += weight * (2 + self.memory_wait_states)
         
@@ -192,8 +321,7 @@ class QueueingModel:
             return 0.0, "none"
         
         # Queue starvation likelihood
-        avg_instr_size = 3.0 if self.bus_width >= 16 else 2.0
-        queue_fullness = self.prefetch_depth / (avg_instr_size * cpi)
+        queue_fullness = self._prefetch_fullness(cpi)
         
         if queue_fullness < 0.3:
             return 0.9, "prefetch_starvation"
@@ -201,6 +329,11 @@ class QueueingModel:
             return 0.5, "prefetch_marginal"
         else:
             return 0.2, "prefetch_adequate"
+
+    def _prefetch_fullness(self, cpi):
+        """Prefetch queue fullness estimate used by the starvation thresholds."""
+        avg_instr_size = 3.0 if self.bus_width >= 16 else 2.0
+        return self.prefetch_depth / (avg_instr_size * cpi)
     
     def _analyze_cache(self, cpi: float) -> Tuple[float, float]:
         """Analyze cache effectiveness."""
@@ -238,72 +371,134 @@ class QueueingModel:
         
         return bottleneck, max_util
     
-    def analyze(self, workload: Optional[Union[str, Dict[str, float]]] = None) -> QueueingResult:
+    def analyze(
+        self,
+        workload: Optional[Union[str, Dict[str, float], np.ndarray]] = None
+    ) -> QueueingResult:
         """Perform complete queueing analysis.
         
         Args:
-            workload: Either a workload name ('typical', 'compute', 'memory', 'control')
-                     or a dict of custom weights. If None, uses default weights.
+            workload: Either a workload name ('typical', 'compute', 'memory', 'control'),
+                     a dict of custom weights, or a 2-D workload x category weight
+                     matrix whose columns follow ``category_names`` (see
+                     ``workload_matrix()``). If None, uses default weights.
                      
         Returns:
-            QueueingResult with all analysis data
+            QueueingResult with all analysis data. For a matrix, every field
+            holds one entry per workload row.
         """
+        if isinstance(workload, np.ndarray):
+            weights = np.atleast_2d(np.asarray(workload, dtype=np.float64))
+            return self._analyze_matrix(weights)
+
         # Handle string workload names
-        if workload is None or workload == 'typical':
-            workload = {name: cat['weight'] for name, cat in self.timing_categories.items()}
-        elif isinstance(workload, str):
-            workload = self._get_named_workload(workload)
-            
-        cpi = self.weighted_cpi(workload)
+        extra_decode = extra_memory = 0.0
+        if workload is None or isinstance(workload, str):
+            vector = self._named_vector(workload or 'typical')
+        else:
+            vector = np.zeros(len(self.category_names), dtype=np.float64)
+            for cat, weight in workload.items():
+                col = self._category_index.get(cat)
+                if col is not None:
+                    vector[col] += weight
+                else:
+                    # Unknown categories still count towards decode/memory load
+                    decode_weight, is_memory = _classify_category(cat)
+                    extra_decode += weight * decode_weight
+                    if is_memory:
+                        extra_memory += weight
+
+        batch = self._analyze_matrix(vector[np.newaxis, :],
+                                     extra_decode=extra_decode,
+                                     extra_memory=extra_memory)
+        utilizations = {stage: float(util[0])
+                        for stage, util in batch.stage_utilizations.items()}
+        if utilizations.get('prefetch_starvation') == 0.0:
+            del utilizations['prefetch_starvation']
+
+        return QueueingResult(
+            ips=float(batch.ips[0]),
+            cpi=float(batch.cpi[0]),
+            utilization=float(batch.utilization[0]),
+            throughput=float(batch.throughput[0]),
+            avg_queue_length=float(batch.avg_queue_length[0]),
+            avg_response_time=float(batch.avg_response_time[0]),
+            bottleneck=str(batch.bottleneck[0]),
+            bottleneck_utilization=float(batch.bottleneck_utilization[0]),
+            stage_utilizations=utilizations
+        )
+
+    def _analyze_matrix(self, weights: np.ndarray, extra_decode=0.0,
+                        extra_memory=0.0) -> QueueingResult:
+        """Vectorized analysis of a workload x category weight matrix."""
+        n_rows = weights.shape[0]
+        cpi = self._weighted_cpi_matrix(weights)
         ips = self.clock_hz / cpi
         throughput = 1.0 / cpi
-        
+        cpi_floor = np.maximum(cpi, 1)
+
         # Analyze each stage
         utilizations = {}
-        
-        fetch_util, _ = self._analyze_fetch_stage(cpi)
-        utilizations['fetch'] = fetch_util
-        
-        decode_util, _ = self._analyze_decode_stage(cpi, workload)
-        utilizations['decode'] = decode_util
-        
-        exec_util, _ = self._analyze_execute_stage(cpi, workload)
-        utilizations['execute'] = exec_util
-        
-        mem_util, _ = self._analyze_memory_stage(cpi, workload)
-        utilizations['memory'] = mem_util
-        
-        # Prefetch analysis
-        if self.prefetch_depth > 0:
-            prefetch_util, prefetch_status = self._analyze_prefetch(cpi)
+
+        _, fetch_cycles = self._analyze_fetch_stage(1.0)
+        utilizations['fetch'] = fetch_cycles / cpi_floor
+
+        complex_weight = weights @ self._decode_weights + extra_decode
+        utilizations['decode'] = (1.0 + complex_weight * 0.5) / cpi_floor
+
+        utilizations['execute'] = (weights @ self._exec_cycles) / cpi_floor
+
+        mem_weight = weights @ self._memory_mask.astype(np.float64) + extra_memory
+        utilizations['memory'] = mem_weight * (2 + self.memory_wait_states) / cpi_floor
+
+        # Prefetch analysis: simulated BIU busy / EU starved shares, else
+        # the same thresholds as _analyze_prefetch
+        n_stages = np.full(n_rows, 4, dtype=np.float64)
+        if self.prefetch_simulator is not None:
+            simulated = self.prefetch_simulator.simulate_categories(weights, self.category_names)
+            starvation = simulated.starvation_share
+            utilizations['prefetch'] = simulated.prefetch_utilization
+            utilizations['prefetch_starvation'] = starvation
+            n_stages += 1 + (starvation > 0)
+        elif self.prefetch_depth > 0:
+            fullness = self._prefetch_fullness(cpi)
+            starving = fullness < 0.3
+            prefetch_util = np.select([starving, fullness < 0.6], [0.9, 0.5], 0.2)
             utilizations['prefetch'] = prefetch_util
-            if prefetch_status == "prefetch_starvation":
-                utilizations['prefetch_starvation'] = prefetch_util
-        
+            utilizations['prefetch_starvation'] = np.where(starving, prefetch_util, 0.0)
+            n_stages += 1 + starving
+
         # Cache analysis
         if self.cache_size > 0:
-            cache_util, hit_rate = self._analyze_cache(cpi)
-            utilizations['cache'] = cache_util
-            utilizations['cache_miss'] = 1.0 - hit_rate
-        
-        # Identify bottleneck
-        bottleneck, bottleneck_util = self.identify_bottleneck(utilizations)
-        
+            cache_util, hit_rate = self._analyze_cache(1.0)
+            utilizations['cache'] = cache_util / cpi_floor
+            utilizations['cache_miss'] = np.full(n_rows, 1.0 - hit_rate)
+            n_stages += 2
+
+        # Identify bottleneck (first stage with the highest utilization)
+        stage_names = list(utilizations)
+        stacked = np.vstack([utilizations[name] for name in stage_names])
+        best = np.argmax(stacked, axis=0)
+        bottleneck_util = stacked[best, np.arange(n_rows)]
+        bottleneck = np.where(bottleneck_util > 0.0,
+                              np.array(stage_names)[best], "unknown")
+        bottleneck_util = np.maximum(bottleneck_util, 0.0)
+
         # Overall utilization (normalized)
-        overall_util = min(sum(utilizations.values()) / max(len(utilizations), 1), 1.0)
-        
-        # Queue metrics
-        service_rate = self.clock_hz / cpi
-        arrival_rate = service_rate * overall_util
-        avg_queue = mm1_queue_length(arrival_rate, service_rate)
+        overall_util = np.minimum(stacked.sum(axis=0) / n_stages, 1.0)
+
+        # Queue metrics (M/M/1 with arrival rate = service rate * utilization)
+        rho = np.minimum(overall_util, 0.999)
+        with np.errstate(divide='ignore'):
+            avg_queue = np.where(rho >= 0.999, np.inf, rho / (1.0 - rho))
         avg_response = cpi / self.clock_hz * 1e6  # microseconds
-        
+
         return QueueingResult(
             ips=ips,
             cpi=cpi,
             utilization=overall_util,
             throughput=throughput,
-            avg_queue_length=min(avg_queue, 100.0),
+            avg_queue_length=np.minimum(avg_queue, 100.0),
             avg_response_time=avg_response,
             bottleneck=bottleneck,
             bottleneck_utilization=bottleneck_util,
@@ -312,47 +507,14 @@ class QueueingModel:
 
     def _get_named_workload(self, name: str) -> Dict[str, float]:
         """Get weights for a named workload profile."""
-        # Default: use category weights
-        base_weights = {n: c['weight'] for n, c in self.timing_categories.items()}
-        
-        if name == 'typical':
-            return base_weights
-        
-        # Adjust for specific workload types
-        adjusted = base_weights.copy()
-        
-        if name == 'compute':
-            # Increase ALU operations, decrease memory/branches
-            for cat in adjusted:
-                if 'alu' in cat.lower() or 'arith' in cat.lower():
-                    adjusted[cat] *= 1.5
-                elif 'mem' in cat.lower() or 'load' in cat.lower() or 'store' in cat.lower():
-                    adjusted[cat] *= 0.7
-                elif 'branch' in cat.lower():
-                    adjusted[cat] *= 0.6
-                    
-        elif name == 'memory':
-            # Increase memory operations
-            for cat in adjusted:
-                if 'mem' in cat.lower() or 'load' in cat.lower() or 'store' in cat.lower():
-                    adjusted[cat] *= 1.8
-                elif 'alu' in cat.lower():
-                    adjusted[cat] *= 0.6
-                    
-        elif name == 'control':
-            # Increase branches and calls
-            for cat in adjusted:
-                if 'branch' in cat.lower() or 'jump' in cat.lower() or 'call' in cat.lower():
-                    adjusted[cat] *= 2.0
-                elif 'alu' in cat.lower():
-                    adjusted[cat] *= 0.5
-        
-        # Normalize to sum to 1.0
-        total = sum(adjusted.values())
-        if total > 0:
-            adjusted = {k: v/total for k, v in adjusted.items()}
-        
-        return adjusted
+        vector = self._named_vector(name)
+        return dict(zip(self.category_names, vector.tolist()))
+
+
+def _normalized(weights: np.ndarray) -> np.ndarray:
+    """Scale a weight vector to sum to 1.0 (unchanged if it sums to 0)."""
+    total = weights.sum()
+    return weights / total if total > 0 else weights
 
 
 def create_model(config: Dict) -> QueueingModel:
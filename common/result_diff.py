@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Run-to-Run Result Diff
+=======================
+
+Aligns two fleet result snapshots on processor x workload and computes the
+deltas in one vectorized pass.  A snapshot is a flat table of
+``(model, workload) -> value`` held as arrays:
+
+    a = ResultSnapshot.from_run_store(store, run_id)      # common.run_store
+    b = ResultSnapshot.from_json('snapshots/after.json')
+    diff = diff_snapshots(a, b, atol=1e-6, rtol=1e-4)
+    diff.changed          # boolean mask over the aligned keys
+    diff.report()         # compact text report
+
+Values are compared like ``numpy.isclose``: a key changed when
+``|b - a| > atol + rtol * |a|``.  Keys present in only one snapshot are
+reported as added / removed and count as changes unless ``ignore_missing``.
+
+Snapshot JSON layout (``ResultSnapshot.to_json``):
+
+    {"field": "predicted", "source": "...",
+     "results": {"intel/i8086": {"typical": 8.12, ...}, ...}}
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+SNAPSHOT_FIELDS = ('predicted', 'measured', 'residual_before', 'residual_after')
+_SEP = '\x1f'                      # joins model and workload into one sort key
+
+
+@dataclass
+class ResultSnapshot:
+    """Flat processor x workload result table.
+
+    ``models[i]``, ``workloads[i]`` and ``values[i]`` describe one result;
+    rows are sorted by (model, workload).
+    """
+    models: np.ndarray
+    workloads: np.ndarray
+    values: np.ndarray
+    field: str = 'predicted'
+    source: str = ''
+
+    def __post_init__(self):
+        self.models = np.asarray(self.models, dtype=str)
+        self.workloads = np.asarray(self.workloads, dtype=str)
+        self.values = np.asarray(self.values, dtype=float)
+        order = np.lexsort((self.workloads, self.models))
+        self.models, self.workloads = self.models[order], self.workloads[order]
+        self.values = self.values[order]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def keys(self) -> np.ndarray:
+        """``model/workload`` keys, aligned with ``values``."""
+        return np.char.add(np.char.add(self.models, _SEP), self.workloads)
+
+    @classmethod
+    def from_mapping(cls, results: Dict[str, Dict[str, float]], field: str = 'predicted',
+                     source: str = '') -> 'ResultSnapshot':
+        """Build from ``{model: {workload: value}}``."""
+        models, workloads, values = [], [], []
+        for model, per_workload in results.items():
+            for workload, value in per_workload.items():
+                models.append(model)
+                workloads.append(workload)
+                values.append(np.nan if value is None else value)
+        return cls(models, workloads, values, field, source)
+
+    @classmethod
+    def from_run_store(cls, store, run_id: int, field: str = 'predicted',
+                       family: Optional[str] = None) -> 'ResultSnapshot':
+        """One field of a stored run (``common.run_store.RunStore``)."""
+        if field not in SNAPSHOT_FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Choose from: {SNAPSHOT_FIELDS}")
+        sql = f"SELECT model_dir, workload, {field} FROM workload_results WHERE run_id = ?"
+        params: List[Any] = [int(run_id)]
+        if family:
+            sql += " AND model_dir LIKE ?"
+            params.append(f"{family}/%")
+        rows = store.execute(sql, params)
+        if rows:
+            models, workloads, values = zip(*rows)
+        else:
+            models, workloads, values = (), (), ()
+        values = [np.nan if v is None else v for v in values]
+        return cls(models, workloads, values, field, f"run {int(run_id)}")
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> 'ResultSnapshot':
+        with open(path) as f:
+            data = json.load(f)
+        return cls.from_mapping(data.get('results', {}), data.get('field', 'predicted'),
+                                str(path))
+
+    def to_mapping(self) -> Dict[str, Dict[str, Optional[float]]]:
+        out: Dict[str, Dict[str, Optional[float]]] = {}
+        for model, workload, value in zip(self.models.tolist(), self.workloads.tolist(),
+                                          self.values.tolist()):
+            out.setdefault(model, {})[workload] = None if np.isnan(value) else value
+        return out
+
+    def to_json(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump({'field': self.field, 'source': self.source,
+                       'results': self.to_mapping()}, f, indent=2)
+
+
+@dataclass
+class ResultDiff:
+    """Aligned comparison of two snapshots (union of their keys)."""
+    models: np.ndarray
+    workloads: np.ndarray
+    before: np.ndarray            # NaN where the key is absent from ``a``
+    after: np.ndarray             # NaN where the key is absent from ``b``
+    in_before: np.ndarray
+    in_after: np.ndarray
+    changed: np.ndarray           # beyond tolerance, or added / removed
+    atol: float
+    rtol: float
+    sources: tuple = ('', '')
+
+    @property
+    def delta(self) -> np.ndarray:
+        return self.after - self.before
+
+    @property
+    def rel_delta(self) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.delta / np.abs(self.before)
+
+    @property
+    def added(self) -> np.ndarray:
+        return self.in_after & ~self.in_before
+
+    @property
+    def removed(self) -> np.ndarray:
+        return self.in_before & ~self.in_after
+
+    @property
+    def n_changed(self) -> int:
+        return int(self.changed.sum())
+
+    def changed_models(self) -> List[str]:
+        return np.unique(self.models[self.changed]).tolist()
+
+    def summary(self) -> Dict[str, Any]:
+        both = self.in_before & self.in_after
+        moved = self.changed & both
+        abs_delta = np.abs(self.delta[both])
+        abs_delta = abs_delta[~np.isnan(abs_delta)]
+        return {
+            'sources': list(self.sources),
+            'keys': int(len(self.models)),
+            'compared': int(both.sum()),
+            'changed': int(moved.sum()),
+            'added': int(self.added.sum()),
+            'removed': int(self.removed.sum()),
+            'models_changed': len(self.changed_models()),
+            'max_abs_delta': float(abs_delta.max()) if abs_delta.size else 0.0,
+            'atol': self.atol,
+            'rtol': self.rtol,
+        }
+
+    def rows(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Changed keys, largest relative change first."""
+        idx = np.flatnonzero(self.changed)
+        magnitude = np.abs(self.rel_delta[idx])
+        magnitude = np.where(np.isnan(magnitude), np.inf, magnitude)
+        idx = idx[np.argsort(-magnitude, kind='stable')][:limit]
+        out = []
+        for i in idx:
+            b, a = self.before[i], self.after[i]
+            out.append({
+                'model': str(self.models[i]),
+                'workload': str(self.workloads[i]),
+                'before': None if np.isnan(b) else float(b),
+                'after': None if np.isnan(a) else float(a),
+                'delta': None if np.isnan(a - b) else float(a - b),
+                'rel_delta': None if not np.isfinite(self.rel_delta[i])
+                else float(self.rel_delta[i]),
+                'status': ('added' if self.added[i] else 'removed' if self.removed[i]
+                           else 'changed'),
+            })
+        return out
+
+    def report(self, limit: int = 40) -> str:
+        s = self.summary()
+        lines = [
+            f"{s['sources'][0]} -> {s['sources'][1]}: {s['compared']} compared, "
+            f"{s['changed']} changed, {s['added']} added, {s['removed']} removed "
+            f"({s['models_changed']} models; atol={self.atol:g}, rtol={self.rtol:g})",
+        ]
+        rows = self.rows(limit)
+        if rows:
+            lines.append(f"  {'model':30s} {'workload':12s} {'before':>10s} {'after':>10s} "
+                         f"{'delta':>10s} {'rel':>8s}")
+            for r in rows:
+                fmt = lambda v, spec: f"{v:{spec}}" if v is not None else f"{'—':>10s}"
+                rel = f"{r['rel_delta'] * 100:+7.2f}%" if r['rel_delta'] is not None \
+                    else f"{r['status']:>8s}"
+                lines.append(f"  {r['model']:30.30s} {r['workload']:12.12s} "
+                             f"{fmt(r['before'], '10.4f')} {fmt(r['after'], '10.4f')} "
+                             f"{fmt(r['delta'], '+10.4f')} {rel}")
+            if self.n_changed > len(rows):
+                lines.append(f"  ... {self.n_changed - len(rows)} more")
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'summary': self.summary(), 'changes': self.rows()}
+
+
+def diff_snapshots(a: ResultSnapshot, b: ResultSnapshot, atol: float = 1e-6,
+                   rtol: float = 1e-4, ignore_missing: bool = False) -> ResultDiff:
+    """Align two snapshots and flag changes beyond tolerance.
+
+    Args:
+        a: Baseline snapshot
+        b: New snapshot
+        atol: Absolute tolerance
+        rtol: Relative tolerance (of the baseline value)
+        ignore_missing: Don't count added / removed keys as changes
+
+    Returns:
+        ResultDiff over the union of keys, sorted by (model, workload)
+    """
+    keys_a, keys_b = a.keys, b.keys
+    keys, inverse = np.unique(np.concatenate([keys_a, keys_b]), return_inverse=True)
+    ia, ib = inverse[:len(keys_a)], inverse[len(keys_a):]
+    before = np.full(len(keys), np.nan)
+    after = np.full(len(keys), np.nan)
+    in_before = np.zeros(len(keys), dtype=bool)
+    in_after = np.zeros(len(keys), dtype=bool)
+    before[ia], in_before[ia] = a.values, True
+    after[ib], in_after[ib] = b.values, True
+
+    both = in_before & in_after
+    nan_a, nan_b = np.isnan(before), np.isnan(after)
+    with np.errstate(invalid='ignore'):
+        beyond = np.abs(after - before) > atol + rtol * np.abs(before)
+    changed = both & (beyond | (nan_a != nan_b))
+    if not ignore_missing:
+        changed |= in_before != in_after
+
+    if len(keys):
+        split = np.char.partition(keys, _SEP)
+        models, workloads = split[:, 0], split[:, 2]
+    else:
+        models = workloads = np.array([], dtype=str)
+    return ResultDiff(models, workloads, before, after, in_before, in_after, changed,
+                      atol, rtol, (a.source, b.source))
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Run Store for Identification and Analysis Results
+===================================================
+
+Append-only SQLite history of fleet runs.  ``sysid_result.json`` and the
+validation files only hold the latest result; the run store keeps every
+one, so error trends and run-to-run changes can be queried directly:
+
+    runs             one row per run: kind ('identify' / 'analyze'), method,
+                     hyperparameters (JSON), code hash, start/finish, label
+    model_results    one row per run x model: converged, iterations, losses,
+                     cpi_error_percent, seconds, corrections (JSON), ...
+    workload_results one row per run x model x workload: measured and
+                     predicted CPI, residual before/after identification
+
+Models are keyed the way ``common.measurement_store`` keys them
+(``family/processor``).  Writes go through a ``RunWriter`` that buffers
+rows and inserts them with ``executemany`` in one transaction per batch:
+
+    with RunStore() as store:
+        with store.start_run('identify', method='ridge',
+                             hyperparameters={'alpha': 0.01}) as run:
+            for model_dir, result, measured, seconds in ...:
+                run.add_identification(model_dir, result, measured, seconds)
+
+        trend = store.error_trend(family='intel', last=20)
+        trend.values          # (n_models, n_runs) cpi_error_percent, NaN = absent
+
+The code hash is a SHA-1 over ``common/*.py`` plus, per model, the model's
+``current/*.py`` source, so a trend break can be tied to a code change.
+
+The database lives in ``.cache/runs.sqlite3`` under the repository root
+unless a path is given.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_DB_PATH = REPO_ROOT / ".cache" / "runs.sqlite3"
+SCHEMA_VERSION = 1
+RUN_KINDS = ('identify', 'analyze')
+
+_MODEL_COLUMNS = ('run_id', 'model_dir', 'status', 'converged', 'iterations', 'loss_before',
+                  'loss_after', 'cpi_error_percent', 'seconds', 'model_hash', 'message',
+                  'corrections', 'free_parameters')
+_WORKLOAD_COLUMNS = ('run_id', 'model_dir', 'workload', 'measured', 'predicted',
+                     'residual_before', 'residual_after')
+TREND_METRICS = ('cpi_error_percent', 'loss_before', 'loss_after', 'iterations', 'seconds')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT NOT NULL, method TEXT,
+    hyperparameters TEXT, code_hash TEXT, started REAL, finished REAL,
+    n_models INTEGER DEFAULT 0, label TEXT);
+CREATE TABLE IF NOT EXISTS model_results (
+    run_id INTEGER NOT NULL, model_dir TEXT NOT NULL, status TEXT, converged INTEGER,
+    iterations INTEGER, loss_before REAL, loss_after REAL, cpi_error_percent REAL,
+    seconds REAL, model_hash TEXT, message TEXT, corrections TEXT, free_parameters TEXT);
+CREATE TABLE IF NOT EXISTS workload_results (
+    run_id INTEGER NOT NULL, model_dir TEXT NOT NULL, workload TEXT NOT NULL,
+    measured REAL, predicted REAL, residual_before REAL, residual_after REAL);
+CREATE INDEX IF NOT EXISTS runs_kind ON runs (kind, run_id);
+CREATE INDEX IF NOT EXISTS model_results_model ON model_results (model_dir, run_id);
+CREATE INDEX IF NOT EXISTS model_results_run ON model_results (run_id);
+CREATE INDEX IF NOT EXISTS workload_results_run ON workload_results (run_id, model_dir);
+"""
+
+
+def _sha1_files(paths: Sequence[Path], digest=None) -> 'hashlib._Hash':
+    digest = digest or hashlib.sha1()
+    for path in paths:
+        digest.update(path.name.encode())
+        digest.update(path.read_bytes())
+    return digest
+
+
+def code_hash(repo_root: Union[str, Path, None] = None) -> str:
+    """SHA-1 (12 hex digits) over the shared modeling code in ``common/``."""
+    root = Path(repo_root) if repo_root else REPO_ROOT
+    return _sha1_files(sorted((root / 'common').glob('*.py'))).hexdigest()[:12]
+
+
+def model_hash(model_dir: Union[str, Path]) -> Optional[str]:
+    """SHA-1 (12 hex digits) over a model's ``current/*.py`` sources."""
+    sources = sorted((Path(model_dir) / 'current').glob('*.py'))
+    return _sha1_files(sources).hexdigest()[:12] if sources else None
+
+
+def _model_key(model_dir: Union[str, Path], repo_root: Path) -> str:
+    path = Path(model_dir)
+    if path.is_absolute():
+        try:
+            return path.resolve().relative_to((repo_root / 'models').resolve()).as_posix()
+        except ValueError:
+            pass
+    parts = path.parts
+    if 'models' in parts:
+        parts = parts[parts.index('models') + 1:]
+    return '/'.join(parts[-2:])
+
+
+def _float(value) -> Optional[float]:
+    if value is None:
+        return None
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+@dataclass
+class ErrorTrend:
+    """One metric for a set of models across a window of runs.
+
+    ``values[i, j]`` is the metric of ``models[i]`` in ``run_ids[j]``
+    (oldest run first); models absent from a run are NaN.
+    """
+    metric: str
+    models: List[str]
+    run_ids: np.ndarray
+    values: np.ndarray
+    runs: List[Dict[str, Any]] = field(default_factory=list)
+
+    def latest(self) -> Dict[str, float]:
+        """Most recent non-NaN value per model."""
+        out = {}
+        for name, row in zip(self.models, self.values):
+            valid = np.flatnonzero(~np.isnan(row))
+            if len(valid):
+                out[name] = float(row[valid[-1]])
+        return out
+
+    def change(self) -> np.ndarray:
+        """Last minus first non-NaN value per model (NaN with < 2 points)."""
+        out = np.full(len(self.models), np.nan)
+        for i, row in enumerate(self.values):
+            valid = np.flatnonzero(~np.isnan(row))
+            if len(valid) >= 2:
+                out[i] = row[valid[-1]] - row[valid[0]]
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'metric': self.metric,
+            'run_ids': self.run_ids.tolist(),
+            'runs': self.runs,
+            'models': {name: [None if np.isnan(v) else round(float(v), 6) for v in row]
+                       for name, row in zip(self.models, self.values)},
+        }
+
+
+class RunWriter:
+    """Buffered writer for one run; obtained from ``RunStore.start_run``.
+
+    Rows are held in memory and inserted ``batch_size`` models at a time;
+    ``close()`` (or leaving the ``with`` block) flushes the rest and stamps
+    the run's finish time and model count.
+    """
+
+    def __init__(self, store: 'RunStore', run_id: int, batch_size: int = 200):
+        self.store = store
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.n_models = 0
+        self._models: List[tuple] = []
+        self._workloads: List[tuple] = []
+        self._closed = False
+
+    def __enter__(self) -> 'RunWriter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _add(self, model_dir, status, converged, iterations, loss_before, loss_after,
+             cpi_error_percent, seconds, message, corrections, free_parameters, workloads):
+        if self._closed:
+            raise RuntimeError(f"run {self.run_id} is closed")
+        key = _model_key(model_dir, self.store.repo_root)
+        path = Path(model_dir)
+        digest = model_hash(path if path.is_absolute() else self.store.repo_root / 'models' / key)
+        self._models.append((
+            self.run_id, key, status, None if converged is None else int(bool(converged)),
+            iterations, _float(loss_before), _float(loss_after), _float(cpi_error_percent),
+            _float(seconds), digest, message,
+            json.dumps(corrections, sort_keys=True) if corrections is not None else None,
+            json.dumps(list(free_parameters)) if free_parameters is not None else None))
+        self._workloads.extend((self.run_id, key) + row for row in workloads)
+        self.n_models += 1
+        if len(self._models) >= self.batch_size:
+            self.flush()
+
+    def add_identification(self, model_dir: Union[str, Path], result,
+                           measurements: Dict[str, float],
+                           seconds: Optional[float] = None, status: Optional[str] = None):
+        """Record one ``IdentificationResult``.
+
+        Args:
+            model_dir: Processor directory (absolute, or ``family/processor``)
+            result: ``common.system_identification.IdentificationResult``
+            measurements: Measured CPI per workload the fit was run against
+            seconds: Wall time of the fit
+            status: Optional status label (e.g. PASS / MARGINAL / FAIL)
+        """
+        workloads = []
+        for workload in sorted(set(measurements) | set(result.residuals_after)):
+            measured = measurements.get(workload)
+            after = result.residuals_after.get(workload)
+            predicted = measured + after if measured is not None and after is not None else None
+            workloads.append((workload, _float(measured), _float(predicted),
+                              _float(result.residuals_before.get(workload)), _float(after)))
+        self._add(model_dir, status, result.converged, result.iterations, result.loss_before,
+                  result.loss_after, result.cpi_error_percent, seconds, result.message,
+                  result.corrections, result.free_parameters, workloads)
+
+    def add_analysis(self, model_dir: Union[str, Path], predicted: Dict[str, float],
+                     measurements: Optional[Dict[str, float]] = None,
+                     seconds: Optional[float] = None, status: Optional[str] = None,
+                     cpi_error_percent: Optional[float] = None, message: str = ''):
+        """Record the predicted CPI of one model across workloads.
+
+        Args:
+            model_dir: Processor directory (absolute, or ``family/processor``)
+            predicted: Predicted CPI per workload (``model.analyze(w).cpi``)
+            measurements: Measured CPI per workload, if any
+            seconds: Wall time of the analysis
+            status: Optional status label
+            cpi_error_percent: Headline error; defaults to the 'typical'
+                workload (or the first measured one)
+            message: Free-form note, e.g. an exception text
+        """
+        measurements = measurements or {}
+        workloads, residuals = [], {}
+        for workload in sorted(set(predicted) | set(measurements)):
+            measured, cpi = measurements.get(workload), predicted.get(workload)
+            residual = cpi - measured if measured is not None and cpi is not None else None
+            if residual is not None:
+                residuals[workload] = residual
+            workloads.append((workload, _float(measured), _float(cpi), None, _float(residual)))
+        if cpi_error_percent is None:
+            for workload in ['typical'] + sorted(residuals):
+                if workload in residuals and measurements[workload] > 0:
+                    cpi_error_percent = abs(residuals[workload]) / measurements[workload] * 100
+                    break
+        loss = float(np.mean(np.square(list(residuals.values())))) if residuals else None
+        self._add(model_dir, status, None, None, None, loss, cpi_error_percent, seconds,
+                  message, None, None, workloads)
+
+    def flush(self):
+        """Insert the buffered rows in one transaction."""
+        if not self._models and not self._workloads:
+            return
+        conn = self.store.conn
+        with conn:
+            conn.executemany(f"INSERT INTO model_results ({', '.join(_MODEL_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(_MODEL_COLUMNS))})", self._models)
+            conn.executemany(f"INSERT INTO workload_results ({', '.join(_WORKLOAD_COLUMNS)}) "
+                             f"VALUES ({', '.join('?' * len(_WORKLOAD_COLUMNS))})",
+                             self._workloads)
+        self._models, self._workloads = [], []
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        with self.store.conn:
+            self.store.conn.execute("UPDATE runs SET finished = ?, n_models = ? WHERE run_id = ?",
+                                    (time.time(), self.n_models, self.run_id))
+        self._closed = True
+
+
+class RunStore:
+    """Append-only SQLite history of identification and analysis runs.
+
+    Args:
+        db_path: Database file (default ``.cache/runs.sqlite3``); ':memory:'
+            gives a throwaway store
+        repo_root: Repository the runs were made in (for hashes and keys)
+    """
+
+    def __init__(self, db_path: Union[str, Path, None] = None,
+                 repo_root: Union[str, Path, None] = None):
+        self.repo_root = Path(repo_root) if repo_root else REPO_ROOT
+        self.db_path = DEFAULT_DB_PATH if db_path is None else db_path
+        if str(self.db_path) != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def __enter__(self) -> 'RunStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _create_schema(self):
+        row = None
+        try:
+            row = self.conn.execute("SELECT value FROM meta WHERE key='schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            pass
+        if row is not None and int(row[0]) != SCHEMA_VERSION:
+            raise RuntimeError(f"{self.db_path}: run store schema {row[0]}, "
+                               f"expected {SCHEMA_VERSION}")
+        with self.conn:
+            self.conn.executescript(_SCHEMA)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('schema_version', ?)",
+                              (str(SCHEMA_VERSION),))
+
+    # -- writing --------------------------------------------------------
+
+    def start_run(self, kind: str, method: Optional[str] = None,
+                  hyperparameters: Optional[Dict[str, Any]] = None,
+                  label: Optional[str] = None, batch_size: int = 200) -> RunWriter:
+        """Open a new run and return its writer.
+
+        Args:
+            kind: 'identify' or 'analyze'
+            method: Optimizer (identify) or analysis flavour
+            hyperparameters: JSON-serializable settings of the run
+            label: Free-form tag, e.g. a branch name or experiment
+            batch_size: Models buffered per insert transaction
+
+        Returns:
+            RunWriter for the new run
+        """
+        if kind not in RUN_KINDS:
+            raise ValueError(f"Unknown run kind '{kind}'. Choose from: {RUN_KINDS}")
+        with self.conn:
+            run_id = self.conn.execute(
+                "INSERT INTO runs (kind, method, hyperparameters, code_hash, started, label) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (kind, method, json.dumps(hyperparameters or {}, sort_keys=True),
+                 code_hash(self.repo_root), time.time(), label)).lastrowid
+        return RunWriter(self, run_id, batch_size)
+
+    # -- queries --------------------------------------------------------
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        """Run an arbitrary (read) statement."""
+        return self.conn.execute(sql, params).fetchall()
+
+    def runs(self, kind: Optional[str] = None, method: Optional[str] = None,
+             last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Run metadata, oldest first (the ``last`` N runs when given)."""
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if method:
+            clauses.append("method = ?")
+            params.append(method)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        limit = f"LIMIT {int(last)}" if last else ""
+        rows = self.conn.execute(
+            f"SELECT * FROM runs {where} ORDER BY run_id DESC {limit}", params).fetchall()
+        out = []
+        for row in reversed(rows):
+            run = dict(row)
+            run['hyperparameters'] = json.loads(run['hyperparameters'] or '{}')
+            out.append(run)
+        return out
+
+    def latest_run_id(self, kind: Optional[str] = None) -> Optional[int]:
+        runs = self.runs(kind=kind, last=1)
+        return runs[0]['run_id'] if runs else None
+
+    @staticmethod
+    def _model_filter(family=None, processor=None, column='model_dir'):
+        clauses, params = [], []
+        if family:
+            clauses.append(f"{column} LIKE ?")
+            params.append(f"{family}/%")
+        if processor:
+            names = [processor] if isinstance(processor, str) else list(processor)
+            clauses.append(f"({' OR '.join([f'{column} = ? OR {column} LIKE ?'] * len(names))})")
+            for name in names:
+                params += [name, f"%/{name}"]
+        return clauses, params
+
+    def model_results(self, run_id: int, family=None, processor=None) -> List[Dict[str, Any]]:
+        """Per-model rows of one run, with JSON columns decoded."""
+        clauses, params = self._model_filter(family, processor)
+        where = ''.join(f" AND {c}" for c in clauses)
+        rows = []
+        for row in self.conn.execute(
+                f"SELECT * FROM model_results WHERE run_id = ?{where} ORDER BY model_dir",
+                [int(run_id)] + params):
+            row = dict(row)
+            for key in ('corrections', 'free_parameters'):
+                row[key] = json.loads(row[key]) if row[key] else None
+            if row['converged'] is not None:
+                row['converged'] = bool(row['converged'])
+            rows.append(row)
+        return rows
+
+    def workload_results(self, run_id: int, family=None, processor=None,
+                         workload: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Per-workload rows of one run."""
+        clauses, params = self._model_filter(family, processor)
+        if workload:
+            clauses.append("workload = ?")
+            params.append(workload)
+        where = ''.join(f" AND {c}" for c in clauses)
+        return [dict(r) for r in self.conn.execute(
+            f"SELECT * FROM workload_results WHERE run_id = ?{where} ORDER BY model_dir, workload",
+            [int(run_id)] + params)]
+
+    def error_trend(self, family: Optional[str] = None, processor=None,
+                    kind: Optional[str] = 'identify', method: Optional[str] = None,
+                    last: int = 20, metric: str = 'cpi_error_percent') -> ErrorTrend:
+        """One metric for the matching models across the last runs.
+
+        Args:
+            family: Family directory, e.g. 'intel'
+            processor: Processor name(s) or ``family/processor`` keys
+            kind: Run kind to include (None for all)
+            method: Only runs of this method
+            last: Number of most recent matching runs
+            metric: One of ``TREND_METRICS``
+
+        Returns:
+            ErrorTrend with a (models x runs) matrix
+        """
+        if metric not in TREND_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Choose from: {TREND_METRICS}")
+        runs = self.runs(kind=kind, method=method, last=last)
+        run_ids = np.array([r['run_id'] for r in runs], dtype=np.int64)
+        if not len(run_ids):
+            return ErrorTrend(metric, [], run_ids, np.empty((0, 0)), runs)
+        clauses, params = self._model_filter(family, processor)
+        where = ''.join(f" AND {c}" for c in clauses)
+        rows = self.conn.execute(
+            f"SELECT model_dir, run_id, {metric} FROM model_results "
+            f"WHERE run_id BETWEEN ? AND ?{where}",
+            [int(run_ids[0]), int(run_ids[-1])] + params).fetchall()
+        if rows:
+            names, run_col, vals = zip(*rows)
+        else:
+            names, run_col, vals = (), (), ()
+        models, model_idx = np.unique(np.array(names, dtype=object).astype(str),
+                                      return_inverse=True)
+        run_col = np.array(run_col, dtype=np.int64)
+        col = np.searchsorted(run_ids, run_col)
+        keep = (col < len(run_ids)) & (run_ids[np.minimum(col, len(run_ids) - 1)] == run_col)
+        values = np.full((len(models), len(run_ids)), np.nan)
+        values[model_idx[keep], col[keep]] = np.array(
+            [np.nan if v is None else v for v in vals], dtype=float)[keep]
+        return ErrorTrend(metric, models.tolist(), run_ids, values, runs)
+
+
+def open_run_store(db_path: Union[str, Path, None] = None,
+                   repo_root: Union[str, Path, None] = None) -> RunStore:
+    """Open (creating if needed) the run store."""
+    return RunStore(db_path, repo_root)
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Sampled Trace Simulation (SimPoint)
+=====================================
+
+Characterizes a long trace by simulating a few representative intervals
+instead of replaying all of it through the cache / branch / CPI engines.
+
+1. One streaming pass splits the trace into fixed intervals and builds a
+   basic-block vector (BBV) per interval: instructions executed per basic
+   block, hashed into ``_BBV_BUCKETS`` buckets and randomly projected to a
+   few dimensions (linear, so it is accumulated chunk by chunk).  With a
+   timing table the pass also records each interval's table CPI, a cheap
+   proxy used for the error estimate.
+2. k-means (NumPy, k-means++ seeding) clusters the vectors for k = 1 ..
+   max_k; the smallest k whose BIC reaches 90% of the best BIC range is
+   kept, as in SimPoint.  The interval nearest each centroid is its
+   simulation point, weighted by the cluster's share of instructions.
+3. Only the points are simulated, each after ``warmup`` records that warm
+   cache and predictor state without being counted.  Results are the
+   weighted combination of the points.
+
+Error estimate: the stratified standard error of the proxy CPI (within-
+cluster variance, one sample per cluster), scaled to the simulated CPI,
+plus the exact error the chosen points make on the proxy itself.
+
+With 1M-instruction intervals and max_k = 10 a 1B-instruction trace is
+characterized from at most 10M simulated instructions (1%, plus warm-up).
+
+Usage:
+    from common.simpoint import sampled_replay
+    with TraceReader('long.trace') as reader:
+        result = sampled_replay(reader, table, geometries=[CacheGeometry(8192, 4, 16)],
+                                predictors=[PredictorConfig('gshare', 12, 12)])
+    print(result.cpi, result.cpi_stderr, result.simulated_fraction)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .branch_sim import BranchSimulator, PredictorConfig, branch_stream
+from .cache_sim import CacheGeometry, CacheSimulator, memory_accesses
+from .trace import FLAG_BRANCH, FLAG_NOT_TAKEN, TimingTable, TraceReplayer, _split_chunk
+
+DEFAULT_INTERVAL = 1_000_000
+DEFAULT_MAX_K = 10
+DEFAULT_DIMENSIONS = 15
+_BBV_BUCKETS = 1 << 12
+_BIC_THRESHOLD = 0.9
+
+
+@dataclass
+class IntervalProfile:
+    """Per-interval basic-block vectors of a trace.
+
+    Attributes:
+        interval: Records per interval (the last one may be shorter)
+        vectors: (n_intervals, dimensions) projected, normalized BBVs
+        instructions: (n_intervals,) records per interval
+        proxy_cycles: (n_intervals,) table cycles of decoded records, or
+            None without a timing table
+        proxy_instructions: (n_intervals,) decoded records, or None
+    """
+    interval: int
+    vectors: np.ndarray
+    instructions: np.ndarray
+    proxy_cycles: Optional[np.ndarray] = None
+    proxy_instructions: Optional[np.ndarray] = None
+
+    @property
+    def n_intervals(self) -> int:
+        return len(self.instructions)
+
+    @property
+    def proxy_cpi(self) -> Optional[np.ndarray]:
+        if self.proxy_cycles is None:
+            return None
+        return self.proxy_cycles / np.maximum(self.proxy_instructions, 1)
+
+
+@dataclass
+class SimulationPoint:
+    """One representative interval."""
+    cluster: int
+    interval: int
+    start: int
+    count: int
+    weight: float
+
+
+@dataclass
+class SimPoints:
+    """Clustering of a trace's intervals and the chosen simulation points.
+
+    Attributes:
+        profile: The IntervalProfile that was clustered
+        labels: (n_intervals,) cluster of each interval
+        points: One SimulationPoint per cluster
+        bic: BIC score per tried k
+    """
+    profile: IntervalProfile
+    labels: np.ndarray
+    points: List[SimulationPoint]
+    bic: Dict[int, float] = field(default_factory=dict)
+
+    @property
+    def k(self) -> int:
+        return len(self.points)
+
+    def proxy_estimate(self) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        """(full-trace proxy CPI, proxy CPI from the points, relative stderr)."""
+        cpi = self.profile.proxy_cpi
+        if cpi is None:
+            return None, None, None
+        profile = self.profile
+        full = float(profile.proxy_cycles.sum() / max(profile.proxy_instructions.sum(), 1))
+        sampled = sum(p.weight * cpi[p.interval] for p in self.points)
+        variance = 0.0
+        for p in self.points:
+            members = cpi[self.labels == p.cluster]
+            variance += p.weight ** 2 * float(members.var()) if len(members) > 1 else 0.0
+        return full, float(sampled), (variance ** 0.5 / full if full else None)
+
+
+@dataclass
+class SampledResult:
+    """Extrapolated metrics of a sampled simulation.
+
+    Attributes:
+        processor: Processor of the timing table ('' without one)
+        instructions: Records in the whole trace
+        simulated: Records simulated and counted (sum of point lengths)
+        warmup: Records simulated for warm-up only
+        points: The simulation points used
+        cpi: Weighted CPI of the points (timing table), or None
+        cpi_stderr: Estimated standard error of ``cpi``, or None
+        proxy_error: Relative error the points make on the full-trace
+            table CPI, or None
+        cache_hit_rates: Weighted hit rate per cache geometry label
+        branch_accuracy: Weighted accuracy per predictor label
+        btb_hit_rates: Weighted BTB hit rate per 'btb' predictor label
+    """
+    processor: str
+    instructions: int
+    simulated: int
+    warmup: int
+    points: List[SimulationPoint]
+    cpi: Optional[float] = None
+    cpi_stderr: Optional[float] = None
+    proxy_error: Optional[float] = None
+    cache_hit_rates: Dict[str, float] = field(default_factory=dict)
+    branch_accuracy: Dict[str, float] = field(default_factory=dict)
+    btb_hit_rates: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def simulated_fraction(self) -> float:
+        """Counted plus warm-up records as a fraction of the trace."""
+        return (self.simulated + self.warmup) / self.instructions if self.instructions else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'processor': self.processor,
+            'instructions': self.instructions,
+            'simulated': self.simulated,
+            'warmup': self.warmup,
+            'simulated_fraction': self.simulated_fraction,
+            'points': [vars(p).copy() for p in self.points],
+            'cpi': self.cpi,
+            'cpi_stderr': self.cpi_stderr,
+            'proxy_error': self.proxy_error,
+            'cache_hit_rates': dict(self.cache_hit_rates),
+            'branch_accuracy': dict(self.branch_accuracy),
+            'btb_hit_rates': dict(self.btb_hit_rates),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Basic-block vectors
+# ---------------------------------------------------------------------------
+
+def _block_keys(chunk, state: Dict) -> np.ndarray:
+    """Basic-block id of every record: the pc of the block's first record.
+
+    A block starts after a branch record or where the pc does not follow
+    the previous instruction.  Plain opcode arrays (no pc) use the opcode,
+    which degrades the BBV to an opcode-mix vector.
+    """
+    names = getattr(getattr(chunk, 'dtype', None), 'names', None)
+    if not names or 'pc' not in names:
+        values, _ = _split_chunk(chunk)
+        return np.asarray(values, dtype=np.int64)
+
+    pc = chunk['pc'].astype(np.int64)
+    n = len(pc)
+    follows = np.empty(n, dtype=np.int64)
+    follows[0] = state.get('next_pc', -1)
+    follows[1:] = pc[:-1] + chunk['length'][:-1]
+    after_branch = np.empty(n, dtype=bool)
+    after_branch[0] = state.get('branch', True)
+    after_branch[1:] = (chunk['flags'][:-1] & FLAG_BRANCH) != 0
+    starts = after_branch | (pc != follows)
+
+    position = np.where(starts, np.arange(n), -1)
+    np.maximum.accumulate(position, out=position)
+    leaders = np.where(position >= 0, pc[np.maximum(position, 0)], state.get('leader', pc[0]))
+    state.update(next_pc=int(pc[-1] + chunk['length'][-1]),
+                 branch=bool(chunk['flags'][-1] & FLAG_BRANCH), leader=int(leaders[-1]))
+    return leaders
+
+
+def _buckets(keys: np.ndarray) -> np.ndarray:
+    hashed = (keys.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(52)
+    return hashed.astype(np.int64) & (_BBV_BUCKETS - 1)
+
+
+def interval_profile(chunks: Iterable, interval: int = DEFAULT_INTERVAL,
+                     table: Optional[TimingTable] = None,
+                     dimensions: int = DEFAULT_DIMENSIONS, seed: int = 0) -> IntervalProfile:
+    """Build projected basic-block vectors over fixed intervals in one pass.
+
+    Args:
+        chunks: Trace record arrays (e.g. a ``TraceReader``) or opcode arrays
+        interval: Records per interval
+        table: Optional timing table for the per-interval proxy CPI
+        dimensions: Dimensions of the random projection
+        seed: Seed of the projection matrix
+
+    Returns:
+        IntervalProfile
+    """
+    projection = np.random.default_rng(seed).standard_normal((_BBV_BUCKETS, dimensions))
+    sums: List[np.ndarray] = []
+    counts: List[np.ndarray] = []
+    cycles: List[np.ndarray] = []
+    decoded: List[np.ndarray] = []
+    state: Dict = {}
+    offset = 0
+
+    def grow(store: List[np.ndarray], size: int, width: Optional[int] = None):
+        while len(store) < size:
+            store.append(np.zeros(width) if width else np.zeros(1))
+
+    for chunk in chunks:
+        n = len(chunk)
+        if not n:
+            continue
+        ids = (offset + np.arange(n)) // interval
+        first, last = int(ids[0]), int(ids[-1])
+        local = ids - first
+        span = last - first + 1
+
+        bucket = _buckets(_block_keys(chunk, state))
+        histogram = np.bincount(local * _BBV_BUCKETS + bucket,
+                                minlength=span * _BBV_BUCKETS).reshape(span, _BBV_BUCKETS)
+        projected = histogram @ projection
+        per_interval = np.bincount(local, minlength=span)
+        grow(sums, last + 1, dimensions)
+        grow(counts, last + 1)
+        for i in range(span):
+            sums[first + i] += projected[i]
+            counts[first + i] += per_interval[i]
+
+        if table is not None:
+            values, flags = _split_chunk(chunk)
+            entries = table.lookup(values)
+            known = entries >= 0
+            entry = np.maximum(entries, 0)
+            record_cycles = table.cycles[entry]
+            if flags is not None:
+                not_taken = (np.asarray(flags) & FLAG_NOT_TAKEN) != 0
+                record_cycles = np.where(not_taken, table.cycles_not_taken[entry], record_cycles)
+            chunk_cycles = np.bincount(local, weights=np.where(known, record_cycles, 0.0),
+                                       minlength=span)
+            chunk_decoded = np.bincount(local, weights=known, minlength=span)
+            grow(cycles, last + 1)
+            grow(decoded, last + 1)
+            for i in range(span):
+                cycles[first + i] += chunk_cycles[i]
+                decoded[first + i] += chunk_decoded[i]
+        offset += n
+
+    instructions = np.concatenate(counts) if counts else np.zeros(0)
+    vectors = (np.vstack(sums) / np.maximum(instructions, 1)[:, None]
+               if sums else np.zeros((0, dimensions)))
+    return IntervalProfile(
+        interval=interval,
+        vectors=vectors,
+        instructions=instructions.astype(np.int64),
+        proxy_cycles=np.concatenate(cycles) if table is not None and cycles else None,
+        proxy_instructions=(np.concatenate(decoded).astype(np.int64)
+                            if table is not None and decoded else None),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Clustering
+# ---------------------------------------------------------------------------
+
+def _squared_distances(X: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    return ((X ** 2).sum(1)[:, None] - 2.0 * X @ centers.T + (centers ** 2).sum(1)[None, :]).clip(0)
+
+
+def kmeans(X: np.ndarray, k: int, seed: int = 0, n_init: int = 5,
+           max_iter: int = 100) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Lloyd's k-means with k-means++ seeding; best of ``n_init`` runs.
+
+    Returns:
+        (centers, labels, inertia)
+    """
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    k = min(k, n)
+    best: Optional[Tuple[np.ndarray, np.ndarray, float]] = None
+    for _ in range(n_init):
+        centers = np.empty((k, X.shape[1]))
+        centers[0] = X[rng.integers(n)]
+        nearest = _squared_distances(X, centers[:1])[:, 0]
+        for c in range(1, k):
+            total = nearest.sum()
+            pick = rng.choice(n, p=nearest / total) if total > 0 else rng.integers(n)
+            centers[c] = X[pick]
+            nearest = np.minimum(nearest, _squared_distances(X, centers[c:c + 1])[:, 0])
+
+        labels = np.full(n, -1)
+        for _ in range(max_iter):
+            distances = _squared_distances(X, centers)
+            new_labels = distances.argmin(1)
+            if np.array_equal(new_labels, labels):
+                break
+            labels = new_labels
+            sizes = np.bincount(labels, minlength=k)
+            sums = np.zeros_like(centers)
+            np.add.at(sums, labels, X)
+            filled = sizes > 0
+            centers[filled] = sums[filled] / sizes[filled, None]
+        inertia = float(distances[np.arange(n), labels].sum())
+        if best is None or inertia < best[2]:
+            best = (centers.copy(), labels.copy(), inertia)
+    return best
+
+
+def bic_score(X: np.ndarray, labels: np.ndarray, centers: np.ndarray) -> float:
+    """Bayesian information criterion of a spherical-Gaussian clustering."""
+    n, dims = X.shape
+    k = len(centers)
+    sizes = np.bincount(labels, minlength=k)
+    sse = float(((X - centers[labels]) ** 2).sum())
+    variance = sse / max(dims * (n - k), 1)
+    if variance <= 0:
+        variance = 1e-12
+    present = sizes[sizes > 0]
+    log_likelihood = float(np.sum(present * np.log(present)) - n * np.log(n)
+                           - n * dims / 2.0 * np.log(2 * np.pi * variance)
+                           - dims * (n - k) / 2.0)
+    parameters = k * (dims + 1)
+    return log_likelihood - parameters / 2.0 * np.log(n)
+
+
+def find_simpoints(profile: IntervalProfile, max_k: int = DEFAULT_MAX_K,
+                   seed: int = 0) -> SimPoints:
+    """Cluster the intervals and pick one weighted simulation point per cluster."""
+    X = profile.vectors
+    n = len(X)
+    if not n:
+        return SimPoints(profile, np.zeros(0, dtype=np.int64), [])
+
+    runs = {}
+    for k in range(1, min(max_k, n) + 1):
+        centers, labels, _ = kmeans(X, k, seed=seed)
+        runs[k] = (centers, labels, bic_score(X, labels, centers))
+    scores = {k: run[2] for k, run in runs.items()}
+    low, high = min(scores.values()), max(scores.values())
+    chosen = min(k for k, s in scores.items() if s >= low + _BIC_THRESHOLD * (high - low))
+    centers, labels, _ = runs[chosen]
+
+    total = float(profile.instructions.sum())
+    distances = _squared_distances(X, centers)
+    points = []
+    for cluster in range(len(centers)):
+        members = np.flatnonzero(labels == cluster)
+        if not len(members):
+            continue
+        interval = int(members[distances[members, cluster].argmin()])
+        points.append(SimulationPoint(
+            cluster=cluster,
+            interval=interval,
+            start=interval * profile.interval,
+            count=int(profile.instructions[interval]),
+            weight=float(profile.instructions[members].sum() / total),
+        ))
+    return SimPoints(profile, labels, points, scores)
+
+
+# ---------------------------------------------------------------------------
+# Simulation of the points
+# ---------------------------------------------------------------------------
+
+def _cache_delta(before, after) -> List[Tuple[int, int]]:
+    return [(a.hits - b.hits, a.accesses - b.accesses) for b, a in zip(before, after)]
+
+
+def simulate_points(reader, simpoints: SimPoints, table: Optional[TimingTable] = None,
+                    geometries: Sequence[CacheGeometry] = (),
+                    predictors: Sequence[PredictorConfig] = (),
+                    warmup: Optional[int] = None, kind: str = 'data') -> SampledResult:
+    """Simulate only the simulation points and extrapolate.
+
+    Args:
+        reader: Random-access trace (``common.tracefile.TraceReader``)
+        simpoints: Result of ``find_simpoints``
+        table: Timing table for CPI
+        geometries: Cache organizations to simulate
+        predictors: Branch predictors to simulate
+        warmup: Records simulated before each point without being counted
+            (default: a quarter interval)
+        kind: Cache access kind ('data', 'instruction', 'unified')
+
+    Returns:
+        SampledResult
+    """
+    interval = simpoints.profile.interval
+    warmup = interval // 4 if warmup is None else warmup
+    cpis, caches, branches = [], [], []
+    warmed = 0
+    for point in simpoints.points:
+        begin = max(0, point.start - warmup)
+        records = reader.read(begin, point.start + point.count - begin)
+        split = point.start - begin
+        warm, measured = records[:split], records[split:]
+        warmed += len(warm)
+
+        if table is not None:
+            replayer = TraceReplayer(table)
+            replayer.update(measured['opcode'], measured['flags'])
+            cpis.append(replayer.result().cpi)
+        if geometries:
+            sim = CacheSimulator(geometries)
+            sim.feed(*memory_accesses(warm, kind))
+            before = sim.results()
+            sim.feed(*memory_accesses(measured, kind))
+            caches.append(_cache_delta(before, sim.results()))
+        if predictors:
+            sim = BranchSimulator(predictors)
+            sim.feed(*branch_stream(warm))
+            before = [replace(s) for s in sim.results()]
+            sim.feed(*branch_stream(measured))
+            branches.append([(a.correct - b.correct, a.branches - b.branches,
+                              a.btb_hits - b.btb_hits, a.btb_lookups - b.btb_lookups)
+                             for b, a in zip(before, sim.results())])
+
+    weights = np.array([p.weight for p in simpoints.points])
+    weights = weights / weights.sum() if len(weights) else weights
+    result = SampledResult(
+        processor=table.processor if table is not None else '',
+        instructions=int(simpoints.profile.instructions.sum()),
+        simulated=sum(p.count for p in simpoints.points),
+        warmup=warmed,
+        points=list(simpoints.points),
+    )
+
+    if cpis:
+        result.cpi = float(weights @ np.array(cpis))
+        full, sampled, relative = simpoints.proxy_estimate()
+        if full:
+            result.proxy_error = (sampled - full) / full
+            result.cpi_stderr = float(relative * result.cpi)
+    for g, geometry in enumerate(geometries):
+        hits = sum(w * c[g][0] for w, c in zip(weights, caches))
+        accesses = sum(w * c[g][1] for w, c in zip(weights, caches))
+        result.cache_hit_rates[geometry.label] = float(hits / accesses) if accesses else 0.0
+    for b, config in enumerate(predictors):
+        correct = sum(w * s[b][0] for w, s in zip(weights, branches))
+        total = sum(w * s[b][1] for w, s in zip(weights, branches))
+        result.branch_accuracy[config.label] = float(correct / total) if total else 0.0
+        if config.kind == 'btb':
+            hits = sum(w * s[b][2] for w, s in zip(weights, branches))
+            lookups = sum(w * s[b][3] for w, s in zip(weights, branches))
+            result.btb_hit_rates[config.label] = float(hits / lookups) if lookups else 0.0
+    return result
+
+
+def sampled_replay(reader, table: Optional[TimingTable] = None,
+                   geometries: Sequence[CacheGeometry] = (),
+                   predictors: Sequence[PredictorConfig] = (),
+                   interval: int = DEFAULT_INTERVAL, max_k: int = DEFAULT_MAX_K,
+                   warmup: Optional[int] = None, kind: str = 'data',
+                   seed: int = 0) -> SampledResult:
+    """Profile a trace, choose simulation points and simulate only those.
+
+    Args:
+        reader: Random-access trace (``common.tracefile.TraceReader``)
+        table: Timing table for CPI and the error estimate
+        geometries: Cache organizations to simulate
+        predictors: Branch predictors to simulate
+        interval: Records per interval
+        max_k: Largest number of clusters tried
+        warmup: Warm-up records per point (default: a quarter interval)
+        kind: Cache access kind
+        seed: Seed for projection and clustering
+
+    Returns:
+        SampledResult
+    """
+    profile = interval_profile(reader, interval, table, seed=seed)
+    simpoints = find_simpoints(profile, max_k, seed)
+    return simulate_points(reader, simpoints, table, geometries, predictors, warmup, kind)
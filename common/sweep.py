@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Instruction-Mix Sweeps over the Probability Simplex
+=====================================================
+
+Generates large numbers of instruction-category mixes and evaluates them in
+chunks through a vectorized evaluator, streaming the results to memory-mapped
+``.npy`` files so that sweeps of many millions of mixes never hold the full
+result set in RAM.
+
+Samplers (each yields ``(chunk_size, n_categories)`` arrays whose rows sum
+to 1.0):
+
+1. **dirichlet** — i.i.d. Dirichlet(alpha) samples (alpha=1 is uniform).
+2. **sobol** — scrambled Sobol points mapped onto the simplex by sorting
+   and differencing, giving low-discrepancy coverage.  The count and the
+   chunk size are powers of two (``n`` is rounded up), which keeps the
+   balance properties of the sequence.
+3. **lattice** — every mix whose weights are multiples of 1/resolution
+   (exhaustive, deterministic).
+
+Store layout (one directory per sweep):
+    cpi.npy         float32 CPI, one entry per mix
+    mixes.npy       float32 (n, n_categories) mixes   (optional)
+    summary.json    SweepSummary: statistics, extremes, histogram
+
+Usage:
+    from common.evaluator import VectorizedEvaluator
+    from common.sweep import sweep_mixes
+    summary = sweep_mixes(VectorizedEvaluator(model), 10_000_000, "out/z80_sweep")
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import itertools
+import json
+import math
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+SAMPLING_METHODS = ('dirichlet', 'sobol', 'lattice')
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+HISTOGRAM_BINS = 4096
+
+
+# ---------------------------------------------------------------------------
+# Samplers
+# ---------------------------------------------------------------------------
+
+def dirichlet_mixes(n: int, n_categories: int, *, alpha: Union[float, np.ndarray] = 1.0,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    seed: Optional[int] = 0) -> Iterator[np.ndarray]:
+    """Yield ``n`` Dirichlet(alpha) mixes in chunks.
+
+    Args:
+        n: Total number of mixes
+        n_categories: Number of instruction categories
+        alpha: Concentration (scalar or per-category); 1.0 = uniform on simplex
+        chunk_size: Rows per yielded chunk
+        seed: Random seed for reproducibility
+    """
+    rng = np.random.default_rng(seed)
+    alpha = np.broadcast_to(np.asarray(alpha, dtype=np.float64), (n_categories,))
+    for start in range(0, n, chunk_size):
+        rows = min(chunk_size, n - start)
+        # Normalized Gamma draws; cheaper than rng.dirichlet for large batches
+        gammas = rng.standard_gamma(alpha, size=(rows, n_categories))
+        yield gammas / gammas.sum(axis=1, keepdims=True)
+
+
+def sobol_size(n: int) -> int:
+    """Number of Sobol mixes drawn for a requested ``n`` (next power of two)."""
+    return 1 << (int(n) - 1).bit_length() if n > 0 else 0
+
+
+def sobol_mixes(n: int, n_categories: int, *, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                seed: Optional[int] = 0, scramble: bool = True) -> Iterator[np.ndarray]:
+    """Yield ``sobol_size(n)`` low-discrepancy mixes from a Sobol sequence in chunks.
+
+    Points in the (k-1)-cube are sorted per row and differenced, which maps
+    the uniform measure on the cube to the uniform measure on the simplex.
+    Sobol points are only balanced in blocks of 2**m, so ``n`` is rounded
+    up and ``chunk_size`` down to a power of two: every chunk, and the whole
+    sample, is then a balanced block.
+    """
+    from scipy.stats import qmc
+
+    n = sobol_size(n)
+    chunk_size = 1 << (max(int(chunk_size), 1).bit_length() - 1)
+    if n_categories == 1:
+        for start in range(0, n, chunk_size):
+            yield np.ones((min(chunk_size, n - start), 1))
+        return
+
+    sampler = qmc.Sobol(d=n_categories - 1, scramble=scramble, seed=seed)
+    for start in range(0, n, chunk_size):
+        rows = min(chunk_size, n - start)
+        cube = np.sort(sampler.random(rows), axis=1)
+        edges = np.hstack([np.zeros((rows, 1)), cube, np.ones((rows, 1))])
+        yield np.diff(edges, axis=1)
+
+
+def lattice_size(n_categories: int, resolution: int) -> int:
+    """Number of lattice mixes for a given category count and resolution."""
+    return math.comb(resolution + n_categories - 1, n_categories - 1)
+
+
+def lattice_mixes(n_categories: int, resolution: int, *,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """Yield every mix with weights in multiples of 1/resolution.
+
+    Uses stars-and-bars: each combination of ``n_categories - 1`` bar
+    positions among ``resolution + n_categories - 1`` slots is one mix.
+    """
+    if n_categories == 1:
+        yield np.ones((1, 1))
+        return
+    slots = resolution + n_categories - 1
+    bars = itertools.combinations(range(slots), n_categories - 1)
+    while True:
+        chunk = np.array(list(itertools.islice(bars, chunk_size)), dtype=np.int64)
+        if chunk.size == 0:
+            return
+        rows = len(chunk)
+        edges = np.hstack([np.full((rows, 1), -1), chunk, np.full((rows, 1), slots)])
+        yield (np.diff(edges, axis=1) - 1) / resolution
+
+
+def iter_mixes(method: str, n: int, n_categories: int, *,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, seed: Optional[int] = 0,
+               alpha: Union[float, np.ndarray] = 1.0,
+               resolution: Optional[int] = None) -> Iterator[np.ndarray]:
+    """Dispatch to a sampler by name (see SAMPLING_METHODS).
+
+    For 'lattice', ``resolution`` sets the grid and ``n`` is ignored; for
+    'sobol', ``sobol_size(n)`` mixes are produced.
+    """
+    if method == 'dirichlet':
+        return dirichlet_mixes(n, n_categories, alpha=alpha, chunk_size=chunk_size, seed=seed)
+    if method == 'sobol':
+        return sobol_mixes(n, n_categories, chunk_size=chunk_size, seed=seed)
+    if method == 'lattice':
+        if resolution is None:
+            raise ValueError("lattice sampling requires a resolution")
+        return lattice_mixes(n_categories, resolution, chunk_size=chunk_size)
+    raise ValueError(f"Unknown sampling method '{method}'. Choose from: {SAMPLING_METHODS}")
+
+
+# ---------------------------------------------------------------------------
+# Summary statistics
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SweepSummary:
+    """Streaming summary of a sweep's CPI values."""
+    processor: str
+    method: str
+    categories: List[str]
+    count: int = 0
+    mean: float = 0.0
+    std: float = 0.0
+    min_cpi: float = math.inf
+    max_cpi: float = -math.inf
+    argmin: int = -1
+    argmax: int = -1
+    min_mix: Dict[str, float] = field(default_factory=dict)
+    max_mix: Dict[str, float] = field(default_factory=dict)
+    percentiles: Dict[str, float] = field(default_factory=dict)
+    histogram_range: List[float] = field(default_factory=list)
+    histogram: List[int] = field(default_factory=list)
+    elapsed_s: float = 0.0
+    mixes_per_minute: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class _RunningStats:
+    """Chunk-merging mean/variance (Chan et al.) plus extremes and histogram.
+
+    The histogram range starts at ``hist_range`` (or, without one, the first
+    chunk's range, padded).  Values outside it widen the range by doubling
+    it towards them and merging adjacent bins, so no value is ever dropped.
+    """
+
+    def __init__(self, categories: List[str], hist_range):
+        self.categories = categories
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.argmin = self.argmax = -1
+        self.min_mix = self.max_mix = None
+        self.hist_range = hist_range
+        self.hist = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+
+    def update(self, offset: int, cpi: np.ndarray, mixes: np.ndarray):
+        n = cpi.size
+        if n == 0:
+            return
+        chunk_mean = float(cpi.mean())
+        chunk_m2 = float(((cpi - chunk_mean) ** 2).sum())
+        total = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += chunk_m2 + delta * delta * self.count * n / total
+        self.count = total
+
+        lo, hi = int(np.argmin(cpi)), int(np.argmax(cpi))
+        if cpi[lo] < self.min:
+            self.min, self.argmin, self.min_mix = float(cpi[lo]), offset + lo, mixes[lo].copy()
+        if cpi[hi] > self.max:
+            self.max, self.argmax, self.max_mix = float(cpi[hi]), offset + hi, mixes[hi].copy()
+
+        if self.hist_range is None:
+            # No analytic bounds: start from the first chunk's range (padded)
+            span = max(self.max - self.min, 1e-9)
+            self.hist_range = (self.min - span, self.max + span)
+        finite = cpi[np.isfinite(cpi)]
+        if finite.size:
+            self._widen(float(finite.min()), float(finite.max()))
+        counts, _ = np.histogram(finite, bins=HISTOGRAM_BINS, range=self.hist_range)
+        self.hist += counts
+
+    def _widen(self, low: float, high: float):
+        """Double the histogram range until it covers [low, high]."""
+        lo, hi = self.hist_range
+        while low < lo or high > hi:
+            merged = self.hist.reshape(-1, 2).sum(axis=1)
+            self.hist = np.zeros(HISTOGRAM_BINS, dtype=np.int64)
+            span = hi - lo
+            if high > hi:
+                # Grow upwards: old bins fill the lower half
+                self.hist[:HISTOGRAM_BINS // 2] = merged
+                hi = lo + 2.0 * span
+            else:
+                self.hist[HISTOGRAM_BINS // 2:] = merged
+                lo = hi - 2.0 * span
+        self.hist_range = (lo, hi)
+
+    def percentile(self, q: float) -> float:
+        cumulative = np.cumsum(self.hist)
+        if not cumulative.size or cumulative[-1] == 0:
+            return math.nan
+        idx = int(np.searchsorted(cumulative, q / 100.0 * cumulative[-1]))
+        lo, hi = self.hist_range
+        width = (hi - lo) / HISTOGRAM_BINS
+        return lo + (min(idx, HISTOGRAM_BINS - 1) + 0.5) * width
+
+    def summary(self, processor: str, method: str) -> SweepSummary:
+        def as_mix(row):
+            if row is None:
+                return {}
+            return {c: round(float(w), 6) for c, w in zip(self.categories, row)}
+
+        return SweepSummary(
+            processor=processor,
+            method=method,
+            categories=list(self.categories),
+            count=self.count,
+            mean=self.mean,
+            std=math.sqrt(self.m2 / self.count) if self.count else 0.0,
+            min_cpi=self.min,
+            max_cpi=self.max,
+            argmin=self.argmin,
+            argmax=self.argmax,
+            min_mix=as_mix(self.min_mix),
+            max_mix=as_mix(self.max_mix),
+            percentiles={f"p{q:g}": self.percentile(q) for q in (1, 5, 25, 50, 75, 95, 99)},
+            histogram_range=list(self.hist_range) if self.hist_range else [],
+            histogram=self.hist.tolist(),
+        )
+
+
+# ---------------------------------------------------------------------------
+# Sweep driver
+# ---------------------------------------------------------------------------
+
+def _cpi_function(evaluator) -> Callable[[np.ndarray], np.ndarray]:
+    """Adapt a VectorizedEvaluator, QueueingModel or callable to W -> cpi."""
+    if hasattr(evaluator, 'cpi') and callable(evaluator.cpi):
+        return evaluator.cpi
+    if hasattr(evaluator, 'workload_matrix'):  # QueueingModel
+        return evaluator.weighted_cpi
+    if callable(evaluator):
+        return evaluator
+    raise TypeError(f"Cannot evaluate mixes with {type(evaluator).__name__}")
+
+
+def _category_names(evaluator, categories: Optional[List[str]]) -> List[str]:
+    """Column order of the evaluator's weight matrices."""
+    names = getattr(evaluator, 'category_names', None)
+    if names is not None:
+        return list(names)
+    if categories is None:
+        raise TypeError("evaluator must expose category_names (or pass categories=)")
+    return list(categories)
+
+
+def sweep_mixes(
+    evaluator,
+    n: int,
+    out_dir: Optional[Union[str, Path]] = None,
+    *,
+    method: str = 'dirichlet',
+    categories: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    seed: Optional[int] = 0,
+    alpha: Union[float, np.ndarray] = 1.0,
+    resolution: Optional[int] = None,
+    store_mixes: bool = True,
+) -> SweepSummary:
+    """Sample ``n`` instruction mixes, evaluate them, and stream results to disk.
+
+    Args:
+        evaluator: VectorizedEvaluator, QueueingModel, or any callable mapping a
+                   (rows, categories) weight matrix to a CPI array
+        n: Number of mixes (ignored for 'lattice', which is exhaustive;
+           rounded up to a power of two for 'sobol')
+        out_dir: Store directory; None keeps only the summary
+        method: 'dirichlet', 'sobol' or 'lattice'
+        categories: Sweep only these categories (others held at zero).
+                    Defaults to all of the evaluator's categories.
+        chunk_size: Mixes evaluated per chunk (bounds peak memory)
+        seed: Random seed for 'dirichlet' and 'sobol'
+        alpha: Dirichlet concentration
+        resolution: Lattice resolution (weights are multiples of 1/resolution)
+        store_mixes: Also write the sampled mixes to mixes.npy
+
+    Returns:
+        SweepSummary (also written to out_dir/summary.json)
+    """
+    cpi_of = _cpi_function(evaluator)
+    all_names = _category_names(evaluator, categories)
+    swept = list(categories) if categories is not None else list(all_names)
+    missing = [c for c in swept if c not in all_names]
+    if missing:
+        raise KeyError(f"Unknown categories for sweep: {missing}")
+    columns = np.array([all_names.index(c) for c in swept], dtype=np.intp)
+
+    if method == 'lattice':
+        if resolution is None:
+            raise ValueError("lattice sampling requires a resolution")
+        n = lattice_size(len(swept), resolution)
+    elif method == 'sobol':
+        n = sobol_size(n)
+
+    bounds = evaluator.cpi_bounds() if hasattr(evaluator, 'cpi_bounds') else None
+    stats = _RunningStats(swept, bounds if bounds and bounds[1] > bounds[0] else None)
+
+    cpi_store = mix_store = None
+    if out_dir is not None:
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        cpi_store = np.lib.format.open_memmap(out_dir / "cpi.npy", mode='w+',
+                                              dtype=np.float32, shape=(n,))
+        if store_mixes:
+            mix_store = np.lib.format.open_memmap(out_dir / "mixes.npy", mode='w+',
+                                                  dtype=np.float32, shape=(n, len(swept)))
+
+    full = np.zeros((min(chunk_size, max(n, 1)), len(all_names)), dtype=np.float64)
+    start_time = time.perf_counter()
+    offset = 0
+    for mixes in iter_mixes(method, n, len(swept), chunk_size=chunk_size, seed=seed,
+                            alpha=alpha, resolution=resolution):
+        rows = len(mixes)
+        weights = full[:rows]
+        weights[:, columns] = mixes
+        cpi = np.asarray(cpi_of(weights), dtype=np.float64)
+        stats.update(offset, cpi, mixes)
+        if cpi_store is not None:
+            cpi_store[offset:offset + rows] = cpi
+            if mix_store is not None:
+                mix_store[offset:offset + rows] = mixes
+        offset += rows
+
+    elapsed = time.perf_counter() - start_time
+    summary = stats.summary(getattr(evaluator, 'processor', ''), method)
+    summary.elapsed_s = elapsed
+    summary.mixes_per_minute = offset / elapsed * 60.0 if elapsed > 0 else math.inf
+
+    if out_dir is not None:
+        cpi_store.flush()
+        if mix_store is not None:
+            mix_store.flush()
+        with open(out_dir / "summary.json", "w") as f:
+            json.dump(summary.to_dict(), f, indent=2)
+
+    return summary
+
+
+def load_sweep(out_dir: Union[str, Path]) -> Dict[str, object]:
+    """Open a sweep store read-only (arrays are memory-mapped).
+
+    Returns:
+        Dict with 'cpi', 'mixes' (or None) and 'summary'
+    """
+    out_dir = Path(out_dir)
+    with open(out_dir / "summary.json") as f:
+        summary = json.load(f)
+    mixes_path = out_dir / "mixes.npy"
+    return {
+        'cpi': np.load(out_dir / "cpi.npy", mmap_mode='r'),
+        'mixes': np.load(mixes_path, mmap_mode='r') if mixes_path.exists() else None,
+        'summary': summary,
+    }
@@ -74,7 +74,7 @@ class IdentificationResult:
 # Measurement loading
 # ---------------------------------------------------------------------------
 
-def load_measurements_for_model(model_dir: Path) -> Dict[str, float]:
+def load_measurements_for_model(model_dir: Path, store=None) -> Dict[str, float]:
     """Load measured CPI values from a processor's measurements directory.
 
     Reads ``measurements/measured_cpi.json`` and returns a dict mapping
@@ -84,11 +84,15 @@ def load_measurements_for_model(model_dir: Path) -> Dict[str, float]:
     Args:
         model_dir: Path to the processor directory
                    (e.g. ``models/zilog/z80``)
+        store: Optional synced ``common.measurement_store.MeasurementStore``
+               to answer from instead of parsing the file
 
     Returns:
         Dict mapping workload name to measured CPI float.
         Empty dict if file is missing or unreadable.
     """
+    if store is not None:
+        return store.measurements_for_model(model_dir)
     path = model_dir / "measurements" / "measured_cpi.json"
     if not path.exists():
         return {}
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""
+Trace-Driven CPI Engine
+========================
+
+Replays instruction traces against the per-opcode timing tables shipped in
+``models/<family>/<processor>/timing/<processor>_timing.json`` and reports
+CPI plus the per-category instruction mix.
+
+A timing table is compiled once into array-indexed lookup pages:
+
+    pages[page, byte] >= 0    index of the timing entry
+    pages[page, byte] == -1   unknown opcode
+    pages[page, byte] <= -2   prefix / escape byte; continue in page -(v + 2)
+
+Page 0 decodes the first opcode byte; prefix groups (Z80 CB/DD/ED/FD,
+x86 0F, DDCB+d+op displacement slots, x86 ModRM ``/r`` extensions) get
+their own 256-entry pages.  Decoding a chunk of opcodes is then at most
+four vectorized gathers, and accumulation is a ``bincount`` per chunk, so
+traces of any length stream through in constant memory.
+
+Trace opcodes are the instruction's opcode bytes (prefixes included,
+operands excluded) packed big-endian into an unsigned integer, e.g.
+``0x3E`` (LD A,n), ``0xDD46`` (LD B,(IX+d)), ``0xDDCB0646`` (BIT 0,(IX+6)).
+Tables without opcodes (about 40% of entries) can still be replayed from
+traces of entry indices, see ``TimingTable.encode``.
+
+Usage:
+    from common.trace import load_timing_table, replay_trace, iter_binary_trace
+    table = load_timing_table('models/zilog/z80')
+    result = replay_trace(table, iter_binary_trace('ops.bin', dtype='>u4'))
+    print(result.cpi, result.category_mix())
+
+    # Trace containers (common.tracefile) iterate as record chunks
+    with TraceReader('z80.trace') as reader:
+        result = replay_trace(table, reader)
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .base_model import WorkloadProfile
+
+# Trace flag bits
+FLAG_NOT_TAKEN = 0x0001          # conditional branch fell through
+FLAG_BRANCH = 0x0002             # control transfer (conditional or not)
+FLAG_TAKEN = 0x0004              # control transfer was taken
+FLAG_MEM_READ = 0x0008           # record has a data read at 'addr'
+FLAG_MEM_WRITE = 0x0010          # record has a data write at 'addr'
+FLAG_IO = 0x0020                 # I/O port access
+FLAG_INTERRUPT = 0x0040          # first instruction of an interrupt handler
+
+UNKNOWN_ENTRY = -1
+MAX_OPCODE_BYTES = 4
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Opcode specs that expand to more codes than this are treated as unparseable
+_MAX_EXPANSION = 1 << 16
+
+_ALL_BYTES = tuple(range(256))
+_HEX = re.compile(r'^[0-9a-f]+$')
+
+
+# ---------------------------------------------------------------------------
+# Opcode spec parsing
+# ---------------------------------------------------------------------------
+
+def _hex_bytes(digits: str) -> Tuple[int, ...]:
+    """'dd7e' -> (0xDD, 0x7E); odd-length strings are left-padded."""
+    if len(digits) % 2:
+        digits = '0' + digits
+    return tuple(int(digits[i:i + 2], 16) for i in range(0, len(digits), 2))
+
+
+def _expand_digits(spec: str) -> Optional[List[str]]:
+    """Expand ranges, alternatives and '_' nibble wildcards to hex strings."""
+    if '-' in spec:
+        low, _, high = spec.partition('-')
+        high = high[2:] if high.startswith('0x') else high
+        if not (_HEX.match(low) and _HEX.match(high)) or len(high) > len(low):
+            return None
+        high = low[:len(low) - len(high)] + high
+        start, stop = int(low, 16), int(high, 16)
+        if stop < start or stop - start >= _MAX_EXPANSION:
+            return None
+        return [format(v, f'0{len(low)}x') for v in range(start, stop + 1)]
+    if '/' in spec:
+        first, *alternatives = spec.split('/')
+        if not _HEX.match(first) or not all(_HEX.match(a) and len(a) <= len(first)
+                                             for a in alternatives):
+            return None
+        return [first] + [first[:len(first) - len(a)] + a for a in alternatives]
+    if spec.endswith('_'):
+        # "0x1_": low nibble wildcard
+        base = spec[:-1]
+        if not _HEX.match(base):
+            return None
+        return [base + format(n, 'x') for n in range(16)]
+    if '_' in spec:
+        # "0xED_CB": byte separator
+        spec = spec.replace('_', '')
+    return [spec] if _HEX.match(spec) else None
+
+
+def parse_opcode(spec: Optional[str]) -> Optional[List[List[Tuple[int, ...]]]]:
+    """Parse a timing-table opcode string into byte-slot patterns.
+
+    Each pattern is a list of slots; each slot is the tuple of byte values it
+    matches.  Supported notations (as used across the timing tables):
+
+        0x3E            exact            0xCB08-0F / 0x40-0x7F   ranges
+        0xED4B/5B/6B    alternatives     0x1_                    nibble wildcard
+        0xED_CB         byte separator   0xF3 A4/A5              spaced bytes
+        0xB8+r          +0..7            0xCB46+8*b              +8*k, k=0..7
+        0x81/0          ModRM reg field  0xDD46+offset           trailing operand
+        0xDDCB+d+06     displacement slot followed by opcode byte
+
+    Returns:
+        List of patterns, or None if the spec is absent or not understood
+    """
+    if not spec or not isinstance(spec, str):
+        return None
+    text = spec.strip().lower().replace(' ', '')
+    if not text.startswith('0x'):
+        return None
+    text = text[2:]
+
+    # x86 ModRM extension: "81/0" -> opcode 0x81 followed by any ModRM byte
+    # whose reg field is 0
+    modrm = re.fullmatch(r'([0-9a-f]{2,})/([0-7])', text)
+    if modrm:
+        reg = int(modrm.group(2))
+        slots = [(b,) for b in _hex_bytes(modrm.group(1))]
+        return [slots + [tuple(b for b in _ALL_BYTES if (b >> 3) & 7 == reg)]]
+
+    head, *terms = text.split('+')
+    codes = _expand_digits(head)
+    if codes is None:
+        return None
+
+    patterns = []
+    for code in codes:
+        slots = [(b,) for b in _hex_bytes(code)]
+        for position, term in enumerate(terms):
+            trailing = position == len(terms) - 1
+            if term in ('r', 'rb', 'rw', 'rd'):
+                slots[-1] = tuple(slots[-1][0] + k for k in range(8) if slots[-1][0] + k < 256)
+            elif re.fullmatch(r'8\*[a-z]', term):
+                slots[-1] = tuple(slots[-1][0] + 8 * k for k in range(8)
+                                  if slots[-1][0] + 8 * k < 256)
+            elif term in ('d', 'disp', 'offset', 'n', 'nn', 'e'):
+                if trailing:
+                    break           # operand bytes after the opcode
+                slots.append(_ALL_BYTES)
+            elif term == 'op':
+                slots.append(_ALL_BYTES)
+            elif _HEX.match(term) and len(term) % 2 == 0:
+                slots.extend((b,) for b in _hex_bytes(term))
+            else:
+                return None
+        if len(slots) > MAX_OPCODE_BYTES:
+            return None
+        patterns.append(slots)
+    return patterns
+
+
+def _pattern_size(patterns: List[List[Tuple[int, ...]]]) -> int:
+    """Number of distinct opcode byte strings a parsed spec covers."""
+    total = 0
+    for slots in patterns:
+        count = 1
+        for slot in slots:
+            count *= len(slot)
+        total += count
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Compiled timing table
+# ---------------------------------------------------------------------------
+
+class TimingTable:
+    """Array-compiled per-opcode timing table for one processor.
+
+    Attributes:
+        processor: Processor name from the timing file
+        mnemonics: Mnemonic of each entry (entry index order = file order)
+        categories: Distinct timing categories
+        category_ids: (n_entries,) index into ``categories``
+        cycles: (n_entries,) cycles (branch taken / condition met)
+        cycles_not_taken: (n_entries,) cycles when FLAG_NOT_TAKEN is set
+        opcode_bytes: (n_entries,) instruction length in bytes
+        addressing_modes: Addressing mode of each entry ('' if not given)
+        pairing_classes: Distinct superscalar pairing classes ('' if not given)
+        pairing_ids: (n_entries,) index into ``pairing_classes``
+        pages: (n_pages, 256) opcode lookup pages (see module docstring)
+        page_default: (n_pages,) entry for an opcode that ends on this page
+        unparsed: Opcode strings that could not be compiled
+    """
+
+    def __init__(self, instructions: Sequence[Dict], processor: str = ""):
+        self.processor = processor
+        self.mnemonics: List[str] = [i.get('mnemonic', '') for i in instructions]
+        self.categories: List[str] = []
+        category_index: Dict[str, int] = {}
+        ids = []
+        for instr in instructions:
+            name = instr.get('category', 'unknown')
+            if name not in category_index:
+                category_index[name] = len(self.categories)
+                self.categories.append(name)
+            ids.append(category_index[name])
+        self.category_ids = np.array(ids, dtype=np.int32)
+        self.cycles = np.array([float(i.get('cycles', 0)) for i in instructions])
+        self.cycles_not_taken = np.array(
+            [float(i.get('cycles_not_taken', i.get('cycles', 0))) for i in instructions])
+        self.opcode_bytes = np.array([int(i.get('bytes', 1)) for i in instructions],
+                                     dtype=np.int32)
+        self.addressing_modes: List[str] = [i.get('addressing_mode', '') for i in instructions]
+        self.pairing_classes: List[str] = []
+        pairing_index: Dict[str, int] = {}
+        ids = []
+        for instr in instructions:
+            name = instr.get('pairing', '')
+            if name not in pairing_index:
+                pairing_index[name] = len(self.pairing_classes)
+                self.pairing_classes.append(name)
+            ids.append(pairing_index[name])
+        self.pairing_ids = np.array(ids, dtype=np.int32)
+        self._mnemonic_index: Dict[str, int] = {}
+        for index, mnemonic in enumerate(self.mnemonics):
+            self._mnemonic_index.setdefault(mnemonic, index)
+
+        self.unparsed: List[str] = []
+        self._compile([i.get('opcode') for i in instructions])
+
+    @classmethod
+    def from_json(cls, path: Union[str, Path]) -> 'TimingTable':
+        """Compile a ``*_timing.json`` file."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data.get('instructions', []), data.get('processor', Path(path).stem))
+
+    # -- compilation ---------------------------------------------------
+
+    def _compile(self, opcodes: Sequence[Optional[str]]):
+        parsed = []
+        for order, spec in enumerate(opcodes):
+            if spec is None:
+                continue
+            patterns = parse_opcode(spec)
+            if patterns is None:
+                self.unparsed.append(spec)
+                continue
+            parsed.append((_pattern_size(patterns), order, patterns))
+
+        self._pages: List[np.ndarray] = [np.full(256, UNKNOWN_ENTRY, dtype=np.int32)]
+        self._defaults: List[int] = [UNKNOWN_ENTRY]
+        # Broadest specs first so that narrower ones override them; among
+        # equally broad specs the first listed entry wins.
+        for _, order, patterns in sorted(parsed, key=lambda p: (-p[0], -p[1])):
+            for slots in patterns:
+                self._insert(0, slots, order)
+
+        self.pages = np.stack(self._pages)
+        self.page_default = np.array(self._defaults, dtype=np.int32)
+        self.n_decodable = len(parsed)
+        del self._pages, self._defaults
+
+    def _new_page(self, default: int) -> int:
+        self._pages.append(np.full(256, default, dtype=np.int32))
+        self._defaults.append(default)
+        return len(self._pages) - 1
+
+    def _insert(self, page: int, slots: List[Tuple[int, ...]], entry: int):
+        values = np.array(slots[0])
+        current = self._pages[page][values]
+        if len(slots) == 1:
+            for value, cur in zip(values, current):
+                if cur <= -2:
+                    self._defaults[-cur - 2] = entry
+                else:
+                    self._pages[page][value] = entry
+            return
+
+        # Bytes that need a continuation page; a displacement slot (all 256
+        # values) shares one page per distinct previous content.
+        children = {}
+        for value, cur in zip(values, current):
+            if cur <= -2:
+                children.setdefault(int(cur), []).append(value)
+            else:
+                key = ('new', int(cur))
+                children.setdefault(key, []).append(value)
+        for key, byte_values in children.items():
+            if isinstance(key, tuple):
+                child = self._new_page(key[1])
+                self._pages[page][byte_values] = -(child + 2)
+            else:
+                child = -key - 2
+            self._insert(child, slots[1:], entry)
+
+    # -- lookup --------------------------------------------------------
+
+    def lookup(self, opcodes: np.ndarray) -> np.ndarray:
+        """Map packed opcode words to entry indices (UNKNOWN_ENTRY if none)."""
+        words = np.asarray(opcodes).astype(np.uint32, copy=False)
+        n_bytes = np.ones(len(words), dtype=np.uint32)
+        for limit in (0xFF, 0xFFFF, 0xFFFFFF):
+            n_bytes += words > limit
+        remaining = n_bytes - 1
+        shift = remaining << 3
+        result = self.pages[0][(words >> shift) & 0xFF]
+
+        # Only prefixed opcodes walk further pages; they are usually a
+        # small fraction of a trace, so work on their indices alone.
+        rows = np.flatnonzero(result <= -2)
+        page = -result[rows] - 2
+        while len(rows):
+            more = remaining[rows] > 0
+            ended = rows[~more]
+            result[ended] = self.page_default[page[~more]]
+            rows, page = rows[more], page[more]
+            remaining[rows] -= 1
+            shift = remaining[rows] << 3
+            value = self.pages[page, (words[rows] >> shift) & 0xFF]
+            result[rows] = value
+            follow = value <= -2
+            rows, page = rows[follow], -value[follow] - 2
+        return result
+
+    def index_of(self, mnemonic: str) -> int:
+        """Entry index of the first entry with this mnemonic."""
+        return self._mnemonic_index.get(mnemonic, UNKNOWN_ENTRY)
+
+    def encode(self, mnemonics: Iterable[str]) -> np.ndarray:
+        """Map mnemonic strings to entry indices (for opcode-less tables)."""
+        return np.array([self.index_of(m) for m in mnemonics], dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.mnemonics)
+
+
+def find_timing_file(model_dir: Union[str, Path]) -> Optional[Path]:
+    """Locate ``timing/<processor>_timing.json`` under a model directory."""
+    path = Path(model_dir)
+    if path.is_file():
+        return path
+    candidates = sorted((path / 'timing').glob('*_timing.json'))
+    return candidates[0] if candidates else None
+
+
+def load_timing_table(model_dir: Union[str, Path]) -> TimingTable:
+    """Compile the timing table of a model directory (or timing JSON path)."""
+    path = find_timing_file(model_dir)
+    if path is None:
+        raise FileNotFoundError(f"No *_timing.json found for {model_dir}")
+    return TimingTable.from_json(path)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+
+@dataclass
+class TraceResult:
+    """Aggregate of a replayed trace.
+
+    Attributes:
+        processor: Processor name of the timing table
+        instructions: Decoded instructions (unknown opcodes excluded)
+        cycles: Total cycles of decoded instructions
+        unknown: Trace records whose opcode is not in the table
+        entry_counts: (n_entries,) executions per timing entry
+        not_taken_counts: (n_entries,) executions with FLAG_NOT_TAKEN
+        category_counts / category_cycles: Per timing category
+    """
+    processor: str
+    instructions: int
+    cycles: float
+    unknown: int
+    entry_counts: np.ndarray
+    not_taken_counts: np.ndarray
+    category_counts: Dict[str, int] = field(default_factory=dict)
+    category_cycles: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def cpi(self) -> float:
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    @property
+    def coverage(self) -> float:
+        """Fraction of trace records found in the timing table."""
+        total = self.instructions + self.unknown
+        return self.instructions / total if total else 0.0
+
+    def category_mix(self) -> Dict[str, float]:
+        """Fraction of instructions per timing category."""
+        if not self.instructions:
+            return {}
+        return {cat: n / self.instructions for cat, n in self.category_counts.items()}
+
+    def to_workload_profile(self, name: str = 'trace',
+                            category_map: Optional[Dict[str, str]] = None,
+                            description: str = "") -> WorkloadProfile:
+        """Instruction mix as a WorkloadProfile.
+
+        Args:
+            name: Profile name
+            category_map: Optional timing-category -> model-category mapping;
+                unmapped categories keep their timing-table name
+            description: Profile description
+        """
+        weights: Dict[str, float] = {}
+        for cat, share in self.category_mix().items():
+            target = (category_map or {}).get(cat, cat)
+            weights[target] = weights.get(target, 0.0) + share
+        return WorkloadProfile(name, weights,
+                               description or f"Replayed trace ({self.instructions} instructions)")
+
+    def to_dict(self) -> Dict:
+        return {
+            'processor': self.processor,
+            'instructions': self.instructions,
+            'cycles': self.cycles,
+            'cpi': self.cpi,
+            'unknown': self.unknown,
+            'coverage': self.coverage,
+            'category_mix': self.category_mix(),
+            'category_cycles': dict(self.category_cycles),
+        }
+
+
+class TraceReplayer:
+    """Streaming accumulator of trace chunks against a timing table.
+
+    Feed chunks with ``update()`` (opcode words or entry indices, optional
+    flags), then call ``result()``.  Memory use is independent of trace
+    length.
+    """
+
+    def __init__(self, table: TimingTable):
+        self.table = table
+        # Slot 0 collects unknown opcodes, entries are shifted by one
+        self._counts = np.zeros(len(table) + 1, dtype=np.int64)
+        self._not_taken = np.zeros(len(table) + 1, dtype=np.int64)
+
+    def update(self, opcodes: Optional[np.ndarray] = None,
+               flags: Optional[np.ndarray] = None,
+               indices: Optional[np.ndarray] = None):
+        """Accumulate one chunk.
+
+        Args:
+            opcodes: Packed opcode words (see module docstring)
+            flags: Per-record flag bits (FLAG_NOT_TAKEN, ...)
+            indices: Entry indices instead of opcodes; indices outside the
+                table (including UNKNOWN_ENTRY wrapped in an unsigned
+                trace field) count as unknown
+        """
+        if indices is None:
+            indices = self.table.lookup(opcodes)
+        entries = np.asarray(indices, dtype=np.int64)
+        known = (entries >= 0) & (entries < len(self.table))
+        slots = np.where(known, entries + 1, 0)
+        size = len(self._counts)
+        self._counts += np.bincount(slots, minlength=size)
+        if flags is not None:
+            not_taken = (np.asarray(flags) & FLAG_NOT_TAKEN) != 0
+            if not_taken.any():
+                self._not_taken += np.bincount(slots[not_taken], minlength=size)
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Accumulated counts, for checkpointing (see ``set_state``)."""
+        return {'counts': self._counts.copy(), 'not_taken': self._not_taken.copy()}
+
+    def set_state(self, state: Dict[str, np.ndarray]):
+        """Restore counts saved by ``state``."""
+        self._counts = np.array(state['counts'], dtype=np.int64)
+        self._not_taken = np.array(state['not_taken'], dtype=np.int64)
+
+    def result(self) -> TraceResult:
+        table = self.table
+        counts = self._counts[1:]
+        not_taken = self._not_taken[1:]
+        taken = counts - not_taken
+        entry_cycles = taken * table.cycles + not_taken * table.cycles_not_taken
+
+        n_categories = len(table.categories)
+        per_category = np.bincount(table.category_ids, weights=counts, minlength=n_categories)
+        cycles_per_category = np.bincount(table.category_ids, weights=entry_cycles,
+                                          minlength=n_categories)
+        return TraceResult(
+            processor=table.processor,
+            instructions=int(counts.sum()),
+            cycles=float(entry_cycles.sum()),
+            unknown=int(self._counts[0]),
+            entry_counts=counts.copy(),
+            not_taken_counts=not_taken.copy(),
+            category_counts={cat: int(n) for cat, n in zip(table.categories, per_category) if n},
+            category_cycles={cat: float(c) for cat, n, c in
+                             zip(table.categories, per_category, cycles_per_category) if n},
+        )
+
+
+def _split_chunk(chunk) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Accept plain arrays, (opcodes, flags) tuples or record arrays."""
+    if isinstance(chunk, tuple):
+        return chunk[0], chunk[1]
+    names = getattr(getattr(chunk, 'dtype', None), 'names', None)
+    if names:
+        return chunk['opcode'], chunk['flags'] if 'flags' in names else None
+    return chunk, None
+
+
+def replay_trace(table: TimingTable, chunks: Iterable, indices: bool = False) -> TraceResult:
+    """Replay a chunked trace through a compiled timing table.
+
+    Args:
+        table: Compiled timing table
+        chunks: Iterable of opcode arrays, (opcodes, flags) tuples, or record
+            arrays with 'opcode' (and optionally 'flags') fields
+        indices: Chunks hold entry indices rather than opcode words
+
+    Returns:
+        TraceResult with CPI and per-category mix
+    """
+    replayer = TraceReplayer(table)
+    for chunk in chunks:
+        values, flags = _split_chunk(chunk)
+        if indices:
+            replayer.update(flags=flags, indices=values)
+        else:
+            replayer.update(values, flags)
+    return replayer.result()
+
+
+def iter_binary_trace(path: Union[str, Path], dtype='<u4',
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      offset: int = 0) -> Iterator[np.ndarray]:
+    """Yield chunks of a raw binary array file through a memory map.
+
+    Only the pages touched by the current chunk are read, so files far
+    larger than RAM can be replayed.
+
+    Args:
+        path: File of fixed-width records (opcode words or a record dtype)
+        dtype: NumPy dtype of one record
+        chunk_size: Records per chunk
+        offset: Byte offset of the first record
+    """
+    data = np.memmap(path, dtype=np.dtype(dtype), mode='r', offset=offset)
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
@@ -12,58 +12,61 @@ AMD Am29000 Grey-Box Queueing Model
 from dataclasses import dataclass
 from typing import Dict, Any
 
-@dataclass
-class InstructionCategory:
-    name: str
-    base_cycles: float
-    memory_cycles: float = 0
-    description: str = ""
-    @property
-    def total_cycles(self): return self.base_cycles + self.memory_cycles
-
-@dataclass
-class CacheConfig:
-    has_cache: bool = False
-    l1_latency: float = 1.0
-    l1_hit_rate: float = 0.95
-    l2_latency: float = 10.0
-    l2_hit_rate: float = 0.90
-    has_l2: bool = False
-    dram_latency: float = 50.0
-    def effective_memory_penalty(self):
-        if not self.has_cache: return 0.0
-        l1_miss = 1.0 - self.l1_hit_rate
-        if self.has_l2:
-            l2_miss = 1.0 - self.l2_hit_rate
-            return l1_miss * (self.l2_hit_rate * (self.l2_latency - self.l1_latency) + l2_miss * (self.dram_latency - self.l1_latency))
-        return l1_miss * (self.dram_latency - self.l1_latency)
-
-
-@dataclass
-class WorkloadProfile:
-    name: str
-    category_weights: Dict[str, float]
-    description: str = ""
-
-@dataclass
-class AnalysisResult:
-    processor: str
-    workload: str
-    ipc: float
-    cpi: float
-    ips: float
-    bottleneck: str
-    utilizations: Dict[str, float]
-    base_cpi: float = 0.0
-    correction_delta: float = 0.0
-
-    @classmethod
-    def from_cpi(cls, processor, workload, cpi, clock_mhz, bottleneck, utilizations, base_cpi=None, correction_delta=0.0):
-        ipc = 1.0 / cpi if cpi > 0 else 0.0
-        ips = clock_mhz * 1e6 * ipc
-        return cls(processor, workload, ipc, cpi, ips, bottleneck, utilizations,
-                   base_cpi=base_cpi if base_cpi is not None else cpi,
-                   correction_delta=correction_delta)
+try:
+    from common.base_model import InstructionCategory, CacheConfig, WorkloadProfile, AnalysisResult
+except ImportError:
+    @dataclass
+    class InstructionCategory:
+        name: str
+        base_cycles: float
+        memory_cycles: float = 0
+        description: str = ""
+        @property
+        def total_cycles(self): return self.base_cycles + self.memory_cycles
+
+    @dataclass
+    class CacheConfig:
+        has_cache: bool = False
+        l1_latency: float = 1.0
+        l1_hit_rate: float = 0.95
+        l2_latency: float = 10.0
+        l2_hit_rate: float = 0.90
+        has_l2: bool = False
+        dram_latency: float = 50.0
+        def effective_memory_penalty(self):
+            if not self.has_cache: return 0.0
+            l1_miss = 1.0 - self.l1_hit_rate
+            if self.has_l2:
+                l2_miss = 1.0 - self.l2_hit_rate
+                return l1_miss * (self.l2_hit_rate * (self.l2_latency - self.l1_latency) + l2_miss * (self.dram_latency - self.l1_latency))
+            return l1_miss * (self.dram_latency - self.l1_latency)
+
+
+    @dataclass
+    class WorkloadProfile:
+        name: str
+        category_weights: Dict[str, float]
+        description: str = ""
+
+    @dataclass
+    class AnalysisResult:
+        processor: str
+        workload: str
+        ipc: float
+        cpi: float
+        ips: float
+        bottleneck: str
+        utilizations: Dict[str, float]
+        base_cpi: float = 0.0
+        correction_delta: float = 0.0
+
+        @classmethod
+        def from_cpi(cls, processor, workload, cpi, clock_mhz, bottleneck, utilizations, base_cpi=None, correction_delta=0.0):
+            ipc = 1.0 / cpi if cpi > 0 else 0.0
+            ips = clock_mhz * 1e6 * ipc
+            return cls(processor, workload, ipc, cpi, ips, bottleneck, utilizations,
+                       base_cpi=base_cpi if base_cpi is not None else cpi,
+                       correction_delta=correction_delta)
 
 class BaseProcessorModel:
     def get_corrections(self):
@@ -22,44 +22,47 @@ from dataclasses import dataclass
 from typing import Dict, Any, List
 
 
-@dataclass
-class InstructionCategory:
-    name: str
-    base_cycles: float
-    memory_cycles: float = 0
-    description: str = ""
-
-    @property
-    def total_cycles(self):
-        return self.base_cycles + self.memory_cycles
-
-
-@dataclass
-class WorkloadProfile:
-    name: str
-    category_weights: Dict[str, float]
-    description: str = ""
-
-
-@dataclass
-class AnalysisResult:
-    processor: str
-    workload: str
-    ipc: float
-    cpi: float
-    ips: float
-    bottleneck: str
-    utilizations: Dict[str, float]
-    base_cpi: float = 0.0
-    correction_delta: float = 0.0
-
-    @classmethod
-    def from_cpi(cls, processor, workload, cpi, clock_mhz, bottleneck, utilizations, base_cpi=None, correction_delta=0.0):
-        ipc = 1.0 / cpi if cpi > 0 else 0.0
-        ips = clock_mhz * 1e6 * ipc
-        return cls(processor, workload, ipc, cpi, ips, bottleneck, utilizations,
-                   base_cpi=base_cpi if base_cpi is not None else cpi,
-                   correction_delta=correction_delta)
+try:
+    from common.base_model import InstructionCategory, WorkloadProfile, AnalysisResult
+except ImportError:
+    @dataclass
+    class InstructionCategory:
+        name: str
+        base_cycles: float
+        memory_cycles: float = 0
+        description: str = ""
+
+        @property
+        def total_cycles(self):
+            return self.base_cycles + self.memory_cycles
+
+
+    @dataclass
+    class WorkloadProfile:
+        name: str
+        category_weights: Dict[str, float]
+        description: str = ""
+
+
+    @dataclass
+    class AnalysisResult:
+        processor: str
+        workload: str
+        ipc: float
+        cpi: float
+        ips: float
+        bottleneck: str
+        utilizations: Dict[str, float]
+        base_cpi: float = 0.0
+        correction_delta: float = 0.0
+
+        @classmethod
+        def from_cpi(cls, processor, workload, cpi, clock_mhz, bottleneck, utilizations, base_cpi=None, correction_delta=0.0):
+            ipc = 1.0 / cpi if cpi > 0 else 0.0
+            ips = clock_mhz * 1e6 * ipc
+            return cls(processor, workload, ipc, cpi, ips, bottleneck, utilizations,
+                       base_cpi=base_cpi if base_cpi is not None else cpi,
+                       correction_delta=correction_delta)
 
 
 class BaseProcessorModel:
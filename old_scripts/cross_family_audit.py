@@ -31,6 +31,12 @@ from typing import Dict, List, Optional, Set, Tuple, Any
 from collections import defaultdict
 from datetime import datetime
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.jsoncache import load_json
+
 
 # =============================================================================
 # CONFIGURATION
@@ -380,8 +386,7 @@ def audit_validation_json(json_path: Path, processor_name: str, family: str) ->
     issues = []
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(json_path)
         
         # Check required keys
         for key in VALIDATION_JSON_REQUIRED_KEYS:
@@ -29,6 +29,12 @@ from datetime import datetime
 from enum import Enum
 import re
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.jsoncache import load_json
+
 
 # =============================================================================
 # CONFIGURATION
@@ -320,8 +326,7 @@ def parse_validation_json(json_path: Path) -> Tuple[Dict[str, Any], List[str]]:
     data = {}
     
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(json_path)
     except json.JSONDecodeError as e:
         issues.append(f"Invalid JSON: {e}")
         return {}, issues
@@ -35,6 +35,12 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Tuple
 from dataclasses import dataclass, field
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.jsoncache import load_json
+
 
 # =============================================================================
 # DATA CLASSES
@@ -166,8 +172,7 @@ def load_processor_model(model_path: Path, repo_root: Path = None) -> Tuple[Any,
 def load_validation_json(json_path: Path) -> Optional[Dict[str, Any]]:
     """Load validation JSON file"""
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(json_path)
     except Exception:
         return None
 
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Run Design-Space Exploration for Modeling_2026
+================================================
+
+Explores cache and branch-predictor configurations for every processor model
+in parallel and prints / saves the Pareto frontier of CPI against hardware
+cost for each one.
+
+Usage:
+    python run_design_space.py                              # all models, LHS
+    python run_design_space.py --processor i80486 -v        # one model, show frontier
+    python run_design_space.py --samples 5000 --workload typical
+    python run_design_space.py --method grid --levels 4
+    python run_design_space.py --axes cache.l2_hit_rate cache.l2_latency \\
+        --fixed cache.has_l2=1                              # "what if it had an L2?"
+    python run_design_space.py --output design_space.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Ensure repo root is on sys.path
+REPO_ROOT = Path(__file__).resolve().parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.design_space import CONFIG_FIELDS, DEFAULT_AXES, SAMPLING_METHODS, explore_design_space
+from common.model_loader import discover_processors, load_model
+
+
+def explore_processor(model_file: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Load one model and explore its design space (runs in a worker process)."""
+    model, error = load_model(Path(model_file))
+    if model is None:
+        return {'status': 'error', 'error': error}
+    try:
+        result = explore_design_space(
+            model,
+            axes=options['axes'],
+            n=options['samples'],
+            method=options['method'],
+            levels=options['levels'],
+            fixed=options['fixed'],
+            seed=options['seed'],
+        )
+    except Exception as e:
+        return {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    summary = result.to_dict(options['workload'])
+    summary['status'] = 'ok'
+    return summary
+
+
+def run_exploration(
+    repo_root: Path,
+    options: Dict[str, Any],
+    family_filter: Optional[str] = None,
+    processor_filter: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Explore every discovered processor, in parallel across models."""
+    processors = discover_processors(repo_root, family_filter, processor_filter)
+    if not processors:
+        print("No processors found matching filters.")
+        return []
+
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(explore_processor, str(p['model_file']), options): p
+            for p in processors
+        }
+        for future in as_completed(futures):
+            proc = futures[future]
+            summary = future.result()
+            summary['family'] = proc['family']
+            summary['processor_id'] = proc['processor']
+            summaries.append(summary)
+
+    summaries.sort(key=lambda s: (s['family'], s['processor_id']))
+    return summaries
+
+
+def print_summary(summaries: List[Dict[str, Any]], verbose: bool = False) -> None:
+    """Print baseline vs. best-frontier CPI per processor."""
+    print(f"{'Family':<12} {'Processor':<18} {'Base CPI':>9} {'Base cost':>10} "
+          f"{'Best CPI':>9} {'@ cost':>10} {'Front':>6} {'Method':>10}")
+    print("-" * 90)
+    errors = 0
+    for s in summaries:
+        if s['status'] != 'ok':
+            errors += 1
+            if verbose:
+                print(f"{s['family']:<12} {s['processor_id']:<18} ERROR: {s['error']}")
+            continue
+        front = s['pareto']
+        best = min(front, key=lambda row: row['cpi']) if front else None
+        print(f"{s['family']:<12} {s['processor_id']:<18} "
+              f"{s['baseline']['cpi']:>9.3f} {s['baseline']['cost']:>10.3f} "
+              f"{best['cpi'] if best else float('nan'):>9.3f} "
+              f"{best['cost'] if best else float('nan'):>10.3f} "
+              f"{len(front):>6} {s['method']:>10}")
+        if verbose:
+            for row in front:
+                design = ", ".join(f"{k}={v:g}" for k, v in row['design'].items())
+                print(f"{'':>32} cost={row['cost']:<10.3f} cpi={row['cpi']:<8.3f} {design}")
+    ok = len(summaries) - errors
+    print("-" * 90)
+    print(f"{ok} explored, {errors} failed")
+
+
+def _parse_fixed(items: List[str]) -> Dict[str, float]:
+    fixed = {}
+    for item in items:
+        name, _, value = item.partition('=')
+        if name not in CONFIG_FIELDS or not value:
+            raise SystemExit(f"--fixed expects FIELD=VALUE with FIELD in {CONFIG_FIELDS}")
+        fixed[name] = float(value)
+    return fixed
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Explore cache / branch-predictor design spaces of processor models"
+    )
+    parser.add_argument("--family", help="Only process models in this family")
+    parser.add_argument("--processor", help="Only process this specific processor")
+    parser.add_argument("--method", choices=SAMPLING_METHODS, default="lhs",
+                        help="Latin hypercube (default) or full factorial grid")
+    parser.add_argument("--samples", "-n", type=int, default=2048,
+                        help="Latin-hypercube points per model (default 2048)")
+    parser.add_argument("--levels", type=int, default=5,
+                        help="Grid points per continuous axis (default 5)")
+    parser.add_argument("--axes", nargs="+", default=list(DEFAULT_AXES),
+                        help="Configuration fields to explore")
+    parser.add_argument("--fixed", nargs="+", default=[], metavar="FIELD=VALUE",
+                        help="Configuration values applied to every design point")
+    parser.add_argument("--workload", default=None,
+                        help="Optimize CPI for one workload (default: mean of all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", "-o", help="Write all frontiers to this JSON file")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="Print every frontier point and failed models")
+    args = parser.parse_args()
+
+    options = {
+        'axes': args.axes,
+        'samples': args.samples,
+        'method': args.method,
+        'levels': args.levels,
+        'fixed': _parse_fixed(args.fixed),
+        'seed': args.seed,
+        'workload': args.workload,
+    }
+
+    print("=" * 90)
+    print("DESIGN-SPACE EXPLORATION — Modeling_2026")
+    print("=" * 90)
+    print(f"Method: {args.method}  Axes: {', '.join(args.axes)}")
+    if options['fixed']:
+        print(f"Fixed: {options['fixed']}")
+    print()
+
+    start = time.time()
+    summaries = run_exploration(
+        REPO_ROOT, options,
+        family_filter=args.family,
+        processor_filter=args.processor,
+        workers=args.workers,
+    )
+    print_summary(summaries, verbose=args.verbose)
+    print(f"Elapsed: {time.time() - start:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Run Emulator Benchmarks for Modeling_2026
+===========================================
+
+Runs the self-checking benchmark kernels of the table-driven reference
+interpreters (common.cpu6502, common.cpuz80) on every 6502- and Z80-family
+model and records the exact CPI per workload in the model's
+``measurements/measured_cpi.json`` with source "emulator".
+
+The ISA is recognized from the model's timing table; opcodes a partial
+table does not list are timed from the family's reference table
+(models/mos_wdc/mos6502, models/zilog/z80) unless --no-fallback is given.
+Models whose table contradicts the core (e.g. a derivative that reuses an
+opcode for a different instruction) fail their kernels and are skipped.
+
+Usage:
+    python run_emulator_benchmarks.py                       # all 6502 / Z80 models
+    python run_emulator_benchmarks.py --processor z80 -v    # one model, per kernel
+    python run_emulator_benchmarks.py --family mos_wdc --dry-run
+    python run_emulator_benchmarks.py --output emulator_cpi.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Ensure repo root is on sys.path
+REPO_ROOT = Path(__file__).resolve().parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.cpu6502 import KERNELS as KERNELS_6502, MOS6502
+from common.cpuz80 import KERNELS as KERNELS_Z80, Z80
+from common.disasm import detect_isa
+from common.interpreter import EmulationError, record_measurements, run_kernel, workload_cpi
+from common.trace import find_timing_file, load_timing_table
+from common.model_loader import discover_processors
+
+CORES = {
+    '6502': (MOS6502, KERNELS_6502, 'models/mos_wdc/mos6502'),
+    'z80': (Z80, KERNELS_Z80, 'models/zilog/z80'),
+}
+
+
+def benchmark_processor(model_dir: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run every kernel of the matching core on one model (worker process)."""
+    if find_timing_file(model_dir) is None:
+        return {'status': 'skipped', 'error': 'no timing table'}
+    table = load_timing_table(model_dir)
+    isa = detect_isa(table)
+    if isa not in CORES:
+        return {'status': 'skipped', 'error': f"no interpreter for ISA {isa or 'unknown'}"}
+
+    core_class, kernels, reference = CORES[isa]
+    reference_dir = REPO_ROOT / reference
+    fallback = None
+    if not options['no_fallback'] and Path(model_dir).resolve() != reference_dir.resolve():
+        fallback = load_timing_table(reference_dir)
+
+    try:
+        core = core_class(table, fallback)
+        results = [run_kernel(core, kernel) for kernel in kernels]
+    except EmulationError as e:
+        return {'status': 'error', 'isa': isa, 'error': str(e)}
+
+    summary = {
+        'status': 'ok' if all(r.passed for r in results) else 'error',
+        'isa': isa,
+        'kernels': [r.to_dict() for r in results],
+        'workload_cpi': workload_cpi([r for r in results if r.passed]),
+    }
+    failed = [r.kernel for r in results if not r.passed]
+    if failed:
+        summary['error'] = f"self-check failed: {', '.join(failed)}"
+    elif not options['dry_run']:
+        summary['written'] = record_measurements(
+            model_dir, results, detail=f"common.interpreter {core_class.__name__} core")
+    return summary
+
+
+def run_benchmarks(
+    repo_root: Path,
+    options: Dict[str, Any],
+    family_filter: Optional[str] = None,
+    processor_filter: Optional[str] = None,
+    workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Benchmark every discovered processor, in parallel across models."""
+    processors = discover_processors(repo_root, family_filter, processor_filter)
+    if not processors:
+        print("No processors found matching filters.")
+        return []
+
+    summaries = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(benchmark_processor, str(p['model_dir']), options): p
+            for p in processors
+        }
+        for future in as_completed(futures):
+            proc = futures[future]
+            summary = future.result()
+            summary['family'] = proc['family']
+            summary['processor_id'] = proc['processor']
+            summaries.append(summary)
+
+    summaries.sort(key=lambda s: (s['family'], s['processor_id']))
+    return summaries
+
+
+def print_summary(summaries: List[Dict[str, Any]], verbose: bool = False) -> None:
+    """Print emulator CPI per workload for every benchmarked processor."""
+    workloads = ('typical', 'compute', 'memory', 'control')
+    print(f"{'Family':<14} {'Processor':<18} {'ISA':<5} "
+          + " ".join(f"{w:>8}" for w in workloads))
+    print("-" * 90)
+    counts = {'ok': 0, 'error': 0, 'skipped': 0}
+    for s in summaries:
+        counts[s['status']] += 1
+        if s['status'] == 'skipped':
+            continue
+        if s['status'] == 'error' and 'kernels' not in s:
+            print(f"{s['family']:<14} {s['processor_id']:<18} {s['isa']:<5} ERROR: {s['error']}")
+            continue
+        cpi = s['workload_cpi']
+        row = " ".join(f"{cpi[w]:>8.3f}" if w in cpi else f"{'-':>8}" for w in workloads)
+        print(f"{s['family']:<14} {s['processor_id']:<18} {s['isa']:<5} {row}")
+        if s['status'] == 'error':
+            print(f"{'':>39}ERROR: {s['error']}")
+        if verbose:
+            for k in s['kernels']:
+                print(f"{'':>39}{k['kernel']:<14} {k['instructions']:>9} instr "
+                      f"{k['cycles']:>10} cycles  CPI {k['cpi']:.3f}"
+                      f"{'' if k['passed'] else '  FAILED'}")
+    print("-" * 90)
+    print(f"{counts['ok']} benchmarked, {counts['error']} failed, {counts['skipped']} skipped")
+
+
+# ---------------------------------------------------------------------------
+# CLI entry point
+# ---------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure CPI of 6502 / Z80 models on table-driven reference interpreters"
+    )
+    parser.add_argument("--family", help="Only process models in this family")
+    parser.add_argument("--processor", help="Only process this specific processor")
+    parser.add_argument("--no-fallback", action="store_true",
+                        help="Do not time missing opcodes from the family reference table")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Run the kernels without writing measured_cpi.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", "-o", help="Write all results to this JSON file")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Print every kernel")
+    args = parser.parse_args()
+
+    options = {'no_fallback': args.no_fallback, 'dry_run': args.dry_run}
+
+    print("=" * 90)
+    print("EMULATOR BENCHMARKS — Modeling_2026")
+    print("=" * 90)
+    print(f"Kernels: 6502 {len(KERNELS_6502)}, Z80 {len(KERNELS_Z80)}"
+          f"{'  (dry run)' if args.dry_run else ''}")
+    print()
+
+    start = time.time()
+    summaries = run_benchmarks(
+        REPO_ROOT, options,
+        family_filter=args.family,
+        processor_filter=args.processor,
+        workers=args.workers,
+    )
+    print_summary(summaries, verbose=args.verbose)
+    print(f"Elapsed: {time.time() - start:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summaries, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
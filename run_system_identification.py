@@ -16,19 +16,23 @@ Usage:
     python run_system_identification.py --processor z80    # one processor
     python run_system_identification.py --dry-run          # preview only
     python run_system_identification.py --verbose          # detailed output
+    python run_system_identification.py --no-record        # skip the run store
+
+Every (non-dry) run is also appended to the run store (``common.run_store``,
+``.cache/runs.sqlite3``) so earlier results stay queryable.
 
 Author: Grey-Box Performance Modeling Research
 Date: January 2026
 """
 
 import argparse
-import importlib.util
-import json
+import inspect
 import sys
+import time
 import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
 # Ensure repo root is on sys.path
 REPO_ROOT = Path(__file__).resolve().parent
@@ -41,83 +45,9 @@ from common.system_identification import (
     load_measurements_for_model,
 )
 from common.base_model import get_model_parameters
-
-
-# ---------------------------------------------------------------------------
-# Model loading (same pattern as run_accuracy_tests.py)
-# ---------------------------------------------------------------------------
-
-def load_model(model_path: Path) -> Tuple[Any, Optional[str]]:
-    """Dynamically load a processor model from its _validated.py file.
-
-    Returns:
-        (model_instance, None) on success, or (None, error_message) on failure.
-    """
-    try:
-        spec = importlib.util.spec_from_file_location("model", model_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-
-        for name in dir(module):
-            if name.endswith("Model") and name != "BaseProcessorModel":
-                obj = getattr(module, name)
-                if isinstance(obj, type):
-                    return obj(), None
-
-        return None, "No Model class found"
-    except Exception as e:
-        return None, f"{type(e).__name__}: {e}"
-
-
-# ---------------------------------------------------------------------------
-# Discovery
-# ---------------------------------------------------------------------------
-
-def discover_processors(
-    repo_root: Path,
-    family_filter: Optional[str] = None,
-    processor_filter: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    """Discover processors from index.json.
-
-    Returns list of dicts with keys: family, processor, model_dir, model_file.
-    """
-    index_path = repo_root / "index.json"
-    if not index_path.exists():
-        print(f"ERROR: {index_path} not found")
-        return []
-
-    with open(index_path) as f:
-        index = json.load(f)
-
-    processors = []
-    for family, info in index.get("families", {}).items():
-        if family_filter and family != family_filter:
-            continue
-        for proc in info.get("processors", []):
-            if processor_filter and proc != processor_filter:
-                continue
-
-            model_dir = repo_root / "models" / family / proc
-            if not model_dir.exists():
-                continue
-
-            # Find the validated model file
-            current_dir = model_dir / "current"
-            if not current_dir.exists():
-                continue
-            model_files = list(current_dir.glob("*_validated.py"))
-            if not model_files:
-                continue
-
-            processors.append({
-                "family": family,
-                "processor": proc,
-                "model_dir": model_dir,
-                "model_file": model_files[0],
-            })
-
-    return processors
+from common.model_loader import discover_processors, load_model
+from common.output_writer import OutputTransaction
+from common.run_store import RunStore
 
 
 # ---------------------------------------------------------------------------
@@ -129,15 +59,24 @@ def save_identification_result(
     proc_name: str,
     result: IdentificationResult,
     dry_run: bool = False,
-) -> None:
-    """Save identification results to the processor's validation directory."""
-    if dry_run:
-        return
+    transaction: Optional[OutputTransaction] = None,
+) -> Optional[str]:
+    """Stage identification results for the processor's output files.
+
+    Writes ``identification/sysid_result.json`` and updates the sysid fields
+    of ``validation/*_validation.json``.  With a ``transaction`` the documents
+    are only staged and land when the caller commits it; without one they
+    are committed immediately.
+
+    Returns:
+        A warning if the validation file could not be updated, else None.
+    """
+    if transaction is None:
+        with OutputTransaction(dry_run=dry_run) as tx:
+            return save_identification_result(model_dir, proc_name, result, transaction=tx)
 
     # Save corrections to a dedicated JSON file
-    output_dir = model_dir / "identification"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    output_path = output_dir / "sysid_result.json"
+    output_path = model_dir / "identification" / "sysid_result.json"
 
     data = {
         "processor": proc_name,
@@ -155,29 +94,26 @@ def save_identification_result(
         "free_parameters": result.free_parameters,
     }
 
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2)
+    transaction.stage(output_path, data)
 
     # Also update validation JSON if it exists
     val_dir = model_dir / "validation"
-    val_files = list(val_dir.glob("*_validation.json")) if val_dir.exists() else []
-    if val_files:
-        try:
-            with open(val_files[0]) as f:
-                val_data = json.load(f)
-
-            if "accuracy" not in val_data:
-                val_data["accuracy"] = {}
-            val_data["accuracy"]["sysid_loss_before"] = round(result.loss_before, 6)
-            val_data["accuracy"]["sysid_loss_after"] = round(result.loss_after, 6)
-            val_data["accuracy"]["sysid_cpi_error_percent"] = round(result.cpi_error_percent, 2)
-            val_data["accuracy"]["sysid_converged"] = result.converged
-            val_data["accuracy"]["sysid_date"] = datetime.now().strftime("%Y-%m-%d")
-
-            with open(val_files[0], "w") as f:
-                json.dump(val_data, f, indent=2)
-        except Exception:
-            pass  # non-critical
+    val_files = sorted(val_dir.glob("*_validation.json")) if val_dir.exists() else []
+    if not val_files:
+        return None
+    try:
+        val_data = transaction.read(val_files[0])
+    except (OSError, ValueError) as e:
+        return f"{val_files[0].name} not updated: {type(e).__name__}: {e}"
+    if not isinstance(val_data.get("accuracy"), dict):
+        val_data["accuracy"] = {}
+    val_data["accuracy"]["sysid_loss_before"] = round(result.loss_before, 6)
+    val_data["accuracy"]["sysid_loss_after"] = round(result.loss_after, 6)
+    val_data["accuracy"]["sysid_cpi_error_percent"] = round(result.cpi_error_percent, 2)
+    val_data["accuracy"]["sysid_converged"] = result.converged
+    val_data["accuracy"]["sysid_date"] = datetime.now().strftime("%Y-%m-%d")
+    transaction.stage(val_files[0], val_data)
+    return None
 
 
 # ---------------------------------------------------------------------------
@@ -191,9 +127,17 @@ def run_identification(
     dry_run: bool = False,
     verbose: bool = False,
     method: str = "ridge",
+    run_writer=None,
 ) -> List[Dict[str, Any]]:
     """Run system identification across all matching processors.
 
+    Output files are staged in one ``OutputTransaction`` and committed
+    together after the last model, so an interrupted run writes nothing.
+
+    Args:
+        run_writer: Optional ``common.run_store.RunWriter`` that receives
+                    every result
+
     Returns a list of summary dicts for the results table.
     """
     processors = discover_processors(repo_root, family_filter, processor_filter)
@@ -204,6 +148,7 @@ def run_identification(
     print(f"Found {len(processors)} processor(s) to identify.\n")
 
     summaries = []
+    transaction = OutputTransaction(dry_run=dry_run)
     skipped_no_measurements = 0
     skipped_load_error = 0
     skipped_no_params = 0
@@ -242,7 +187,9 @@ def run_identification(
 
         # Run identification
         try:
+            start = time.perf_counter()
             result = identify_model(model, measurements, method=method, verbose=2 if verbose else 0)
+            seconds = time.perf_counter() - start
         except Exception as e:
             errors += 1
             if verbose:
@@ -293,7 +240,19 @@ def run_identification(
         )
 
         # Save results
-        save_identification_result(model_dir, proc, result, dry_run)
+        warning = save_identification_result(model_dir, proc, result, dry_run, transaction)
+        if warning:
+            print(f"  WARN  {label:35s} — {warning}")
+        if run_writer is not None:
+            run_writer.add_identification(model_dir, result, measurements, seconds,
+                                          status=status_display)
+
+    report = transaction.commit()
+    print(f"\nOutput files: {report.summary()}")
+    if verbose:
+        for path in report.changed:
+            print(f"  {'new' if path in report.created else 'updated':7s} "
+                  f"{Path(path).relative_to(repo_root)}")
 
     # Print skip summary
     print()
@@ -309,6 +268,15 @@ def run_identification(
     return summaries
 
 
+def identification_defaults() -> Dict[str, Any]:
+    """Default optimizer settings of ``identify_model`` (recorded per run)."""
+    return {
+        name: p.default
+        for name, p in inspect.signature(identify_model).parameters.items()
+        if p.default is not inspect.Parameter.empty and name not in ("method", "verbose")
+    }
+
+
 def _compute_typical_error(
     residuals: Dict[str, float], measurements: Dict[str, float]
 ) -> float:
@@ -399,6 +367,15 @@ def main():
         default="ridge",
         help="Optimization method: ridge (default), de (differential evolution), bayesian, trf (plain least-squares)",
     )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help="Don't append this run to the run store",
+    )
+    parser.add_argument(
+        "--label",
+        help="Tag stored with the run in the run store",
+    )
 
     args = parser.parse_args()
 
@@ -414,14 +391,28 @@ def main():
     print(f"Mode: {'DRY-RUN' if args.dry_run else 'WRITE RESULTS'}")
     print()
 
-    summaries = run_identification(
-        REPO_ROOT,
-        family_filter=args.family,
-        processor_filter=args.processor,
-        dry_run=args.dry_run,
-        verbose=args.verbose,
-        method=args.method,
-    )
+    store = writer = None
+    if not (args.dry_run or args.no_record):
+        store = RunStore()
+        writer = store.start_run(
+            "identify", method=args.method, label=args.label,
+            hyperparameters={"family": args.family, "processor": args.processor,
+                             **identification_defaults()})
+    try:
+        summaries = run_identification(
+            REPO_ROOT,
+            family_filter=args.family,
+            processor_filter=args.processor,
+            dry_run=args.dry_run,
+            verbose=args.verbose,
+            method=args.method,
+            run_writer=writer,
+        )
+    finally:
+        if store is not None:
+            writer.close()
+            store.close()
+            print(f"\nRecorded run {writer.run_id} ({writer.n_models} models) in the run store.")
 
     print_summary(summaries)
 
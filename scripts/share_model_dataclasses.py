@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script to make standalone model files use the shared data classes.
+
+Some model files define their own InstructionCategory, WorkloadProfile,
+AnalysisResult and CacheConfig unconditionally, so they never get the
+slotted, name-interning classes in common/base_model.py.  This script:
+1. Finds the top-level definitions of those classes in each model file
+2. Wraps them in ``try: from common.base_model import ... / except ImportError:``
+   (the layout the other model files already use), keeping them as fallback
+
+The model's own BaseProcessorModel (if any) is left alone.
+
+Usage:
+    python scripts/share_model_dataclasses.py [--dry-run] [--single PATH]
+"""
+
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR = ROOT / "models"
+
+SHARED_CLASSES = ("InstructionCategory", "CacheConfig", "BranchPredictionConfig",
+                  "WorkloadProfile", "AnalysisResult")
+
+CLASS_RE = re.compile(r"^(?:@dataclass(?:\(\))?\n)?class (%s)\b" % "|".join(SHARED_CLASSES),
+                      re.M)
+
+
+def find_blocks(lines):
+    """Return [(start, end, name)] line spans of top-level shared class definitions."""
+    blocks = []
+    text = "".join(lines)
+    offsets = [0]
+    for line in lines:
+        offsets.append(offsets[-1] + len(line))
+    for m in CLASS_RE.finditer(text):
+        start = offsets.index(m.start())
+        end = start + 2 if lines[start].startswith("@") else start + 1
+        while end < len(lines):
+            line = lines[end]
+            if line.strip() and not line[0].isspace() and not line.startswith("#"):
+                break
+            end += 1
+        # Trailing blank lines belong between blocks, not to them
+        while end > start and not lines[end - 1].strip():
+            end -= 1
+        blocks.append((start, end, m.group(1)))
+    return blocks
+
+
+def convert(content: str):
+    """Return (new_content, class names) or (None, reason)."""
+    lines = content.splitlines(keepends=True)
+    blocks = find_blocks(lines)
+    if not blocks:
+        return None, "no top-level shared classes"
+    for (_, end, _), (start, _, _) in zip(blocks, blocks[1:]):
+        if any(line.strip() for line in lines[end:start]):
+            return None, "shared classes are not contiguous"
+    start, end = blocks[0][0], blocks[-1][1]
+    names = [name for _, _, name in blocks]
+    body = ["    " + line if line.strip() else line for line in lines[start:end]]
+    new = (["try:\n", f"    from common.base_model import {', '.join(names)}\n",
+            "except ImportError:\n"] + body)
+    return "".join(lines[:start] + new + lines[end:]), names
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    if "--single" in sys.argv:
+        paths = [Path(sys.argv[sys.argv.index("--single") + 1])]
+    else:
+        paths = sorted(MODELS_DIR.glob("*/*/current/*_validated.py"))
+
+    converted = skipped = 0
+    for path in paths:
+        content = path.read_text()
+        if not CLASS_RE.search(content):
+            continue
+        new, info = convert(content)
+        if new is None:
+            print(f"  SKIP {path.relative_to(ROOT)}: {info}")
+            skipped += 1
+            continue
+        compile(new, str(path), "exec")
+        converted += 1
+        print(f"  {'WOULD CONVERT' if dry_run else 'CONVERTED'} "
+              f"{path.relative_to(ROOT)}: {', '.join(info)}")
+        if not dry_run:
+            path.write_text(new)
+
+    print(f"\n{converted} converted, {skipped} skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Analysis Batch Tests
+=====================
+
+``common.analysis_batch.AnalysisBatch`` rows must match ``analyze()`` and
+keep their original row ids (the ``mix[<row>]`` labels of anonymous mixes)
+through slicing and concatenation.
+
+Usage:
+    python -m pytest -q tests/test_analysis_batch.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.analysis_batch import AnalysisBatch
+from common.evaluator import VectorizedEvaluator
+from common.model_loader import discover_processors, load_model
+
+
+@pytest.fixture(scope="module")
+def evaluator():
+    entry, = discover_processors(REPO_ROOT, "zilog", "z80")
+    model, error = load_model(entry['model_file'])
+    assert model is not None, error
+    return VectorizedEvaluator(model)
+
+
+@pytest.fixture(scope="module")
+def mixes(evaluator):
+    rng = np.random.default_rng(0)
+    weights = rng.random((10, len(evaluator.category_names)))
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def test_named_rows_match_analyze(evaluator):
+    batch = evaluator.analyze_batch()
+    for result in batch:
+        expected = evaluator.model.analyze(result.workload)
+        assert result.cpi == pytest.approx(expected.cpi, rel=1e-12)
+        assert result.bottleneck == expected.bottleneck
+
+
+def test_slices_keep_original_mix_labels(evaluator, mixes):
+    batch = evaluator.analyze_batch(mixes)
+    assert list(batch.workload_names()) == [f"mix[{i}]" for i in range(10)]
+
+    subset = batch[batch.cpi > np.median(batch.cpi)]
+    rows = np.flatnonzero(batch.cpi > np.median(batch.cpi))
+    assert list(subset.workload_names()) == [f"mix[{i}]" for i in rows]
+    assert [r.workload for r in subset] == [f"mix[{i}]" for i in rows]
+    np.testing.assert_array_equal(subset.cpi, batch.cpi[rows])
+
+    nested = batch[3:][::2]
+    assert [r.workload for r in nested] == ["mix[3]", "mix[5]", "mix[7]", "mix[9]"]
+    assert nested[-1].workload == "mix[9]"
+
+
+def test_concatenate_keeps_row_ids(evaluator, mixes):
+    batch = evaluator.analyze_batch(mixes)
+    joined = AnalysisBatch.concatenate([batch[6:], evaluator.analyze_batch(), batch[:2]])
+    names = list(joined.workload_names())
+    assert names[:4] == ["mix[6]", "mix[7]", "mix[8]", "mix[9]"]
+    assert names[4:-2] == list(evaluator.workload_names)
+    assert names[-2:] == ["mix[0]", "mix[1]"]
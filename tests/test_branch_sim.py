@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Branch-Predictor Simulator Tests
+=================================
+
+Checks ``common.branch_sim`` against a naive per-branch reference and
+checks that ``pc_shift`` is applied to every PC-indexed structure.
+
+Usage:
+    python -m pytest -q tests/test_branch_sim.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.branch_sim import PredictorConfig, derive_branch_config, simulate_branches
+
+ALL_KINDS = [
+    dict(kind='static', static_rule='btfn'),
+    dict(kind='bimodal', table_bits=6),
+    dict(kind='global', table_bits=6, history_bits=6),
+    dict(kind='gselect', table_bits=8, history_bits=3),
+    dict(kind='gshare', table_bits=7, history_bits=5),
+    dict(kind='local', table_bits=6, history_bits=4, history_table_bits=5),
+    dict(kind='btb', table_bits=6, btb_entries=16, btb_associativity=2),
+]
+
+
+def branch_trace(n=3000, sites=200, seed=1):
+    """Loop-like branches at word-granular sites, split into chunks."""
+    rng = np.random.default_rng(seed)
+    site = rng.integers(0, sites, n)
+    bias = rng.random(sites)
+    taken = rng.random(n) < bias[site]
+    target = np.where(taken, site + rng.integers(-20, 20, n), -1)
+    return site.astype(np.int64), taken, target.astype(np.int64)
+
+
+def chunks(pc, taken, target, size=700):
+    return [(pc[i:i + size], taken[i:i + size], target[i:i + size])
+            for i in range(0, len(pc), size)]
+
+
+def reference_bimodal(pc, taken, table_bits, counter_bits=2):
+    """Per-branch loop over an n-bit saturating counter table."""
+    top = (1 << counter_bits) - 1
+    table = [(1 << counter_bits) >> 1] * (1 << table_bits)
+    correct = 0
+    for p, t in zip(pc.tolist(), taken.tolist()):
+        entry = p & ((1 << table_bits) - 1)
+        correct += (table[entry] >= (1 << counter_bits) >> 1) == t
+        table[entry] = min(table[entry] + 1, top) if t else max(table[entry] - 1, 0)
+    return correct
+
+
+def reference_gshare(pc, taken, table_bits, history_bits):
+    table = [2] * (1 << table_bits)
+    history = correct = 0
+    for p, t in zip(pc.tolist(), taken.tolist()):
+        entry = (p ^ history) & ((1 << table_bits) - 1)
+        correct += (table[entry] >= 2) == t
+        table[entry] = min(table[entry] + 1, 3) if t else max(table[entry] - 1, 0)
+        history = ((history << 1) | int(t)) & ((1 << history_bits) - 1)
+    return correct
+
+
+@pytest.mark.parametrize("counter_bits", [1, 2, 3])
+def test_bimodal_matches_reference(counter_bits):
+    pc, taken, target = branch_trace()
+    config = PredictorConfig('bimodal', table_bits=5, counter_bits=counter_bits)
+    stats, = simulate_branches(chunks(pc, taken, target), [config])
+    assert stats.branches == len(pc)
+    assert stats.correct == reference_bimodal(pc, taken, 5, counter_bits)
+
+
+def test_gshare_matches_reference():
+    pc, taken, target = branch_trace(seed=2)
+    config = PredictorConfig('gshare', table_bits=7, history_bits=5)
+    stats, = simulate_branches(chunks(pc, taken, target), [config])
+    assert stats.correct == reference_gshare(pc, taken, 7, 5)
+
+
+def test_pc_shift_matches_unshifted_word_addresses():
+    pc, taken, target = branch_trace(seed=3)
+    byte_target = np.where(target >= 0, 4 * target, -1)
+    unshifted = simulate_branches(chunks(pc, taken, target),
+                                  [PredictorConfig(**kw) for kw in ALL_KINDS])
+    shifted = simulate_branches(chunks(4 * pc, taken, byte_target),
+                                [PredictorConfig(pc_shift=2, **kw) for kw in ALL_KINDS])
+    for a, b in zip(unshifted, shifted):
+        assert (a.correct, a.btb_hits, a.btb_lookups) == (b.correct, b.btb_hits, b.btb_lookups), \
+            a.config.label
+
+
+def test_mixed_pc_shifts_do_not_share_state():
+    pc, taken, target = branch_trace(seed=4)
+    byte_pc = 4 * pc
+    configs = [PredictorConfig(pc_shift=shift, **kw) for kw in ALL_KINDS[1:] for shift in (0, 2)]
+    together = simulate_branches(chunks(byte_pc, taken, target), configs)
+    for config, stats in zip(configs, together):
+        alone, = simulate_branches(chunks(byte_pc, taken, target), [config])
+        assert (stats.correct, stats.btb_hits) == (alone.correct, alone.btb_hits), config
+
+
+@pytest.mark.parametrize("kind", [dict(kind='bimodal', table_bits=6), ALL_KINDS[-1]],
+                         ids=['bimodal', 'btb'])
+def test_derived_config_holds_numbers(kind):
+    pc, taken, target = branch_trace(seed=4)
+    config = derive_branch_config(chunks(pc, taken, target), PredictorConfig(**kind))
+    assert isinstance(config.predict_accuracy, float)
+    assert isinstance(config.btb_hit_rate, float)
+    assert 0.0 <= config.btb_hit_rate <= 1.0
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Cache Simulator Tests
+======================
+
+Checks ``common.cache_sim`` against a naive per-access set-associative
+cache (a list of tags per set) for LRU and FIFO replacement, with and
+without write allocation, and checks the L1 -> L2 miss stream.
+
+Usage:
+    python -m pytest -q tests/test_cache_sim.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.cache_sim import (CacheGeometry, CacheSimulator, derive_cache_config, simulate_caches,
+                              simulate_hierarchy)
+
+
+def address_trace(n=6000, seed=1):
+    """Loop-like accesses over a few arrays plus random scatter."""
+    rng = np.random.default_rng(seed)
+    base = rng.choice([0x0000, 0x4000, 0x9000], n)
+    offset = np.where(rng.random(n) < 0.8, (np.arange(n) * 4) % 3072,
+                      rng.integers(0, 16384, n))
+    return (base + offset).astype(np.int64), rng.random(n) < 0.3
+
+
+def chunks(addresses, writes, size=1000):
+    return [(addresses[i:i + size], writes[i:i + size])
+            for i in range(0, len(addresses), size)]
+
+
+def reference_cache(addresses, writes, geometry):
+    """Per-access loop; each set is a list of tags, most recent first."""
+    shift = geometry.line_size.bit_length() - 1
+    sets = [[] for _ in range(geometry.n_sets)]
+    hits = {False: 0, True: 0}
+    for address, write in zip(addresses.tolist(), writes.tolist()):
+        line = address >> shift
+        ways = sets[line & (geometry.n_sets - 1)]
+        if line in ways:
+            hits[write] += 1
+            if geometry.policy == 'lru':
+                ways.remove(line)
+                ways.insert(0, line)
+        elif geometry.write_allocate or not write:
+            ways.insert(0, line)
+            del ways[geometry.associativity:]
+    return hits[False], hits[True]
+
+
+GEOMETRIES = [
+    CacheGeometry(1024, 1, 16),
+    CacheGeometry(1024, 2, 16),
+    CacheGeometry(2048, 4, 16),
+    CacheGeometry(4096, 8, 32),
+    CacheGeometry(2048, 4, 16, policy='fifo'),
+    CacheGeometry(2048, 2, 32, write_allocate=False),
+    CacheGeometry(1024, 4, 16, policy='fifo', write_allocate=False),
+    CacheGeometry(512, 32, 16),                      # fully associative
+]
+
+
+def test_geometries_match_reference():
+    addresses, writes = address_trace()
+    stats = simulate_caches(chunks(addresses, writes), GEOMETRIES)
+    for geometry, s in zip(GEOMETRIES, stats):
+        assert s.geometry == geometry
+        assert (s.reads, s.writes) == (int((~writes).sum()), int(writes.sum()))
+        assert (s.read_hits, s.write_hits) == reference_cache(addresses, writes, geometry), \
+            geometry.label
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES[:4], ids=lambda g: g.label)
+def test_single_geometry_matches_shared_simulation(geometry):
+    addresses, writes = address_trace(seed=2)
+    alone, = simulate_caches(chunks(addresses, writes, 777), [geometry])
+    together = simulate_caches(chunks(addresses, writes), GEOMETRIES[:4])
+    assert alone == together[GEOMETRIES.index(geometry)]
+
+
+def test_l2_sees_l1_miss_stream():
+    addresses, writes = address_trace(seed=3)
+    l1, l2 = CacheGeometry(1024, 2, 16), CacheGeometry(8192, 4, 16)
+    l1_stats, (l2_stats,) = simulate_hierarchy(chunks(addresses, writes), l1, [l2])
+
+    sim = CacheSimulator([l1])
+    depths = sim.feed(addresses, writes, return_depths=True)
+    miss = ~sim.hit_mask(depths, 0)
+    assert l2_stats.accesses == l1_stats.accesses - l1_stats.hits == int(miss.sum())
+    assert (l2_stats.read_hits, l2_stats.write_hits) == reference_cache(
+        addresses[miss], writes[miss], l2)
+
+
+def test_derived_config_holds_numbers():
+    addresses, writes = address_trace(seed=4)
+    config = derive_cache_config(chunks(addresses, writes), CacheGeometry(1024, 2, 16),
+                                 CacheGeometry(8192, 4, 16))
+    assert isinstance(config.l1_hit_rate, float) and isinstance(config.l2_hit_rate, float)
+    assert config.has_l2 and 0.0 <= config.l2_hit_rate <= 1.0
+
+
+def test_l1_only_hierarchy():
+    addresses, writes = address_trace(seed=5)
+    l1 = CacheGeometry(2048, 4, 16)
+    l1_stats, l2_stats = simulate_hierarchy(chunks(addresses, writes), l1, [])
+    assert l2_stats == []
+    assert (l1_stats.read_hits, l1_stats.write_hits) == reference_cache(addresses, writes, l1)
+    config = derive_cache_config(chunks(addresses, writes), l1)
+    assert not config.has_l2 and isinstance(config.l2_hit_rate, float)
+    assert config.l1_hit_rate == pytest.approx(l1_stats.hit_rate)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Correction Overlay Tests
+=========================
+
+Checks ``common.correction_overlay``: overlay entries built from
+identification results, atomic versioned writes, and that applied models
+are rebuilt as source corrections + overlay entry on every refresh, so
+terms and entries dropped from the overlay revert to the source values.
+
+Usage:
+    python -m pytest -q tests/test_correction_overlay.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import itertools
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.correction_overlay import (CorrectionOverlay, build_overlay, model_key,
+                                       read_overlay, write_overlay)
+
+
+class Model:
+    def __init__(self, **corrections):
+        self.corrections = dict(corrections)
+
+
+def sysid(**corrections):
+    return {"corrections": {f"cor.{k}": v for k, v in corrections.items()},
+            "method": "ridge", "cpi_error_percent": 0.5, "date": "2026-01-29",
+            "loss_before": 2.0, "loss_after": 1.0, "message": "Converged"}
+
+
+_MTIMES = itertools.count(10**9, 10**9)
+
+
+def write(models, path):
+    """write_overlay with a distinct mtime, so stat checks see every write."""
+    version = write_overlay(models, path)
+    mtime = next(_MTIMES)
+    os.utime(path, ns=(mtime, mtime))
+    return version
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "_corrections_overlay.json"
+
+
+def test_model_key():
+    assert model_key("models/zilog/z80") == "zilog/z80"
+    assert model_key(REPO_ROOT / "models" / "intel" / "i8086" / "current" / "m.py") == "intel/i8086"
+    assert model_key("mos/mos6502") == "mos/mos6502"
+
+
+def test_build_overlay_skips_empty_zero_and_rolled_back():
+    rolled_back = dict(sysid(alu=0.2), loss_after=2.0, message="Rolled back: no improvement")
+    models = build_overlay(sysid_results={
+        "zilog/z80": sysid(alu=0.3, memory=-0.1),
+        "intel/i8080": sysid(),
+        "intel/i8085": sysid(alu=0.0, memory=1e-10),
+        "mos/mos6502": rolled_back,
+    }, base={"intel/i8086": {"corrections": {"alu": 1.0}}})
+    assert list(models) == ["intel/i8086", "zilog/z80"]
+    assert models["zilog/z80"]["corrections"] == {"alu": 0.3, "memory": -0.1}
+    assert models["zilog/z80"]["method"] == "ridge"
+
+
+def test_write_overlay_bumps_version(path):
+    assert read_overlay(path) == {"version": 0, "generated": None, "models": {}}
+    models = {"zilog/z80": {"corrections": {"alu": 0.3}}}
+    assert write(models, path) == 1
+    assert write(models, path) == 2
+    assert read_overlay(path)["models"] == models
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+
+def test_apply_merges_over_source(path):
+    write({"zilog/z80": {"corrections": {"alu": 0.3}}}, path)
+    overlay = CorrectionOverlay(path)
+    model, other = Model(alu=0.1, memory=0.2), Model(alu=0.5)
+    assert overlay.apply(model, "models/zilog/z80")
+    assert model.corrections == {"alu": 0.3, "memory": 0.2}
+    assert not overlay.apply(other, "models/intel/i8080")
+    assert other.corrections == {"alu": 0.5}
+    # Applying again does not fold the overlay into the recorded source
+    assert overlay.apply(model, "models/zilog/z80")
+    write({}, path)
+    assert overlay.refresh() == 1
+    assert model.corrections == {"alu": 0.1, "memory": 0.2}
+
+
+def test_refresh_updates_in_place(path):
+    write({"zilog/z80": {"corrections": {"alu": 0.3}}}, path)
+    overlay = CorrectionOverlay(path)
+    model = Model(alu=0.1)
+    held = model.corrections
+    overlay.apply(model, "models/zilog/z80")
+    assert overlay.refresh() == 0                      # file unchanged
+    write({"zilog/z80": {"corrections": {"alu": 0.4, "memory": -0.2}}}, path)
+    assert overlay.refresh() == 1
+    assert held is model.corrections
+    assert held == {"alu": 0.4, "memory": -0.2}
+
+
+def test_refresh_removes_dropped_keys(path):
+    write({"zilog/z80": {"corrections": {"alu": 0.3, "memory": -0.2}}}, path)
+    overlay = CorrectionOverlay(path)
+    model = Model(alu=0.1, io=0.05)
+    overlay.apply(model, "models/zilog/z80")
+    assert model.corrections == {"alu": 0.3, "memory": -0.2, "io": 0.05}
+    write({"zilog/z80": {"corrections": {"alu": 0.3}}}, path)
+    assert overlay.refresh() == 1
+    assert model.corrections == {"alu": 0.3, "io": 0.05}
+
+
+def test_refresh_reverts_removed_entry(path):
+    write({"zilog/z80": {"corrections": {"alu": 0.3}},
+           "intel/i8080": {"corrections": {"alu": 0.7}}}, path)
+    overlay = CorrectionOverlay(path)
+    z80, i8080 = Model(alu=0.1), Model()
+    overlay.apply(z80, "models/zilog/z80")
+    overlay.apply(i8080, "models/intel/i8080")
+    write({"intel/i8080": {"corrections": {"alu": 0.7}}}, path)
+    assert overlay.refresh() == 1
+    assert z80.corrections == {"alu": 0.1}
+    assert i8080.corrections == {"alu": 0.7}
+
+
+def test_refresh_forgets_dead_models(path):
+    write({"zilog/z80": {"corrections": {"alu": 0.3}}}, path)
+    overlay = CorrectionOverlay(path)
+    overlay.apply(Model(), "models/zilog/z80")
+    write({"zilog/z80": {"corrections": {"alu": 0.4}}}, path)
+    assert overlay.refresh() == 0
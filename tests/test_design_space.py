@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Design-Space Exploration Consistency Tests
+===========================================
+
+``common.design_space`` must apply a cache / branch-predictor configuration
+exactly the way the models' ``analyze()`` does:
+
+- the model's own configuration (``baseline_design``) reproduces
+  ``analyze()`` for every model and workload, on both the vectorized and
+  the point-by-point path;
+- a design point without a cache keeps the memory costs the model defines,
+  even on models whose ``analyze()`` has already overwritten them.
+
+Usage:
+    python -m pytest -q tests/test_design_space.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import copy
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.design_space import baseline_design, explore_design_space
+from common.model_loader import discover_processors, load_model
+
+
+def _at(model, design):
+    """Evaluate a single design point (all fields fixed to ``design``)."""
+    axis = 'cache.l1_hit_rate'
+    return explore_design_space(model, axes=[axis], method='grid',
+                                levels={axis: [design[axis]]}, fixed=design)
+
+
+def _load(family, processor):
+    entry = discover_processors(REPO_ROOT, family, processor)[0]
+    model, error = load_model(entry['model_file'])
+    assert model is not None, error
+    return model
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    models = {}
+    for entry in discover_processors(REPO_ROOT):
+        model, _ = load_model(entry['model_file'])
+        if model is not None:
+            models[f"{entry['family']}/{entry['processor']}"] = model
+    return models
+
+
+def test_baseline_design_reproduces_analyze(fleet):
+    methods = set()
+    mismatches = []
+    for key, model in fleet.items():
+        result = _at(model, baseline_design(model))
+        methods.add(result.method)
+        expected = [model.analyze(w).cpi for w in result.workload_names]
+        if not np.allclose(result.cpi[0], expected, rtol=1e-12, atol=1e-12):
+            mismatches.append(f"{key}: {result.cpi[0].tolist()} != {expected}")
+    assert methods == {'vectorized', 'analyze'}
+    assert not mismatches, "\n".join(mismatches)
+
+
+@pytest.mark.parametrize("family,processor", [("powerpc", "aim_ppc_601"), ("motorola", "m68030")])
+def test_cacheless_design_keeps_defined_memory_cost(family, processor):
+    model = _load(family, processor)
+    assert model.cache_config.has_cache
+    design = dict(baseline_design(model), **{'cache.has_cache': 0.0})
+
+    reference = type(model)()
+    reference.corrections = copy.deepcopy(getattr(model, 'corrections', {}))
+    reference.cache_config.has_cache = False
+    expected = [reference.analyze(w).cpi for w in _at(model, design).workload_names]
+
+    model.analyze('typical')  # overwrites memory_cycles with the cache penalty
+    np.testing.assert_allclose(_at(model, design).cpi[0], expected, rtol=1e-12)
+
+
+def test_cacheless_model_unaffected_by_cache_axes():
+    model = _load("zilog", "z80")
+    assert not getattr(getattr(model, 'cache_config', None), 'has_cache', False)
+    result = explore_design_space(model, axes=['cache.l1_hit_rate', 'cache.has_l2'], n=16,
+                                  fixed={'bp.has_branch_prediction': 0.0})
+    np.testing.assert_allclose(result.cpi, np.tile(result.baseline_cpi, (16, 1)), rtol=1e-12)
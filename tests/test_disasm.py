@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Static Disassembly Tests
+=========================
+
+Checks ``common.disasm`` on small hand-built Z80 and 6502 images: linear
+sweeps against a per-instruction loop, recursive descent against the
+hand-traced reachable code (skipping embedded data, stopping at unknown
+opcodes and at jumps out of the image), the resulting static mix, and the
+``tools/rom_mix.py`` front end.
+
+Usage:
+    python -m pytest -q tests/test_disasm.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.disasm import decode_image, detect_isa, disassemble, disassemble_images, find_images
+from common.trace import UNKNOWN_ENTRY, load_timing_table
+
+ROM_MIX_TOOL = REPO_ROOT / "tools" / "rom_mix.py"
+
+# Z80, loaded at 0 (entry points 0x0000 and 0x0066)
+Z80_IMAGE = bytes([
+    0x3E, 0x05,                 # 00 LD A,5
+    0x18, 0x03,                 # 02 JR 07
+    0x00, 0x00, 0x00,           # 04 data
+    0xCD, 0x10, 0x00,           # 07 CALL 0010
+    0xC3, 0x00, 0x20,           # 0A JP 2000 (outside the image)
+    0x00, 0x00, 0x00,           # 0D data
+    0x3C,                       # 10 INC A
+    0x28, 0x01,                 # 11 JR Z,14
+    0xC9,                       # 13 RET
+    0xED, 0x00,                 # 14 undefined ED opcode
+    0x00,                       # 16 data
+])
+Z80_RECURSIVE = [0x00, 0x02, 0x07, 0x0A, 0x10, 0x11, 0x13, 0x14]
+
+# 6502, loaded at the top of memory (base 0xFFE0) with its vectors
+M6502_IMAGE = bytes([
+    0xA9, 0x05,                 # FFE0 LDA #5
+    0xD0, 0x03,                 # FFE2 BNE FFE7
+    0x4C, 0x00, 0x10,           # FFE4 JMP 1000 (outside the image)
+    0x20, 0xEE, 0xFF,           # FFE7 JSR FFEE
+    0x60,                       # FFEA RTS
+    0x02, 0xEA, 0xEA,           # FFEB data (0x02 is undefined)
+    0xE8,                       # FFEE INX
+    0x60,                       # FFEF RTS
+] + [0xEA] * 10 + [
+    0xE0, 0xFF,                 # FFFA NMI   -> FFE0
+    0xE0, 0xFF,                 # FFFC RESET -> FFE0
+    0xEF, 0xFF,                 # FFFE IRQ   -> FFEF
+])
+M6502_RECURSIVE = [0x00, 0x02, 0x04, 0x07, 0x0A, 0x0E, 0x0F]
+
+IMAGES = {
+    'z80': ('zilog/z80', Z80_IMAGE, Z80_RECURSIVE),
+    'mos6502': ('mos_wdc/mos6502', M6502_IMAGE, M6502_RECURSIVE),
+}
+
+
+def table(path):
+    return load_timing_table(REPO_ROOT / "models" / path)
+
+
+def reference_linear(table, image, start=0):
+    """Per-instruction sweep: decode at the offset, step by its length."""
+    _, lengths = decode_image(table, np.frombuffer(image, dtype=np.uint8))
+    offsets = []
+    offset = start
+    while offset < len(image):
+        offsets.append(offset)
+        offset += int(lengths[offset])
+    return offsets
+
+
+@pytest.mark.parametrize("name", list(IMAGES))
+def test_linear_sweep_matches_loop(name):
+    path, image, _ = IMAGES[name]
+    t = table(path)
+    result = disassemble(t, np.frombuffer(image, dtype=np.uint8), mode='linear',
+                         entry_points=[0xFFE0 if name == 'mos6502' else 0])
+    expected = reference_linear(t, image)
+    assert result.offsets.tolist() == expected
+    assert result.mix.instructions + result.mix.unknown == len(expected)
+    assert result.code_bytes == sum(result.lengths.tolist())
+    assert result.offsets[-1] + result.lengths[-1] <= len(image)
+
+
+@pytest.mark.parametrize("name", list(IMAGES))
+def test_recursive_descent_follows_control_flow(name):
+    path, image, reachable = IMAGES[name]
+    t = table(path)
+    result = disassemble(t, np.frombuffer(image, dtype=np.uint8))
+    assert result.isa == ('6502' if name == 'mos6502' else 'z80')
+    assert result.base == (0xFFE0 if name == 'mos6502' else 0)
+    assert result.offsets.tolist() == reachable
+    np.testing.assert_array_equal(result.entries, decode_image(t, np.frombuffer(
+        image, dtype=np.uint8))[0][reachable])
+
+
+def test_z80_static_mix():
+    t = table("zilog/z80")
+    result = disassemble(t, np.frombuffer(Z80_IMAGE, dtype=np.uint8), name='tiny')
+    mnemonics = [t.mnemonics[e] if e >= 0 else None for e in result.entries]
+    assert mnemonics == ['LD A,n', 'JR e', 'CALL nn', 'JP nn', 'INC A', 'JR Z,e', 'RET', None]
+    assert (result.mix.instructions, result.mix.unknown) == (7, 1)
+    expected = {}
+    for entry in result.entries[result.entries >= 0]:
+        category = t.categories[t.category_ids[entry]]
+        expected[category] = expected.get(category, 0) + 1
+    assert result.mix.category_counts == expected
+    assert result.mix.cycles == pytest.approx(t.cycles[result.entries[:-1]].sum())
+    summary = result.to_dict()
+    assert summary['instructions'] == 7 and summary['unknown'] == 1
+    assert sum(summary['category_mix'].values()) == pytest.approx(1.0)
+    assert result.to_workload_profile().name == 'tiny'
+
+
+def test_6502_unknown_opcodes_in_linear_sweep():
+    t = table("mos_wdc/mos6502")
+    result = disassemble(t, np.frombuffer(M6502_IMAGE, dtype=np.uint8), mode='linear')
+    unknown = result.offsets[result.entries == UNKNOWN_ENTRY].tolist()
+    assert 0x0B in unknown                          # the 0x02 data byte
+    assert np.all(result.lengths[result.entries == UNKNOWN_ENTRY] == 1)
+    assert result.mix.unknown == len(unknown)
+
+
+def test_jumps_out_of_image_and_entry_points():
+    t = table("zilog/z80")
+    image = np.frombuffer(Z80_IMAGE, dtype=np.uint8)
+    # Backward JR out of the image from the only entry point
+    escape = np.frombuffer(bytes([0x18, 0x80, 0x00]), dtype=np.uint8)
+    assert disassemble(t, escape).offsets.tolist() == [0]
+    # Entry points outside the image decode nothing
+    outside = disassemble(t, image, entry_points=[0x4000])
+    assert len(outside.offsets) == 0 and outside.mix.instructions == 0
+    # Loaded higher, the same code's absolute targets miss the image
+    shifted = disassemble(t, image, base=0x8000, entry_points=[0x8000])
+    assert shifted.offsets.tolist() == [0x00, 0x02, 0x07, 0x0A]
+
+
+def test_detect_isa_and_bad_arguments():
+    assert detect_isa(table("zilog/z80")) == 'z80'
+    assert detect_isa(table("zilog/z80a")) == 'z80'
+    assert detect_isa(table("mos_wdc/wdc65c02")) == '6502'
+    with pytest.raises(ValueError):
+        disassemble(table("zilog/z80"), np.zeros(4, dtype=np.uint8), mode='sideways')
+
+
+def test_rom_mix_tool(tmp_path):
+    roms = tmp_path / "roms"
+    (roms / "sub").mkdir(parents=True)
+    (roms / "tiny.rom").write_bytes(Z80_IMAGE)
+    (roms / "sub" / "copy.bin").write_bytes(Z80_IMAGE)
+    (roms / "notes.txt").write_text("not an image")
+    paths = find_images(roms)
+    assert [p.name for p in paths] == ["copy.bin", "tiny.rom"]
+    summaries = disassemble_images(paths, REPO_ROOT / "models" / "zilog" / "z80", workers=1)
+    assert [s['status'] for s in summaries] == ['ok', 'ok']
+    assert summaries[0]['instructions'] == 7
+
+    output = tmp_path / "mix.json"
+    proc = subprocess.run([sys.executable, str(ROM_MIX_TOOL), "--processor", "z80", str(roms),
+                           "--workers", "1", "--output", str(output)],
+                          capture_output=True, text=True, cwd=REPO_ROOT)
+    assert proc.returncode == 0, proc.stderr
+    document = json.loads(output.read_text())
+    assert [s['instructions'] for s in document['images']] == [7, 7]
+    weights = document['workload_profile']['category_weights']
+    assert weights == pytest.approx(summaries[0]['category_mix'])
+
+    proc = subprocess.run([sys.executable, str(ROM_MIX_TOOL), "--processor", "nosuch",
+                           str(roms)], capture_output=True, text=True, cwd=REPO_ROOT)
+    assert proc.returncode != 0 and "Unknown processor" in proc.stderr
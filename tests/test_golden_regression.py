@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Golden-Value Regression Suite
+==============================
+
+Snapshots CPI, IPC, base_cpi, correction_delta and bottleneck for every
+model in ``index.json`` and every workload profile it defines into one
+golden file (``tests/golden/fleet_golden.json``), and checks the whole
+fleet against it in a single vectorized comparison.  Each model is
+evaluated through ``common.evaluator.VectorizedEvaluator``, so the suite
+costs one model load plus one matrix product per model.
+
+A failure lists every drifted model with its per-workload old/new values.
+After an intentional change, refresh the golden file and review its diff:
+
+    python tests/test_golden_regression.py --update
+
+Usage:
+    python -m pytest -q tests/test_golden_regression.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.evaluator import VectorizedEvaluator
+from common.model_loader import discover_processors, load_model
+
+GOLDEN_PATH = Path(__file__).resolve().parent / "golden" / "fleet_golden.json"
+NUMERIC_FIELDS = ("cpi", "ipc", "base_cpi", "correction_delta")
+FIELDS = NUMERIC_FIELDS + ("bottleneck",)
+RTOL = 1e-7
+ATOL = 1e-9
+MAX_REPORTED_MODELS = 25
+
+
+def collect_fleet() -> Tuple[Dict[str, Dict[str, list]], Dict[str, str]]:
+    """Evaluate every workload of every model.
+
+    Returns:
+        ({model: {workload: [cpi, ipc, base_cpi, correction_delta, bottleneck]}},
+         {model: load/evaluation error})
+    """
+    results, errors = {}, {}
+    for entry in discover_processors(REPO_ROOT):
+        key = f"{entry['family']}/{entry['processor']}"
+        model, error = load_model(entry["model_file"])
+        if model is None:
+            errors[key] = error
+            continue
+        try:
+            evaluator = VectorizedEvaluator(model)
+            values = evaluator.evaluate_workloads()
+        except Exception as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+            continue
+        columns = [values[f].tolist() for f in NUMERIC_FIELDS]
+        columns.append([str(b) for b in values["bottleneck"]])
+        results[key] = {w: list(row) for w, row in zip(evaluator.workload_names, zip(*columns))}
+    return results, errors
+
+
+def _flatten(results: Dict[str, Dict[str, list]]):
+    """Sorted (model, workload) keys, numeric matrix and bottleneck array."""
+    keys = sorted((m, w) for m, per_workload in results.items() for w in per_workload)
+    numeric = np.array([results[m][w][:len(NUMERIC_FIELDS)] for m, w in keys],
+                       dtype=np.float64).reshape(len(keys), len(NUMERIC_FIELDS))
+    bottleneck = np.array([results[m][w][len(NUMERIC_FIELDS)] for m, w in keys], dtype=object)
+    return keys, numeric, bottleneck
+
+
+def compare(golden: Dict[str, Dict[str, list]],
+            current: Dict[str, Dict[str, list]]) -> List[str]:
+    """Per-model diagnostics for every difference (empty when identical)."""
+    golden_keys, golden_num, golden_bn = _flatten(golden)
+    current_keys, current_num, current_bn = _flatten(current)
+    problems: Dict[str, List[str]] = {}
+
+    if golden_keys != current_keys:
+        for m, w in sorted(set(golden_keys) - set(current_keys)):
+            problems.setdefault(m, []).append(f"{w}: missing (golden only)")
+        for m, w in sorted(set(current_keys) - set(golden_keys)):
+            problems.setdefault(m, []).append(f"{w}: new (not in golden file)")
+        shared = sorted(set(golden_keys) & set(current_keys))
+        g_idx = {k: i for i, k in enumerate(golden_keys)}
+        c_idx = {k: i for i, k in enumerate(current_keys)}
+        gi = np.array([g_idx[k] for k in shared], dtype=np.intp)
+        ci = np.array([c_idx[k] for k in shared], dtype=np.intp)
+        golden_num, golden_bn = golden_num[gi], golden_bn[gi]
+        current_num, current_bn = current_num[ci], current_bn[ci]
+        keys = shared
+    else:
+        keys = golden_keys
+
+    numeric_ok = np.isclose(current_num, golden_num, rtol=RTOL, atol=ATOL, equal_nan=True)
+    bottleneck_ok = current_bn == golden_bn
+    for row in np.flatnonzero(~numeric_ok.all(axis=1) | ~bottleneck_ok):
+        m, w = keys[row]
+        diffs = [f"{f} {golden_num[row, i]:.9g} -> {current_num[row, i]:.9g}"
+                 for i, f in enumerate(NUMERIC_FIELDS) if not numeric_ok[row, i]]
+        if not bottleneck_ok[row]:
+            diffs.append(f"bottleneck {golden_bn[row]} -> {current_bn[row]}")
+        problems.setdefault(m, []).append(f"{w}: " + ", ".join(diffs))
+
+    lines = []
+    for m in sorted(problems)[:MAX_REPORTED_MODELS]:
+        lines.append(f"{m}:")
+        lines.extend(f"    {p}" for p in problems[m])
+    if len(problems) > MAX_REPORTED_MODELS:
+        lines.append(f"... and {len(problems) - MAX_REPORTED_MODELS} more models")
+    if lines:
+        lines.insert(0, f"{len(problems)} model(s) differ from {GOLDEN_PATH.name} "
+                        f"(rtol={RTOL:g}, atol={ATOL:g}); "
+                        f"run 'python tests/test_golden_regression.py --update' if intended")
+    return lines
+
+
+def write_golden(results: Dict[str, Dict[str, list]], path: Path = GOLDEN_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write('{\n  "fields": ' + json.dumps(list(FIELDS)) + ',\n  "models": {\n')
+        models = sorted(results)
+        for i, model in enumerate(models):
+            per_workload = json.dumps({w: results[model][w] for w in sorted(results[model])})
+            f.write(f'    {json.dumps(model)}: {per_workload}'
+                    + (",\n" if i < len(models) - 1 else "\n"))
+        f.write("  }\n}\n")
+
+
+@pytest.fixture(scope="module")
+def fleet():
+    return collect_fleet()
+
+
+@pytest.fixture(scope="module")
+def golden():
+    if not GOLDEN_PATH.exists():
+        pytest.skip(f"{GOLDEN_PATH} missing; create it with --update")
+    with open(GOLDEN_PATH) as f:
+        data = json.load(f)
+    assert data["fields"] == list(FIELDS), "golden file field layout changed"
+    return data["models"]
+
+
+def test_all_models_load(fleet):
+    _, errors = fleet
+    assert not errors, "models failed to load or evaluate:\n" + "\n".join(
+        f"  {m}: {e}" for m, e in sorted(errors.items()))
+
+
+def test_fleet_matches_golden(fleet, golden):
+    results, _ = fleet
+    problems = compare(golden, results)
+    assert not problems, "\n".join(problems)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check or refresh the fleet golden values")
+    parser.add_argument("--update", action="store_true", help="Rewrite the golden file")
+    args = parser.parse_args()
+
+    results, errors = collect_fleet()
+    for model, error in sorted(errors.items()):
+        print(f"  ERROR {model}: {error}")
+    n_rows = sum(len(v) for v in results.values())
+    if args.update:
+        write_golden(results)
+        print(f"Wrote {GOLDEN_PATH} ({len(results)} models, {n_rows} model x workload rows)")
+        return
+    with open(GOLDEN_PATH) as f:
+        problems = compare(json.load(f)["models"], results)
+    print("\n".join(problems) if problems else f"OK: {len(results)} models, {n_rows} rows")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Reference Interpreter Tests
+============================
+
+Checks the table-driven cores (``common.cpu6502``, ``common.cpuz80``) on
+short hand-assembled programs: register / memory results and exact cycle
+totals against data-sheet cycle counts, including dynamic extras (taken
+branches, page crossings, block repeats) and the Z80 derivative tables
+that time (HL) ALU slots with a register-form range entry.  Also runs the
+self-checking kernels through ``run_emulator_benchmarks``.
+
+Usage:
+    python -m pytest -q tests/test_interpreter.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.cpu6502 import MOS6502
+from common.cpuz80 import Z80
+from common.interpreter import EmulationError, assemble
+from common.trace import load_timing_table
+from run_emulator_benchmarks import benchmark_processor
+
+ORIGIN = 0x0200
+
+
+@lru_cache(maxsize=None)
+def table(path):
+    return load_timing_table(REPO_ROOT / "models" / path)
+
+
+@lru_cache(maxsize=None)
+def z80(path, fallback=True):
+    return Z80(table(path), table("zilog/z80") if fallback and path != "zilog/z80" else None)
+
+
+@lru_cache(maxsize=None)
+def benchmark(path):
+    return benchmark_processor(str(REPO_ROOT / "models" / path),
+                               {'no_fallback': False, 'dry_run': True})
+
+
+def run(core, items, data):
+    """Assemble at ORIGIN, load ``{address: bytes}``, run to the halt."""
+    core.memory[:] = bytes(len(core.memory))
+    core.load(assemble(ORIGIN, items), ORIGIN)
+    for address, values in data.items():
+        core.load(values, address)
+    return core.run(ORIGIN, max_instructions=1000), core.state()
+
+
+def check_state(core, state, expected):
+    expected = dict(expected)
+    for address, values in expected.pop('mem', {}).items():
+        assert bytes(core.memory[address:address + len(values)]) == values
+    for flag, bit in (('zero', 0x40), ('carry', 0x01)):      # Z80 F register
+        if flag in expected:
+            assert bool(state['f'] & bit) == expected.pop(flag), flag
+    assert {k: state[k] for k in expected} == expected
+
+
+# (program, data, instructions, data-sheet cycles, expected registers / memory)
+Z80_CASES = {
+    'adc_a_hl': ([0x21, 0x00, 0x90, 0x3E, 0x10, 0x37, 0x8E, 0x76], {0x9000: b'\x05'},
+                 4, 10 + 7 + 4 + 7, dict(a=0x16)),
+    'sub_hl': ([0x21, 0x00, 0x90, 0x3E, 0x10, 0x96, 0x76], {0x9000: b'\x05'},
+               3, 10 + 7 + 7, dict(a=0x0B)),
+    'sbc_a_hl': ([0x21, 0x00, 0x90, 0x3E, 0x10, 0x37, 0x9E, 0x76], {0x9000: b'\x05'},
+                 4, 10 + 7 + 4 + 7, dict(a=0x0A)),
+    'cp_hl': ([0x21, 0x00, 0x90, 0x3E, 0x05, 0xBE, 0x76], {0x9000: b'\x05'},
+              3, 10 + 7 + 7, dict(a=0x05, zero=True)),
+    'and_or_xor_hl': ([0x21, 0x00, 0x90, 0x3E, 0x0F, 0xA6, 0xB6, 0xAE, 0x76], {0x9000: b'\x35'},
+                      5, 10 + 7 + 7 + 7 + 7, dict(a=0x00, zero=True)),
+    'ld_b_hl_inc_hl': ([0x21, 0x00, 0x90, 0x46, 0x34, 0x76], {0x9000: b'\x05'},
+                       3, 10 + 7 + 11, dict(b=0x05, mem={0x9000: b'\x06'})),
+    'add_a_ix_d': ([0xDD, 0x21, 0x00, 0x90, 0x3E, 0x01, 0xDD, 0x86, 0x02, 0x76],
+                   {0x9000: b'\x00\x00\x30'}, 3, 14 + 7 + 19, dict(a=0x31)),
+    'set_bit_hl': ([0x21, 0x00, 0x90, 0xCB, 0xDE, 0xCB, 0x46, 0x76], {0x9000: b'\x05'},
+                   3, 10 + 15 + 12, dict(zero=False, mem={0x9000: b'\x0D'})),
+    'rlc_ix_d': ([0xDD, 0x21, 0x00, 0x90, 0xDD, 0xCB, 0x01, 0x06, 0x76], {0x9000: b'\x00\x81'},
+                 2, 14 + 23, dict(carry=True, mem={0x9001: b'\x03'})),
+    'djnz': ([0x06, 0x03, 'loop:', 0x10, ('rel', 'loop'), 0x76], {},
+             4, 7 + 13 + 13 + 8, dict(b=0)),
+    'ldir': ([0x21, 0x00, 0x90, 0x11, 0x10, 0x90, 0x01, 0x03, 0x00, 0xED, 0xB0, 0x76],
+             {0x9000: b'abc'}, 6, 10 + 10 + 10 + 21 + 21 + 16,
+             dict(b=0, c=0, mem={0x9010: b'abc'})),
+}
+
+
+@pytest.mark.parametrize("path", ["zilog/z80", "zilog/z80a", "zilog/z80b"])
+@pytest.mark.parametrize("case", list(Z80_CASES))
+def test_z80_programs(path, case):
+    core = z80(path)
+    items, data, instructions, cycles, expected = Z80_CASES[case]
+    stats, state = run(core, items, data)
+    assert (stats.instructions, stats.cycles) == (instructions, cycles)
+    check_state(core, state, expected)
+
+
+@pytest.mark.parametrize("path", ["zilog/z80a", "zilog/z80b"])
+@pytest.mark.parametrize("slot", [0x8E, 0x96, 0x9E, 0xA6, 0xAE, 0xB6, 0xBE])
+def test_z80_hl_alu_slots_use_memory_form(path, slot):
+    core = z80(path)
+    assert core.slot_cycles[slot] == z80("zilog/z80").slot_cycles[slot] == 7
+    assert core.slot_mnemonic[slot].endswith('(HL)')
+    alone = z80(path, fallback=False)           # register-form entry plus the (HL) extra
+    if alone.slot_known[slot]:
+        assert not alone.memory_form(alone.slot_mnemonic[slot])
+        assert alone.slot_cycles[slot] == 7
+
+
+# 6502 programs (NMOS cycle counts); BRK halts and is not counted
+M6502_CASES = {
+    'adc_zero_page': ([0xA9, 0x05, 0x18, 0x65, 0x10, 0x00], {0x10: b'\x07'},
+                      3, 2 + 2 + 3, dict(a=0x0C)),
+    'lda_abs_x_page_cross': ([0xA2, 0x01, 0xBD, 0xFF, 0x20, 0x00], {0x2100: b'\x42'},
+                             2, 2 + 4 + 1, dict(a=0x42, x=1)),
+    'lda_abs_x_same_page': ([0xA2, 0x01, 0xBD, 0x00, 0x21, 0x00], {0x2101: b'\x42'},
+                            2, 2 + 4, dict(a=0x42)),
+    'sta_absolute': ([0xA9, 0xAA, 0x8D, 0x00, 0x30, 0x00], {},
+                     2, 2 + 4, dict(a=0xAA, mem={0x3000: b'\xAA'})),
+    'inx_loop': ([0xA2, 0x00, 'loop:', 0xE8, 0xE0, 0x03, 0xD0, ('rel', 'loop'), 0x00], {},
+                 10, 2 + 3 * (2 + 2) + 3 + 3 + 2, dict(x=3)),
+    'jsr_rts': ([0x20, ('abs', 'sub'), 0x00, 'sub:', 0xA0, 0x07, 0x60], {},
+                3, 6 + 2 + 6, dict(y=7)),
+}
+
+
+@pytest.fixture(scope="module", params=["mos_wdc/mos6502", "mos_wdc/wdc65c02"])
+def m6502_core(request):
+    return MOS6502(table(request.param))
+
+
+@pytest.mark.parametrize("case", list(M6502_CASES))
+def test_6502_programs(m6502_core, case):
+    items, data, instructions, cycles, expected = M6502_CASES[case]
+    stats, state = run(m6502_core, items, data)
+    assert (stats.instructions, stats.cycles) == (instructions, cycles)
+    check_state(m6502_core, state, expected)
+
+
+def test_runaway_program_raises():
+    core = MOS6502(table("mos_wdc/mos6502"))
+    core.load(assemble(ORIGIN, ['loop:', 0x4C, ('abs', 'loop')]), ORIGIN)
+    with pytest.raises(EmulationError):
+        core.run(ORIGIN, max_instructions=50)
+
+
+@pytest.mark.parametrize("path", ["mos_wdc/mos6502", "mos_wdc/wdc65c02", "zilog/z80",
+                                  "zilog/z80a", "zilog/z80b"])
+def test_benchmark_kernels_pass(path):
+    summary = benchmark(path)
+    assert summary['status'] == 'ok', summary.get('error')
+    assert 'written' not in summary
+    assert set(summary['workload_cpi']) == {'typical', 'compute', 'memory', 'control'}
+    if path.startswith('zilog/z80'):
+        assert summary['workload_cpi'] == pytest.approx(benchmark("zilog/z80")['workload_cpi'])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Pairing Simulator Tests
+========================
+
+Checks ``common.pairing_sim`` (compat matrices + prefix-scan group starts)
+against a naive greedy issue loop that asks ``PairingRules.verdict`` about
+every candidate group, for the shipped two- and three-wide presets, with
+and without dependency and branch checks, across chunk boundaries.
+
+Usage:
+    python -m pytest -q tests/test_pairing_sim.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.pairing_sim import (PAIRING_PRESETS, REJECT_REASONS, UNPAIRED_CLASS,
+                                simulate_pairing)
+from common.trace import FLAG_BRANCH, FLAG_NOT_TAKEN, UNKNOWN_ENTRY, load_timing_table
+from common.tracefile import make_records
+
+PRESET_MODELS = {'pentium': 'intel/pentium', 'm68060': 'motorola/m68060',
+                 'i960ca': 'intel/i960ca', 'i860': 'intel/i860'}
+
+
+def pairing_trace(table, n=4000, registers=6, seed=1):
+    """Random table entries (indices), a few unknown, with branches and registers."""
+    rng = np.random.default_rng(seed)
+    entries = rng.integers(0, len(table), n)
+    entries[rng.random(n) < 0.02] = UNKNOWN_ENTRY         # wraps in the unsigned field
+    branch = rng.random(n) < 0.12
+    flags = np.where(branch, FLAG_BRANCH, 0)
+    flags |= np.where(branch & (rng.random(n) < 0.4), FLAG_NOT_TAKEN, 0)
+    return make_records(opcode=entries, flags=flags,
+                        dst=rng.integers(0, registers, n),
+                        src1=rng.integers(0, registers, n),
+                        src2=rng.integers(0, registers, n))
+
+
+def reference_pairing(records, rules, table):
+    """Greedy in-order issue, one group at a time."""
+    rows = records.tolist()
+    n = len(rows)
+
+    def decode(rec):
+        _, entry, _, flags, _, _, dst, src1, src2 = rec
+        known = 0 <= entry < len(table)
+        name = table.pairing_classes[table.pairing_ids[entry]] if known else UNPAIRED_CLASS
+        cls = name if name in rules.units and name != UNPAIRED_CLASS else UNPAIRED_CLASS
+        cycles = 1.0
+        if known:
+            cycles = float(table.cycles_not_taken[entry] if flags & FLAG_NOT_TAKEN
+                           else table.cycles[entry])
+        if not rules.check_dependencies:
+            dst = src1 = src2 = 0
+        return dict(cls=cls, cycles=cycles, branch=bool(flags & FLAG_BRANCH),
+                    dst=dst, srcs=(src1, src2), known=known)
+
+    decoded = [decode(rec) for rec in rows]
+    groups = cycles = 0
+    group_sizes, class_counts, class_paired = {}, {}, {}
+    rejections = dict.fromkeys(REJECT_REASONS, 0)
+    i = 0
+    while i < n:
+        members = [i]
+        reason = None
+        while len(members) < rules.width:
+            j = members[-1] + 1
+            if j >= n:
+                reason = 'end_of_trace'
+                break
+            code = rules.verdict([decoded[k]['cls'] for k in members + [j]])
+            reason = REJECT_REASONS[code - 1] if code else None
+            if rules.branch_ends_group and decoded[members[-1]]['branch'] \
+                    and reason in (None, 'pipe_conflict'):
+                reason = 'branch'
+            if reason is None and any(
+                    decoded[k]['dst'] and (decoded[k]['dst'] in decoded[j]['srcs']
+                                           or decoded[k]['dst'] == decoded[j]['dst'])
+                    for k in members):
+                reason = 'dependency'
+            if reason is not None:
+                break
+            members.append(j)
+        groups += 1
+        cycles += max(decoded[k]['cycles'] for k in members)
+        group_sizes[len(members)] = group_sizes.get(len(members), 0) + 1
+        if len(members) < rules.width:
+            rejections[reason] += 1
+        for k in members:
+            cls = decoded[k]['cls']
+            class_counts[cls] = class_counts.get(cls, 0) + 1
+            if len(members) > 1:
+                class_paired[cls] = class_paired.get(cls, 0) + 1
+        i = members[-1] + 1
+    unknown = sum(not d['known'] for d in decoded)
+    return dict(instructions=n, groups=groups, cycles=cycles, group_sizes=group_sizes,
+                rejections=rejections, class_counts=class_counts,
+                class_paired=class_paired, unknown=unknown)
+
+
+CASES = [(name, name, {}) for name in PRESET_MODELS] + [
+    ('pentium', 'pentium_no_checks', dict(check_dependencies=False, branch_ends_group=False)),
+    ('i960ca', 'i960ca_no_dependencies', dict(check_dependencies=False)),
+]
+
+
+@pytest.mark.parametrize("preset,label,changes", CASES, ids=[c[1] for c in CASES])
+@pytest.mark.parametrize("chunk_size", [4000, 501, 2])
+def test_matches_greedy_reference(preset, label, changes, chunk_size):
+    table = load_timing_table(REPO_ROOT / "models" / PRESET_MODELS[preset])
+    rules = replace(PAIRING_PRESETS[preset], name=label, **changes)
+    records = pairing_trace(table)
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    stats, = simulate_pairing(chunks, [rules], table, indices=True)
+    expected = reference_pairing(records, rules, table)
+    assert stats.cycles == pytest.approx(expected.pop('cycles'), rel=1e-12)
+    for name, value in expected.items():
+        assert getattr(stats, name) == value, name
+    assert 1 < len(stats.group_sizes) and stats.class_paired
+
+
+def test_compat_matrices_agree_with_verdict():
+    for rules in PAIRING_PRESETS.values():
+        compat2, compat3 = rules.compat_matrices()
+        classes = rules.classes
+        for a, ca in enumerate(classes):
+            for b, cb in enumerate(classes):
+                assert compat2[a, b] == rules.verdict((ca, cb))
+                if compat3 is not None:
+                    for c, cc in enumerate(classes):
+                        assert compat3[a, b, c] == rules.verdict((ca, cb, cc))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pipeline Hazard Simulator Tests
+================================
+
+Checks ``common.pipeline_sim`` (max-plus blockwise solver) against a naive
+in-order scoreboard that issues one record at a time, for every preset and
+for hand-built configurations, across chunk boundaries.
+
+Usage:
+    python -m pytest -q tests/test_pipeline_sim.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.pipeline_sim import (INSTRUCTION_CLASSES, PIPELINE_PRESETS, PipelineConfig,
+                                 simulate_pipeline)
+from common.trace import (FLAG_BRANCH, FLAG_MEM_READ, FLAG_MEM_WRITE, FLAG_TAKEN, UNKNOWN_ENTRY,
+                          TimingTable)
+from common.tracefile import make_records
+
+# Entry index = opcode (simulated with indices=True)
+TABLE = TimingTable([{'mnemonic': 'add', 'cycles': 1}, {'mnemonic': 'mul', 'cycles': 4},
+                     {'mnemonic': 'div', 'cycles': 7.5}, {'mnemonic': 'ld', 'cycles': 2}])
+
+
+def pipeline_trace(n=3000, registers=8, seed=1):
+    """Random mix of ALU, multiply, load, store and branch records (some unknown)."""
+    rng = np.random.default_rng(seed)
+    kind = rng.choice(5, n, p=[0.45, 0.05, 0.25, 0.1, 0.15])
+    flags = np.select([kind == 2, kind == 3, kind == 4],
+                      [FLAG_MEM_READ, FLAG_MEM_WRITE, FLAG_BRANCH], 0)
+    flags |= np.where((kind == 4) & (rng.random(n) < 0.6), FLAG_TAKEN, 0)
+    opcode = np.where(kind == 1, rng.choice([1, 2, UNKNOWN_ENTRY], n), np.where(kind == 2, 3, 0))
+    dst = np.where(kind <= 2, rng.integers(1, registers, n), 0)
+    src1 = rng.integers(0, registers, n)
+    src2 = np.where(kind == 4, 0, rng.integers(0, registers, n))
+    return make_records(opcode=opcode, flags=flags, dst=dst, src1=src1, src2=src2)
+
+
+def reference_pipeline(records, cfg, table=None):
+    """Issue one record per step; ready[r] = first cycle a reader of r may issue."""
+    causes = dict.fromkeys(('load_use', 'raw', 'multicycle', 'branch', 'structural'), 0)
+    class_counts = dict.fromkeys(INSTRUCTION_CLASSES, 0)
+    class_stalls = dict.fromkeys(INSTRUCTION_CLASSES, 0)
+    ready, ready_class = {}, {}
+    last, bubble_last, violations = -1, 0, 0
+    for rec in records.tolist():
+        _, opcode, _, flags, _, _, dst, src1, src2 = rec
+        store = bool(flags & FLAG_MEM_WRITE)
+        load = bool(flags & FLAG_MEM_READ) and not store
+        branch = bool(flags & FLAG_BRANCH)
+        busy = 0
+        if table is not None and cfg.multicycle and not (load or store or branch):
+            cycles = table.cycles[opcode] if opcode < len(table) else 1
+            busy = max(math.ceil(cycles) - 1, 0)
+        klass = ('load' if load else 'store' if store else 'branch' if branch
+                 else 'multicycle' if busy else 'alu')
+        busy += cfg.load_busy if load else cfg.store_busy if store else 0
+        pays = branch and (cfg.branch_policy == 'stall' or bool(flags & FLAG_TAKEN))
+        control = cfg.branch_penalty if pays else 0
+        latency = (cfg.load_latency if load else cfg.alu_latency) + busy
+        early = int(cfg.branch_operands_in_id) if branch else 0
+
+        issue = last + 1 + bubble_last
+        need, blame = None, None
+        for src in (src1, src2):
+            if src and src in ready and (need is None or ready[src] + early > need):
+                need, blame = ready[src] + early, ready_class[src]
+        stall = 0
+        if need is not None and need > issue:
+            if cfg.interlocked:
+                stall = need - issue
+                issue = need
+                causes['load_use' if blame == 'load' else
+                       'multicycle' if blame == 'multicycle' else 'raw'] += stall
+                class_stalls[blame] += stall
+            else:
+                violations += 1
+        causes['branch'] += control
+        causes['structural'] += busy
+        class_counts[klass] += 1
+        class_stalls[klass] += busy + control
+        if dst:
+            ready[dst], ready_class[dst] = issue + latency, klass
+        last, bubble_last = issue, busy + control
+    return causes, class_counts, class_stalls, violations
+
+
+CONFIGS = list(PIPELINE_PRESETS.values()) + [
+    PipelineConfig('alu_bypass', forwarding='alu', load_delay=2),
+    PipelineConfig('stall_branches', branch_policy='stall', branch_resolve=3,
+                   branch_delay_slots=0, load_busy=1),
+    PipelineConfig('deep_id_compare', stages=7, ex_stage=3, load_delay=3,
+                   branch_operands_in_id=True, store_busy=2),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS, ids=lambda c: c.name)
+@pytest.mark.parametrize("chunk_size", [3000, 613])
+def test_matches_scoreboard(config, chunk_size):
+    records = pipeline_trace()
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    stats, = simulate_pipeline(chunks, [config], TABLE, indices=True)
+    causes, class_counts, class_stalls, violations = reference_pipeline(records, config, TABLE)
+    assert stats.instructions == len(records)
+    assert stats.stalls == causes
+    assert stats.class_counts == class_counts
+    assert stats.class_stalls == class_stalls
+    assert stats.violations == violations
+
+
+def test_without_table_has_no_multicycle_class():
+    records = pipeline_trace(seed=2)
+    config = PIPELINE_PRESETS['classic5']
+    stats, = simulate_pipeline([records], [config])
+    causes, class_counts, _, _ = reference_pipeline(records, config)
+    assert stats.class_counts['multicycle'] == 0
+    assert stats.stalls == causes and stats.class_counts == class_counts
+    assert stats.stalls['load_use'] > 0
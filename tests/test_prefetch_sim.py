@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Prefetch-Queue Co-Simulation Tests
+===================================
+
+Checks ``common.prefetch_sim`` (event-stepped, vectorized across
+workloads) against a naive clock-by-clock BIU/EU loop that replays the
+same sampled instruction stream one workload at a time.
+
+Usage:
+    python -m pytest -q tests/test_prefetch_sim.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.prefetch_sim import PrefetchQueueSimulator
+
+MIXES = ['typical',
+         {'alu': 0.5, 'control': 0.3, 'data_transfer': 0.2},
+         {'multiply': 0.3, 'string': 0.3, 'stack': 0.4},
+         {'control': 1.0}]
+
+
+class ClockedBIU:
+    """One workload's queue and bus, stepped one clock at a time."""
+
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.now = 0
+        self.q = cfg.queue_bytes
+        self.landing = None          # clock at which the in-flight fetch lands
+        self.landing_bytes = 0       # 0: fetch whose bytes a jump discarded
+        self.fetched = 0
+
+    def try_start(self):
+        cfg = self.cfg
+        if self.landing is None and cfg.queue_bytes - self.q >= cfg.bus_bytes:
+            self.landing = self.now + cfg.fetch_clocks
+            self.landing_bytes = cfg.bus_bytes
+
+    def tick(self, prefetch=True):
+        self.now += 1
+        if self.landing == self.now:
+            self.q += self.landing_bytes
+            self.fetched += self.landing_bytes
+            self.landing = None
+        if prefetch:
+            self.try_start()
+
+    def run_until(self, clock, prefetch=True):
+        while self.now < clock:
+            self.tick(prefetch)
+
+
+def reference_prefetch(sim, weights):
+    """Clock-by-clock co-simulation of every row of ``weights``."""
+    cfg = sim.config
+    lanes, n_entries = weights.shape
+    cdf = np.cumsum(weights, axis=1)
+    cdf /= cdf[:, -1:]
+    rng = np.random.default_rng(sim.seed)
+    draws = [(rng.random(lanes), rng.random(lanes)) for _ in range(sim.n_instructions)]
+
+    results = []
+    for lane in range(lanes):
+        biu = ClockedBIU(cfg)
+        stats = dict.fromkeys(('starve', 'starved', 'empty', 'queue', 'contention', 'flushed'), 0)
+        for u_entry, u_taken in draws:
+            e = min(int(np.searchsorted(cdf[lane] + lane, u_entry[lane] + lane, side='right')),
+                    n_entries - 1)
+            taken = bool(sim.always_flush[e]
+                         or (sim.conditional[e] and u_taken[lane] < sim.taken_rate))
+            clocks = int(sim.clocks_not_taken[e] if sim.conditional[e] and not taken
+                         else sim.clocks[e])
+            transfers = int(sim.transfers[e])
+            t = biu.now
+
+            # Take the instruction bytes as they arrive
+            stats['queue'] += biu.q
+            stats['empty'] += biu.q == 0
+            stats['starved'] += biu.q < sim.length[e]
+            needed = int(sim.length[e])
+            while True:
+                take = min(biu.q, needed)
+                biu.q -= take
+                needed -= take
+                biu.try_start()
+                if not needed:
+                    break
+                biu.tick()
+            start = biu.now
+            stats['starve'] += start - t
+
+            if transfers:
+                request = start + max(clocks - transfers * cfg.bus_cycle, 0)
+                biu.run_until(request)
+                if biu.landing is not None:          # finish the prefetch in flight
+                    biu.run_until(biu.landing, prefetch=False)
+                stats['contention'] += biu.now - request
+                bus = transfers * int(sim.cycles_per_transfer[e])
+                biu.run_until(biu.now + bus * cfg.fetch_clocks, prefetch=False)
+                if taken:
+                    stats['flushed'] += biu.q
+                    biu.q = 0
+                biu.try_start()
+            elif taken:
+                biu.run_until(max(start, start + clocks - cfg.jump_overlap))
+                stats['flushed'] += biu.q
+                biu.q = 0
+                if biu.landing is not None:
+                    biu.landing_bytes = 0
+                biu.try_start()
+                biu.run_until(start + clocks)
+            else:
+                biu.run_until(start + clocks)
+        stats['cycles'], stats['fetched'] = biu.now, biu.fetched
+        results.append(stats)
+    return results
+
+
+@pytest.mark.parametrize("processor,changes", [
+    ("i8086", {}),
+    ("i8088", {}),
+    ("i8086", dict(wait_states=2, jump_overlap=3)),
+    ("i8088", dict(queue_bytes=6, wait_states=1, jump_overlap=0)),
+], ids=["i8086", "i8088", "i8086_wait2", "i8088_q6"])
+def test_matches_clocked_reference(processor, changes):
+    base = PrefetchQueueSimulator.from_model(REPO_ROOT / "models" / "intel" / processor)
+    config = replace(base.config, **changes)
+    sim = PrefetchQueueSimulator.from_model(REPO_ROOT / "models" / "intel" / processor,
+                                            config=config, n_instructions=400, seed=3)
+    weights = sim.entry_weights(MIXES)
+    result = sim.simulate(MIXES)
+    n = sim.n_instructions
+    expected = reference_prefetch(sim, weights)
+    for lane, ref in enumerate(expected):
+        per_instruction = {'cpi': 'cycles', 'starvation_cpi': 'starve',
+                           'starved_fraction': 'starved', 'empty_fraction': 'empty',
+                           'avg_queue_bytes': 'queue', 'contention_cpi': 'contention',
+                           'flushed_bytes': 'flushed'}
+        for name, key in per_instruction.items():
+            assert getattr(result, name)[lane] == pytest.approx(ref[key] / n, rel=1e-12), name
+        prefetch_clocks = ref['fetched'] / config.bus_bytes * config.fetch_clocks
+        assert result.prefetch_utilization[lane] == pytest.approx(
+            min(prefetch_clocks / ref['cycles'], 1.0), rel=1e-12)
+    assert (result.starvation_cpi > 0).any() and (result.contention_cpi > 0).any()
+    assert (result.flushed_bytes > 0).any()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Queueing Model Tests
+=====================
+
+Checks that ``QueueingModel.analyze`` on a workload x category matrix (the
+precompiled-mask batch path) gives, row for row, the per-mix results and a
+scalar reference built from the per-stage helpers -- with and without the
+threshold prefetch stage (including its starvation branch) and with the
+prefetch stage taken from a ``PrefetchQueueSimulator``.
+
+Usage:
+    python -m pytest -q tests/test_queueing.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.prefetch_sim import PrefetchQueueSimulator
+from common.queueing import QueueingModel
+
+CATEGORIES = {
+    'alu': {'cycles': 3, 'weight': 0.35},
+    'data_transfer': {'cycles': 10, 'weight': 0.25},
+    'control': {'cycles': 16, 'weight': 0.15},
+    'multiply': {'cycles': 120, 'weight': 0.05},
+    'string': {'cycles': 18, 'weight': 0.05},
+    'stack': {'cycles': 11, 'weight': 0.15},
+}
+
+WORKLOADS = ['typical', 'compute', 'memory', 'control', 'no_such_profile',
+             {'alu': 0.9, 'control': 0.1},
+             {'alu': 1.0},                                  # short ops: queue stays full
+             {'multiply': 0.5, 'string': 0.5},              # long ops: queue starves
+             {'stack': 0.6, 'data_transfer': 0.2, 'alu': 0.2},
+             {}]
+
+MODELS = {
+    'plain': dict(bus_width=8),
+    'prefetch4': dict(bus_width=8, prefetch_depth=4),
+    'prefetch6_cache': dict(bus_width=16, prefetch_depth=6, cache_size=2048,
+                            memory_wait_states=1),
+}
+
+
+def model(name, **extra):
+    return QueueingModel(4.77, CATEGORIES, **MODELS[name], **extra)
+
+
+def reference_analysis(m, workload, prefetch=None):
+    """Scalar analysis of one workload dict from the per-stage helpers.
+
+    ``prefetch`` = (utilization, starvation share) of a simulated prefetch
+    stage, replacing the fullness thresholds.
+    """
+    cpi = m.weighted_cpi(workload)
+    stages = {'fetch': m._analyze_fetch_stage(cpi)[0],
+              'decode': m._analyze_decode_stage(cpi, workload)[0],
+              'execute': m._analyze_execute_stage(cpi, workload)[0],
+              'memory': m._analyze_memory_stage(cpi, workload)[0]}
+    n_stages = 4
+    if prefetch is not None:
+        stages['prefetch'], starvation = prefetch
+        if starvation > 0:
+            stages['prefetch_starvation'] = starvation
+        n_stages += 1 + (starvation > 0)
+    elif m.prefetch_depth > 0:
+        util, status = m._analyze_prefetch(cpi)
+        stages['prefetch'] = util
+        if status == 'prefetch_starvation':
+            stages['prefetch_starvation'] = util
+        n_stages += 1 + (status == 'prefetch_starvation')
+    if m.cache_size > 0:
+        util, hit_rate = m._analyze_cache(cpi)
+        stages['cache'], stages['cache_miss'] = util, 1.0 - hit_rate
+        n_stages += 2
+    bottleneck, util = m.identify_bottleneck(stages)
+    return dict(cpi=cpi, ips=m.clock_hz / cpi, bottleneck=bottleneck,
+                bottleneck_utilization=util, stages=stages,
+                utilization=min(sum(stages.values()) / n_stages, 1.0))
+
+
+def assert_row(batch, row, expected):
+    assert batch.cpi[row] == pytest.approx(expected['cpi'], rel=1e-12)
+    assert batch.ips[row] == pytest.approx(expected['ips'], rel=1e-12)
+    assert batch.utilization[row] == pytest.approx(expected['utilization'], rel=1e-12)
+    assert batch.bottleneck[row] == expected['bottleneck']
+    assert batch.bottleneck_utilization[row] == pytest.approx(
+        expected['bottleneck_utilization'], rel=1e-12)
+    stages = {stage: float(util[row]) for stage, util in batch.stage_utilizations.items()}
+    if stages.get('prefetch_starvation') == 0.0:
+        del stages['prefetch_starvation']
+    assert stages == pytest.approx(expected['stages'], rel=1e-12)
+
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_batch_rows_match_per_mix_analysis(name):
+    m = model(name)
+    weights = m.workload_matrix(WORKLOADS)
+    batch = m.analyze(weights)
+    assert batch.cpi.shape == (len(WORKLOADS),)
+    for row, workload in enumerate(WORKLOADS):
+        single = m.analyze(workload)
+        assert_row(batch, row, dict(cpi=single.cpi, ips=single.ips,
+                                    utilization=single.utilization,
+                                    bottleneck=single.bottleneck,
+                                    bottleneck_utilization=single.bottleneck_utilization,
+                                    stages=single.stage_utilizations))
+        mix = dict(zip(m.category_names, weights[row].tolist()))
+        assert_row(batch, row, reference_analysis(m, mix))
+
+
+def test_threshold_prefetch_branches_are_covered():
+    m = model('prefetch4')
+    batch = m.analyze(m.workload_matrix(WORKLOADS))
+    starving = batch.stage_utilizations['prefetch_starvation'] > 0
+    assert starving.any() and not starving.all()
+    assert set(batch.stage_utilizations['prefetch'].tolist()) == {0.9, 0.5, 0.2}
+    slow = m.analyze({'multiply': 0.5, 'string': 0.5})
+    assert slow.stage_utilizations['prefetch_starvation'] == 0.9
+    assert 'prefetch_starvation' not in m.analyze({'alu': 1.0}).stage_utilizations
+
+
+def test_unknown_categories_count_towards_decode_and_memory():
+    m = model('plain')
+    workload = {'alu': 0.5, 'string': 0.2, 'call_return': 0.1, 'memory_load': 0.2}
+    single = m.analyze(workload)
+    expected = reference_analysis(m, workload)
+    assert single.cpi == pytest.approx(expected['cpi'])
+    assert single.stage_utilizations == pytest.approx(expected['stages'])
+
+
+@pytest.fixture(scope="module")
+def simulator():
+    return PrefetchQueueSimulator.from_model(REPO_ROOT / "models" / "intel" / "i8088",
+                                             n_instructions=300, seed=5)
+
+
+@pytest.mark.parametrize("name", ['plain', 'prefetch4'])
+def test_simulated_prefetch_rows(simulator, name):
+    m = model(name, prefetch_simulator=simulator)
+    weights = m.workload_matrix(WORKLOADS)
+    batch = m.analyze(weights)
+    simulated = simulator.simulate_categories(weights, m.category_names)
+    np.testing.assert_allclose(batch.stage_utilizations['prefetch'],
+                               simulated.prefetch_utilization, rtol=1e-12)
+    np.testing.assert_allclose(batch.stage_utilizations['prefetch_starvation'],
+                               simulated.starvation_share, rtol=1e-12)
+    assert (simulated.starvation_share > 0).any()
+    for row in range(len(WORKLOADS)):
+        mix = dict(zip(m.category_names, weights[row].tolist()))
+        prefetch = (simulated.prefetch_utilization[row], simulated.starvation_share[row])
+        assert_row(batch, row, reference_analysis(m, mix, prefetch))
+
+
+def test_simulated_prefetch_single_mix(simulator):
+    m = model('prefetch4', prefetch_simulator=simulator)
+    workload = {'alu': 0.6, 'control': 0.4}
+    single = m.analyze(workload)
+    simulated = simulator.simulate_categories(m.workload_matrix([workload]), m.category_names)
+    prefetch = (simulated.prefetch_utilization[0], simulated.starvation_share[0])
+    expected = reference_analysis(m, workload, prefetch)
+    assert single.bottleneck == expected['bottleneck']
+    assert single.utilization == pytest.approx(expected['utilization'], rel=1e-12)
+    assert single.stage_utilizations == pytest.approx(expected['stages'], rel=1e-12)
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Result Diff Tests
+==================
+
+``common.result_diff.diff_snapshots`` and the ``tools/diff_results.py``
+exit codes: 0 unchanged, 1 changed, 2 bad input -- including the case
+where a filter leaves nothing to compare.
+
+Usage:
+    python -m pytest -q tests/test_result_diff.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.result_diff import ResultSnapshot, diff_snapshots
+from common.run_store import RunStore
+
+DIFF_TOOL = REPO_ROOT / "tools" / "diff_results.py"
+
+
+def test_empty_snapshots_give_empty_diff():
+    empty = ResultSnapshot([], [], [])
+    diff = diff_snapshots(empty, empty)
+    assert diff.n_changed == 0
+    assert diff.rows() == []
+    assert diff.summary()['keys'] == 0
+
+
+def test_diff_flags_changed_added_and_removed():
+    a = ResultSnapshot.from_mapping({'zilog/z80': {'typical': 4.0, 'memory': 5.0},
+                                     'mos/6502': {'typical': 3.0}})
+    b = ResultSnapshot.from_mapping({'zilog/z80': {'typical': 4.0, 'memory': 5.5},
+                                     'intel/i8080': {'typical': 6.0}})
+    diff = diff_snapshots(a, b)
+    status = {(r['model'], r['workload']): r['status'] for r in diff.rows()}
+    assert status == {('zilog/z80', 'memory'): 'changed',
+                      ('mos/6502', 'typical'): 'removed',
+                      ('intel/i8080', 'typical'): 'added'}
+    assert diff_snapshots(a, b, ignore_missing=True).n_changed == 1
+    np.testing.assert_allclose(
+        [r['delta'] for r in diff.rows() if r['status'] == 'changed'], [0.5])
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    path = tmp_path / "runs.sqlite3"
+    with RunStore(path) as store:
+        for cpi in (4.0, 4.5):
+            with store.start_run("analyze", method="analyze") as writer:
+                writer.add_analysis("zilog/z80", {'typical': cpi})
+    return path
+
+
+def _run_tool(*args):
+    return subprocess.run([sys.executable, str(DIFF_TOOL), *args],
+                          capture_output=True, text=True, cwd=REPO_ROOT).returncode
+
+
+def test_cli_exit_codes(store_path):
+    db = ["--db", str(store_path)]
+    assert _run_tool("run:1", "run:1", *db) == 0
+    assert _run_tool("run:1", "run:2", *db) == 1
+    assert _run_tool("run:1", "run:2", "--family", "nosuch", *db) == 2
+    assert _run_tool("run:1", "run:99", *db) == 2
+    assert _run_tool(str(store_path.parent / "missing.json"), "run:1", *db) == 2
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Reuse-Distance Engine Tests
+============================
+
+Checks ``common.reuse_distance`` against a naive LRU stack: per-access
+stack distances across chunk boundaries, the resulting hit-rate curve, and
+``count_smaller_before`` against a pairwise count.
+
+Usage:
+    python -m pytest -q tests/test_reuse_distance.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.cache_sim import CacheGeometry, simulate_caches
+from common.reuse_distance import ReuseDistanceAnalyzer, count_smaller_before, reuse_profile
+
+
+def address_trace(n=5000, seed=1):
+    rng = np.random.default_rng(seed)
+    hot = rng.integers(0, 2048, n)
+    cold = rng.integers(0, 1 << 16, n)
+    return np.where(rng.random(n) < 0.85, hot, cold).astype(np.int64)
+
+
+def reference_distances(addresses, line_size):
+    """LRU stack as a list, most recent line first (-1 = cold miss)."""
+    stack = []
+    distances = []
+    for line in (addresses // line_size).tolist():
+        if line in stack:
+            depth = stack.index(line)
+            stack.pop(depth)
+        else:
+            depth = -1
+        stack.insert(0, line)
+        distances.append(depth)
+    return np.array(distances)
+
+
+@pytest.mark.parametrize("values", [
+    np.random.default_rng(0).permutation(1000),
+    np.random.default_rng(1).choice(1 << 20, 300, replace=False) - (1 << 19),
+    np.arange(100)[::-1],
+    np.array([3]),
+])
+def test_count_smaller_before_matches_pairwise(values):
+    expected = [int((values[:i] < v).sum()) for i, v in enumerate(values)]
+    np.testing.assert_array_equal(count_smaller_before(values), expected)
+
+
+def test_count_smaller_before_bounds_ties():
+    values = np.random.default_rng(2).integers(-5, 5, 300)
+    counts = count_smaller_before(values)
+    assert all((values[:i] < v).sum() <= c <= (values[:i] <= v).sum()
+               for i, (v, c) in enumerate(zip(values, counts)))
+
+
+@pytest.mark.parametrize("chunk_size", [5000, 997, 64])
+def test_distances_match_lru_stack(chunk_size):
+    addresses = address_trace()
+    analyzer = ReuseDistanceAnalyzer(line_size=16)
+    distances = np.concatenate([analyzer.feed(addresses[i:i + chunk_size])
+                                for i in range(0, len(addresses), chunk_size)])
+    np.testing.assert_array_equal(distances, reference_distances(addresses, 16))
+
+
+def test_hit_curve_matches_fully_associative_cache():
+    addresses = address_trace(seed=2)
+    chunks = [addresses[i:i + 800] for i in range(0, len(addresses), 800)]
+    profile = reuse_profile(chunks, line_size=16)
+    reference = reference_distances(addresses, 16)
+    assert profile.accesses == len(addresses)
+    assert profile.cold_misses == int((reference < 0).sum())
+    assert profile.distinct_lines == len(np.unique(addresses // 16))
+    for lines in (4, 16, 64):
+        geometry = CacheGeometry(lines * 16, lines, 16)
+        stats, = simulate_caches(chunks, [geometry])
+        assert profile.hit_rate(geometry.size) == pytest.approx(stats.hit_rate, abs=1e-12)
+        assert stats.hits == int(((reference >= 0) & (reference < lines)).sum())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Instruction-Mix Sweep Tests
+============================
+
+``common.sweep``: the streaming histogram keeps every value when the CPI
+range is not known in advance, and Sobol sweeps draw balanced
+power-of-two blocks.
+
+Usage:
+    python -m pytest -q tests/test_sweep.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.sweep import HISTOGRAM_BINS, load_sweep, sobol_mixes, sobol_size, sweep_mixes
+
+CATEGORIES = ['alu', 'load', 'store', 'branch']
+
+
+def unbounded_cpi(weights):
+    """A callable evaluator without cpi_bounds."""
+    return 1.0 + 50.0 * weights[:, 0] ** 4 - 0.9 * weights[:, 1]
+
+
+class DriftingCPI:
+    """Each chunk's CPI is shifted further, far outside the first chunk's range."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, weights):
+        self.calls += 1
+        return unbounded_cpi(weights) * self.calls ** 2 - 3.0 * (self.calls % 3)
+
+
+def test_histogram_widens_instead_of_dropping(tmp_path):
+    summary = sweep_mixes(DriftingCPI(), 20_000, tmp_path, categories=CATEGORIES,
+                          chunk_size=256, seed=3)
+    cpi = load_sweep(tmp_path)['cpi'].astype(np.float64)
+    assert sum(summary.histogram) == summary.count == len(cpi)
+    lo, hi = summary.histogram_range
+    assert lo <= cpi.min() and cpi.max() <= hi
+    width = (hi - lo) / HISTOGRAM_BINS
+    for q in (1, 50, 99):
+        assert abs(summary.percentiles[f"p{q}"] - np.percentile(cpi, q)) <= 2 * width
+
+
+def test_sobol_uses_power_of_two_blocks():
+    assert [sobol_size(n) for n in (0, 1, 5, 1024, 1025)] == [0, 1, 8, 1024, 2048]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        chunks = list(sobol_mixes(1000, 4, chunk_size=300, seed=0))
+    assert [len(c) for c in chunks] == [256] * 4
+    mixes = np.vstack(chunks)
+    np.testing.assert_allclose(mixes.sum(axis=1), 1.0)
+
+
+def test_sobol_sweep_count_is_power_of_two():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        summary = sweep_mixes(unbounded_cpi, 3000, method='sobol', categories=CATEGORIES,
+                              chunk_size=1000)
+    assert summary.count == 4096
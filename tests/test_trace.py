@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Trace Engine Tests
+===================
+
+The packed-opcode examples in the ``common.trace`` module docstring must
+decode with the shipped Z80 timing table to the entries they name, and
+``TraceReplayer`` must count out-of-table entry indices as unknown.
+
+Usage:
+    python -m pytest -q tests/test_trace.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import common.trace as trace
+from common.trace import UNKNOWN_ENTRY, load_timing_table
+
+# Documented example -> mnemonic of the timing entry it must decode to
+DOCUMENTED = {
+    0x3E: "LD A,n",
+    0xDD46: "LD r,(IX+d)",
+    0xDDCB0646: "BIT b,(IX+d)",
+}
+
+
+@pytest.fixture(scope="module")
+def z80():
+    return load_timing_table(REPO_ROOT / "models" / "zilog" / "z80")
+
+
+def test_docstring_lists_the_checked_examples():
+    documented = re.findall(r"``(0x[0-9A-F]+)`` \(", trace.__doc__)
+    assert [int(op, 16) for op in documented] == list(DOCUMENTED)
+
+
+@pytest.mark.parametrize("opcode,mnemonic", DOCUMENTED.items(),
+                         ids=[hex(op) for op in DOCUMENTED])
+def test_docstring_example_decodes(z80, opcode, mnemonic):
+    entry, = z80.lookup(np.array([opcode], dtype=np.uint32))
+    assert entry != UNKNOWN_ENTRY
+    assert z80.mnemonics[entry] == mnemonic
+
+
+def test_replay_of_documented_examples(z80):
+    opcodes = np.array(list(DOCUMENTED), dtype=np.uint32)
+    result = trace.replay_trace(z80, [opcodes])
+    assert result.coverage == 1.0
+    entries = z80.lookup(opcodes)
+    assert result.cpi == pytest.approx(z80.cycles[entries].mean())
+
+
+def test_replayer_counts_out_of_range_indices_as_unknown(z80):
+    known = np.array([0, 1, len(z80) - 1, 1])
+    bad = np.array([len(z80), len(z80) + 7, -1, -5, 0xFFFFFFFF])
+    flags = np.zeros(len(known) + len(bad), dtype=np.uint16)
+    flags[[1, 5]] = trace.FLAG_NOT_TAKEN
+    replayer = trace.TraceReplayer(z80)
+    replayer.update(indices=np.concatenate([known, bad]), flags=flags)
+    replayer.update(indices=bad.astype(np.uint32))
+    result = replayer.result()
+
+    reference = trace.TraceReplayer(z80)
+    reference.update(indices=known, flags=flags[:len(known)])
+    expected = reference.result()
+    assert result.unknown == 2 * len(bad)
+    assert (result.instructions, result.cycles) == (expected.instructions, expected.cycles)
+    np.testing.assert_array_equal(replayer.state()['counts'][1:], reference.state()['counts'][1:])
+    np.testing.assert_array_equal(replayer.state()['not_taken'][1:],
+                                  reference.state()['not_taken'][1:])
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Trace Container Tests
+======================
+
+Checks ``common.tracefile``: write / read round trips for raw and zlib
+chunks with and without delta encoding (including wrapping pc / addr
+deltas), random-access ``read()`` across chunk boundaries, ``partitions()``,
+an empty trace and rejected headers.
+
+Usage:
+    python -m pytest -q tests/test_tracefile.py
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.tracefile import (TRACE_MAGIC, TRACE_RECORD, TRACE_VERSION, TraceReader, TraceWriter,
+                              make_records, write_trace)
+
+CHUNK = 1000
+
+
+def trace_records(n=4321, seed=1):
+    """Mostly sequential pcs with jumps, random data addresses near 2**32."""
+    rng = np.random.default_rng(seed)
+    step = np.where(rng.random(n) < 0.9, rng.integers(1, 4, n), rng.integers(-4000, 4000, n))
+    pc = (0xFFFFF000 + np.cumsum(step)) % (1 << 32)
+    return make_records(pc=pc, opcode=rng.integers(0, 1 << 32, n),
+                        addr=rng.integers(0, 1 << 32, n),
+                        flags=rng.integers(0, 1 << 16, n), cycles=rng.integers(0, 40, n),
+                        length=rng.integers(1, 5, n), dst=rng.integers(0, 16, n),
+                        src1=rng.integers(0, 16, n), src2=rng.integers(0, 16, n))
+
+
+@pytest.fixture(scope="module")
+def records():
+    return trace_records()
+
+
+@pytest.mark.parametrize("compression", [None, 'zlib'])
+@pytest.mark.parametrize("delta", [False, True])
+def test_round_trip(tmp_path, records, compression, delta):
+    path = tmp_path / "t.trace"
+    metadata = {'processor': 'Zilog Z80', 'clock_mhz': 4.0}
+    with TraceWriter(path, chunk_records=CHUNK, compression=compression, delta=delta,
+                     metadata=metadata) as writer:
+        for start in range(0, len(records), 777):          # appends straddle chunks
+            writer.append(records[start:start + 777])
+    with TraceReader(path) as reader:
+        assert (len(reader), reader.n_chunks) == (len(records), 5)
+        assert reader.delta == delta and reader.metadata == metadata
+        assert reader.index['n_records'].tolist() == [CHUNK] * 4 + [321]
+        assert reader.index['first_record'].tolist() == [0, 1000, 2000, 3000, 4000]
+        chunks = list(reader)
+        assert all(c.dtype == TRACE_RECORD for c in chunks)
+        np.testing.assert_array_equal(np.concatenate(chunks), records)
+        np.testing.assert_array_equal(reader.chunk(3), records[3000:4000])
+
+
+def test_raw_chunks_are_views_and_zlib_is_smaller(tmp_path, records):
+    raw = write_trace(tmp_path / "raw.trace", records, chunk_records=CHUNK)
+    packed = write_trace(tmp_path / "zlib.trace", records[np.argsort(records['pc'])],
+                         chunk_records=CHUNK, compression='zlib', delta=True)
+    with TraceReader(raw) as reader:
+        chunk = reader.chunk(0)
+        assert not chunk.flags.writeable and not chunk.flags.owndata
+        del chunk
+    assert packed.stat().st_size < raw.stat().st_size
+
+
+@pytest.mark.parametrize("compression,delta", [(None, False), ('zlib', True)])
+@pytest.mark.parametrize("start,count", [(0, 10), (995, 10), (999, 1), (1000, 1),
+                                         (500, 2600), (4300, 100), (4321, 5), (0, 10**6)])
+def test_read_across_chunk_boundaries(tmp_path, records, compression, delta, start, count):
+    path = write_trace(tmp_path / "t.trace", records, chunk_records=CHUNK,
+                       compression=compression, delta=delta)
+    with TraceReader(path) as reader:
+        np.testing.assert_array_equal(reader.read(start, count), records[start:start + count])
+
+
+def test_seek(tmp_path, records):
+    with TraceReader(write_trace(tmp_path / "t.trace", records, chunk_records=CHUNK)) as reader:
+        assert reader.seek(0) == (0, 0)
+        assert reader.seek(999) == (0, 999)
+        assert reader.seek(1000) == (1, 0)
+        assert reader.seek(4320) == (4, 320)
+        with pytest.raises(IndexError):
+            reader.seek(4321)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8])
+def test_partitions_cover_all_chunks(tmp_path, records, n):
+    with TraceReader(write_trace(tmp_path / "t.trace", records, chunk_records=CHUNK)) as reader:
+        parts = reader.partitions(n)
+        assert len(parts) == min(n, reader.n_chunks)
+        assert parts[0][0] == 0 and parts[-1][1] == reader.n_chunks
+        assert all(a < b for a, b in parts)
+        assert all(stop == start for (_, stop), (start, _) in zip(parts, parts[1:]))
+        covered = np.concatenate([c for a, b in parts for c in reader.iter_chunks(a, b)])
+        np.testing.assert_array_equal(covered, records)
+
+
+def test_empty_trace(tmp_path):
+    path = tmp_path / "empty.trace"
+    with TraceWriter(path, compression='zlib', delta=True):
+        pass
+    with TraceReader(path) as reader:
+        assert (len(reader), reader.n_chunks) == (0, 0)
+        assert list(reader) == [] and reader.partitions(4) == []
+        assert reader.read(0, 10).dtype == TRACE_RECORD and len(reader.read(0, 10)) == 0
+        assert reader.metadata == {}
+
+
+def test_rejects_bad_header(tmp_path, records):
+    path = write_trace(tmp_path / "t.trace", records[:10])
+    data = path.read_bytes()
+
+    bad_magic = tmp_path / "magic.trace"
+    bad_magic.write_bytes(b'NOTTRACE' + data[len(TRACE_MAGIC):])
+    with pytest.raises(ValueError, match="not a trace file"):
+        TraceReader(bad_magic)
+
+    newer = tmp_path / "version.trace"
+    version = (TRACE_VERSION + 1).to_bytes(2, 'little')
+    newer.write_bytes(data[:8] + version + data[10:])
+    with pytest.raises(ValueError, match="unsupported trace version"):
+        TraceReader(newer)
+
+
+def test_append_rejects_other_dtypes(tmp_path):
+    with TraceWriter(tmp_path / "t.trace") as writer:
+        with pytest.raises(TypeError):
+            writer.append(np.zeros(4, dtype=np.uint32))
+    with pytest.raises(ValueError):
+        TraceWriter(tmp_path / "u.trace", compression='lzma')
@@ -40,6 +40,7 @@ from tools.benchmark_to_cpi import (
     compute_uncertainty,
     compute_confidence,
 )
+from common.jsoncache import load_json
 
 
 # ---------------------------------------------------------------------------
@@ -56,8 +57,7 @@ def load_benchmark_database(repo_root: Path) -> Dict[str, List[Dict]]:
         print(f"ERROR: {path} not found")
         return {}
 
-    with open(path) as f:
-        data = json.load(f)
+    data = load_json(path)
 
     # Group by processor
     by_processor = {}
@@ -134,8 +134,7 @@ def load_existing_measured_cpi(model_dir: Path) -> Optional[Dict]:
     path = model_dir / "measurements" / "measured_cpi.json"
     if not path.exists():
         return None
-    with open(path) as f:
-        return json.load(f)
+    return load_json(path)
 
 
 def get_existing_workloads(existing: Dict) -> List[str]:
@@ -278,8 +277,8 @@ def update_measured_cpi(
     source_url = ""
     sources_db = None
     try:
-        with open(REPO_ROOT / "external_validation" / "benchmark_data.json") as f:
-            sources_db = json.load(f).get("sources", {})
+        sources_db = load_json(
+            REPO_ROOT / "external_validation" / "benchmark_data.json").get("sources", {})
     except Exception:
         pass
     if sources_db:
@@ -473,8 +472,7 @@ def update_remaining_sources(repo_root: Path, processors_with_data: set, dry_run
     Changes source from 'emulator' to 'estimated' for honesty.
     """
     index_path = repo_root / "index.json"
-    with open(index_path) as f:
-        index = json.load(f)
+    index = load_json(index_path)
 
     updated = 0
     for family, info in index.get("families", {}).items():
@@ -488,8 +486,7 @@ def update_remaining_sources(repo_root: Path, processors_with_data: set, dry_run
                 continue
 
             try:
-                with open(path) as f:
-                    data = json.load(f)
+                data = load_json(path)
             except Exception:
                 continue
 
@@ -543,8 +540,7 @@ def main():
 
     # Load index
     index_path = REPO_ROOT / "index.json"
-    with open(index_path) as f:
-        index = json.load(f)
+    index = load_json(index_path)
 
     # Build processor -> (family, model_dir) mapping
     proc_info = {}
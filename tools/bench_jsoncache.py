@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Parsed-JSON Cache
+================================
+
+Times three passes over the JSON files the batch tools read (``index.json``,
+``_models_config.json`` and every ``models/**/*.json``):
+
+    json      -- plain ``json.load`` of every file (no cache)
+    cold      -- ``common.jsoncache`` with an empty bundle: parse + flush
+    warm      -- a fresh ``JsonCache`` over the bundle written by the cold
+                 pass, i.e. what the next tool invocation sees
+
+Each pass runs ``--repeat`` times and the best time is reported.  The
+benchmark uses its own bundle file so the shared cache is left untouched.
+
+Usage:
+    python tools/bench_jsoncache.py
+    python tools/bench_jsoncache.py --repeat 5 -o jsoncache_bench.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.jsoncache import JsonCache
+
+
+def collect_files():
+    files = [REPO_ROOT / "index.json", REPO_ROOT / "_models_config.json"]
+    files += sorted((REPO_ROOT / "models").glob("**/*.json"))
+    return [p for p in files if p.exists()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold/warm timings for common.jsoncache")
+    parser.add_argument("--repeat", type=int, default=3, help="Passes per mode (best is kept)")
+    parser.add_argument("--output", "-o", help="Write the timings to JSON")
+    args = parser.parse_args()
+
+    files = collect_files()
+    total_bytes = sum(p.stat().st_size for p in files)
+
+    def plain():
+        for p in files:
+            with open(p) as f:
+                json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bundle = Path(tmp) / "jsoncache.marshal"
+
+        def cold():
+            cache = JsonCache(bundle)
+            cache.clear()
+            for p in files:
+                cache.load(p)
+            cache.flush()
+
+        def warm():
+            cache = JsonCache(bundle)
+            for p in files:
+                cache.load(p)
+            assert cache.misses == 0
+
+        timings = {}
+        for name, fn in (("json", plain), ("cold", cold), ("warm", warm)):
+            best = float('inf')
+            for _ in range(max(1, args.repeat)):
+                start = time.perf_counter()
+                fn()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        bundle_bytes = bundle.stat().st_size
+
+    print("=" * 90)
+    print(f"JSON CACHE BENCHMARK — {len(files)} files, {total_bytes / 1e6:.1f} MB of JSON, "
+          f"bundle {bundle_bytes / 1e6:.1f} MB")
+    print("=" * 90)
+    for name, seconds in timings.items():
+        print(f"  {name:<6} {seconds * 1000:9.1f} ms   "
+              f"{timings['json'] / seconds:5.2f}x vs json")
+    print("-" * 90)
+
+    if args.output:
+        result = {
+            "files": len(files),
+            "json_bytes": total_bytes,
+            "bundle_bytes": bundle_bytes,
+            "seconds": timings,
+            "warm_speedup": timings["json"] / timings["warm"],
+        }
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Benchmark Fleet Memory Footprint
+=================================
+
+Loads every model in the fleet, analyzes each named workload and keeps
+``--snapshots`` copies of those results resident, then reports the memory
+held (``tracemalloc``) per model and per result for two builds of the core
+data classes in ``common/base_model.py``:
+
+    plain     -- ordinary dataclasses with a per-instance ``__dict__`` and
+                 no name interning (the classes before ``__slots__``)
+    slotted   -- the classes as shipped
+
+Each build is measured in its own child process so that neither sees the
+other's allocations.  The plain build is produced by re-declaring the
+shipped classes without slots before any model is imported.
+
+Usage:
+    python tools/bench_model_memory.py
+    python tools/bench_model_memory.py --snapshots 200 -o model_memory.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import dataclasses
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+CORE_CLASSES = ("CacheConfig", "BranchPredictionConfig", "InstructionCategory",
+                "WorkloadProfile", "AnalysisResult")
+BUILDS = ("plain", "slotted")
+
+
+def _plain_copy(cls):
+    """``cls`` re-declared as an ordinary dataclass (no slots, no interning)."""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if not name.startswith('__')
+                 and not isinstance(value, types.MemberDescriptorType)}
+    specs = []
+    for f in dataclasses.fields(cls):
+        kwargs = {}
+        if f.default is not dataclasses.MISSING:
+            kwargs['default'] = f.default
+        if f.default_factory is not dataclasses.MISSING:
+            kwargs['default_factory'] = f.default_factory
+        specs.append((f.name, f.type, dataclasses.field(**kwargs)))
+    return dataclasses.make_dataclass(cls.__name__, specs, namespace=namespace)
+
+
+def install_plain_classes():
+    import common.base_model as base_model
+    for name in CORE_CLASSES:
+        setattr(base_model, name, _plain_copy(getattr(base_model, name)))
+
+
+def _instance_bytes(obj) -> int:
+    size = sys.getsizeof(obj)
+    state = getattr(obj, '__dict__', None)
+    return size + (sys.getsizeof(state) if state is not None else 0)
+
+
+def measure(build: str, snapshots: int) -> dict:
+    """Load the fleet under one build of the data classes (child process)."""
+    if build == "plain":
+        install_plain_classes()
+    from common.model_loader import discover_processors, load_model
+
+    entries = discover_processors(REPO_ROOT, None, None)
+    tracemalloc.start()
+    start = time.perf_counter()
+    models = []
+    for entry in entries:
+        model, _ = load_model(entry['model_file'])
+        if model is not None:
+            models.append(model)
+    load_seconds = time.perf_counter() - start
+    fleet_bytes = tracemalloc.get_traced_memory()[0]
+
+    instance_bytes = instances = 0
+    for model in models:
+        categories = getattr(model, 'instruction_categories',
+                             getattr(model, '_instruction_categories', {}))
+        profiles = getattr(model, 'workload_profiles', getattr(model, '_workload_profiles', {}))
+        objects = list(categories.values()) + list(profiles.values())
+        objects += [c for c in (getattr(model, 'cache_config', None),
+                                getattr(model, 'branch_config', None)) if c is not None]
+        instances += len(objects)
+        instance_bytes += sum(_instance_bytes(o) for o in objects)
+
+    workloads = [(model, list(getattr(model, 'workload_profiles',
+                                      getattr(model, '_workload_profiles', {}))))
+                 for model in models]
+    before = tracemalloc.get_traced_memory()[0]
+    resident = []
+    for _ in range(snapshots):
+        snapshot = []
+        for model, names in workloads:
+            for name in names:
+                try:
+                    snapshot.append(model.analyze(name))
+                except Exception:
+                    pass
+        resident.append(snapshot)
+    results = sum(len(s) for s in resident)
+    result_bytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        "build": build,
+        "models": len(models),
+        "load_seconds": load_seconds,
+        "fleet_bytes": fleet_bytes,
+        "bytes_per_model": fleet_bytes / max(1, len(models)),
+        "instances": instances,
+        "instance_bytes_per_model": instance_bytes / max(1, len(models)),
+        "results": results,
+        "result_bytes": result_bytes,
+        "bytes_per_result": result_bytes / max(1, results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet memory with plain vs slotted data classes")
+    parser.add_argument("--snapshots", type=int, default=20,
+                        help="Copies of the fleet's workload results kept resident")
+    parser.add_argument("--output", "-o", help="Write the measurements to JSON")
+    parser.add_argument("--child", choices=BUILDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        json.dump(measure(args.child, args.snapshots), sys.stdout)
+        return
+
+    measurements = {}
+    for build in BUILDS:
+        out = subprocess.run([sys.executable, __file__, "--child", build,
+                              "--snapshots", str(args.snapshots)],
+                             cwd=REPO_ROOT, check=True, capture_output=True, text=True).stdout
+        measurements[build] = json.loads(out.strip().splitlines()[-1])
+    plain, slotted = measurements["plain"], measurements["slotted"]
+
+    print("=" * 90)
+    print(f"FLEET MEMORY BENCHMARK — {slotted['models']} models, "
+          f"{args.snapshots} resident result snapshots ({slotted['results']} results)")
+    print("=" * 90)
+    print(f"  {'':<28}{'plain':>14}{'slotted':>14}{'saved':>10}")
+    for label, key, unit in (("fleet (per model)", "bytes_per_model", "B"),
+                             ("data classes (per model)", "instance_bytes_per_model", "B"),
+                             ("analysis result", "bytes_per_result", "B"),
+                             ("all resident results", "result_bytes", "B")):
+        a, b = plain[key], slotted[key]
+        saved = 100.0 * (a - b) / a if a else 0.0
+        print(f"  {label:<28}{a:>12,.0f} {unit}{b:>12,.0f} {unit}{saved:>9.1f}%")
+    print("-" * 90)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"snapshots": args.snapshots, **measurements}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
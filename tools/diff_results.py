@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Diff Fleet Results Between Two Snapshots
+=========================================
+
+Compares two processor x workload result snapshots (``common.result_diff``)
+and flags every value that moved beyond tolerance.  Exits 1 when anything
+changed, 0 otherwise, so it can gate automation; bad input (unknown run,
+unreadable snapshot file, nothing to compare) exits 2.
+
+A snapshot is one of:
+
+    run:<id>          a run in the run store (``common.run_store``)
+    run:latest        the newest run of --kind; ``run:latest~1`` the one before
+    current           analyze every model now (nothing is written)
+    <path>.json       a snapshot saved with --save
+
+Usage:
+    python tools/diff_results.py                          # run:latest vs current
+    python tools/diff_results.py run:latest~1 run:latest
+    python tools/diff_results.py baseline.json current --rtol 1e-3
+    python tools/diff_results.py run:12 current --save after.json -o diff.json
+    python tools/diff_results.py --kind identify --field residual_after run:latest~1 run:latest
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.result_diff import SNAPSHOT_FIELDS, ResultSnapshot, diff_snapshots
+from common.run_store import RunStore
+
+
+def load_snapshot(spec: str, store: RunStore, args) -> ResultSnapshot:
+    """Resolve a snapshot spec (see module docstring)."""
+    if spec == "current":
+        from tools.run_fleet_analysis import analyze_fleet
+        with RunStore(":memory:") as scratch:
+            with scratch.start_run("analyze", method="analyze") as writer:
+                analyze_fleet(writer, family=args.family)
+            snapshot = ResultSnapshot.from_run_store(scratch, writer.run_id, args.field)
+        snapshot.source = "current"
+        return snapshot
+
+    match = re.fullmatch(r"run:(?:(\d+)|latest(?:~(\d+))?)", spec)
+    if match:
+        if match.group(1):
+            run_id = int(match.group(1))
+            if not store.execute("SELECT 1 FROM runs WHERE run_id = ?", [run_id]):
+                raise ValueError(f"{spec}: no such run in the store")
+        else:
+            back = int(match.group(2) or 0)
+            runs = store.runs(kind=args.kind, last=back + 1)
+            if len(runs) <= back:
+                raise ValueError(f"{spec}: only {len(runs)} {args.kind} run(s) in the store")
+            run_id = runs[0]["run_id"]
+        return ResultSnapshot.from_run_store(store, run_id, args.field, family=args.family)
+
+    path = Path(spec)
+    if not path.exists():
+        raise ValueError(f"{spec}: no such snapshot file")
+    snapshot = ResultSnapshot.from_json(path)
+    if args.family:
+        keep = [m.startswith(f"{args.family}/") for m in snapshot.models.tolist()]
+        snapshot = ResultSnapshot(snapshot.models[keep], snapshot.workloads[keep],
+                                  snapshot.values[keep], snapshot.field, snapshot.source)
+    return snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Flag processor x workload results that moved between two snapshots"
+    )
+    parser.add_argument("before", nargs="?", default="run:latest", help="Baseline snapshot")
+    parser.add_argument("after", nargs="?", default="current", help="New snapshot")
+    parser.add_argument("--kind", default="analyze", choices=("analyze", "identify"),
+                        help="Run kind for run:latest specs")
+    parser.add_argument("--field", default="predicted", choices=SNAPSHOT_FIELDS,
+                        help="Value compared (run-store snapshots)")
+    parser.add_argument("--family", help="Only models in this family")
+    parser.add_argument("--atol", type=float, default=1e-6, help="Absolute tolerance")
+    parser.add_argument("--rtol", type=float, default=1e-4, help="Relative tolerance")
+    parser.add_argument("--ignore-missing", action="store_true",
+                        help="Don't fail on added / removed results")
+    parser.add_argument("--limit", type=int, default=40, help="Rows in the report")
+    parser.add_argument("--db", help="Run store path (default: .cache/runs.sqlite3)")
+    parser.add_argument("--save", help="Save the 'after' snapshot to JSON")
+    parser.add_argument("--output", "-o", help="Write the diff to JSON")
+    args = parser.parse_args()
+
+    try:
+        with RunStore(args.db) as store:
+            before = load_snapshot(args.before, store, args)
+            after = load_snapshot(args.after, store, args)
+    except (ValueError, OSError, sqlite3.Error) as e:
+        parser.error(str(e))
+    if not len(before) and not len(after):
+        scope = f" for family '{args.family}'" if args.family else ""
+        parser.error(f"no results to compare in {args.before} or {args.after}{scope}")
+
+    start = time.perf_counter()
+    diff = diff_snapshots(before, after, atol=args.atol, rtol=args.rtol,
+                          ignore_missing=args.ignore_missing)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 90)
+    print(f"RESULT DIFF — {args.field} ({len(before)} vs {len(after)} results, "
+          f"diff {elapsed * 1000:.1f} ms)")
+    print("=" * 90)
+    print(diff.report(args.limit))
+
+    if args.save:
+        after.to_json(args.save)
+        print(f"Saved snapshot {args.save}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(diff.to_dict(), f, indent=2)
+        print(f"Wrote {args.output}")
+
+    sys.exit(1 if diff.n_changed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Export Fleet Metadata, Parameters and Results
+==============================================
+
+Streams processor metadata, model parameters and per-workload analysis
+results (``common.fleet_export``) as JSON Lines or CSV, one model at a time.
+
+Usage:
+    python tools/export_fleet.py -o fleet.jsonl                # all kinds, JSONL
+    python tools/export_fleet.py --format csv -o export/fleet  # fleet_processor.csv, ...
+    python tools/export_fleet.py --kind result --family intel  # JSONL to stdout
+    python tools/export_fleet.py --format csv --kind parameter -o params
+
+For pandas, use ``common.fleet_export.to_dataframes(iter_records())``.
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import sys
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.fleet_export import RECORD_KINDS, iter_records, write_csv, write_jsonl
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream fleet records as JSONL or CSV")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--kind", action="append", choices=RECORD_KINDS,
+                        help="Record kind to export (repeatable; default: all)")
+    parser.add_argument("--family", help="Only models in this family")
+    parser.add_argument("--processor", help="Only this processor")
+    parser.add_argument("--output", "-o",
+                        help="JSONL file, or CSV prefix (<prefix>_<kind>.csv); "
+                             "JSONL defaults to stdout")
+    args = parser.parse_args()
+
+    kinds = tuple(args.kind or RECORD_KINDS)
+    errors = {}
+    records = iter_records(kinds, family=args.family, processor=args.processor, errors=errors)
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        if args.format == "jsonl":
+            stream = (stack.enter_context(open(args.output, "w")) if args.output
+                      else sys.stdout)
+            counts = write_jsonl(records, stream)
+            targets = [args.output or "stdout"]
+        else:
+            if not args.output:
+                parser.error("--format csv needs --output PREFIX")
+            prefix = Path(args.output)
+            prefix.parent.mkdir(parents=True, exist_ok=True)
+            targets = [f"{prefix}_{kind}.csv" for kind in kinds]
+            streams = {kind: stack.enter_context(open(path, "w", newline=""))
+                       for kind, path in zip(kinds, targets)}
+            counts = write_csv(records, streams)
+    elapsed = time.perf_counter() - start
+
+    for model, error in sorted(errors.items()):
+        print(f"  ERROR {model}: {error}", file=sys.stderr)
+    summary = ", ".join(f"{counts.get(k, 0)} {k}" for k in kinds)
+    print(f"Exported {summary} records in {elapsed:.2f}s -> {', '.join(targets)}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
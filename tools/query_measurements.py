@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Query the Measurement Store
+============================
+
+Syncs the SQLite measurement store (``common.measurement_store``) with the
+model JSON files and answers fleet-wide questions about measured CPI,
+instruction timings and benchmark scores without opening every file.
+
+Usage:
+    python tools/query_measurements.py --sync
+    python tools/query_measurements.py cpi --workload typical --source published_benchmark
+    python tools/query_measurements.py cpi --family intel --year-to 1985 --min-confidence high
+    python tools/query_measurements.py benchmarks --benchmark dhrystone_2_1 -o dhry.json
+    python tools/query_measurements.py sql "SELECT source, COUNT(*) FROM cpi_measurements GROUP BY source"
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.measurement_store import MeasurementStore
+
+COLUMNS = {
+    'cpi': ('processor', 'year', 'workload', 'measured_cpi', 'source', 'confidence'),
+    'timings': ('processor', 'year', 'mnemonic', 'category', 'measured_cycles', 'source'),
+    'benchmarks': ('processor', 'year', 'benchmark', 'score', 'unit', 'source'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fleet-wide queries over the SQLite measurement store"
+    )
+    parser.add_argument("table", nargs="?", choices=("cpi", "timings", "benchmarks", "sql"),
+                        help="What to list (or 'sql' to run a statement)")
+    parser.add_argument("statement", nargs="?", help="SQL statement for 'sql'")
+    parser.add_argument("--db", help="Database path (default: .cache/measurements.sqlite3)")
+    parser.add_argument("--sync", action="store_true", help="Only sync the store and report")
+    parser.add_argument("--rebuild", action="store_true", help="Re-read every file")
+    parser.add_argument("--processor", action="append", help="Processor (repeatable)")
+    parser.add_argument("--family", help="Family directory, e.g. intel")
+    parser.add_argument("--workload", help="Workload (cpi)")
+    parser.add_argument("--source", help="Source kind")
+    parser.add_argument("--confidence", help="Exact confidence (cpi)")
+    parser.add_argument("--min-confidence", choices=("low", "medium", "high"))
+    parser.add_argument("--category", help="Instruction category (timings)")
+    parser.add_argument("--benchmark", help="Benchmark name (benchmarks)")
+    parser.add_argument("--year-from", type=int)
+    parser.add_argument("--year-to", type=int)
+    parser.add_argument("--output", "-o", help="Write the rows to JSON")
+    args = parser.parse_args()
+
+    with MeasurementStore(args.db) as store:
+        start = time.time()
+        report = store.sync(force=args.rebuild)
+        synced = time.time() - start
+        if args.sync or args.table is None:
+            print(f"Scanned {report.scanned} files in {synced:.2f}s: {report.loaded} loaded, "
+                  f"{report.touched} touched, {report.removed} removed")
+            for path, error in report.errors.items():
+                print(f"  ERROR {path}: {error}")
+            return
+
+        start = time.time()
+        common = dict(processor=args.processor, family=args.family,
+                      year_from=args.year_from, year_to=args.year_to)
+        if args.table == 'sql':
+            if not args.statement:
+                raise SystemExit("'sql' needs a statement")
+            rows = [dict(r) for r in store.execute(args.statement)]
+            columns = tuple(rows[0]) if rows else ()
+        elif args.table == 'cpi':
+            rows = store.cpi_measurements(workload=args.workload, source=args.source,
+                                          confidence=args.confidence,
+                                          min_confidence=args.min_confidence, **common)
+            columns = COLUMNS['cpi']
+        elif args.table == 'timings':
+            rows = store.instruction_timings(category=args.category, source=args.source, **common)
+            columns = COLUMNS['timings']
+        else:
+            rows = store.benchmark_results(benchmark=args.benchmark, source=args.source, **common)
+            columns = COLUMNS['benchmarks']
+        elapsed = time.time() - start
+
+    print("=" * 90)
+    print(f"MEASUREMENT STORE — {args.table} ({len(rows)} rows, query {elapsed * 1000:.1f} ms, "
+          f"sync {synced:.2f}s)")
+    print("=" * 90)
+    print("  ".join(f"{c:<16}" for c in columns))
+    print("-" * 90)
+    for row in rows:
+        print("  ".join(f"{str(row.get(c, '')):<16.16}" for c in columns))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Parallel Trace Replay
+======================
+
+Replays a binary trace file (``common.tracefile``) through a model's timing
+table and any number of cache geometries and branch predictors, split into
+partitions across worker processes (``common.parallel_replay``).  With
+--checkpoint-dir an interrupted run resumes where it stopped.
+
+Cache geometries are SIZE:WAYS[:LINE[:POLICY]] (e.g. 8192:4:16:lru);
+predictors are KIND[:TABLE_BITS[:HISTORY_BITS]] (e.g. gshare:12:8, static).
+
+Usage:
+    python tools/replay_trace.py z80.trace --processor z80
+    python tools/replay_trace.py long.trace --processor mos6502 \\
+        --cache 2048:2:16 --cache 8192:4:16 --predictor bimodal:10 --warmup 500000
+    python tools/replay_trace.py long.trace --cache 16384:4 --checkpoint-dir ckpt/ -o replay.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.branch_sim import PredictorConfig
+from common.cache_sim import CacheGeometry
+from common.parallel_replay import DEFAULT_CHECKPOINT_EVERY, DEFAULT_WARMUP, replay_parallel
+from common.trace import load_timing_table
+
+
+def parse_geometry(spec: str) -> CacheGeometry:
+    """SIZE:WAYS[:LINE[:POLICY]] -> CacheGeometry."""
+    parts = spec.split(':')
+    geometry = CacheGeometry(int(parts[0], 0), int(parts[1]))
+    if len(parts) > 2:
+        geometry = CacheGeometry(geometry.size, geometry.associativity, int(parts[2]),
+                                 parts[3] if len(parts) > 3 else 'lru')
+    return geometry
+
+
+def parse_predictor(spec: str) -> PredictorConfig:
+    """KIND[:TABLE_BITS[:HISTORY_BITS]] -> PredictorConfig."""
+    parts = spec.split(':')
+    kwargs = {}
+    if len(parts) > 1:
+        kwargs['table_bits'] = int(parts[1])
+    if len(parts) > 2:
+        kwargs['history_bits'] = int(parts[2])
+    return PredictorConfig(parts[0], **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Parallel replay of a trace file through CPI, cache and branch engines"
+    )
+    parser.add_argument("trace", help="Trace file")
+    parser.add_argument("--processor", help="Processor whose timing table gives CPI")
+    parser.add_argument("--cache", action="append", default=[], type=parse_geometry,
+                        help="Cache geometry SIZE:WAYS[:LINE[:POLICY]] (repeatable)")
+    parser.add_argument("--kind", choices=("data", "instruction", "unified"), default="data",
+                        help="Cache accesses to simulate (default: data)")
+    parser.add_argument("--predictor", action="append", default=[], type=parse_predictor,
+                        help="Branch predictor KIND[:TABLE_BITS[:HISTORY_BITS]] (repeatable)")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                        help=f"Warm-up records per partition (default: {DEFAULT_WARMUP})")
+    parser.add_argument("--partitions", type=int, help="Partitions (default: workers)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--checkpoint-dir", help="Save / resume per-partition checkpoints here")
+    parser.add_argument("--checkpoint-every", type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                        help=f"Chunks between checkpoints (default: {DEFAULT_CHECKPOINT_EVERY})")
+    parser.add_argument("--output", "-o", help="Write the merged result to JSON")
+    args = parser.parse_args()
+
+    table = None
+    if args.processor:
+        matches = sorted((REPO_ROOT / "models").glob(f"*/{args.processor}"))
+        if not matches:
+            raise SystemExit(f"Unknown processor '{args.processor}'")
+        table = load_timing_table(matches[0])
+    if table is None and not args.cache and not args.predictor:
+        raise SystemExit("Nothing to simulate: give --processor, --cache or --predictor")
+
+    print("=" * 90)
+    print(f"PARALLEL TRACE REPLAY — {args.trace}")
+    print("=" * 90)
+    start = time.time()
+    result = replay_parallel(args.trace, table, args.cache, args.predictor, kind=args.kind,
+                             warmup=args.warmup, partitions=args.partitions,
+                             workers=args.workers, checkpoint_dir=args.checkpoint_dir,
+                             checkpoint_every=args.checkpoint_every)
+    print(f"{result.instructions} records in {result.partitions} partitions, "
+          f"{result.warmup} warm-up records, {result.resumed} resumed")
+    print("-" * 90)
+    if result.trace is not None:
+        print(f"CPI {result.trace.cpi:.4f}  ({result.trace.unknown} unknown opcodes)")
+    for stats in result.cache:
+        label = stats.geometry.label
+        print(f"{label:<28} hit rate {stats.hit_rate:.4f}  bias {result.cache_bias[label]:+.2e}")
+    for stats in result.branch:
+        label = stats.config.label
+        line = f"{label:<28} accuracy {stats.accuracy:.4f}  bias {result.branch_bias[label]:+.2e}"
+        if stats.config.kind == 'btb':
+            line += f"  BTB hit rate {stats.btb_hit_rate:.4f}"
+        print(line)
+    print("-" * 90)
+    print(f"Elapsed: {time.time() - start:.1f}s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result.to_dict(), f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Static Instruction Mix of ROM / Program Images
+================================================
+
+Disassembles ROM or program images with a model's timing-table opcodes
+and prints the static category histogram of each image plus the combined
+mix, ready to use as a WorkloadProfile.  Directories are searched
+recursively and images are processed in parallel.
+
+Usage:
+    python tools/rom_mix.py --processor z80 roms/spectrum/
+    python tools/rom_mix.py --processor mos6502 basic.rom kernal.rom -v
+    python tools/rom_mix.py --processor i8080 cpm.com --mode linear --base 0x100
+    python tools/rom_mix.py --processor z80 roms/ --output rom_mix.json
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.disasm import DISASSEMBLY_MODES, disassemble_images, find_images
+
+
+def find_model_dir(processor: str) -> Optional[Path]:
+    """Model directory of a processor id (models/<family>/<processor>)."""
+    matches = sorted((REPO_ROOT / "models").glob(f"*/{processor}"))
+    return matches[0] if matches else None
+
+
+def combined_mix(summaries: List[Dict]) -> Dict[str, float]:
+    """Instruction-weighted category mix over all decoded images."""
+    counts: Dict[str, float] = {}
+    total = 0
+    for s in summaries:
+        if s['status'] != 'ok':
+            continue
+        for cat, share in s['category_mix'].items():
+            counts[cat] = counts.get(cat, 0.0) + share * s['instructions']
+        total += s['instructions']
+    return {cat: n / total for cat, n in sorted(counts.items())} if total else {}
+
+
+def print_summary(summaries: List[Dict], verbose: bool = False) -> None:
+    print(f"{'Image':<28} {'Bytes':>7} {'Instr':>7} {'Code%':>6} {'Unknown':>8} "
+          f"{'CPI':>6}  Top categories")
+    print("-" * 90)
+    for s in summaries:
+        if s['status'] != 'ok':
+            print(f"{s['name']:<28} ERROR: {s['error']}")
+            continue
+        top = sorted(s['category_mix'].items(), key=lambda kv: -kv[1])
+        top = ", ".join(f"{cat} {share:.0%}" for cat, share in (top if verbose else top[:3]))
+        print(f"{s['name']:<28} {s['size']:>7} {s['instructions']:>7} "
+              f"{100 * s['code_fraction']:>5.1f}% {s['unknown']:>8} "
+              f"{s['static_cpi']:>6.2f}  {top}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Static instruction-mix extraction from ROM / program images"
+    )
+    parser.add_argument("images", nargs="+", help="Image files or directories")
+    parser.add_argument("--processor", required=True,
+                        help="Processor whose timing table decodes the images")
+    parser.add_argument("--mode", choices=DISASSEMBLY_MODES, default="recursive",
+                        help="Follow control flow (default) or sweep linearly")
+    parser.add_argument("--base", type=lambda v: int(v, 0),
+                        help="Load address (default: top of memory for 6502, else 0)")
+    parser.add_argument("--entry", type=lambda v: int(v, 0), nargs="+",
+                        help="Entry addresses (default: reset / interrupt vectors)")
+    parser.add_argument("--name", default="rom_static", help="Name of the combined profile")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--output", "-o", help="Write per-image results and profile to JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show every category")
+    args = parser.parse_args()
+
+    model_dir = find_model_dir(args.processor)
+    if model_dir is None:
+        raise SystemExit(f"Unknown processor '{args.processor}'")
+    paths: List[Path] = []
+    for item in map(Path, args.images):
+        paths.extend(find_images(item) if item.is_dir() else [item])
+    if not paths:
+        raise SystemExit("No images found")
+
+    options = {'mode': args.mode}
+    if args.base is not None:
+        options['base'] = args.base
+    if args.entry:
+        options['entry_points'] = args.entry
+
+    print("=" * 90)
+    print(f"STATIC INSTRUCTION MIX — {args.processor} ({len(paths)} images, {args.mode})")
+    print("=" * 90)
+    start = time.time()
+    summaries = disassemble_images(paths, model_dir, workers=args.workers, **options)
+    print_summary(summaries, verbose=args.verbose)
+
+    mix = combined_mix(summaries)
+    print("-" * 90)
+    print("Combined: " + ", ".join(f"{cat} {share:.3f}" for cat, share in mix.items()))
+    print(f"Elapsed: {time.time() - start:.2f}s")
+
+    if args.output:
+        profile = {'name': args.name, 'category_weights': mix,
+                   'description': f"Static mix of {len(paths)} {args.processor} images"}
+        with open(args.output, 'w') as f:
+            json.dump({'processor': args.processor, 'images': summaries,
+                       'workload_profile': profile}, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
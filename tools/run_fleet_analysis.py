@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Record a Fleet Analysis Run
+============================
+
+Loads every processor model, predicts CPI for its measured workloads plus
+the four standard ones (``model.analyze(w).cpi``), and appends the
+predictions and residuals as one 'analyze' run to the run store
+(``common.run_store``).  Nothing under ``models/`` is written.
+
+Usage:
+    python tools/run_fleet_analysis.py
+    python tools/run_fleet_analysis.py --family intel --label cache-default-change
+    python tools/run_fleet_analysis.py --trend --family intel --last 20
+
+Author: Grey-Box Performance Modeling Research
+Date: January 2026
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from common.run_store import TREND_METRICS, RunStore
+from common.system_identification import load_measurements_for_model
+from common.model_loader import discover_processors, load_model
+
+STANDARD = ('typical', 'compute', 'memory', 'control')
+
+
+def analyze_fleet(writer, family=None, processor=None, verbose=False):
+    """Analyze the matching models and feed them to ``writer``.
+
+    Returns:
+        (recorded, failed) model counts
+    """
+    recorded = failed = 0
+    for entry in discover_processors(REPO_ROOT, family, processor):
+        label = f"{entry['family']}/{entry['processor']}"
+        start = time.perf_counter()
+        model, error = load_model(entry["model_file"])
+        if model is None:
+            failed += 1
+            if verbose:
+                print(f"  ERROR {label:35s} — {error}")
+            continue
+        measurements = load_measurements_for_model(entry["model_dir"])
+        predicted = {}
+        for workload in dict.fromkeys(STANDARD + tuple(measurements)):
+            try:
+                predicted[workload] = float(model.analyze(workload).cpi)
+            except Exception:
+                pass
+        writer.add_analysis(entry["model_dir"], predicted, measurements,
+                            seconds=time.perf_counter() - start)
+        recorded += 1
+    return recorded, failed
+
+
+def print_trend(store, args):
+    trend = store.error_trend(family=args.family, processor=args.processor, kind=args.kind,
+                              last=args.last, metric=args.metric)
+    print("=" * 90)
+    print(f"{args.metric.upper()} TREND — {len(trend.models)} models, "
+          f"runs {trend.run_ids.tolist()}")
+    print("=" * 90)
+    change = trend.change()
+    for name, row, delta in zip(trend.models, trend.values, change):
+        valid = row[~np.isnan(row)]
+        first = f"{valid[0]:10.4f}" if len(valid) else f"{'—':>10s}"
+        last = f"{valid[-1]:10.4f}" if len(valid) else f"{'—':>10s}"
+        moved = f"{delta:+10.4f}" if not np.isnan(delta) else f"{'':>10s}"
+        print(f"  {name:35s} {len(valid):4d} runs  first {first}  last {last}  {moved}")
+    return trend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record fleet CPI predictions in the run store")
+    parser.add_argument("--family", help="Only models in this family")
+    parser.add_argument("--processor", help="Only this processor")
+    parser.add_argument("--label", help="Tag stored with the run")
+    parser.add_argument("--db", help="Run store path (default: .cache/runs.sqlite3)")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    parser.add_argument("--trend", action="store_true",
+                        help="Print the error trend instead of recording a run")
+    parser.add_argument("--kind", default="analyze", choices=("analyze", "identify"),
+                        help="Run kind for --trend")
+    parser.add_argument("--metric", default="cpi_error_percent", choices=TREND_METRICS)
+    parser.add_argument("--last", type=int, default=20, help="Runs in the --trend window")
+    parser.add_argument("--output", "-o", help="Write the trend to JSON")
+    args = parser.parse_args()
+
+    with RunStore(args.db) as store:
+        if args.trend:
+            start = time.perf_counter()
+            trend = print_trend(store, args)
+            print(f"\nQuery + report: {(time.perf_counter() - start) * 1000:.1f} ms")
+            if args.output:
+                with open(args.output, 'w') as f:
+                    json.dump(trend.to_dict(), f, indent=2)
+                print(f"Wrote {args.output}")
+            return
+
+        start = time.perf_counter()
+        with store.start_run("analyze", method="analyze", label=args.label,
+                             hyperparameters={"family": args.family,
+                                              "processor": args.processor,
+                                              "workloads": list(STANDARD)}) as writer:
+            recorded, failed = analyze_fleet(writer, args.family, args.processor, args.verbose)
+        print(f"Recorded run {writer.run_id}: {recorded} models "
+              f"({failed} failed to load) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -27,14 +27,15 @@ REPO_ROOT = Path(__file__).resolve().parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from common.jsoncache import load_json
+
 TODAY = datetime.now().strftime("%Y-%m-%d")
 
 
 def load_benchmark_database() -> Dict[str, List[Dict]]:
     """Load benchmark database grouped by processor."""
     path = REPO_ROOT / "external_validation" / "benchmark_data.json"
-    with open(path) as f:
-        data = json.load(f)
+    data = load_json(path)
     by_processor = {}
     for entry in data.get("benchmarks", []):
         proc = entry["processor"]
@@ -45,8 +46,7 @@ def load_benchmark_database() -> Dict[str, List[Dict]]:
 def get_processor_dirs() -> Dict[str, Path]:
     """Map processor name -> model directory."""
     index_path = REPO_ROOT / "index.json"
-    with open(index_path) as f:
-        index = json.load(f)
+    index = load_json(index_path)
     dirs = {}
     for family, info in index.get("families", {}).items():
         for proc in info.get("processors", []):
@@ -63,16 +63,14 @@ def get_current_validation_status(model_dir: Path) -> Dict[str, Any]:
     # Read sysid result
     sysid_path = model_dir / "identification" / "sysid_result.json"
     if sysid_path.exists():
-        with open(sysid_path) as f:
-            sysid = json.load(f)
+        sysid = load_json(sysid_path)
         status["cpi_error"] = sysid.get("cpi_error_percent", None)
         status["converged"] = sysid.get("converged", False)
 
     # Read measured_cpi for source info
     meas_path = model_dir / "measurements" / "measured_cpi.json"
     if meas_path.exists():
-        with open(meas_path) as f:
-            meas = json.load(f)
+        meas = load_json(meas_path)
         measurements = meas.get("measurements", [])
         if measurements:
             status["source"] = measurements[0].get("source", "unknown")
@@ -202,8 +200,7 @@ def update_validation_json(model_dir: Path, proc_name: str, benchmarks: List[Dic
         return False
 
     try:
-        with open(val_files[0]) as f:
-            val_data = json.load(f)
+        val_data = load_json(val_files[0])
     except Exception:
         return False
 
@@ -288,8 +285,7 @@ def main():
         # Check if this processor was actually updated (has published_benchmark source)
         meas_path = model_dir / "measurements" / "measured_cpi.json"
         if meas_path.exists():
-            with open(meas_path) as f:
-                meas = json.load(f)
+            meas = load_json(meas_path)
             sources = [m.get("source") for m in meas.get("measurements", [])]
             if "published_benchmark" not in sources:
                 continue